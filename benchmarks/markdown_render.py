@@ -0,0 +1,75 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Renders per second of a new Markdown\
+instance per comment (how it used to be)\
+vs the thread-local one (get_markdown)
+
+Usage: python benchmarks/markdown_render.py [--renders 2000]
+"""
+
+from __future__ import unicode_literals
+
+import os
+import sys
+import time
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'spirit.settings_tests')
+
+import django
+
+
+COMMENTS = [
+    "Hi @nitely, thanks! :+1:",
+    "# Title\n\nSome *emphasis* and **strong** text, `code` and a [link](http://example.com).\n\n"
+    "* one\n* two\n* three\n",
+    "> @esteban said:\n> Lorem ipsum dolor sit amet,\n> consectetur adipiscing elit\n\n"
+    "I don't agree :smile: :airplane:",
+    "https://www.youtube.com/watch?v=Z0UISCEe52Y\n\nhttp://example.com/foo.png\n\n"
+    "Check those :8ball:",
+    "[poll name=foo]\n# Which one?\n1. opt 1\n2. opt 2\n[/poll]\n\nVote please @nitely @esteban",
+    "```\ndef foo():\n    return 'bar'\n```\n\n" + "Long paragraph with words. " * 40,
+]
+
+
+def bench(name, get_markdown, renders):
+    start = time.time()
+
+    for i in range(renders):
+        markdown = get_markdown()
+        markdown.render(COMMENTS[i % len(COMMENTS)])
+
+    elapsed = time.time() - start
+    sys.stdout.write('%s: %.1f renders/s\n' % (name, renders / elapsed))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--renders', type=int, default=2000)
+    args = parser.parse_args()
+
+    django.setup()
+
+    from django.test.utils import setup_test_environment
+    from django.test.runner import DiscoverRunner
+    from spirit.core.utils.markdown import Markdown, get_markdown
+    from spirit.core.tests import utils
+
+    setup_test_environment()
+    runner = DiscoverRunner(verbosity=0)
+    old_config = runner.setup_databases()
+
+    try:
+        utils.create_user(username='nitely')
+        utils.create_user(username='esteban')
+        bench('new instance', Markdown, args.renders)
+        bench('get_markdown', get_markdown, args.renders)
+    finally:
+        runner.teardown_databases(old_config)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,410 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Markdown pipeline benchmark. Renders a synthetic\
+corpus of comments (quotes, emojis, non latin text,\
+mentions, polls, embeds and regex backtracking traps) and\
+reports the throughput and p99 per kind of comment\
+and the p99 time spent on each grammar rule.
+
+Timings are relative to a calibration loop, so a\
+baseline taken in another machine is comparable.\
+It exits with status 1 if anything got slower\
+than the baseline by more than the tolerance.
+
+Usage: python benchmarks/markdown_suite.py [--save-baseline] [--tolerance 0.5]
+"""
+
+from __future__ import unicode_literals
+
+import gc
+import os
+import re
+import sys
+import copy
+import json
+import random
+import argparse
+from collections import defaultdict
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'spirit.settings_tests')
+
+import django
+
+try:
+    from time import perf_counter as clock
+except ImportError:  # Python 2
+    from time import time as clock
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'markdown_baseline.json')
+
+USERNAMES = ['user_%d' % i for i in range(50)]
+
+WORDS = (
+    "lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod "
+    "tempor incididunt ut labore et dolore magna aliqua").split()
+
+
+def _words(rand, count):
+    return ' '.join(rand.choice(WORDS) for _ in range(count))
+
+
+def _paragraphs(rand, count):
+    return '\n\n'.join(_words(rand, rand.randint(10, 60)) for _ in range(count))
+
+
+def _plain(rand):
+    return (
+        "# %s\n\n%s *%s* **%s** `%s` [%s](http://example.com/%d)\n\n"
+        "* %s\n* %s\n\n```\n%s\n```\n\n%s" % (
+            _words(rand, 3), _words(rand, 20), _words(rand, 2), _words(rand, 2),
+            _words(rand, 1), _words(rand, 2), rand.randint(0, 1000),
+            _words(rand, 5), _words(rand, 5), _words(rand, 8), _paragraphs(rand, 2)))
+
+
+def _quotes(rand):
+    from spirit.core.utils.markdown import quotify
+
+    comment = _paragraphs(rand, 3)
+
+    for _ in range(rand.randint(2, 5)):
+        comment = quotify(comment, rand.choice(USERNAMES)) + _paragraphs(rand, 1)
+
+    return comment
+
+
+def _emojis(rand):
+    from spirit.core.utils.markdown.utils.emoji import emojis
+
+    names = sorted(emojis)
+    unicode_emojis = [
+        '\U0001f44d', '\U0001f44d\U0001f3fb', '\U0001f1fa\U0001f1f8',
+        '\u2764\ufe0f', '\u26a1', '1\ufe0f\u20e3', '\u00a9']
+
+    def emoji(i):
+        chance = rand.random()
+
+        if chance < 0.5:
+            return ':%s:' % rand.choice(names)
+
+        if chance < 0.8:
+            return rand.choice(unicode_emojis)
+
+        return ':not_an_emoji_%d:' % i
+
+    return ' '.join(emoji(i) for i in range(rand.randint(50, 200)))
+
+
+def _non_latin(rand):
+    # Japanese and the symbols blocks,
+    # none of them are emojis by themselves
+    words = [
+        '\u65e5\u672c\u8a9e', '\u30c6\u30ad\u30b9\u30c8', '\u3072\u3089\u304c\u306a',
+        '\u6f22\u5b57', '\u3002', '\u2122', '\u20ac', '\u2192', '\u00a9']
+    return '\n\n'.join(
+        ''.join(rand.choice(words) for _ in range(rand.randint(20, 120)))
+        for _ in range(rand.randint(1, 4)))
+
+
+def _mentions(rand):
+    # Some of them don't exist
+    return ' '.join(
+        '@%s %s' % (rand.choice(USERNAMES) if rand.random() < 0.8 else 'nobody_%d' % i, _words(rand, 2))
+        for i in range(rand.randint(10, 60)))
+
+
+def _polls(rand):
+    polls = []
+
+    for i in range(rand.randint(1, 3)):
+        choices = '\n'.join(
+            '%d. %s' % (number, _words(rand, 4))
+            for number in range(1, rand.randint(3, 6)))
+        polls.append(
+            "[poll name=poll_%d min=1 max=2 mode=secret]\n# %s?\n%s\n[/poll]" % (
+                i, _words(rand, 5), choices))
+
+    return '\n\n'.join(polls) + '\n\n' + _paragraphs(rand, 1)
+
+
+def _embeds(rand):
+    links = [
+        'https://www.youtube.com/watch?v=Z0UISCEe52Y&t=1h2m3s',
+        'https://youtu.be/Z0UISCEe52Y',
+        'https://vimeo.com/11111111',
+        'https://gfycat.com/PointlessRequiredAntelope',
+        'https://www.twitch.tv/videos/1234567',
+        'http://example.com/foo.png',
+        'http://example.com/foo.mp4',
+        'http://example.com/foo.mp3']
+    return '\n\n'.join(
+        rand.choice(links) if rand.random() < 0.7 else _words(rand, 10)
+        for _ in range(rand.randint(5, 20)))
+
+
+def _pathological(rand):
+    size = rand.randint(500, 3000)
+    traps = [
+        ':' + 'a' * size,
+        ':a' * size,
+        '@' * size,
+        '@a.' * size,
+        '*' * size,
+        '_a' * size,
+        '[' * size,
+        '[poll name=' + 'a' * size,
+        '[poll name=foo]\n' + '1. opt\n' * size,
+        'https://www.youtube.com/watch?v=' + 'a' * size,
+        'http://' + 'a' * size + '.png?',
+        '> ' * size + 'foo',
+        '`' * size,
+        '    ' + '\n    '.join(['a'] * size)]
+    return rand.choice(traps)
+
+
+KINDS = [
+    ('plain', _plain),
+    ('quotes', _quotes),
+    ('emojis', _emojis),
+    ('non_latin', _non_latin),
+    ('mentions', _mentions),
+    ('polls', _polls),
+    ('embeds', _embeds),
+    ('pathological', _pathological)]
+
+
+def generate_corpus(size, seed=0):
+    """
+    Return a list of (kind, comment)
+    """
+    rand = random.Random(seed)
+    return [
+        (kind, generate(rand))
+        for kind, generate in KINDS
+        for _ in range(size)]
+
+
+class TimedPattern(object):
+    """
+    Wraps a compiled regex, so the time\
+    spent on each rule can be measured
+    """
+
+    def __init__(self, pattern, elapsed):
+        self.pattern = pattern
+        self.elapsed = elapsed
+
+    def match(self, *args, **kwargs):
+        start = clock()
+
+        try:
+            return self.pattern.match(*args, **kwargs)
+        finally:
+            self.elapsed[0] += clock() - start
+
+    def __getattr__(self, name):
+        return getattr(self.pattern, name)
+
+
+def _timed_rules(lexer, prefix, timers):
+    rules = copy.copy(lexer.rules)
+
+    for name in lexer.default_rules:
+        elapsed = timers['%s.%s' % (prefix, name)]
+        setattr(rules, name, TimedPattern(getattr(lexer.rules, name), elapsed))
+
+    return rules
+
+
+def calibrate(rounds=10):
+    """
+    Time of a fixed pure python and regex\
+    workload, used as the unit of the timings
+    """
+    pattern = re.compile(r'^(?P<word>[a-z]+?)(?: |$)')
+    text = ' '.join(WORDS) * 20
+    timings = []
+
+    for _ in range(rounds):
+        start = clock()
+
+        for _ in range(20):
+            rest = text
+
+            while rest:
+                m = pattern.match(rest)
+                rest = rest[len(m.group(0)):] if m else rest[1:]
+
+        timings.append(clock() - start)
+
+    return min(timings)
+
+
+def percentile(values, percent):
+    values = sorted(values)
+    index = int(round(percent / 100.0 * (len(values) - 1)))
+    return values[index]
+
+
+def run(corpus, rounds):
+    """
+    Render the corpus a few times, the fastest\
+    round of each comment is kept, the slower\
+    ones are noise (i.e: other processes)
+
+    :return: The render timings by kind\
+    and the rule timings by rule name
+    """
+    from spirit.core.utils.markdown import Markdown
+
+    timers = defaultdict(lambda: [0.0])
+    markdown = Markdown()
+    markdown.block.rules = _timed_rules(markdown.block, 'block', timers)
+    markdown.inline.rules = _timed_rules(markdown.inline, 'inline', timers)
+
+    render_timings = [float('inf')] * len(corpus)
+    rule_timings = defaultdict(lambda: [float('inf')] * len(corpus))
+    gc_enabled = gc.isenabled()
+    gc.disable()
+
+    try:
+        for _ in range(rounds):
+            for index, (kind, comment) in enumerate(corpus):
+                markdown.reset()
+
+                for elapsed in timers.values():
+                    elapsed[0] = 0.0
+
+                start = clock()
+                markdown.render(comment)
+                render_timings[index] = min(render_timings[index], clock() - start)
+
+                for name, elapsed in timers.items():
+                    rule_timings[name][index] = min(rule_timings[name][index], elapsed[0])
+    finally:
+        if gc_enabled:
+            gc.enable()
+
+    timings_by_kind = defaultdict(list)
+
+    for (kind, _), elapsed in zip(corpus, render_timings):
+        timings_by_kind[kind].append(elapsed)
+
+    return timings_by_kind, rule_timings
+
+
+def summarize(render_timings, rule_timings, unit):
+    results = {}
+
+    for kind, timings in render_timings.items():
+        results['render.%s.throughput' % kind] = len(timings) / sum(timings) * unit
+        results['render.%s.p99' % kind] = percentile(timings, 99) / unit
+
+    for name, timings in rule_timings.items():
+        results['rule.%s.p99' % name] = percentile(timings, 99) / unit
+
+    return results
+
+
+def compare(results, baseline, tolerance):
+    """
+    Return the metrics that regressed\
+    past the tolerance
+
+    :return: [(name, baseline, current)]
+    """
+    regressions = []
+
+    for name, current in sorted(results.items()):
+        if name not in baseline:
+            continue
+
+        expected = baseline[name]
+
+        if name.endswith('.throughput'):
+            regressed = current < expected / (1 + tolerance)
+        else:
+            # Rules that are not even tried would
+            # be flagged for a tiny absolute increase
+            regressed = current > expected * (1 + tolerance) + 0.005
+
+        if regressed:
+            regressions.append((name, expected, current))
+
+    return regressions
+
+
+def report(results, unit):
+    sys.stdout.write('calibration unit: %.2fms\n' % (unit * 1000))
+
+    for name, value in sorted(results.items()):
+        if name.endswith('.throughput'):
+            sys.stdout.write('%-40s %10.1f renders/s\n' % (name, value / unit))
+        else:
+            sys.stdout.write('%-40s %10.1f us\n' % (name, value * unit * 1000000))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--size', type=int, default=30, help='comments per kind')
+    parser.add_argument('--rounds', type=int, default=5)
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--tolerance', type=float, default=0.5)
+    parser.add_argument('--save-baseline', action='store_true', default=False)
+    args = parser.parse_args()
+
+    django.setup()
+
+    from django.test.utils import setup_test_environment, override_settings
+    from django.test.runner import DiscoverRunner
+    from spirit.core.tests import utils
+
+    setup_test_environment()
+    runner = DiscoverRunner(verbosity=0)
+    old_config = runner.setup_databases()
+
+    try:
+        for username in USERNAMES:
+            utils.create_user(username=username)
+
+        corpus = generate_corpus(args.size, seed=args.seed)
+        unit = calibrate()
+
+        # Measure the rendering, not the cache
+        with override_settings(ST_MARKDOWN_CACHE_SIZE=0, ST_MARKDOWN_CACHE=None):
+            render_timings, rule_timings = run(corpus, args.rounds)
+
+        unit = min(unit, calibrate())
+    finally:
+        runner.teardown_databases(old_config)
+
+    results = summarize(render_timings, rule_timings, unit)
+    report(results, unit)
+
+    if args.save_baseline:
+        with open(BASELINE_PATH, 'w') as fh:
+            json.dump(results, fh, indent=2, sort_keys=True)
+
+        sys.stdout.write('baseline saved\n')
+        return
+
+    if not os.path.exists(BASELINE_PATH):
+        sys.stdout.write('no baseline, run with --save-baseline\n')
+        return
+
+    with open(BASELINE_PATH) as fh:
+        baseline = json.load(fh)
+
+    regressions = compare(results, baseline, args.tolerance)
+
+    for name, expected, current in regressions:
+        sys.stdout.write('REGRESSION %s: %.4f -> %.4f\n' % (name, expected, current))
+
+    if regressions:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
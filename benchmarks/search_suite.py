@@ -0,0 +1,152 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+Search backends benchmark. Indexes a synthetic\
+corpus of topics with the whoosh and the database\
+backends, and reports the indexing throughput\
+and the latency of a set of queries.
+
+Usage: python benchmarks/search_suite.py [--topics 500] [--comments 10]
+"""
+
+from __future__ import unicode_literals
+
+import os
+import sys
+import shutil
+import random
+import tempfile
+import argparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'spirit.settings_tests')
+
+import django
+
+try:
+    from time import perf_counter as clock
+except ImportError:  # Python 2
+    from time import time as clock
+
+WORDS = (
+    "lorem ipsum dolor sit amet consectetur adipiscing elit sed do eiusmod "
+    "tempor incididunt ut labore et dolore magna aliqua enim ad minim veniam "
+    "quis nostrud exercitation ullamco laboris nisi aliquip ex ea commodo "
+    "consequat duis aute irure in reprehenderit voluptate velit esse cillum "
+    "fugiat nulla pariatur excepteur sint occaecat cupidatat non proident").split()
+
+
+def _words(rand, count):
+    # Skewed, like a natural language
+    return ' '.join(
+        WORDS[min(int(rand.expovariate(0.1)), len(WORDS) - 1)]
+        for _ in range(count))
+
+
+def generate_corpus(topics, comments, seed=0):
+    from spirit.core.tests import utils
+
+    rand = random.Random(seed)
+    user = utils.create_user()
+    categories = [utils.create_category() for _ in range(5)]
+
+    for _ in range(topics):
+        topic = utils.create_topic(
+            rand.choice(categories), user=user, title=_words(rand, 6))
+
+        for _ in range(rand.randint(1, comments)):
+            utils.create_comment(
+                topic=topic, user=user,
+                comment_html='<p>%s</p>' % _words(rand, rand.randint(10, 100)))
+
+    queries = [_words(rand, rand.randint(1, 3)) for _ in range(50)]
+    return categories, queries
+
+
+def percentile(values, percent):
+    values = sorted(values)
+    index = int(round(percent / 100.0 * (len(values) - 1)))
+    return values[index]
+
+
+def run(using, categories, queries, batch_size):
+    from haystack import connections
+    from haystack.query import SearchQuerySet
+    from spirit.topic.models import Topic
+
+    backend = connections[using].get_backend()
+    index = connections[using].get_unified_index().get_index(Topic)
+    backend.clear()
+    topics = list(index.index_queryset(using=using).order_by('pk'))
+
+    start = clock()
+
+    for i in range(0, len(topics), batch_size):
+        backend.update(index, topics[i:i + batch_size])
+
+    index_time = clock() - start
+    timings = []
+
+    for query in queries:
+        start = clock()
+        sqs = SearchQuerySet(using=using)\
+            .models(Topic)\
+            .auto_query(query)\
+            .filter(
+                category_id__in=[c.pk for c in categories[:3]],
+                is_removed=0)
+        list(sqs[:20])
+        timings.append(clock() - start)
+
+    return {
+        'index.throughput': len(topics) / index_time,
+        'query.p50': percentile(timings, 50),
+        'query.p99': percentile(timings, 99)}
+
+
+def report(using, results):
+    sys.stdout.write('%s\n' % using)
+    sys.stdout.write('  %-20s %10.1f topics/s\n' % ('index.throughput', results['index.throughput']))
+    sys.stdout.write('  %-20s %10.2f ms\n' % ('query.p50', results['query.p50'] * 1000))
+    sys.stdout.write('  %-20s %10.2f ms\n' % ('query.p99', results['query.p99'] * 1000))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument('--topics', type=int, default=500)
+    parser.add_argument('--comments', type=int, default=10, help='max comments per topic')
+    parser.add_argument('--batch-size', type=int, default=100)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    django.setup()
+
+    from django.test.utils import setup_test_environment
+    from django.test.runner import DiscoverRunner
+    from haystack import connections
+
+    # Whoosh on disk, as it's deployed
+    path = tempfile.mkdtemp(prefix='spirit_search_bench_')
+    connections.connections_info['bench_whoosh'] = {
+        'ENGINE': 'haystack.backends.whoosh_backend.WhooshEngine',
+        'PATH': path}
+    connections.connections_info['bench_db'] = {
+        'ENGINE': 'spirit.search.db_backend.DatabaseEngine'}
+
+    setup_test_environment()
+    runner = DiscoverRunner(verbosity=0)
+    old_config = runner.setup_databases()
+
+    try:
+        categories, queries = generate_corpus(args.topics, args.comments, seed=args.seed)
+
+        for using in ('bench_whoosh', 'bench_db'):
+            report(using, run(using, categories, queries, args.batch_size))
+    finally:
+        runner.teardown_databases(old_config)
+        shutil.rmtree(path, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
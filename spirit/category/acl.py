@@ -0,0 +1,196 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+import time
+import uuid
+import threading
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+
+__all__ = [
+    'ACCESS',
+    'TOPIC',
+    'COMMENT',
+    'get_category_ids',
+    'bump_version',
+    'bump_pending_version']
+
+ACCESS, TOPIC, COMMENT = range(3)
+
+RESTRICT_FIELDS = ('restrict_access', 'restrict_topic', 'restrict_comment')
+
+_VERSION_KEY = 'st_category_acl_version'
+_SNAPSHOT_KEY = 'st_category_acl_snapshot_%s'
+
+# Seconds, bounds the life of a snapshot
+# built from uncommitted changes
+_SNAPSHOT_TIMEOUT = 60
+
+_lock = threading.Lock()
+_local = {
+    'version': None,
+    'snapshot': None,
+    'expires_at': 0,
+    'category_ids': {}}
+_pending = threading.local()
+
+
+def _get_cache():
+    return caches[settings.ST_CATEGORY_ACL_CACHE]
+
+
+def _set_version():
+    _get_cache().set(_VERSION_KEY, uuid.uuid4().hex, timeout=None)
+
+
+def bump_version():
+    """
+    Invalidate the snapshot, must be called\
+    every time a category or its restrictions change.\
+    It's bumped again once the changes are committed,\
+    since a concurrent request may cache the snapshot\
+    of the uncommitted ones under the new version
+    """
+    _set_version()
+
+    try:
+        on_commit = transaction.on_commit
+    except AttributeError:  # Django 1.8
+        _pending.is_pending = True
+    else:
+        on_commit(_set_version)
+
+
+def bump_pending_version():
+    """
+    Bump the version again once the request\
+    is finished (and committed). Django 1.8\
+    has no ``transaction.on_commit``
+    """
+    if getattr(_pending, 'is_pending', False):
+        _pending.is_pending = False
+        _set_version()
+
+
+def _get_version():
+    cache = _get_cache()
+    version = cache.get(_VERSION_KEY)
+
+    if version is None:
+        cache.add(_VERSION_KEY, uuid.uuid4().hex, timeout=None)
+        version = cache.get(_VERSION_KEY)
+
+    return version
+
+
+def _build_snapshot():
+    """
+    Return the groups each category is restricted to
+
+    :return: {category_id: (access_groups, topic_groups, comment_groups)}
+    """
+    Category = apps.get_model('spirit_category', 'Category')
+    groups = {
+        pk: (set(), set(), set())
+        for pk in Category.objects.values_list('pk', flat=True)}
+
+    for index, field_name in enumerate(RESTRICT_FIELDS):
+        through = Category._meta.get_field(field_name).rel.through
+
+        for category_id, group_id in through.objects.values_list('category_id', 'group_id'):
+            groups[category_id][index].add(group_id)
+
+    return {
+        pk: tuple(frozenset(g) for g in category_groups)
+        for pk, category_groups in groups.items()}
+
+
+def _get_snapshot(version):
+    if (_local['version'] == version and
+            _local['expires_at'] > time.time()):
+        return _local['snapshot']
+
+    cache = _get_cache()
+    key = _SNAPSHOT_KEY % version
+    snapshot = cache.get(key)
+
+    if snapshot is None:
+        snapshot = _build_snapshot()
+        cache.set(key, snapshot, timeout=_SNAPSHOT_TIMEOUT)
+
+    with _lock:
+        _local.update({
+            'version': version,
+            'snapshot': snapshot,
+            'expires_at': time.time() + _SNAPSHOT_TIMEOUT,
+            'category_ids': {}})
+
+    return snapshot
+
+
+def _is_allowed(restricted_to, group_ids):
+    return not restricted_to or not restricted_to.isdisjoint(group_ids)
+
+
+def _resolve(snapshot, group_ids, perm):
+    """
+    Return the ids of the categories the groups\
+    can access, or None if there is no restriction
+    """
+    category_ids = sorted(
+        pk
+        for pk, groups in snapshot.items()
+        if _is_allowed(groups[ACCESS], group_ids) and
+        _is_allowed(groups[perm], group_ids))
+
+    if len(category_ids) == len(snapshot):
+        return
+
+    return category_ids
+
+
+def _get_group_ids(user):
+    if not user or not user.is_authenticated():
+        return frozenset()
+
+    # Cache it for the request lifetime
+    try:
+        return user._st_group_ids
+    except AttributeError:
+        user._st_group_ids = frozenset(
+            user.groups.values_list('pk', flat=True))
+        return user._st_group_ids
+
+
+def get_category_ids(user, perm=ACCESS):
+    """
+    Return the ids of the categories the\
+    user is allowed to access, create topics\
+    in or comment in, depending on perm
+
+    :param user: The user, maybe anonymous
+    :param perm: One of ACCESS, TOPIC or COMMENT
+    :return: List of category ids or None\
+    if the user is allowed in all of them
+    """
+    if (user and user.is_authenticated() and
+            getattr(user, 'st', None) and
+            (user.st.is_administrator or user.st.is_moderator)):
+        return
+
+    version = _get_version()
+    snapshot = _get_snapshot(version)
+    group_ids = _get_group_ids(user)
+    key = (version, group_ids, perm)
+    category_ids_cache = _local['category_ids']
+
+    try:
+        return category_ids_cache[key]
+    except KeyError:
+        category_ids = _resolve(snapshot, group_ids, perm)
+        category_ids_cache[key] = category_ids
+        return category_ids
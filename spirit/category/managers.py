@@ -1,11 +1,12 @@
 # -*- coding: utf-8 -*-
 
 from __future__ import unicode_literals
-from django.contrib.auth.models import Group
 
 from django.db import models
 from django.db.models import Q
 
+from . import acl
+
 
 class CategoryQuerySet(models.QuerySet):
 
@@ -20,40 +21,28 @@ class CategoryQuerySet(models.QuerySet):
         return self.unremoved().public().can_access(user)
 
     def can_access(self, user=None):
-        if user and user.is_authenticated():
-            if getattr(user, 'st', None) and (user.st.is_administrator or user.st.is_moderator):
-                return self.all()
-            groups = user.groups.all()
-        else:
-            groups = Group.objects.none()
-        return self.filter(
-            Q(restrict_access=None) |
-            Q(restrict_access__contains=groups)
-        ).distinct()
+        category_ids = acl.get_category_ids(user, acl.ACCESS)
+
+        if category_ids is None:
+            return self.all()
+
+        return self.filter(pk__in=category_ids)
 
     def can_topic(self, user):
-        if user and user.is_authenticated():
-            if getattr(user, 'st', None) and (user.st.is_administrator or user.st.is_moderator):
-                return self.all()
-            groups = user.groups.all()
-        else:
-            groups = Group.objects.none()
-        return self.can_access(user).filter(
-            Q(restrict_topic=None) |
-            Q(restrict_topic__contains=groups)
-        ).distinct()
+        category_ids = acl.get_category_ids(user, acl.TOPIC)
+
+        if category_ids is None:
+            return self.all()
+
+        return self.filter(pk__in=category_ids)
 
     def can_comment(self, user):
-        if user and user.is_authenticated():
-            if getattr(user, 'st', None) and (user.st.is_administrator or user.st.is_moderator):
-                return self.all()
-            groups = user.groups.all()
-        else:
-            groups = Group.objects.none()
-        return self.can_access(user).filter(
-            Q(restrict_comment=None) |
-            Q(restrict_comment__contains=groups)
-        ).distinct()
+        category_ids = acl.get_category_ids(user, acl.COMMENT)
+
+        if category_ids is None:
+            return self.all()
+
+        return self.filter(pk__in=category_ids)
 
     def opened(self):
         return self.filter(Q(parent=None) | Q(parent__is_closed=False),
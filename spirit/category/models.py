@@ -8,9 +8,14 @@ from django.core.urlresolvers import reverse
 from django.conf import settings
 from django.contrib.auth.models import Group
 from django.utils import timezone
+from django.db.models.signals import post_save, post_delete, m2m_changed
+from django.core.signals import request_finished
+from django.db.models import Q
+from django.apps import apps
 
 from .managers import CategoryQuerySet
 from ..core.utils.models import AutoSlugField
+from . import acl
 
 
 class Category(models.Model):
@@ -81,3 +86,35 @@ class Category(models.Model):
         if self.restrict_topic.exists():
             setattr(self, 'can_topic', self.restrict_topic.through.objects.filter(
                 category_id=self.id, group_id__in=group_ids).exists())
+
+
+def invalidate_acl(sender, **kwargs):
+    acl.bump_version()
+
+post_save.connect(invalidate_acl, sender=Category, dispatch_uid='Category:invalidate_acl')
+post_delete.connect(invalidate_acl, sender=Category, dispatch_uid='Category:invalidate_acl')
+post_delete.connect(invalidate_acl, sender=Group, dispatch_uid='Group:invalidate_acl')
+
+for _field_name in acl.RESTRICT_FIELDS:
+    m2m_changed.connect(
+        invalidate_acl,
+        sender=getattr(Category, _field_name).through,
+        dispatch_uid='Category:%s:invalidate_acl' % _field_name)
+
+
+def invalidate_pending_acl(sender, **kwargs):
+    acl.bump_pending_version()
+
+request_finished.connect(invalidate_pending_acl, dispatch_uid='Category:invalidate_pending_acl')
+
+
+def update_topics_visibility(sender, instance, created, **kwargs):
+    if created:
+        return
+
+    Topic = apps.get_model('spirit_topic', 'Topic')
+    Topic.objects\
+        .filter(Q(category=instance) | Q(category__parent=instance))\
+        .update_visibility()
+
+post_save.connect(update_topics_visibility, sender=Category, dispatch_uid='Category:update_topics_visibility')
@@ -7,11 +7,13 @@ from django.contrib.auth.models import Group
 from django.test import TestCase
 from django.core.urlresolvers import reverse
 from django.core.cache import cache
+from django.core.signals import request_finished
 
 from ..core.tests import utils
 from spirit.comment.models import Comment
 from ..topic.models import Topic
 from .models import Category
+from . import acl
 
 
 class CategoryViewTest(TestCase):
@@ -222,3 +224,103 @@ class CategoryViewTest(TestCase):
                                     form_data)
         self.assertEqual(response.status_code, 302)
         self.assertEqual(Comment.objects.count(), 4)
+
+
+class CategoryACLTest(TestCase):
+
+    def setUp(self):
+        utils.cache_clear()
+        self.user = utils.create_user()
+        self.group = Group.objects.create(name='secret group')
+        self.category = utils.create_category()
+        self.category_restricted = utils.create_category()
+
+    def test_acl_get_category_ids(self):
+        """
+        Should return the allowed category ids for each permission
+        """
+        self.assertIsNone(acl.get_category_ids(self.user, acl.ACCESS))
+
+        self.category_restricted.restrict_access.add(self.group)
+        category_ids = acl.get_category_ids(self.user, acl.ACCESS)
+        self.assertIn(self.category.pk, category_ids)
+        self.assertNotIn(self.category_restricted.pk, category_ids)
+        self.assertNotIn(self.category_restricted.pk, acl.get_category_ids(self.user, acl.TOPIC))
+        self.assertNotIn(self.category_restricted.pk, acl.get_category_ids(self.user, acl.COMMENT))
+        self.assertNotIn(self.category_restricted.pk, acl.get_category_ids(None, acl.ACCESS))
+
+        user = utils.create_user()
+        user.groups.add(self.group)
+        self.assertIsNone(acl.get_category_ids(user, acl.ACCESS))
+
+    def test_acl_get_category_ids_moderator(self):
+        """
+        Moderators can access everything
+        """
+        self.category_restricted.restrict_access.add(self.group)
+        self.user.st.is_moderator = True
+        self.user.st.save()
+        self.assertIsNone(acl.get_category_ids(self.user, acl.ACCESS))
+        self.assertIsNone(acl.get_category_ids(self.user, acl.COMMENT))
+
+    def test_acl_invalidation(self):
+        """
+        Should rebuild the snapshot when the categories change
+        """
+        self.category_restricted.restrict_comment.add(self.group)
+        self.assertNotIn(self.category_restricted.pk, acl.get_category_ids(self.user, acl.COMMENT))
+
+        self.category_restricted.restrict_comment.remove(self.group)
+        self.assertIsNone(acl.get_category_ids(self.user, acl.COMMENT))
+
+        self.group.categories_topic.add(self.category_restricted)
+        self.assertNotIn(self.category_restricted.pk, acl.get_category_ids(self.user, acl.TOPIC))
+
+        category = utils.create_category()
+        self.assertIn(category.pk, acl.get_category_ids(self.user, acl.TOPIC))
+
+        self.group.delete()
+        self.assertIsNone(acl.get_category_ids(self.user, acl.TOPIC))
+
+    def test_acl_invalidation_after_commit(self):
+        """
+        Should bump the version again once the request\
+        is finished, a concurrent request may have cached\
+        the uncommitted snapshot under the bumped version
+        """
+        acl.bump_version()
+        version = acl._get_version()
+        request_finished.send(sender=self.__class__)
+        version_finished = acl._get_version()
+        self.assertNotEqual(version, version_finished)
+
+        # Once
+        request_finished.send(sender=self.__class__)
+        self.assertEqual(acl._get_version(), version_finished)
+
+    def test_acl_snapshot_timeout(self):
+        """
+        Should rebuild the snapshot once it expires
+        """
+        self.assertIsNone(acl.get_category_ids(self.user, acl.ACCESS))
+        version = acl._get_version()
+        cache.delete(acl._SNAPSHOT_KEY % version)
+        self.category_restricted.restrict_access.through.objects.create(
+            category=self.category_restricted, group=self.group)  # No signals
+        self.assertIsNone(acl.get_category_ids(self.user, acl.ACCESS))
+
+        acl._local['expires_at'] = 0
+        self.assertNotIn(self.category_restricted.pk, acl.get_category_ids(self.user, acl.ACCESS))
+        self.assertEqual(acl._get_version(), version)
+
+    def test_acl_querysets_distinct(self):
+        """
+        Should filter by category ids, without joins
+        """
+        self.category_restricted.restrict_access.add(self.group)
+        topic = utils.create_topic(self.category)
+        utils.create_topic(self.category_restricted)
+        topics = Topic.objects.visible(self.user)
+        self.assertEqual(list(topics), [topic])
+        self.assertFalse(topics.query.distinct)
+        self.assertNotIn('restrict_access', str(topics.query))
@@ -63,3 +63,39 @@ class CommentBookmark(models.Model):
         )
 
         return bookmark
+
+    @classmethod
+    def increase_to(cls, user, topic, comment_number):
+        """
+        Move the bookmark forward, it never\
+        goes backwards. Nothing gets written\
+        if the bookmark is already ahead
+
+        :param user: The user, it must be authenticated
+        :param topic: The topic
+        :param comment_number: The comment number or None
+        """
+        if comment_number is None:
+            return
+
+        current_number = cls.objects\
+            .filter(user=user, topic=topic)\
+            .values_list('comment_number', flat=True)\
+            .first()
+
+        if current_number is None:
+            bookmark, created = cls.objects.get_or_create(
+                user=user,
+                topic=topic,
+                defaults={'comment_number': comment_number, }
+            )
+
+            if created:
+                return
+        elif current_number >= comment_number:
+            return
+
+        # It may have changed since it was read
+        cls.objects\
+            .filter(user=user, topic=topic, comment_number__lt=comment_number)\
+            .update(comment_number=comment_number)
@@ -66,6 +66,22 @@ class CommentBookmarkModelsTest(TestCase):
         comment_bookmark = CommentBookmark.objects.get(user=self.user, topic=self.topic)
         self.assertEqual(comment_bookmark.comment_number, config.comments_per_page * (page - 1) + 1)
 
+    def test_comment_bookmark_increase_to(self):
+        """
+        Should create or move the bookmark forward, never backwards
+        """
+        CommentBookmark.increase_to(user=self.user, topic=self.topic, comment_number=None)
+        self.assertFalse(CommentBookmark.objects.filter(user=self.user, topic=self.topic).exists())
+
+        CommentBookmark.increase_to(user=self.user, topic=self.topic, comment_number=11)
+        self.assertEqual(CommentBookmark.objects.get(user=self.user, topic=self.topic).comment_number, 11)
+
+        CommentBookmark.increase_to(user=self.user, topic=self.topic, comment_number=1)
+        self.assertEqual(CommentBookmark.objects.get(user=self.user, topic=self.topic).comment_number, 11)
+
+        CommentBookmark.increase_to(user=self.user, topic=self.topic, comment_number=21)
+        self.assertEqual(CommentBookmark.objects.get(user=self.user, topic=self.topic).comment_number, 21)
+
     def test_comment_bookmark_update_or_create_invalid_page(self):
         """
         Should do nothing when receiving an invalid page
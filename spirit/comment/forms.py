@@ -8,12 +8,14 @@ from django import forms
 from django.conf import settings
 from django.core.files.storage import default_storage
 from django.core.validators import MaxLengthValidator
+from django.db import transaction
 from django.utils.translation import ugettext_lazy as _
 from django.utils.encoding import smart_bytes
 
 from ..core import utils
-from ..core.utils.markdown import Markdown
+from ..core.utils.markdown import get_markdown, RENDERER_VERSION
 from ..topic.models import Topic
+from ..search.models import TopicIndexQueue, CommentIndexQueue
 from .poll.models import CommentPoll, CommentPollChoice
 from .models import Comment
 
@@ -62,7 +64,7 @@ class CommentForm(forms.ModelForm):
 
     def _get_comment_html(self):
         user = self.user or self.instance.user
-        markdown = Markdown(no_follow=not user.st.is_moderator)
+        markdown = get_markdown(no_follow=not user.st.is_moderator)
         comment_html = markdown.render(self.cleaned_data['comment'])
         self.mentions = markdown.get_mentions()
         self.polls = markdown.get_polls()
@@ -84,6 +86,7 @@ class CommentForm(forms.ModelForm):
             self.instance.topic = self.topic
 
         self.instance.comment_html = self._get_comment_html()
+        self.instance.comment_html_version = RENDERER_VERSION
         comment = super(CommentForm, self).save(commit)
 
         if commit:
@@ -98,20 +101,40 @@ class CommentMoveForm(forms.Form):
 
     def __init__(self, topic, *args, **kwargs):
         super(CommentMoveForm, self).__init__(*args, **kwargs)
+        self.topic = topic
         self.fields['comments'] = forms.ModelMultipleChoiceField(
             queryset=Comment.objects.filter(topic=topic),
             widget=forms.CheckboxSelectMultiple
         )
 
     def save(self):
-        comments = self.cleaned_data['comments']
-        comments_list = list(comments)
         topic = self.cleaned_data['topic']
-        comments.update(topic=topic)
 
-        # Update topic in comment instance
-        for c in comments_list:
-            c.topic = topic
+        with transaction.atomic():
+            # Same lock new comments take to get their
+            # number, in pk order so moves don't deadlock
+            list(Topic.objects
+                 .select_for_update()
+                 .filter(pk__in=[self.topic.pk, topic.pk])
+                 .order_by('pk')
+                 .values_list('pk', flat=True))
+
+            comments = self.cleaned_data['comments']
+            comments_list = list(comments)
+            comments.update(topic=topic)
+
+            # Update topic in comment instance
+            for c in comments_list:
+                c.topic = topic
+
+            # Fill the gaps left in the old topic
+            # and make room in the new one
+            if comments_list:
+                from_date = min(c.date for c in comments_list)
+                Comment.renumber(topic_id=self.topic.pk, from_date=from_date)
+                Comment.renumber(topic_id=topic.pk, from_date=from_date)
+                TopicIndexQueue.enqueue([self.topic.pk, topic.pk])
+                CommentIndexQueue.enqueue([c.pk for c in comments_list])
 
         return comments_list
 
@@ -1,12 +1,12 @@
 # -*- coding: utf-8 -*-
 
 from __future__ import unicode_literals
-from django.contrib.auth.models import Group
 
 from django.db import models
 from django.shortcuts import get_object_or_404
 from django.db.models import Q, Prefetch
 
+from ..category import acl
 from .like.models import CommentLike
 from .poll.models import CommentPoll, CommentPollChoice, CommentPollVote
 
@@ -22,48 +22,38 @@ class CommentQuerySet(models.QuerySet):
     def unremoved(self):
         # TODO: remove action
         return self.filter(
-            Q(topic__category__parent=None) | Q(topic__category__parent__is_removed=False),
-            topic__category__is_removed=False,
-            topic__is_removed=False,
+            topic__effective_is_removed=False,
             is_removed=False,
             action=0
         )
 
     def public(self):
-        return self.filter(topic__category__is_private=False)
+        return self.filter(topic__effective_is_private=False)
 
     def visible(self, user=None):
         return self.unremoved().public().can_access(user)
 
     def can_access(self, user=None):
-        if user and user.is_authenticated():
-            if getattr(user, 'st', None) and (user.st.is_administrator or user.st.is_moderator):
-                return self.all()
-            groups = user.groups.all()
-        else:
-            groups = Group.objects.none()
-        return self.filter(
-            Q(topic__category__restrict_access=None) |
-            Q(topic__category__restrict_access__contains=groups)
-        ).distinct()
+        category_ids = acl.get_category_ids(user, acl.ACCESS)
+
+        if category_ids is None:
+            return self.all()
+
+        return self.filter(topic__category_id__in=category_ids)
 
     def can_comment(self, user):
-        if user and user.is_authenticated():
-            if getattr(user, 'st', None) and (user.st.is_administrator or user.st.is_moderator):
-                return self.all()
-            groups = user.groups.all()
-        else:
-            groups = Group.objects.none()
-        return self.can_access(user).filter(
-            Q(topic__category__restrict_comment=None) |
-            Q(topic__category__restrict_comment__contains=groups)
-        ).distinct()
+        category_ids = acl.get_category_ids(user, acl.COMMENT)
+
+        if category_ids is None:
+            return self.all()
+
+        return self.filter(topic__category_id__in=category_ids)
 
     def for_topic(self, topic):
         return self.filter(topic=topic)
 
     def _access(self, user):
-        return self.filter(Q(topic__category__is_private=False) | Q(topic__topics_private__user=user))
+        return self.filter(Q(topic__effective_is_private=False) | Q(topic__topics_private__user=user))
 
     def with_likes(self, user):
         if not user.is_authenticated():
@@ -0,0 +1,23 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('spirit_comment', '0004_auto_20160315_2021'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='comment_number',
+            field=models.PositiveIntegerField(verbose_name='comment number', blank=True, null=True),
+        ),
+        migrations.AlterIndexTogether(
+            name='comment',
+            index_together=set([('topic', 'comment_number')]),
+        ),
+    ]
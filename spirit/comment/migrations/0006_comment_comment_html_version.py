@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('spirit_comment', '0005_comment_comment_number'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='comment',
+            name='comment_html_version',
+            field=models.CharField(max_length=32, blank=True, default='', editable=False),
+        ),
+    ]
@@ -2,12 +2,14 @@
 
 from __future__ import unicode_literals
 
-from django.db import models
-from django.db.models.signals import post_save, post_delete
+import threading
+
+from django.db import models, transaction
+from django.db.models.signals import post_save, pre_delete, post_delete
 from django.utils.translation import ugettext_lazy as _
 from django.core.urlresolvers import reverse
 from django.conf import settings
-from django.db.models import F
+from django.db.models import F, Max, Case, When, Value
 from django.utils import timezone
 from django.utils.encoding import python_2_unicode_compatible
 
@@ -25,6 +27,10 @@ ACTION = (
     (UNPINNED, _("topic unpinned")),
 )
 
+# Every number updated takes 3 query parameters,
+# SQLite (before 3.32) allows up to 999 per query
+_NUMBERS_BATCH_SIZE = 300
+
 
 @python_2_unicode_compatible
 class Comment(models.Model):
@@ -34,6 +40,7 @@ class Comment(models.Model):
 
     comment = models.TextField(_("comment"))
     comment_html = models.TextField(_("comment html"))
+    comment_html_version = models.CharField(max_length=32, blank=True, default='', editable=False)
     action = models.IntegerField(_("action"), choices=ACTION, default=COMMENT)
     date = models.DateTimeField(default=timezone.now)
     is_removed = models.BooleanField(default=False)
@@ -42,17 +49,30 @@ class Comment(models.Model):
 
     modified_count = models.PositiveIntegerField(_("modified count"), default=0)
     likes_count = models.PositiveIntegerField(_("likes count"), default=0)
+    comment_number = models.PositiveIntegerField(_("comment number"), null=True, blank=True)
 
     objects = CommentQuerySet.as_manager()
 
     class Meta:
         ordering = ['-date', '-pk']
+        index_together = [('topic', 'comment_number'), ]
         verbose_name = _("comment")
         verbose_name_plural = _("comments")
 
     def __str__(self):
         return "%s - %s" % (self.date, self.user)
 
+    def save(self, *args, **kwargs):
+        if self.pk is not None or self.comment_number is not None:
+            return super(Comment, self).save(*args, **kwargs)
+
+        # The topic row is locked until the
+        # comment is inserted, so concurrent
+        # comments get consecutive numbers
+        with transaction.atomic():
+            self.comment_number = Comment.next_comment_number(self.topic_id)
+            return super(Comment, self).save(*args, **kwargs)
+
     def get_absolute_url(self):
         return reverse('spirit:comment:find', kwargs={'pk': str(self.id), })
 
@@ -104,6 +124,95 @@ class Comment(models.Model):
                 .order_by('pk')
                 .last())
 
+    @classmethod
+    def next_comment_number(cls, topic_id):
+        """
+        Return the number (position) for a new\
+        comment in the topic. This must be called\
+        within a transaction, the topic row\
+        is locked until it gets committed
+
+        :param topic_id: Topic the comment belongs to
+        :return: 1-based comment number
+        """
+        topic_model = cls._meta.get_field('topic').related_model
+        list(topic_model.objects
+             .select_for_update()
+             .filter(pk=topic_id)
+             .values_list('pk', flat=True))
+
+        last_number = cls.objects\
+            .filter(topic_id=topic_id)\
+            .aggregate(last_number=Max('comment_number'))['last_number']
+
+        if last_number is None:
+            # Comments created before the numbers
+            # were introduced, if any, run
+            # spiritcommentnumbers to backfill them
+            last_number = cls.objects\
+                .filter(topic_id=topic_id)\
+                .count()
+
+        return last_number + 1
+
+    @classmethod
+    def renumber(cls, topic_id, from_date=None, batch_size=_NUMBERS_BATCH_SIZE):
+        """
+        Re-assign the comment numbers of a topic.\
+        Comments are numbered in (date, pk) order,\
+        the same order they are listed in
+
+        :param topic_id: Topic to renumber
+        :param from_date: Renumber comments from this date onwards,\
+        the ones before it are assumed to be right
+        :param batch_size: Max comments updated per query,\
+        it's capped to fit the SQLite query parameters limit
+        :return: Number of updated comments
+        """
+        batch_size = min(batch_size, _NUMBERS_BATCH_SIZE)
+        comments = cls.objects\
+            .filter(topic_id=topic_id)\
+            .order_by('date', 'pk')
+        comment_number = 0
+
+        if from_date is not None:
+            last_number = comments\
+                .filter(date__lt=from_date)\
+                .order_by('-date', '-pk')\
+                .values_list('comment_number', flat=True)\
+                .first()
+
+            if last_number is not None or not comments.filter(date__lt=from_date).exists():
+                comments = comments.filter(date__gte=from_date)
+                comment_number = last_number or 0
+
+        updated_count = 0
+        changed = []
+
+        for pk, number in comments.values_list('pk', 'comment_number').iterator():
+            comment_number += 1
+
+            if number != comment_number:
+                changed.append((pk, comment_number))
+
+            if len(changed) >= batch_size:
+                updated_count += cls._update_numbers(changed)
+                changed = []
+
+        if changed:
+            updated_count += cls._update_numbers(changed)
+
+        return updated_count
+
+    @classmethod
+    def _update_numbers(cls, numbers):
+        return cls.objects\
+            .filter(pk__in=[pk for pk, _number in numbers])\
+            .update(comment_number=Case(
+                *[When(pk=pk, then=Value(number))
+                  for pk, number in numbers],
+                output_field=models.PositiveIntegerField()))
+
 
 def increase_user_profile_comment_count(sender, instance, created, **kwargs):
     if created and not instance.topic.category.is_private:
@@ -120,3 +229,71 @@ def decrease_user_profile_comment_count(sender, instance, **kwargs):
             pass  # deleting the user
 
 post_delete.connect(decrease_user_profile_comment_count, sender=Comment, dispatch_uid='Comment:decrease_user_profile_comment_count')
+
+
+_deleting = threading.local()
+
+
+class _DeletedTopicComments(object):
+    """
+    The comments of a topic being deleted.\
+    The ones of a delete that failed halfway\
+    are left behind, they only widen the next\
+    renumber, and are dropped by the next\
+    delete once the topic got renumbered
+    """
+
+    def __init__(self, date):
+        self.pks = set()
+        self.date = date
+        self.is_renumbered = False
+
+
+def _get_deleting():
+    # {topic_id: _DeletedTopicComments}
+    if not hasattr(_deleting, 'topics'):
+        _deleting.topics = {}
+
+    return _deleting.topics
+
+
+def track_deleted_topic_comments(sender, instance, **kwargs):
+    # A delete (i.e: a cascade) sends all the pre_delete
+    # signals before any of the post_delete signals
+    topics = _get_deleting()
+    deleted = topics.get(instance.topic_id)
+
+    if deleted is None or deleted.is_renumbered:
+        deleted = _DeletedTopicComments(date=instance.date)
+        topics[instance.topic_id] = deleted
+
+    deleted.pks.add(instance.pk)
+    deleted.date = min(deleted.date, instance.date)
+
+pre_delete.connect(track_deleted_topic_comments, sender=Comment, dispatch_uid='Comment:track_deleted_topic_comments')
+
+
+def renumber_topic_comments(sender, instance, **kwargs):
+    # Removed (is_removed) comments are still listed,
+    # only deleting a comment leaves a gap. The rows
+    # are deleted before any post_delete signal is sent,
+    # so the topic is renumbered on the first one
+    topics = _get_deleting()
+    deleted = topics.get(instance.topic_id)
+
+    if deleted is None or instance.pk not in deleted.pks:
+        Comment.renumber(topic_id=instance.topic_id, from_date=instance.date)
+        return
+
+    deleted.pks.discard(instance.pk)
+
+    if not deleted.pks:
+        del topics[instance.topic_id]
+
+    if deleted.is_renumbered:
+        return
+
+    deleted.is_renumbered = True
+    Comment.renumber(topic_id=instance.topic_id, from_date=deleted.date)
+
+post_delete.connect(renumber_topic_comments, sender=Comment, dispatch_uid='Comment:renumber_topic_comments')
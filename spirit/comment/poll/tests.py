@@ -3,6 +3,7 @@
 from __future__ import unicode_literals
 
 from django.test import TestCase, RequestFactory
+from django.test.utils import override_settings
 from django.core.urlresolvers import reverse
 from django.contrib.auth import get_user_model
 from django.utils import timezone
@@ -531,6 +532,58 @@ class CommentPollTemplateTagsTest(TestCase):
         self.assertFalse('form' in out)
         self.assertTrue('comment-poll' in out)
 
+    @override_settings(ST_POLL_RENDER_CACHE='default')
+    def test_render_polls_cache(self):
+        """
+        Should cache the rendered poll for every viewer in the same state
+        """
+        CommentPollChoice.objects.create(poll=self.user_poll, number=1, description="op1")
+        CommentPollChoice.objects.create(poll=self.user_poll, number=2, description="op2")
+        templates = []
+        org_render_to_string = render.render_to_string
+
+        def mock_render_to_string(template, context):
+            templates.append(template)
+            return org_render_to_string(template, context)
+
+        def render_polls(user, csrf_token):
+            request = RequestFactory().get('/')
+            request.user = user
+            comment = self.user_comment.__class__.objects\
+                .filter(pk=self.user_comment.pk)\
+                .with_polls(user)\
+                .first()
+            return render.render_polls(comment, request, csrf_token)
+
+        render.render_to_string = mock_render_to_string
+        try:
+            user_a = utils.create_user()
+            user_b = utils.create_user()
+            out_a = render_polls(user_a, 'token_a')
+            out_b = render_polls(user_b, 'token_b')
+            self.assertEqual(len(templates), 1)
+            self.assertIn('token_a', out_a)
+            self.assertIn('token_b', out_b)
+            self.assertNotIn('token_a', out_b)
+            self.assertEqual(out_a.replace('token_a', 'token_b'), out_b)
+
+            # The author sees the close link
+            out = render_polls(self.user, 'token_a')
+            self.assertEqual(len(templates), 2)
+            self.assertIn(reverse('spirit:comment:poll:close', kwargs={'pk': self.user_poll.pk}), out)
+
+            # A vote changes the voter's and the results state
+            choice = CommentPollChoice.objects.get(poll=self.user_poll, number=1)
+            CommentPollVote.objects.create(voter=user_a, choice=choice)
+            CommentPollChoice.objects.filter(pk=choice.pk).update(vote_count=1)
+            out_a = render_polls(user_a, 'token_a')
+            self.assertEqual(len(templates), 3)
+            self.assertIn('Votes: 1.', out_a)
+            render_polls(user_b, 'token_b')
+            self.assertEqual(len(templates), 4)
+        finally:
+            render.render_to_string = org_render_to_string
+
 
 class PollModelsTest(TestCase):
 
@@ -2,8 +2,13 @@
 
 from __future__ import unicode_literals
 import re
+import hashlib
 
+from django.conf import settings
+from django.core.cache import caches
 from django.template.loader import render_to_string
+from django.utils import timezone, translation
+from django.utils.encoding import smart_bytes, force_text
 
 from ..forms import PollVoteManyForm
 
@@ -13,6 +18,12 @@ __all__ = ['PATTERN', 'render_polls']
 
 PATTERN = re.compile(r'(?:<poll\s+name=(?P<name>[\w\-_]+)>)')
 
+# The rendered polls are cached for every viewer,
+# the token is replaced by the viewer's one
+_CSRF_TOKEN_PLACEHOLDER = 'st-poll-csrf-token'
+_CACHE_KEY = 'st_poll_render_%s'
+_CACHE_TIMEOUT = 60 * 60
+
 
 def _render_form(poll, comment, request, csrf_token):
     form = PollVoteManyForm(poll=poll)
@@ -47,6 +58,58 @@ def _render_results(poll, comment, request, csrf_token):
     return render_to_string('spirit/comment/poll/_results.html', context)
 
 
+def _get_cache_key(poll, comment, request, show_results):
+    """
+    Return a key made of everything the rendered\
+    poll depends on: the poll, its choices and vote\
+    counts, the viewer's votes, whether the viewer\
+    is the author, the URL and the locale
+    """
+    user = request.user
+    is_authenticated = user.is_authenticated()
+    state = (
+        show_results,
+        poll.pk,
+        poll.title,
+        poll.choice_min,
+        poll.choice_max,
+        poll.mode,
+        poll.close_at,
+        bool(poll.is_closed),
+        tuple(
+            (choice.pk, choice.description, choice.vote_count, bool(choice.vote))
+            for choice in poll.choices),
+        is_authenticated,
+        is_authenticated and user.pk == comment.user_id,
+        request.get_full_path(),
+        translation.get_language(),
+        timezone.get_current_timezone_name())
+    return _CACHE_KEY % hashlib.sha1(smart_bytes(repr(state))).hexdigest()
+
+
+def _render(poll, comment, request, csrf_token, show_results):
+    if show_results:
+        render = _render_results
+    else:
+        render = _render_form
+
+    csrf_token = force_text(csrf_token or '')
+
+    if (settings.ST_POLL_RENDER_CACHE is None or
+            csrf_token in ('', 'NOTPROVIDED')):
+        return render(poll, comment, request, csrf_token)
+
+    cache = caches[settings.ST_POLL_RENDER_CACHE]
+    key = _get_cache_key(poll, comment, request, show_results)
+    html = cache.get(key)
+
+    if html is None:
+        html = render(poll, comment, request, _CSRF_TOKEN_PLACEHOLDER)
+        cache.set(key, html, timeout=_CACHE_TIMEOUT)
+
+    return html.replace(_CSRF_TOKEN_PLACEHOLDER, csrf_token)
+
+
 def _evaluate(polls_by_name, comment, request, csrf_token):
     def evaluate(m):
         name = m.group('name')
@@ -57,10 +120,10 @@ def _evaluate(polls_by_name, comment, request, csrf_token):
             (poll.has_user_voted and not show_poll)
         )
 
-        if poll.is_closed or (poll.can_show_results and show_results):
-            return _render_results(poll, comment, request, csrf_token)
-        else:
-            return _render_form(poll, comment, request, csrf_token)
+        show_results = bool(
+            poll.is_closed or
+            (poll.can_show_results and show_results))
+        return _render(poll, comment, request, csrf_token, show_results)
 
     return evaluate
 
@@ -9,6 +9,7 @@ import hashlib
 
 from django.test import TestCase, RequestFactory
 from django.core.urlresolvers import reverse
+from django.core import mail
 from django.template import Template, Context
 from django.core.exceptions import PermissionDenied
 from django.contrib.auth import get_user_model
@@ -16,16 +17,21 @@ from django.conf import settings
 from django.core.files.uploadedfile import SimpleUploadedFile
 from django.test.utils import override_settings
 from django.utils.six import BytesIO
+from django.utils import timezone
+from django.db.models.signals import pre_delete
+
+from djconfig.utils import override_djconfig
 
 from ..core.tests import utils
 from .models import Comment
 from .forms import CommentForm, CommentMoveForm, CommentImageForm
 from .tags import render_comments_form
 from ..core.utils import markdown
+from ..core.utils import jobs
 from .views import delete as comment_delete
 from ..topic.models import Topic
 from ..category.models import Category
-from ..user.models import UserProfile
+from ..user.models import UserProfile, NOTIFY_IMMEDIATELY
 from .history.models import CommentHistory
 from .utils import comment_posted, pre_comment_update, post_comment_update
 from ..topic.notification.models import TopicNotification, MENTION
@@ -192,6 +198,7 @@ class CommentViewTest(TestCase):
         """
         # removed category
         Category.objects.all().update(is_removed=True)
+        Topic.objects.all().update_visibility()
 
         utils.login(self)
         form_data = {'comment': 'foobar', }
@@ -213,6 +220,7 @@ class CommentViewTest(TestCase):
         # removed topic
         Category.objects.all().update(is_removed=False)
         Topic.objects.all().update(is_removed=True)
+        Topic.objects.all().update_visibility()
 
         utils.login(self)
         form_data = {'comment': 'foobar', }
@@ -417,6 +425,32 @@ class CommentViewTest(TestCase):
         expected_url = comment.topic.get_absolute_url() + "#c1"
         self.assertRedirects(response, expected_url, status_code=302)
 
+    @override_djconfig(comments_per_page=2)
+    def test_comment_find_comment_number(self):
+        """
+        Should use the comment number to find the page
+        """
+        utils.create_comment(user=self.user, topic=self.topic)
+        utils.create_comment(user=self.user, topic=self.topic)
+        comment = utils.create_comment(user=self.user, topic=self.topic)
+        self.assertEqual(comment.comment_number, 3)
+        response = self.client.get(reverse('spirit:comment:find', kwargs={'pk': comment.pk, }))
+        expected_url = comment.topic.get_absolute_url() + "?page=2#c3"
+        self.assertRedirects(response, expected_url, status_code=302)
+
+    @override_djconfig(comments_per_page=2)
+    def test_comment_find_not_numbered(self):
+        """
+        Should count the comments when the comment has no number
+        """
+        utils.create_comment(user=self.user, topic=self.topic)
+        utils.create_comment(user=self.user, topic=self.topic)
+        comment = utils.create_comment(user=self.user, topic=self.topic)
+        Comment.objects.filter(topic=self.topic).update(comment_number=None)
+        response = self.client.get(reverse('spirit:comment:find', kwargs={'pk': comment.pk, }))
+        expected_url = comment.topic.get_absolute_url() + "?page=2#c3"
+        self.assertRedirects(response, expected_url, status_code=302)
+
     @override_settings(MEDIA_ROOT=os.path.join(settings.BASE_DIR, 'media_test'))
     def test_comment_image_upload(self):
         """
@@ -547,6 +581,125 @@ class CommentModelsTest(TestCase):
         comment_last = utils.create_comment(topic=self.topic)
         self.assertEqual(Comment.get_last_for_topic(self.topic.pk), comment_last)
 
+    def test_comment_number(self):
+        """
+        Should number the comments of each topic sequentially
+        """
+        comment_a = utils.create_comment(topic=self.topic)
+        comment_b = utils.create_comment(topic=self.topic)
+        comment_action = Comment.create_moderation_action(user=self.user, topic=self.topic, action=1)
+        comment_c = utils.create_comment(topic=utils.create_topic(self.category))
+        self.assertEqual(Comment.objects.get(pk=comment_a.pk).comment_number, 1)
+        self.assertEqual(Comment.objects.get(pk=comment_b.pk).comment_number, 2)
+        self.assertEqual(Comment.objects.get(pk=comment_action.pk).comment_number, 3)
+        self.assertEqual(Comment.objects.get(pk=comment_c.pk).comment_number, 1)
+
+        # Updating does not change it
+        comment_b.comment = 'foo'
+        comment_b.save()
+        self.assertEqual(Comment.objects.get(pk=comment_b.pk).comment_number, 2)
+
+    def test_comment_number_not_numbered(self):
+        """
+        Should take into account comments without number
+        """
+        utils.create_comment(topic=self.topic)
+        utils.create_comment(topic=self.topic)
+        Comment.objects.filter(topic=self.topic).update(comment_number=None)
+        comment = utils.create_comment(topic=self.topic)
+        self.assertEqual(comment.comment_number, 3)
+        self.assertEqual(Comment.next_comment_number(self.topic.pk), 4)
+
+    def test_comment_renumber(self):
+        """
+        Should number the comments by date
+        """
+        now = timezone.now()
+        comment_a = utils.create_comment(topic=self.topic, date=now)
+        comment_b = utils.create_comment(topic=self.topic, date=now - timezone.timedelta(hours=1))
+        comment_c = utils.create_comment(topic=self.topic, date=now + timezone.timedelta(hours=1))
+        self.assertEqual(Comment.renumber(topic_id=self.topic.pk), 2)
+        self.assertEqual(Comment.objects.get(pk=comment_a.pk).comment_number, 2)
+        self.assertEqual(Comment.objects.get(pk=comment_b.pk).comment_number, 1)
+        self.assertEqual(Comment.objects.get(pk=comment_c.pk).comment_number, 3)
+        self.assertEqual(Comment.renumber(topic_id=self.topic.pk), 0)
+
+        # From date
+        Comment.objects.filter(pk=comment_c.pk).update(comment_number=10)
+        Comment.objects.filter(pk=comment_b.pk).update(comment_number=5)
+        self.assertEqual(Comment.renumber(topic_id=self.topic.pk, from_date=now, batch_size=1), 2)
+        self.assertEqual(Comment.objects.get(pk=comment_b.pk).comment_number, 5)
+        self.assertEqual(Comment.objects.get(pk=comment_a.pk).comment_number, 6)
+        self.assertEqual(Comment.objects.get(pk=comment_c.pk).comment_number, 7)
+
+        # Previous comment without number
+        Comment.objects.filter(pk=comment_b.pk).update(comment_number=None)
+        self.assertEqual(Comment.renumber(topic_id=self.topic.pk, from_date=now), 3)
+        self.assertEqual(
+            list(Comment.objects.filter(topic=self.topic).order_by('date').values_list('comment_number', flat=True)),
+            [1, 2, 3])
+
+    def test_comment_delete_renumber(self):
+        """
+        Should fill the gap left by the deleted comment
+        """
+        utils.create_comment(topic=self.topic)
+        comment = utils.create_comment(topic=self.topic)
+        comment_last = utils.create_comment(topic=self.topic)
+        comment.delete()
+        self.assertEqual(Comment.objects.get(pk=comment_last.pk).comment_number, 2)
+
+    def test_comment_delete_cascade_renumber(self):
+        """
+        Should renumber each topic once on cascade deletes
+        """
+        user = utils.create_user()
+        topic_other = utils.create_topic(category=self.topic.category)
+        utils.create_comment(topic=self.topic)
+        utils.create_comment(topic=self.topic, user=user)
+        utils.create_comment(topic=self.topic, user=user)
+        comment_last = utils.create_comment(topic=self.topic)
+        utils.create_comment(topic=topic_other, user=user)
+        comment_other = utils.create_comment(topic=topic_other)
+        calls = []
+        org_renumber = Comment.renumber
+
+        def renumber(topic_id, **kwargs):
+            calls.append(topic_id)
+            return org_renumber(topic_id=topic_id, **kwargs)
+
+        Comment.renumber = renumber
+        try:
+            user.delete()
+        finally:
+            Comment.renumber = org_renumber
+
+        self.assertEqual(sorted(calls), sorted([self.topic.pk, topic_other.pk]))
+        self.assertEqual(Comment.objects.get(pk=comment_last.pk).comment_number, 2)
+        self.assertEqual(Comment.objects.get(pk=comment_other.pk).comment_number, 1)
+
+        # The counts don't leak to later deletes
+        comment_first = Comment.objects.filter(topic=self.topic).order_by('date').first()
+        comment_first.delete()
+        self.assertEqual(Comment.objects.get(pk=comment_last.pk).comment_number, 1)
+
+    def test_comment_delete_failed_renumber(self):
+        """
+        Should renumber after a delete that\
+        failed between the delete signals
+        """
+        comment_a = utils.create_comment(topic=self.topic)
+        comment_b = utils.create_comment(topic=self.topic)
+        comment_c = utils.create_comment(topic=self.topic)
+        comment_d = utils.create_comment(topic=self.topic)
+        # The delete fails after the pre_delete signal
+        pre_delete.send(sender=Comment, instance=comment_a, using='default')
+        comment_b.delete()
+        self.assertEqual(Comment.objects.get(pk=comment_c.pk).comment_number, 2)
+        self.assertEqual(Comment.objects.get(pk=comment_d.pk).comment_number, 3)
+        comment_c.delete()
+        self.assertEqual(Comment.objects.get(pk=comment_d.pk).comment_number, 2)
+
 
 class CommentTemplateTagTests(TestCase):
 
@@ -663,6 +816,28 @@ class CommentFormTest(TestCase):
         self.assertEqual(form.is_valid(), True)
         self.assertEqual(form.save(), list(Comment.objects.filter(topic=to_topic)))
 
+    def test_comments_move_renumber(self):
+        """
+        Should renumber the comments of both topics
+        """
+        now = timezone.now()
+        comment = utils.create_comment(user=self.user, topic=self.topic, date=now)
+        comment_moved = utils.create_comment(user=self.user, topic=self.topic, date=now + timezone.timedelta(hours=1))
+        comment_last = utils.create_comment(user=self.user, topic=self.topic, date=now + timezone.timedelta(hours=3))
+        to_topic = utils.create_topic(category=self.category)
+        to_comment = utils.create_comment(user=self.user, topic=to_topic, date=now)
+        to_comment_last = utils.create_comment(user=self.user, topic=to_topic, date=now + timezone.timedelta(hours=2))
+        form_data = {'topic': to_topic.pk,
+                     'comments': [comment_moved.pk, ], }
+        form = CommentMoveForm(topic=self.topic, data=form_data)
+        self.assertEqual(form.is_valid(), True)
+        form.save()
+        self.assertEqual(Comment.objects.get(pk=comment.pk).comment_number, 1)
+        self.assertEqual(Comment.objects.get(pk=comment_last.pk).comment_number, 2)
+        self.assertEqual(Comment.objects.get(pk=to_comment.pk).comment_number, 1)
+        self.assertEqual(Comment.objects.get(pk=comment_moved.pk).comment_number, 2)
+        self.assertEqual(Comment.objects.get(pk=to_comment_last.pk).comment_number, 3)
+
     def test_comment_image_upload(self):
         """
         Image upload
@@ -790,8 +965,8 @@ class CommentUtilsTest(TestCase):
         # Should mark the topic as unread
         user_unread = utils.create_user()
         topic = utils.create_topic(self.category)
-        topic_unread_creator = TopicUnread.objects.create(user=user, topic=topic, is_read=True)
-        topic_unread_subscriber = TopicUnread.objects.create(user=user_unread, topic=topic, is_read=True)
+        topic_unread_creator = TopicUnread.objects.create(user=user, topic=topic)
+        topic_unread_subscriber = TopicUnread.objects.create(user=user_unread, topic=topic)
         comment = utils.create_comment(user=user, topic=topic)
         comment_posted(comment=comment, mentions=None)
         self.assertTrue(TopicUnread.objects.get(pk=topic_unread_creator.pk).is_read)
@@ -806,6 +981,67 @@ class CommentUtilsTest(TestCase):
         comment_posted(comment=comment, mentions=None)
         self.assertEqual(Topic.objects.get(pk=topic.pk).comment_count, 2)
 
+    @override_settings(ST_JOBS_MODE='queue')
+    def test_comment_posted_queue(self):
+        """
+        Should queue the side effects until the worker runs them
+        """
+        mentioned = utils.create_user()
+        comment = utils.create_comment(user=self.user, topic=self.topic)
+        comment_posted(comment=comment, mentions={mentioned.username: mentioned})
+        self.assertFalse(TopicNotification.objects.exists())
+        self.assertEqual(Topic.objects.get(pk=self.topic.pk).comment_count, 0)
+
+        self.assertEqual(jobs.run_pending(), (1, 0))
+        self.assertEqual(TopicNotification.objects.get(user=mentioned, comment=comment).action, MENTION)
+        self.assertEqual(Topic.objects.get(pk=self.topic.pk).comment_count, 1)
+
+        # Deleted comment
+        comment = utils.create_comment(user=self.user, topic=self.topic)
+        comment_posted(comment=comment, mentions=None)
+        Comment.objects.filter(pk=comment.pk).delete()
+        self.assertEqual(jobs.run_pending(), (1, 0))
+        self.assertEqual(Topic.objects.get(pk=self.topic.pk).comment_count, 1)
+
+    @override_settings(ST_NOTIFICATIONS_EMAIL_SITE_URL='https://example.com', ST_JOBS_MODE='queue')
+    def test_comment_posted_email(self):
+        """
+        Should email the notified users that get them right away
+        """
+        subscriber = self.user
+        UserProfile.objects.filter(user=subscriber).update(notify_email=NOTIFY_IMMEDIATELY)
+        comment = utils.create_comment(user=subscriber, topic=self.topic)
+        comment_posted(comment=comment, mentions=None)
+        self.assertEqual(jobs.run_pending(), (1, 0))
+        self.assertEqual(jobs.run_pending(), (1, 0))
+        self.assertEqual(len(mail.outbox), 0)
+
+        mentioned = utils.create_user()
+        comment = utils.create_comment(user=utils.create_user(), topic=self.topic)
+        comment_posted(comment=comment, mentions={mentioned.username: mentioned})
+        self.assertEqual(jobs.run_pending(), (1, 0))
+        self.assertEqual(len(mail.outbox), 0)
+        self.assertEqual(jobs.run_pending(), (1, 0))
+        self.assertEqual([m.to for m in mail.outbox], [[subscriber.email]])
+        self.assertTrue(TopicNotification.objects.get(user=subscriber).is_emailed)
+
+    @override_settings(ST_NOTIFICATIONS_EMAIL_SITE_URL='https://example.com')
+    def test_comment_posted_email_inline(self):
+        """
+        Should not email within the request,\
+        the notifications are left pending
+        """
+        subscriber = self.user
+        UserProfile.objects.filter(user=subscriber).update(notify_email=NOTIFY_IMMEDIATELY)
+        comment = utils.create_comment(user=subscriber, topic=self.topic)
+        comment_posted(comment=comment, mentions=None)
+        comment = utils.create_comment(user=utils.create_user(), topic=self.topic)
+        comment_posted(comment=comment, mentions=None)
+        self.assertEqual(len(mail.outbox), 0)
+        notification = TopicNotification.objects.get(user=subscriber)
+        self.assertFalse(notification.is_read)
+        self.assertFalse(notification.is_emailed)
+
     def test_pre_comment_update(self):
         """
         * Should render static polls
@@ -2,19 +2,68 @@
 
 from __future__ import unicode_literals
 
+from django.conf import settings
+from django.contrib.auth import get_user_model
+
+from ..core.utils import jobs
 from ..topic.notification.models import TopicNotification, UNDEFINED
+from ..topic.models import Topic
 from ..topic.unread.models import TopicUnread
+from ..user.utils.email import send_notification_emails
 from .history.models import CommentHistory
 from .poll.utils.render_static import post_render_static_polls
+from .models import Comment
+
+User = get_user_model()
 
 
 def comment_posted(comment, mentions):
+    """
+    Defer the notifications and topic counters\
+    until the comment is committed,\
+    see :py:func:`spirit.core.utils.jobs.defer`
+
+    :param comment: The new comment
+    :param mentions: {username: User} or None
+    """
+    mentions = mentions or {}
+    jobs.defer(
+        run_comment_posted,
+        comment_id=comment.pk,
+        mention_ids=[user.pk for user in mentions.values()])
+
+
+def run_comment_posted(comment_id, mention_ids):
+    # The job is run within a transaction that
+    # gets rolled back on failure, so it's safe to retry
+    comment = Comment.objects\
+        .select_related('topic', 'user')\
+        .filter(pk=comment_id)\
+        .first()
+
+    if comment is None:  # Deleted
+        return
+
+    mentions = {
+        user.username: user
+        for user in User.objects.filter(pk__in=mention_ids)}
+
     TopicNotification.create_maybe(user=comment.user, comment=comment, action=UNDEFINED)
     TopicNotification.notify_new_comment(comment=comment)
     TopicNotification.notify_new_mentions(comment=comment, mentions=mentions)
-    TopicUnread.unread_new_comment(comment=comment)
     comment.topic.increase_comment_count()
 
+    # They are not sent within the request, in the
+    # inline mode the spiritnotificationemails command
+    # sends the pending ones
+    if (settings.ST_NOTIFICATIONS_EMAIL_SITE_URL and
+            settings.ST_JOBS_MODE == jobs.QUEUE):
+        jobs.defer(send_notification_emails, comment_id=comment.pk)
+
+    # The topic is unread for everyone else now
+    topic = Topic.objects.get(pk=comment.topic_id)
+    TopicUnread.create_or_mark_as_read(user=comment.user, topic=topic)
+
 
 def pre_comment_update(comment):
     comment.comment_html = post_render_static_polls(comment)
@@ -15,6 +15,7 @@ from ..core.utils.ratelimit.decorators import ratelimit
 from ..core.utils.decorators import moderator_required
 from ..core.utils import markdown, paginator, render_form_errors, json_response
 from ..topic.models import Topic
+from ..search.models import TopicIndexQueue, CommentIndexQueue
 from .models import Comment
 from .forms import CommentForm, CommentMoveForm, CommentImageForm
 from .utils import comment_posted, post_comment_update, pre_comment_update
@@ -89,6 +90,8 @@ def delete(request, pk, remove=True):
         Comment.objects\
             .filter(pk=pk)\
             .update(is_removed=remove)
+        TopicIndexQueue.enqueue([comment.topic_id])
+        CommentIndexQueue.enqueue([comment.pk])
 
         return redirect(comment.get_absolute_url())
 
@@ -116,8 +119,18 @@ def move(request, topic_id):
 
 
 def find(request, pk):
-    comment = get_object_or_404(Comment.objects.can_access(request.user), pk=pk)
-    comment_number = Comment.objects.filter(topic=comment.topic, date__lte=comment.date).count()
+    comment = get_object_or_404(
+        Comment.objects
+            .can_access(request.user)
+            .select_related('topic'),
+        pk=pk
+    )
+    comment_number = comment.comment_number
+
+    if comment_number is None:
+        # Not backfilled yet
+        comment_number = Comment.objects.filter(topic=comment.topic, date__lte=comment.date).count()
+
     url = paginator.get_url(comment.topic.get_absolute_url(),
                             comment_number,
                             config.comments_per_page,
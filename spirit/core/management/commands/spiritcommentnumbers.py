@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from ....topic.models import Topic
+from ....comment.models import Comment
+
+
+class Command(BaseCommand):
+    help = 'Assigns the comment numbers (position within the topic) in chunks of topics.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size', dest='chunk_size', type=int, default=500,
+            help='Number of topics fetched per query and comments updated per query')
+        parser.add_argument(
+            '--all', action='store_true', dest='all', default=False,
+            help='Renumber every topic, not just the ones having comments without a number')
+
+    def _topics_to_number(self, chunk_size, renumber_all):
+        last_pk = 0
+
+        while True:
+            if renumber_all:
+                topic_ids = Topic.objects\
+                    .filter(pk__gt=last_pk)\
+                    .order_by('pk')\
+                    .values_list('pk', flat=True)
+            else:
+                topic_ids = Comment.objects\
+                    .filter(topic_id__gt=last_pk, comment_number=None)\
+                    .order_by('topic_id')\
+                    .values_list('topic_id', flat=True)\
+                    .distinct()
+
+            topic_ids = list(topic_ids[:chunk_size])
+
+            if not topic_ids:
+                return
+
+            for topic_id in topic_ids:
+                yield topic_id
+
+            last_pk = topic_ids[-1]
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        topics_count = 0
+        comments_count = 0
+
+        for topic_id in self._topics_to_number(chunk_size, options['all']):
+            # Lock the topic so no comment
+            # gets posted while renumbering
+            with transaction.atomic():
+                list(Topic.objects
+                     .select_for_update()
+                     .filter(pk=topic_id)
+                     .values_list('pk', flat=True))
+                comments_count += Comment.renumber(topic_id=topic_id, batch_size=chunk_size)
+
+            topics_count += 1
+
+            if not topics_count % chunk_size:
+                self.stdout.write('%d topics processed' % topics_count)
+
+        self.stdout.write('%d topics processed, %d comments updated' % (topics_count, comments_count))
+        self.stdout.write('ok')
@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+import time
+
+from django.core.management.base import BaseCommand
+
+from ...utils import jobs
+
+
+class Command(BaseCommand):
+    help = 'Runs the queued jobs (settings.ST_JOBS_MODE = \'queue\').'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', dest='batch_size', type=int, default=100,
+            help='Number of jobs fetched per query')
+        parser.add_argument(
+            '--loop', action='store_true', dest='loop', default=False,
+            help='Keep waiting for new jobs instead of exiting when the queue is empty')
+        parser.add_argument(
+            '--sleep', dest='sleep', type=float, default=1.0,
+            help='Seconds to wait when the queue is empty, used along with --loop')
+
+    def handle(self, *args, **options):
+        done_count = 0
+        failed_count = 0
+
+        while True:
+            done, failed = jobs.run_pending(batch_size=options['batch_size'])
+            done_count += done
+            failed_count += failed
+
+            if done or failed:
+                continue
+
+            if not options['loop']:
+                break
+
+            time.sleep(options['sleep'])
+
+        self.stdout.write('%d jobs done, %d failed' % (done_count, failed_count))
+        self.stdout.write('ok')
@@ -0,0 +1,20 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from ....user.utils.email import send_pending_notification_emails
+
+
+class Command(BaseCommand):
+    help = 'Sends the notification digests and the pending notification emails.'
+
+    def handle(self, *args, **options):
+        if not settings.ST_NOTIFICATIONS_EMAIL_SITE_URL:
+            raise CommandError('settings.ST_NOTIFICATIONS_EMAIL_SITE_URL is not set, the notification emails are disabled')
+
+        count = send_pending_notification_emails()
+        self.stdout.write('%d emails sent' % count)
+        self.stdout.write('ok')
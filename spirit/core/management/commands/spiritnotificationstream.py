@@ -0,0 +1,56 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from ....topic.notification import pubsub
+
+
+class Command(BaseCommand):
+    help = 'Serves the notifications stream (server-sent events and long-polling).'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--host', dest='host', default='127.0.0.1',
+            help='Address to listen on')
+        parser.add_argument(
+            '--port', dest='port', type=int, default=8001,
+            help='Port to listen on')
+        parser.add_argument(
+            '--workers', dest='workers', type=int, default=4,
+            help='Number of threads querying the sessions and counters')
+
+    def handle(self, *args, **options):
+        if settings.ST_NOTIFICATIONS_PUBSUB != pubsub.SOCKET:
+            raise CommandError(
+                "settings.ST_NOTIFICATIONS_PUBSUB must be '%s', "
+                "the notifications are published by other processes" % pubsub.SOCKET)
+
+        try:
+            import asyncio
+        except ImportError:
+            raise CommandError('The notifications stream requires Python 3.4+')
+
+        from ....topic.notification.stream import StreamServer
+
+        loop = asyncio.get_event_loop()
+        stream = StreamServer(loop, pubsub.get_pubsub(), workers=options['workers'])
+        server = loop.run_until_complete(
+            loop.create_server(stream, options['host'], options['port']))
+        stream.start()
+        self.stdout.write('Serving on %s:%d' % (options['host'], options['port']))
+
+        try:
+            loop.run_forever()
+        except KeyboardInterrupt:
+            pass
+        finally:
+            stream.close()
+            server.close()
+            loop.run_until_complete(server.wait_closed())
+            pubsub.get_pubsub().close()
+            loop.close()
+
+        self.stdout.write('ok')
@@ -0,0 +1,173 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+import multiprocessing
+
+from django.core.cache import cache
+from django.core.management.base import BaseCommand
+from django.db import connections, transaction
+from django.db.models import Case, When, Value, TextField
+
+from ...utils.markdown import get_markdown, RENDERER_VERSION
+from ....comment.models import Comment, COMMENT
+from ....comment.history.models import CommentHistory
+
+_CHECKPOINT_KEY = 'st_render_comments_checkpoint_%s_%s'
+
+# Every HTML replaced takes 3 query parameters,
+# SQLite (before 3.32) allows up to 999 per query
+_REPLACE_BATCH_SIZE = 300
+
+
+def _init_worker():
+    # The parent closes its connections before
+    # forking, closing the inherited ones here
+    # would close the parent server sessions
+    for connection in connections.all():
+        connection.connection = None
+
+
+def _render(row):
+    pk, comment, is_moderator = row
+    markdown = get_markdown(no_follow=not is_moderator)
+    return pk, markdown.render(comment)
+
+
+def _replace_html(queryset, html_by_pk):
+    items = list(html_by_pk.items())
+    updated = 0
+
+    for i in range(0, len(items), _REPLACE_BATCH_SIZE):
+        batch = items[i:i + _REPLACE_BATCH_SIZE]
+        updated += queryset\
+            .filter(pk__in=[pk for pk, _html in batch])\
+            .update(comment_html=Case(
+                *[When(pk=pk, then=Value(html)) for pk, html in batch],
+                output_field=TextField()))
+
+    return updated
+
+
+class Command(BaseCommand):
+    help = 'Re-renders the comments HTML rendered by a previous version of the markdown renderer.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--chunk-size', dest='chunk_size', type=int, default=500,
+            help='Number of comments fetched and updated per query')
+        parser.add_argument(
+            '--workers', dest='workers', type=int, default=multiprocessing.cpu_count(),
+            help='Number of rendering processes, 1 renders within this process')
+        parser.add_argument(
+            '--all', action='store_true', dest='all', default=False,
+            help='Re-render every comment, not just the ones rendered by a previous version')
+        parser.add_argument(
+            '--restart', action='store_true', dest='restart', default=False,
+            help='Ignore the checkpoint of an interrupted run and start from the first comment')
+
+    def _chunks(self, last_pk, chunk_size, render_all):
+        while True:
+            comments = Comment.objects\
+                .filter(pk__gt=last_pk, action=COMMENT)\
+                .order_by('pk')
+
+            if not render_all:
+                comments = comments.exclude(comment_html_version=RENDERER_VERSION)
+
+            rows = list(
+                comments
+                .values_list('pk', 'comment', 'comment_html', 'user__st__is_moderator')[:chunk_size]
+                .iterator())
+
+            if not rows:
+                return
+
+            yield rows
+            last_pk = rows[-1][0]
+
+    def _save(self, rows, rendered, render_all):
+        """
+        Write the HTML of the comments whose\
+        output changed, and the history entries\
+        that are a copy of it. The version of\
+        the rest of the comments is updated
+
+        :return: Number of comments whose HTML changed
+        """
+        old_html_by_pk = {pk: comment_html for pk, _, comment_html, _ in rows}
+        html_by_pk = {
+            pk: comment_html
+            for pk, comment_html in rendered
+            if comment_html != old_html_by_pk[pk]}
+        comments = Comment.objects.all()
+
+        if not render_all:
+            # Comments edited while rendering are current
+            comments = comments.exclude(comment_html_version=RENDERER_VERSION)
+
+        with transaction.atomic():
+            if html_by_pk:
+                histories = CommentHistory.objects\
+                    .filter(comment_fk_id__in=list(html_by_pk))\
+                    .values_list('pk', 'comment_fk_id', 'comment_html')
+                history_html_by_pk = {
+                    pk: html_by_pk[comment_id]
+                    for pk, comment_id, comment_html in histories
+                    if comment_html == old_html_by_pk[comment_id]}
+
+                if history_html_by_pk:
+                    _replace_html(CommentHistory.objects.all(), history_html_by_pk)
+
+                _replace_html(comments, html_by_pk)
+
+            comments\
+                .filter(pk__in=list(old_html_by_pk))\
+                .update(comment_html_version=RENDERER_VERSION)
+
+        return len(html_by_pk)
+
+    def handle(self, *args, **options):
+        chunk_size = options['chunk_size']
+        render_all = options['all']
+        checkpoint_key = _CHECKPOINT_KEY % (RENDERER_VERSION, 'all' if render_all else 'stale')
+        last_pk = 0
+
+        if not options['restart']:
+            last_pk = cache.get(checkpoint_key, 0)
+
+        if last_pk:
+            self.stdout.write('Resuming after comment %d' % last_pk)
+
+        pool = None
+
+        if options['workers'] > 1:
+            # The children must not inherit them
+            connections.close_all()
+            pool = multiprocessing.Pool(options['workers'], initializer=_init_worker)
+
+        comments_count = 0
+        updated_count = 0
+
+        try:
+            for rows in self._chunks(last_pk, chunk_size, render_all):
+                to_render = [
+                    (pk, comment, is_moderator)
+                    for pk, comment, _, is_moderator in rows]
+
+                if pool is not None:
+                    rendered = pool.map(_render, to_render)
+                else:
+                    rendered = [_render(row) for row in to_render]
+
+                updated_count += self._save(rows, rendered, render_all)
+                comments_count += len(rows)
+                cache.set(checkpoint_key, rows[-1][0], timeout=None)
+                self.stdout.write('%d comments processed' % comments_count)
+        finally:
+            if pool is not None:
+                pool.terminate()
+
+        cache.delete(checkpoint_key)
+        self.stdout.write('%d comments processed, %d updated' % (comments_count, updated_count))
+        self.stdout.write('ok')
@@ -0,0 +1,86 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+from django.core.management.base import BaseCommand
+from django.utils import timezone
+
+from haystack.constants import DEFAULT_ALIAS
+
+from ....search.models import TopicIndexQueue, CommentIndexQueue
+from ....search.utils import update_topics, update_comments, is_queue_paused
+from ....search import cache as search_cache
+
+
+class Command(BaseCommand):
+    help = 'Indexes the topics and comments queued for search (re)indexing.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--batch-size', dest='batch_size', type=int, default=100,
+            help='Number of topics or comments indexed per batch')
+        parser.add_argument(
+            '--using', dest='using', default=DEFAULT_ALIAS,
+            help='Haystack connection to update')
+
+    def _batches(self, queue, field_name, batch_size, until):
+        # Entries queued after the start are left
+        # for the next run, so this always ends
+        while True:
+            rows = list(
+                queue.objects
+                .filter(date__lte=until)
+                .order_by('date', 'pk')
+                .values_list(field_name, 'date')[:batch_size])
+
+            if not rows:
+                return
+
+            yield rows
+
+    def _drain(self, queue, field_name, update, batch_size, using, until):
+        """
+        :return: The number of updated\
+        and removed objects
+        """
+        updated_count = 0
+        removed_count = 0
+
+        for rows in self._batches(queue, field_name, batch_size, until):
+            pks = [pk for pk, _ in rows]
+            updated, removed = update(pks, using=using)
+
+            # The entries are removed once indexed, the ones
+            # queued again meanwhile have a newer date and stay
+            queue.objects\
+                .filter(**{
+                    '%s__in' % field_name: pks,
+                    'date__lte': max(date for _, date in rows)})\
+                .delete()
+
+            updated_count += updated
+            removed_count += removed
+
+        return updated_count, removed_count
+
+    def handle(self, *args, **options):
+        # The rebuild holds the index lock
+        if is_queue_paused():
+            self.stdout.write('The search index is being rebuilt, the queue is left for the next run')
+            self.stdout.write('ok')
+            return
+
+        started_at = timezone.now()
+        batch_size = options['batch_size']
+        using = options['using']
+        topics_count = self._drain(
+            TopicIndexQueue, 'topic_id', update_topics, batch_size, using, started_at)
+        comments_count = self._drain(
+            CommentIndexQueue, 'comment_id', update_comments, batch_size, using, started_at)
+
+        if any(topics_count + comments_count):
+            search_cache.bump_generation()
+
+        self.stdout.write('%d topics indexed, %d removed' % topics_count)
+        self.stdout.write('%d comments indexed, %d removed' % comments_count)
+        self.stdout.write('ok')
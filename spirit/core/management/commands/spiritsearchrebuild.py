@@ -0,0 +1,225 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+import time
+import itertools
+import multiprocessing
+from collections import deque
+
+from django.core.management.base import BaseCommand
+from django.core.management import call_command
+from django.db import connections as db_connections
+from django.db.models import Min, Max
+from django.utils import timezone
+
+from haystack import connections
+from haystack.constants import DEFAULT_ALIAS
+from haystack.exceptions import SkipDocument
+from haystack.backends.whoosh_backend import WhooshSearchBackend
+from whoosh.writing import CLEAR
+
+from ....topic.models import Topic
+from ....comment.models import Comment
+from ....search import cache as search_cache
+from ....search.utils import pause_queue, resume_queue
+
+_MODELS = (Topic, Comment)
+
+# Partitions being prepared or waiting to
+# be written per worker, the prepared ones
+# are held in memory until they are written
+_PENDING_PER_WORKER = 2
+
+
+def _init_worker():
+    # The parent closes its connections before
+    # forking, closing the inherited ones here
+    # would close the parent server sessions
+    for connection in db_connections.all():
+        connection.connection = None
+
+
+def _get_index(using, model):
+    return connections[using].get_unified_index().get_index(model)
+
+
+def _update(backend, index, objs, batch_size):
+    count = 0
+
+    while True:
+        batch = list(itertools.islice(objs, batch_size))
+
+        if not batch:
+            return count
+
+        backend.update(index, batch)
+        count += len(batch)
+
+
+def _imap_bounded(pool, func, iterable, size):
+    """
+    Same as ``pool.imap`` but up to\
+    ``size`` tasks are submitted at a time
+    """
+    pending = deque()
+
+    for item in iterable:
+        pending.append(pool.apply_async(func, (item,)))
+
+        if len(pending) >= size:
+            yield pending.popleft().get()
+
+    while pending:
+        yield pending.popleft().get()
+
+
+def _prepare_partition(partition):
+    """
+    Prepare the documents of the topics\
+    or comments within the pk range
+
+    :return: List of documents, ready to be written
+    """
+    using, model_index, start, end = partition
+    backend = connections[using].get_backend()
+    index = _get_index(using, _MODELS[model_index])
+    objs = index.index_queryset(using=using)\
+        .filter(pk__gte=start, pk__lt=end)\
+        .order_by('pk')\
+        .iterator()
+    documents = []
+
+    for obj in objs:
+        try:
+            document = index.full_prepare(obj)
+        except SkipDocument:
+            continue
+
+        # Same as the backend update
+        document.pop('boost', None)
+        documents.append({
+            key: backend._from_python(value)
+            for key, value in document.items()})
+
+    return documents
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the search index on a process pool, the new index replaces the current one once done.'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers', dest='workers', type=int, default=multiprocessing.cpu_count(),
+            help='Number of indexing processes, 1 indexes within this process')
+        parser.add_argument(
+            '--partition-size', dest='partition_size', type=int, default=100,
+            help='Range of topic or comment pks prepared by each task, '
+                 'the prepared documents are held in memory until they are written')
+        parser.add_argument(
+            '--batch-size', dest='batch_size', type=int, default=500,
+            help='Number of changed topics or comments written per index commit, once rebuilt')
+        parser.add_argument(
+            '--using', dest='using', default=DEFAULT_ALIAS,
+            help='Haystack connection to rebuild')
+
+    def _partitions(self, using, partition_size):
+        partitions = []
+
+        for model_index, model in enumerate(_MODELS):
+            pks = _get_index(using, model)\
+                .index_queryset(using=using)\
+                .aggregate(min=Min('pk'), max=Max('pk'))
+
+            if pks['min'] is None:
+                continue
+
+            partitions.extend(
+                (using, model_index, start, start + partition_size)
+                for start in range(pks['min'], pks['max'] + 1, partition_size))
+
+        return partitions
+
+    def _rebuild(self, backend, partitions, workers):
+        """
+        Write the partitions documents as they\
+        are prepared and replace the current index\
+        content on commit. The old segments are kept\
+        until then, so the searches never see a\
+        partial index. The progress is reported\
+        for every partition
+        """
+        pool = None
+
+        if workers > 1:
+            # The children must not inherit them
+            db_connections.close_all()
+            pool = multiprocessing.Pool(workers, initializer=_init_worker)
+            results = _imap_bounded(
+                pool, _prepare_partition, partitions, workers * _PENDING_PER_WORKER)
+        else:
+            results = (_prepare_partition(p) for p in partitions)
+
+        backend.setup()
+        writer = backend.index.writer(timeout=60)
+        partitions_count = 0
+        documents_count = 0
+        started_at = time.time()
+
+        try:
+            for documents in results:
+                for document in documents:
+                    writer.add_document(**document)
+
+                pause_queue()
+                partitions_count += 1
+                documents_count += len(documents)
+                elapsed = max(time.time() - started_at, 0.001)
+                self.stdout.write('%d/%d partitions, %d documents, %.1f documents/s' % (
+                    partitions_count, len(partitions), documents_count, documents_count / elapsed))
+        except Exception:
+            writer.cancel()
+            raise
+        finally:
+            if pool is not None:
+                pool.terminate()
+
+        writer.commit(mergetype=CLEAR)
+
+    def handle(self, *args, **options):
+        using = options['using']
+        backend = connections[using].get_backend()
+
+        if not isinstance(backend, WhooshSearchBackend):
+            self.stdout.write('The search backend is not whoosh, running rebuild_index')
+            call_command(
+                'rebuild_index', using=[using], interactive=False,
+                stdout=self.stdout, stderr=self.stderr)
+            search_cache.bump_generation()
+            self.stdout.write('ok')
+            return
+
+        # The whoosh index lock is held until
+        # the new index is committed, the queued
+        # topics are indexed once it's done.
+        # The update_index command must not run meanwhile
+        pause_queue()
+
+        try:
+            started_at = timezone.now()
+            partitions = self._partitions(using, options['partition_size'])
+            self._rebuild(backend, partitions, options['workers'])
+
+            # Changed while the partitions were built
+            count = 0
+
+            for model in _MODELS:
+                index = _get_index(using, model)
+                objs = index.build_queryset(using=using, start_date=started_at).iterator()
+                count += _update(backend, index, objs, options['batch_size'])
+        finally:
+            resume_queue()
+
+        search_cache.bump_generation()
+        self.stdout.write('%d documents changed during the rebuild were re-indexed' % count)
+        self.stdout.write('ok')
@@ -0,0 +1,20 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from ....topic import view_count
+
+
+class Command(BaseCommand):
+    help = 'Flushes the buffered topic views to the database.'
+
+    def handle(self, *args, **options):
+        if settings.ST_TOPIC_VIEWS_BUFFER_CACHE is None:
+            raise CommandError('settings.ST_TOPIC_VIEWS_BUFFER_CACHE is not set, there is nothing to flush')
+
+        count = view_count.flush()
+        self.stdout.write('%d topics updated' % count)
+        self.stdout.write('ok')
@@ -0,0 +1,16 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+from django.core.management.base import BaseCommand
+
+from ....topic.models import Topic
+
+
+class Command(BaseCommand):
+    help = 'Recomputes the denormalized topic visibility (effective removal, privacy and main category).'
+
+    def handle(self, *args, **options):
+        count = Topic.objects.all().update_visibility()
+        self.stdout.write('%d topics updated' % count)
+        self.stdout.write('ok')
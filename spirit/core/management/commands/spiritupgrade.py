@@ -11,6 +11,6 @@ class Command(BaseCommand):
 
     def handle(self, *args, **options):
         call_command('migrate', stdout=self.stdout, stderr=self.stderr)
-        call_command('rebuild_index', stdout=self.stdout, stderr=self.stderr, interactive=False)
+        call_command('spiritsearchrebuild', stdout=self.stdout, stderr=self.stderr)
         call_command('collectstatic', stdout=self.stdout, stderr=self.stderr, verbosity=0)
         self.stdout.write('ok')
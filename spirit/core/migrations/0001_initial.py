@@ -0,0 +1,31 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='Job',
+            fields=[
+                ('id', models.AutoField(verbose_name='ID', primary_key=True, serialize=False, auto_created=True)),
+                ('name', models.CharField(verbose_name='name', max_length=255)),
+                ('payload', models.TextField(verbose_name='payload', default='{}')),
+                ('date', models.DateTimeField(verbose_name='date', default=django.utils.timezone.now)),
+                ('locked_until', models.DateTimeField(verbose_name='locked until', blank=True, null=True)),
+                ('attempts', models.PositiveIntegerField(verbose_name='attempts', default=0)),
+                ('last_error', models.TextField(verbose_name='last error', blank=True)),
+            ],
+            options={
+                'verbose_name': 'job',
+                'verbose_name_plural': 'jobs',
+                'ordering': ['date', 'pk'],
+            },
+        ),
+    ]
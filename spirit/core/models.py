@@ -0,0 +1,39 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+from django.db import models
+from django.utils.translation import ugettext_lazy as _
+from django.utils import timezone
+from django.utils.encoding import python_2_unicode_compatible
+
+
+@python_2_unicode_compatible
+class Job(models.Model):
+    """
+    Job queued to run after the request,\
+    see :py:mod:`spirit.core.utils.jobs`
+
+    :ivar name: Dotted path of the function to run
+    :vartype name: `:py:class:models.CharField`
+    :ivar payload: JSON of the function kwargs
+    :vartype payload: `:py:class:models.TextField`
+    :ivar locked_until: The job won't be run\
+    before this time. It's set when a worker\
+    takes the job and when the job fails
+    :vartype locked_until: `:py:class:models.DateTimeField`
+    """
+    name = models.CharField(_("name"), max_length=255)
+    payload = models.TextField(_("payload"), default='{}')
+    date = models.DateTimeField(_("date"), default=timezone.now)
+    locked_until = models.DateTimeField(_("locked until"), null=True, blank=True)
+    attempts = models.PositiveIntegerField(_("attempts"), default=0)
+    last_error = models.TextField(_("last error"), blank=True)
+
+    class Meta:
+        ordering = ['date', 'pk']
+        verbose_name = _("job")
+        verbose_name_plural = _("jobs")
+
+    def __str__(self):
+        return self.name
@@ -3,14 +3,26 @@
 from __future__ import unicode_literals
 import os
 
-from django.test import TestCase
+from django.test import TestCase, override_settings
 from django.core.management import call_command
+from django.core.cache import cache
 from django.utils.six import StringIO
 
 from ..management.commands import spiritmakelocales
 from ..management.commands import spirittxpush
 from ..management.commands import spiritinstall
 from ..management.commands import spiritupgrade
+from ..management.commands import spiritrendercomments
+from ...comment.models import Comment
+from ...comment.history.models import CommentHistory
+from ...comment.utils import comment_posted
+from ...category.models import Category
+from ...topic.models import Topic
+from ...topic import view_count
+from ...topic.notification.models import TopicNotification, COMMENT
+from ...user.models import NOTIFY_IMMEDIATELY
+from ..utils.markdown import RENDERER_VERSION
+from . import utils
 
 
 class CommandsTests(TestCase):
@@ -101,6 +113,213 @@ class CommandsTests(TestCase):
             out_put_err = err.getvalue().strip().splitlines()
             self.assertEqual(out_put[-1], "ok")
             self.assertEqual(out_put_err, [])
-            self.assertEqual(command_list, ["migrate", "rebuild_index", "collectstatic"])
+            self.assertEqual(command_list, ["migrate", "spiritsearchrebuild", "collectstatic"])
         finally:
             spiritupgrade.call = org_call
+
+    def test_command_spiritcommentnumbers(self):
+        """
+        Should number the comments missing a number
+        """
+        category = utils.create_category()
+        topic = utils.create_topic(category)
+        comment_a = utils.create_comment(topic=topic)
+        comment_b = utils.create_comment(topic=topic)
+        topic_other = utils.create_topic(category)
+        comment_c = utils.create_comment(topic=topic_other)
+        Comment.objects.filter(pk__in=[comment_a.pk, comment_b.pk]).update(comment_number=None)
+        Comment.objects.filter(pk=comment_c.pk).update(comment_number=5)
+
+        out = StringIO()
+        err = StringIO()
+        call_command('spiritcommentnumbers', chunk_size=1, stdout=out, stderr=err)
+        out_put = out.getvalue().strip().splitlines()
+        out_put_err = err.getvalue().strip().splitlines()
+        self.assertEqual(out_put[-1], "ok")
+        self.assertEqual(out_put[-2], "1 topics processed, 2 comments updated")
+        self.assertEqual(out_put_err, [])
+        self.assertEqual(Comment.objects.get(pk=comment_a.pk).comment_number, 1)
+        self.assertEqual(Comment.objects.get(pk=comment_b.pk).comment_number, 2)
+        self.assertEqual(Comment.objects.get(pk=comment_c.pk).comment_number, 5)
+
+        # All
+        out = StringIO()
+        call_command('spiritcommentnumbers', all=True, stdout=out, stderr=err)
+        self.assertEqual(Comment.objects.get(pk=comment_c.pk).comment_number, 1)
+
+    def test_command_spirittopicvisibility(self):
+        """
+        Should recompute the topics visibility
+        """
+        category = utils.create_category()
+        topic = utils.create_topic(category)
+        Category.objects.filter(pk=category.pk).update(is_removed=True)
+
+        out = StringIO()
+        err = StringIO()
+        call_command('spirittopicvisibility', stdout=out, stderr=err)
+        out_put = out.getvalue().strip().splitlines()
+        out_put_err = err.getvalue().strip().splitlines()
+        self.assertEqual(out_put[-1], "ok")
+        self.assertEqual(out_put[-2], "1 topics updated")
+        self.assertEqual(out_put_err, [])
+        self.assertTrue(Topic.objects.get(pk=topic.pk).effective_is_removed)
+
+    @override_settings(ST_TOPIC_VIEWS_BUFFER_CACHE='default', ST_TOPIC_VIEWS_FLUSH_INTERVAL=None)
+    def test_command_spirittopicviews(self):
+        """
+        Should flush the buffered views
+        """
+        utils.cache_clear()
+        category = utils.create_category()
+        topic = utils.create_topic(category)
+        view_count.record(topic=topic, viewer='user:1')
+        view_count.record(topic=topic, viewer='user:1')
+
+        out = StringIO()
+        err = StringIO()
+        call_command('spirittopicviews', stdout=out, stderr=err)
+        out_put = out.getvalue().strip().splitlines()
+        out_put_err = err.getvalue().strip().splitlines()
+        self.assertEqual(out_put[-1], "ok")
+        self.assertEqual(out_put[-2], "1 topics updated")
+        self.assertEqual(out_put_err, [])
+        self.assertEqual(Topic.objects.get(pk=topic.pk).view_count, 2)
+
+    @override_settings(ST_NOTIFICATIONS_EMAIL_SITE_URL='https://example.com')
+    def test_command_spiritnotificationemails(self):
+        """
+        Should send the pending notification emails
+        """
+        user = utils.create_user()
+        user.st.notify_email = NOTIFY_IMMEDIATELY
+        user.st.save()
+        topic = utils.create_topic(utils.create_category())
+        TopicNotification.objects.create(
+            user=user, topic=topic, comment=utils.create_comment(topic=topic),
+            action=COMMENT, is_active=True)
+
+        out = StringIO()
+        err = StringIO()
+        call_command('spiritnotificationemails', stdout=out, stderr=err)
+        out_put = out.getvalue().strip().splitlines()
+        out_put_err = err.getvalue().strip().splitlines()
+        self.assertEqual(out_put[-1], "ok")
+        self.assertEqual(out_put[-2], "1 emails sent")
+        self.assertEqual(out_put_err, [])
+        self.assertTrue(TopicNotification.objects.get(user=user).is_emailed)
+
+    @override_settings(ST_JOBS_MODE='queue')
+    def test_command_spiritjobs(self):
+        """
+        Should run the queued jobs
+        """
+        category = utils.create_category()
+        topic = utils.create_topic(category)
+        comment = utils.create_comment(topic=topic)
+        comment_posted(comment=comment, mentions=None)
+        self.assertEqual(Topic.objects.get(pk=topic.pk).comment_count, 0)
+
+        out = StringIO()
+        err = StringIO()
+        call_command('spiritjobs', stdout=out, stderr=err)
+        out_put = out.getvalue().strip().splitlines()
+        out_put_err = err.getvalue().strip().splitlines()
+        self.assertEqual(out_put[-1], "ok")
+        self.assertEqual(out_put[-2], "1 jobs done, 0 failed")
+        self.assertEqual(out_put_err, [])
+        self.assertEqual(Topic.objects.get(pk=topic.pk).comment_count, 1)
+
+    def test_command_spiritrendercomments(self):
+        """
+        Should re-render the comments rendered by a previous version
+        """
+        utils.cache_clear()
+        category = utils.create_category()
+        topic = utils.create_topic(category)
+        comment_a = utils.create_comment(topic=topic, comment='**a**', comment_html='a')
+        comment_b = utils.create_comment(topic=topic, comment='b', comment_html='<p>b</p>')
+        comment_c = utils.create_comment(topic=topic, comment='**c**', comment_html='c')
+        Comment.objects\
+            .filter(pk=comment_c.pk)\
+            .update(comment_html_version=RENDERER_VERSION)
+        history_a = CommentHistory.create(comment_a)
+        history_a_old = CommentHistory.objects.create(comment_fk=comment_a, comment_html='old')
+
+        out = StringIO()
+        err = StringIO()
+        call_command('spiritrendercomments', chunk_size=1, workers=1, stdout=out, stderr=err)
+        out_put = out.getvalue().strip().splitlines()
+        out_put_err = err.getvalue().strip().splitlines()
+        self.assertEqual(out_put[-1], "ok")
+        self.assertEqual(out_put[-2], "2 comments processed, 1 updated")
+        self.assertEqual(out_put_err, [])
+
+        comment_a = Comment.objects.get(pk=comment_a.pk)
+        self.assertEqual(comment_a.comment_html, '<p><strong>a</strong></p>')
+        self.assertEqual(comment_a.comment_html_version, RENDERER_VERSION)
+        comment_b = Comment.objects.get(pk=comment_b.pk)
+        self.assertEqual(comment_b.comment_html, '<p>b</p>')
+        self.assertEqual(comment_b.comment_html_version, RENDERER_VERSION)
+        self.assertEqual(Comment.objects.get(pk=comment_c.pk).comment_html, 'c')
+        self.assertEqual(
+            CommentHistory.objects.get(pk=history_a.pk).comment_html,
+            '<p><strong>a</strong></p>')
+        self.assertEqual(CommentHistory.objects.get(pk=history_a_old.pk).comment_html, 'old')
+
+        # Current comments are skipped
+        out = StringIO()
+        call_command('spiritrendercomments', workers=1, stdout=out, stderr=err)
+        self.assertEqual(out.getvalue().strip().splitlines()[-2], "0 comments processed, 0 updated")
+
+        # All
+        out = StringIO()
+        call_command('spiritrendercomments', all=True, workers=1, stdout=out, stderr=err)
+        self.assertEqual(out.getvalue().strip().splitlines()[-2], "3 comments processed, 1 updated")
+        self.assertEqual(Comment.objects.get(pk=comment_c.pk).comment_html, '<p><strong>c</strong></p>')
+
+    def test_command_spiritrendercomments_replace_batches(self):
+        """
+        Should replace the HTML in batches
+        """
+        topic = utils.create_topic(utils.create_category())
+        comments = [utils.create_comment(topic=topic) for _ in range(3)]
+        html_by_pk = {comment.pk: 'html %d' % comment.pk for comment in comments}
+        org_batch_size, spiritrendercomments._REPLACE_BATCH_SIZE = \
+            spiritrendercomments._REPLACE_BATCH_SIZE, 2
+        try:
+            self.assertEqual(spiritrendercomments._replace_html(Comment.objects.all(), html_by_pk), 3)
+        finally:
+            spiritrendercomments._REPLACE_BATCH_SIZE = org_batch_size
+
+        self.assertEqual(
+            dict(Comment.objects.filter(topic=topic).values_list('pk', 'comment_html')),
+            html_by_pk)
+
+    def test_command_spiritrendercomments_resume(self):
+        """
+        Should resume from the checkpoint of an interrupted run
+        """
+        utils.cache_clear()
+        category = utils.create_category()
+        topic = utils.create_topic(category)
+        comment_a = utils.create_comment(topic=topic, comment='a', comment_html='a')
+        comment_b = utils.create_comment(topic=topic, comment='b', comment_html='b')
+        cache.set(
+            'st_render_comments_checkpoint_%s_stale' % RENDERER_VERSION,
+            comment_a.pk, timeout=None)
+
+        out = StringIO()
+        err = StringIO()
+        call_command('spiritrendercomments', workers=1, stdout=out, stderr=err)
+        out_put = out.getvalue().strip().splitlines()
+        self.assertEqual(out_put[0], "Resuming after comment %d" % comment_a.pk)
+        self.assertEqual(out_put[-2], "1 comments processed, 1 updated")
+        self.assertEqual(Comment.objects.get(pk=comment_a.pk).comment_html, 'a')
+        self.assertEqual(Comment.objects.get(pk=comment_b.pk).comment_html, '<p>b</p>')
+
+        # The checkpoint gets removed once done
+        out = StringIO()
+        call_command('spiritrendercomments', workers=1, stdout=out, stderr=err)
+        self.assertEqual(out.getvalue().strip().splitlines()[-2], "1 comments processed, 1 updated")
+        self.assertEqual(Comment.objects.get(pk=comment_a.pk).comment_html, '<p>a</p>')
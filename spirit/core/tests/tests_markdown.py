@@ -2,13 +2,18 @@
 
 from __future__ import unicode_literals
 
+import threading
+
 from django.test import TestCase
 from django.test.utils import override_settings
 from django.utils import translation
 from django.utils import timezone
 
 from . import utils
-from ..utils.markdown import Markdown, quotify
+from ..utils.markdown import Markdown, get_markdown, quotify
+from ..utils.markdown import cache as markdown_cache
+from ..utils.markdown.markdown import _get_cache_key
+from ..utils.markdown import inline
 
 
 now_fixed = timezone.now()
@@ -97,6 +102,171 @@ class UtilsMarkdownTests(TestCase):
         self.assertDictEqual(md.get_mentions(), {'nitely': self.user,
                                                  'esteban': self.user2})
 
+    def test_markdown_mentions_one_query(self):
+        """
+        Should fetch all the mentioned users at once
+        """
+        comment = "@nitely, @esteban, @nitely, `@esteban` @fakeone"
+        md = Markdown()
+
+        with self.assertNumQueries(1):
+            comment_md = md.render(comment)
+
+        self.assertEqual(comment_md, '<p><a class="comment-mention" rel="nofollow" href="%s">@nitely</a>, '
+                                     '<a class="comment-mention" rel="nofollow" href="%s">@esteban</a>, '
+                                     '<a class="comment-mention" rel="nofollow" href="%s">@nitely</a>, '
+                                     '<code>@esteban</code> @fakeone</p>' %
+                                     (self.user.st.get_absolute_url(),
+                                      self.user2.st.get_absolute_url(),
+                                      self.user.st.get_absolute_url()))
+
+        with self.assertNumQueries(0):
+            Markdown().render("no mentions")
+
+    def test_markdown_mentions_placeholder(self):
+        """
+        Should not replace escaped placeholders
+        """
+        comment = "<st-mention-0> @nitely"
+        comment_md = Markdown().render(comment)
+        self.assertEqual(comment_md, '<p>&lt;st-mention-0&gt; '
+                                     '<a class="comment-mention" rel="nofollow" href="%s">@nitely</a></p>' %
+                                     self.user.st.get_absolute_url())
+
+    def test_get_markdown(self):
+        """
+        Should reuse the instance within the thread and reset its state
+        """
+        md = get_markdown()
+        md.render("@nitely\n\n[poll name=foo]\n1. opt 1\n2. opt 2\n[/poll]")
+        mentions = md.get_mentions()
+        polls = md.get_polls()
+        self.assertEqual(mentions, {'nitely': self.user})
+        self.assertEqual(len(polls['polls']), 1)
+
+        md2 = get_markdown()
+        self.assertIs(md2, md)
+        self.assertEqual(md2.get_mentions(), {})
+        self.assertEqual(md2.get_polls(), {'polls': [], 'choices': []})
+        self.assertEqual(md2.render("@esteban"),
+                         '<p><a class="comment-mention" rel="nofollow" href="%s">@esteban</a></p>' %
+                         self.user2.st.get_absolute_url())
+        self.assertEqual(md2.get_mentions(), {'esteban': self.user2})
+
+        # Previous results are not modified
+        self.assertEqual(mentions, {'nitely': self.user})
+        self.assertEqual(len(polls['polls']), 1)
+
+        self.assertIsNot(get_markdown(no_follow=False), md)
+
+    def test_get_markdown_thread(self):
+        """
+        Should not share the instance between threads
+        """
+        instances = []
+        thread = threading.Thread(target=lambda: instances.append(get_markdown()))
+        thread.start()
+        thread.join()
+        self.assertIsNot(instances[0], get_markdown())
+
+    def test_markdown_cache(self):
+        """
+        Should cache the rendered text along the mentions and polls
+        """
+        comment = "@nitely\n\n[poll name=foo]\n1. opt 1\n2. opt 2\n[/poll]"
+        comment_md = Markdown().render(comment)
+        cached = markdown_cache.get(_get_cache_key(comment, no_follow=True))
+        self.assertEqual(cached['mentions'], ['nitely'])
+        self.assertEqual(len(cached['polls']['polls']), 1)
+        self.assertIsNone(markdown_cache.get(_get_cache_key(comment, no_follow=False)))
+
+        def parse_mock(*args, **kwargs):
+            raise AssertionError("It should not be parsed")
+
+        md = Markdown()
+        org_parse, md.parse = md.parse, parse_mock
+        try:
+            self.assertEqual(md.render(comment), comment_md)
+        finally:
+            md.parse = org_parse
+
+        self.assertEqual(md.get_mentions(), {'nitely': self.user})
+        self.assertEqual(md.get_polls(), cached['polls'])
+
+        # Cached values can't be modified
+        md.get_polls()['polls'].append({'name': 'bar'})
+        self.assertEqual(Markdown().get_polls(), {'polls': [], 'choices': []})
+        md = Markdown()
+        md.render(comment)
+        self.assertEqual(len(md.get_polls()['polls']), 1)
+
+    def test_markdown_cache_mentions_renamed(self):
+        """
+        Should render the mentions with the current username
+        """
+        comment = "@nitely @esteban"
+        Markdown().render(comment)
+        self.user.username = 'nitely2'
+        self.user.save()
+        self.user.st.save()
+        self.user2.st.slug = 'foo'
+        self.user2.st.save()
+        self.assertEqual(Markdown().render(comment),
+                         '<p>@nitely <a class="comment-mention" rel="nofollow" href="%s">@esteban</a></p>' %
+                         self.user2.st.get_absolute_url())
+        self.assertIn('foo', self.user2.st.get_absolute_url())
+
+    def test_markdown_cache_not_clean(self):
+        """
+        Should not use the cache when a\
+        previous render left polls behind
+        """
+        comment = "[poll name=foo]\n1. opt 1\n2. opt 2\n[/poll]"
+        md = Markdown()
+        self.assertEqual(md.render(comment), '<poll name=foo>')
+        self.assertEqual(md.render(comment), '<p>[poll name=foo]<br>1. opt 1<br>2. opt 2<br>[/poll]</p>')
+        self.assertEqual(Markdown().render(comment), '<poll name=foo>')
+
+    def test_markdown_cache_poll_close(self):
+        """
+        Should not cache the polls having a closing date
+        """
+        comment = "[poll name=foo close=1d]\n1. opt 1\n2. opt 2\n[/poll]"
+        Markdown().render(comment)
+        self.assertIsNone(markdown_cache.get(_get_cache_key(comment, no_follow=True)))
+
+    @override_settings(ST_MARKDOWN_CACHE_SIZE=2)
+    def test_markdown_cache_lru(self):
+        """
+        Should evict the least recently used texts
+        """
+        Markdown().render("foo")
+        Markdown().render("bar")
+        Markdown().render("foo")
+        Markdown().render("baz")
+        self.assertIsNotNone(markdown_cache.get(_get_cache_key("foo", no_follow=True)))
+        self.assertIsNone(markdown_cache.get(_get_cache_key("bar", no_follow=True)))
+        self.assertIsNotNone(markdown_cache.get(_get_cache_key("baz", no_follow=True)))
+
+    @override_settings(ST_MARKDOWN_CACHE_SIZE=0, ST_MARKDOWN_CACHE='default')
+    def test_markdown_cache_shared(self):
+        """
+        Should use the shared cache
+        """
+        Markdown().render("foo")
+        self.assertEqual(markdown_cache.get(_get_cache_key("foo", no_follow=True))['html'].strip(), '<p>foo</p>')
+
+        with override_settings(ST_MARKDOWN_CACHE=None):
+            self.assertIsNone(markdown_cache.get(_get_cache_key("foo", no_follow=True)))
+
+    def test_markdown_code_backticks(self):
+        """
+        Should not backtrack on long runs of backticks
+        """
+        self.assertEqual(Markdown().render("`" * 3000), '<p>' + "`" * 3000 + '</p>')
+        self.assertEqual(Markdown().render("``foo``"), '<p><code>foo</code></p>')
+        self.assertEqual(Markdown().render("``foo` bar`"), '<p>`<code>foo</code> bar`</p>')
+
     def test_markdown_emoji(self):
         """
         markdown emojify
@@ -108,6 +278,46 @@ class UtilsMarkdownTests(TestCase):
                                      '<i class="tw tw-plus1" title=":+1:"></i> '
                                      ':bademoji: foo:</p>')
 
+    def test_markdown_unicode_emoji(self):
+        """
+        Should render the unicode emojis, the longest sequence wins
+        """
+        comment = "\U0001f44d \U0001f44d\U0001f3fb \U0001f1fa\U0001f1f8x \u26a1 \u2764\ufe0f 1\ufe0f\u20e3"
+        comment_md = Markdown().render(comment)
+        self.assertEqual(comment_md, '<p><i class="tw tw-plus1" title=":+1:"></i> '
+                                     '<i class="tw tw-plus1-tone1" title=":+1_tone1:"></i> '
+                                     '<i class="tw tw-flag-us" title=":flag_us:"></i>x '
+                                     '<i class="tw tw-zap" title=":zap:"></i> '
+                                     '<i class="tw tw-heart" title=":heart:"></i> '
+                                     '<i class="tw tw-one" title=":one:"></i></p>')
+
+    def test_markdown_unicode_emoji_text(self):
+        """
+        Should not render the chars displayed\
+        as text by default, nor the code
+        """
+        comment = "\u00a9 \u2764 \u2192 123 # `\U0001f44d` \u00e1\u00e9"
+        comment_md = Markdown().render(comment)
+        self.assertEqual(comment_md, '<p>\u00a9 \u2764 \u2192 123 # <code>\U0001f44d</code> \u00e1\u00e9</p>')
+
+        comment = "\u00a9\ufe0f"
+        comment_md = Markdown().render(comment)
+        self.assertEqual(comment_md, '<p><i class="tw tw-copyright" title=":copyright:"></i></p>')
+
+    def test_markdown_unicode_emoji_text_run(self):
+        """
+        Should not stop the text at the chars\
+        that are not emojis by themselves (i.e: CJK)
+        """
+        comment = "\u65e5\u672c\u8a9e\u306e\u30c6\u30ad\u30b9\u30c8\u2122\u20ac\u2192\u00a9"
+        self.assertEqual(inline._text.match(comment).group(0), comment)
+        self.assertEqual(Markdown().render(comment), '<p>%s</p>' % comment)
+
+        comment = "\u261d\U0001f3fb \u2122\ufe0f"
+        comment_md = Markdown().render(comment)
+        self.assertEqual(comment_md, '<p><i class="tw tw-point-up-tone1" title=":point_up_tone1:"></i> '
+                                     '<i class="tw tw-tm" title=":tm:"></i></p>')
+
     @override_settings(LANGUAGE_CODE='en')
     def test_markdown_quote(self):
         """
@@ -118,6 +328,19 @@ class UtilsMarkdownTests(TestCase):
         self.assertListEqual(quote.splitlines(), ("> @%s said:\n> text\n> new line\n\n" % self.user.username).splitlines())
 
     @override_settings(LANGUAGE_CODE='en')
+    def test_markdown_quote_max_depth(self):
+        """
+        Should render the quotes past the max depth as text
+        """
+        comment = "> " * 3 + "foo"
+        md = Markdown()
+        md.block.max_block_quote_depth = 2
+        self.assertEqual(md.render(comment), '<blockquote><blockquote><p>&gt; foo</p>\n</blockquote>\n</blockquote>')
+
+        # Would exceed the recursion limit
+        comment_md = Markdown().render("> " * 1000 + "foo")
+        self.assertEqual(comment_md.count('<blockquote>'), 20)
+
     def test_markdown_quote_header_language(self):
         """
         markdown quote
@@ -583,6 +806,16 @@ class UtilsMarkdownTests(TestCase):
         self.assertEqual(len(polls['choices']), 0)
         self.assertEqual(len(polls['polls']), 1)
 
+    def test_markdown_poll_unclosed(self):
+        """
+        Should not backtrack on unclosed polls with many choices
+        """
+        comment = "[poll name=foo]\n" + "1. opt\n" * 100
+        md = Markdown()
+        comment_md = md.render(comment)
+        self.assertTrue(comment_md.startswith('<p>[poll name=foo]</p>\n<ol>\n<li>opt</li>'))
+        self.assertEqual(md.get_polls(), {'polls': [], 'choices': []})
+
     def test_markdown_poll_unique_choice_numbers(self):
         """
         Should not allow repeated numbers
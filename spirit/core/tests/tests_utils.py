@@ -28,6 +28,7 @@ from ..utils.decorators import moderator_required, administrator_required
 from ..tags import time as ttags_utils
 from . import utils as test_utils
 from ..tags.messages import render_messages
+from ..utils.hyperloglog import HyperLogLog
 
 User = get_user_model()
 
@@ -297,3 +298,51 @@ class UtilsDecoratorsTests(TestCase):
         req.user.st.is_administrator = True
         self.assertIsNone(view(req))
 
+
+class UtilsHyperLogLogTests(TestCase):
+
+    def test_count(self):
+        """
+        Should estimate the distinct values
+        """
+        counter = HyperLogLog()
+        self.assertEqual(counter.count(), 0)
+
+        for i in range(5000):
+            counter.add('user:%d' % i)
+
+        self.assertAlmostEqual(counter.count(), 5000, delta=5000 * 0.1)
+
+    def test_add(self):
+        """
+        Should return whether the counter changed
+        """
+        counter = HyperLogLog()
+        self.assertTrue(counter.add('foo'))
+        self.assertFalse(counter.add('foo'))
+        self.assertEqual(counter.count(), 1)
+
+    def test_merge(self):
+        """
+        Should merge counters, repeated values are counted once
+        """
+        counter_a = HyperLogLog()
+        counter_b = HyperLogLog()
+
+        for i in range(100):
+            counter_a.add('user:%d' % i)
+            counter_b.add('user:%d' % (i + 50))
+
+        self.assertTrue(counter_a.merge(counter_b))
+        self.assertFalse(counter_a.merge(counter_b))
+        self.assertAlmostEqual(counter_a.count(), 150, delta=150 * 0.1)
+
+    def test_to_bytes(self):
+        """
+        Should be restorable from bytes
+        """
+        counter = HyperLogLog(precision=4)
+        counter.add('foo')
+        registers = counter.to_bytes()
+        self.assertEqual(len(registers), 16)
+        self.assertEqual(HyperLogLog(registers, precision=4).count(), 1)
@@ -0,0 +1,108 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+import json
+
+from django.test import TestCase, override_settings
+from django.db import connection
+
+from ..models import Job
+from ..utils import jobs
+
+results = []
+
+
+def append_result(value):
+    results.append(value)
+
+
+def fail(value):
+    append_result(value)
+    raise ValueError('foo')
+
+
+def append_savepoints(value):
+    # Nested transactions
+    results.append((value, len(connection.savepoint_ids)))
+
+
+@jobs.non_atomic
+def append_savepoints_non_atomic(value):
+    append_savepoints(value)
+
+
+class UtilsJobsTests(TestCase):
+
+    def setUp(self):
+        del results[:]
+
+    def test_defer_inline(self):
+        """
+        Should run the job right away (there's no commit hook in Django 1.8)
+        """
+        jobs.defer(append_result, value=1)
+        self.assertEqual(results, [1])
+        self.assertFalse(Job.objects.exists())
+
+    @override_settings(ST_JOBS_MODE=jobs.QUEUE)
+    def test_defer_queue(self):
+        """
+        Should queue the job
+        """
+        jobs.defer(append_result, value=1)
+        self.assertEqual(results, [])
+        job = Job.objects.get()
+        self.assertEqual(job.name, 'spirit.core.tests.tests_utils_jobs.append_result')
+        self.assertEqual(json.loads(job.payload), {'value': 1})
+
+    @override_settings(ST_JOBS_MODE=jobs.QUEUE)
+    def test_run_pending(self):
+        """
+        Should run and delete the jobs in order
+        """
+        jobs.defer(append_result, value=1)
+        jobs.defer(append_result, value=2)
+        jobs.defer(append_result, value=3)
+        self.assertEqual(jobs.run_pending(batch_size=2), (2, 0))
+        self.assertEqual(results, [1, 2])
+        self.assertEqual(jobs.run_pending(), (1, 0))
+        self.assertEqual(results, [1, 2, 3])
+        self.assertFalse(Job.objects.exists())
+        self.assertEqual(jobs.run_pending(), (0, 0))
+
+    @override_settings(ST_JOBS_MODE=jobs.QUEUE, ST_JOBS_MAX_ATTEMPTS=2, ST_JOBS_RETRY_SECONDS=0)
+    def test_run_pending_failed(self):
+        """
+        Should retry failed jobs until the max attempts
+        """
+        jobs.defer(fail, value=1)
+        self.assertEqual(jobs.run_pending(), (0, 1))
+        job = Job.objects.get()
+        self.assertEqual(job.attempts, 1)
+        self.assertIn('ValueError', job.last_error)
+
+        self.assertEqual(jobs.run_pending(), (0, 1))
+        self.assertEqual(jobs.run_pending(), (0, 0))
+        self.assertEqual(results, [1, 1])
+        self.assertEqual(Job.objects.get().attempts, 2)
+
+    @override_settings(ST_JOBS_MODE=jobs.QUEUE)
+    def test_run_pending_failed_backoff(self):
+        """
+        Should not retry right away
+        """
+        jobs.defer(fail, value=1)
+        self.assertEqual(jobs.run_pending(), (0, 1))
+        self.assertEqual(jobs.run_pending(), (0, 0))
+
+    @override_settings(ST_JOBS_MODE=jobs.QUEUE)
+    def test_run_pending_non_atomic(self):
+        """
+        Should run the non atomic jobs outside of the job transaction
+        """
+        jobs.defer(append_savepoints, value=1)
+        jobs.defer(append_savepoints_non_atomic, value=2)
+        self.assertEqual(jobs.run_pending(), (2, 0))
+        self.assertEqual(results[0][1], results[1][1] + 1)
+        self.assertFalse(Job.objects.exists())
@@ -13,6 +13,7 @@ from ...comment.models import Comment
 from ..utils import paginator
 from ..utils.paginator import YTPaginator, InvalidPage, YTPage
 from ..utils.paginator import infinite_paginator, paginate, yt_paginate
+from ..utils.paginator import NumberPaginator, number_paginate
 from ..tags.paginator import render_paginator
 from ..tags import paginator as ttag_paginator
 
@@ -229,6 +230,80 @@ class UtilsYTPaginatorTemplateTagsTests(TestCase):
             ttag_paginator.render_to_string = org_render
 
 
+class UtilsNumberPaginatorTests(TestCase):
+
+    def setUp(self):
+        utils.cache_clear()
+        self.user = utils.create_user()
+        self.topic = utils.create_topic(utils.create_category())
+
+        for _ in range(10):
+            utils.create_comment(user=self.user, topic=self.topic)
+
+        self.queryset = Comment.objects\
+            .filter(topic=self.topic)\
+            .order_by('date', 'pk')
+
+    def test_number_paginator_page(self):
+        comments = list(self.queryset)
+        paginator = NumberPaginator(self.queryset, per_page=3, lookup_field='comment_number')
+        self.assertEqual(paginator.count, 10)
+        self.assertEqual(paginator.num_pages, 4)
+        page = paginator.page(1)
+        self.assertIsInstance(page, Page)
+        self.assertEqual(list(page), comments[:3])
+        self.assertEqual(page.start_index(), 1)
+        self.assertEqual(list(paginator.page(2)), comments[3:6])
+        self.assertEqual(list(paginator.page(4)), comments[9:])
+        self.assertEqual(paginator.page(4).start_index(), 10)
+
+    def test_number_paginator_page_invalid(self):
+        paginator = NumberPaginator(self.queryset, per_page=3, lookup_field='comment_number')
+        self.assertRaises(InvalidPage, paginator.page, 5)
+        self.assertRaises(InvalidPage, paginator.page, 10 ** 20)
+        self.assertRaises(InvalidPage, paginator.page, 0)
+        self.assertRaises(InvalidPage, paginator.page, 'foo')
+
+    def test_number_paginator_count(self):
+        """
+        Should use the given count
+        """
+        paginator = NumberPaginator(self.queryset, per_page=3, lookup_field='comment_number', count=3)
+        self.assertEqual(paginator.num_pages, 1)
+        self.assertRaises(InvalidPage, paginator.page, 2)
+
+    def test_number_paginator_not_numbered(self):
+        """
+        Should fall back to an offset query
+        """
+        comments = list(self.queryset)
+        Comment.objects\
+            .filter(pk__in=[c.pk for c in comments[:5]])\
+            .update(comment_number=None)
+        paginator = NumberPaginator(self.queryset, per_page=3, lookup_field='comment_number')
+        self.assertEqual(paginator.count, 10)
+        self.assertEqual(list(paginator.page(1)), comments[:3])
+        self.assertEqual(list(paginator.page(2)), comments[3:6])
+        self.assertEqual(list(paginator.page(4)), comments[9:])
+
+        Comment.objects.all().update(comment_number=None)
+        paginator = NumberPaginator(self.queryset, per_page=3, lookup_field='comment_number')
+        self.assertEqual(paginator.count, 10)
+        self.assertEqual(list(paginator.page(2)), comments[3:6])
+
+    def test_number_paginate(self):
+        comments = list(self.queryset)
+        page = number_paginate(self.queryset, lookup_field='comment_number', per_page=3, page_number=2)
+        self.assertEqual(list(page), comments[3:6])
+        self.assertRaises(Http404, number_paginate,
+                          self.queryset, lookup_field='comment_number', per_page=3, page_number=99)
+
+        # empty first page
+        page = number_paginate(
+            Comment.objects.none(), lookup_field='comment_number', per_page=3)
+        self.assertListEqual(list(page), [])
+
+
 class UtilsPaginatorTemplateTagsTests(TestCase):
 
     def setUp(self):
@@ -10,6 +10,8 @@ from ...topic.models import Topic
 from ...category.models import Category
 from ...comment.models import Comment
 from ...topic.private.models import TopicPrivate
+from ..utils.markdown import cache as markdown_cache
+from ...search import typeahead
 
 User = get_user_model()
 
@@ -84,3 +86,6 @@ def cache_clear():
 
     for c in caches.all():
         c.clear()
+
+    markdown_cache.clear()
+    typeahead.clear()
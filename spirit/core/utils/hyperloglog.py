@@ -0,0 +1,107 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+import binascii
+import hashlib
+import math
+
+__all__ = ['HyperLogLog']
+
+
+def _hash(value):
+    """
+    Return a 64 bits hash of the value
+    """
+    digest = hashlib.sha1(value.encode('utf-8')).digest()
+    return int(binascii.hexlify(digest[:8]), 16)
+
+
+class HyperLogLog(object):
+    """
+    Probabilistic counter of distinct values.\
+    It takes ``2 ** precision`` bytes no matter\
+    how many values are added. The standard error\
+    is about ``1.04 / sqrt(2 ** precision)``,\
+    ~3% for the default precision
+
+    :param registers: bytes of a previous\
+    counter (see :py:meth:`.to_bytes`) or None
+    :param precision: Number of bits used\
+    for the register index (4-16)
+    """
+
+    def __init__(self, registers=None, precision=10):
+        assert 4 <= precision <= 16, "Precision must be between 4 and 16"
+        self.precision = precision
+        self.size = 1 << precision
+
+        if registers is None:
+            self.registers = bytearray(self.size)
+        else:
+            self.registers = bytearray(registers)
+
+        assert len(self.registers) == self.size, "Registers don't match the precision"
+
+    def _index_and_rank(self, value):
+        hashed = _hash(value)
+        rest_bits = 64 - self.precision
+        index = hashed >> rest_bits
+        rest = hashed & ((1 << rest_bits) - 1)
+        rank = rest_bits - rest.bit_length() + 1
+        return index, rank
+
+    def add(self, value):
+        """
+        Add a value to the counter
+
+        :param value: A string
+        :return: Whether the counter changed or not
+        """
+        index, rank = self._index_and_rank(value)
+
+        if self.registers[index] >= rank:
+            return False
+
+        self.registers[index] = rank
+        return True
+
+    def merge(self, other):
+        """
+        Merge another counter into this one
+
+        :param other: :py:class:`HyperLogLog` of the same precision
+        :return: Whether the counter changed or not
+        """
+        assert self.precision == other.precision, "Can't merge counters of different precision"
+        changed = False
+
+        for index, rank in enumerate(other.registers):
+            if self.registers[index] < rank:
+                self.registers[index] = rank
+                changed = True
+
+        return changed
+
+    def count(self):
+        """
+        Return the estimated number of distinct values
+        """
+        size = self.size
+
+        if size >= 128:
+            alpha = 0.7213 / (1 + 1.079 / size)
+        else:
+            alpha = {16: 0.673, 32: 0.697, 64: 0.709}[size]
+
+        estimate = alpha * size * size / sum(2.0 ** -rank for rank in self.registers)
+        zeros = sum(1 for rank in self.registers if not rank)
+
+        # Small range correction
+        if estimate <= 2.5 * size and zeros:
+            estimate = size * math.log(float(size) / zeros)
+
+        return int(round(estimate))
+
+    def to_bytes(self):
+        return bytes(self.registers)
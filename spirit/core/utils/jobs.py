@@ -0,0 +1,142 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+import json
+import datetime
+import traceback
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q, F
+from django.utils import timezone
+from django.utils.module_loading import import_string
+
+from ..models import Job
+
+__all__ = [
+    'INLINE',
+    'QUEUE',
+    'defer',
+    'non_atomic',
+    'run_pending']
+
+INLINE, QUEUE = 'inline', 'queue'
+
+
+def _get_name(func):
+    return '%s.%s' % (func.__module__, func.__name__)
+
+
+def _on_commit(func):
+    try:
+        on_commit = transaction.on_commit
+    except AttributeError:  # Django 1.8
+        func()
+    else:
+        on_commit(func)
+
+
+def defer(func, **kwargs):
+    """
+    Run a function once the current transaction\
+    commits. In ``settings.ST_JOBS_MODE = 'queue'``\
+    it gets saved to the jobs table (in the same\
+    transaction) and it's run by the ``spiritjobs``\
+    worker command instead.
+
+    The function must be importable and\
+    its kwargs must be JSON serializable.\
+    Queued jobs may be retried, so they\
+    must be idempotent
+
+    :param func: Module level function
+    :param kwargs: Function kwargs
+    """
+    if settings.ST_JOBS_MODE == QUEUE:
+        Job.objects.create(
+            name=_get_name(func),
+            payload=json.dumps(kwargs))
+        return
+
+    assert settings.ST_JOBS_MODE == INLINE, "Invalid settings.ST_JOBS_MODE"
+    _on_commit(lambda: func(**kwargs))
+
+
+def non_atomic(func):
+    """
+    Decorator for the jobs that must not run within\
+    a transaction, since their side effects can't\
+    be rolled back (i.e: sending emails). The job\
+    gets deleted once it's done, so it must keep\
+    track of its own progress in case it fails
+    """
+    func._st_non_atomic = True
+    return func
+
+
+def _run(job):
+    """
+    Run the job and delete it\
+    in the same transaction,\
+    so a failed job leaves\
+    nothing behind
+    """
+    func = import_string(job.name)
+
+    if getattr(func, '_st_non_atomic', False):
+        func(**json.loads(job.payload))
+        Job.objects\
+            .filter(pk=job.pk)\
+            .delete()
+        return
+
+    with transaction.atomic():
+        func(**json.loads(job.payload))
+        Job.objects\
+            .filter(pk=job.pk)\
+            .delete()
+
+
+def run_pending(batch_size=100):
+    """
+    Run the queued jobs that are not locked,\
+    oldest first. Failed jobs are retried later\
+    (backing off) until they reach\
+    ``settings.ST_JOBS_MAX_ATTEMPTS``
+
+    :param batch_size: Max number of jobs to run
+    :return: Tuple of done and failed jobs count
+    """
+    now = timezone.now()
+    jobs = Job.objects\
+        .filter(Q(locked_until=None) | Q(locked_until__lte=now),
+                attempts__lt=settings.ST_JOBS_MAX_ATTEMPTS)\
+        .order_by('date', 'pk')[:batch_size]
+    done = 0
+    failed = 0
+
+    for job in jobs:
+        # Another worker may have taken it
+        is_taken = not Job.objects\
+            .filter(pk=job.pk, locked_until=job.locked_until)\
+            .update(
+                locked_until=now + datetime.timedelta(seconds=settings.ST_JOBS_LOCK_SECONDS),
+                attempts=F('attempts') + 1)
+
+        if is_taken:
+            continue
+
+        try:
+            _run(job)
+        except Exception:
+            failed += 1
+            retry_at = timezone.now() + datetime.timedelta(
+                seconds=settings.ST_JOBS_RETRY_SECONDS * (job.attempts + 1))
+            Job.objects\
+                .filter(pk=job.pk)\
+                .update(locked_until=retry_at, last_error=traceback.format_exc())
+        else:
+            done += 1
+
+    return done, failed
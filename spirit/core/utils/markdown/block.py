@@ -127,12 +127,16 @@ class BlockGrammar(mistune.BlockGrammar):
         r'|(?P<invalid_params>[^\]]*))'
         r'\])\n'
         r'((?:#\s*(?P<title>[^\n]+\n))?'
-        r'(?P<choices>(?:\d+\.\s*[^\n]+\n){2,})'
+        r'(?P<choices>(?:\d+\.[^\n]+\n){2,})'
         r'|(?P<invalid_body>(?:[^\n]+\n)*))'
         r'(?:\[/poll\])'
     )
 
 
+# The grammar is never modified, so it's shared
+_rules = BlockGrammar()
+
+
 class BlockLexer(mistune.BlockLexer):
 
     default_rules = copy.copy(mistune.BlockLexer.default_rules)
@@ -146,17 +150,43 @@ class BlockLexer(mistune.BlockLexer):
     default_rules.insert(0, 'twitch_video')
     default_rules.insert(0, 'poll')
 
+    # Deeper quotes are rendered as text,
+    # they would exhaust the recursion limit
+    max_block_quote_depth = 20
+
     def __init__(self, rules=None, **kwargs):
         if rules is None:
-            rules = BlockGrammar()
+            rules = _rules
 
         super(BlockLexer, self).__init__(rules=rules, **kwargs)
-
+        self.reset()
+
+    def reset(self):
+        """
+        Clear the state of the previous render
+        """
+        self.tokens = []
+        self.def_links = {}
+        self.def_footnotes = {}
+        self._block_quote_depth = 0
         self.polls = {
             'polls': [],
             'choices': []
         }
 
+    # Override
+    def parse_block_quote(self, m):
+        if self._block_quote_depth >= self.max_block_quote_depth:
+            self.parse_text(m)
+            return
+
+        self._block_quote_depth += 1
+
+        try:
+            super(BlockLexer, self).parse_block_quote(m)
+        finally:
+            self._block_quote_depth -= 1
+
     def parse_audio_link(self, m):
         self.tokens.append({
             'type': 'audio_link',
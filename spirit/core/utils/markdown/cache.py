@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+import copy
+import threading
+from collections import OrderedDict
+
+from django.conf import settings
+from django.core.cache import caches
+
+__all__ = [
+    'get',
+    'set',
+    'clear']
+
+# Least recently used entries come first
+_entries = OrderedDict()
+_lock = threading.Lock()
+
+
+def _get_shared_cache():
+    if settings.ST_MARKDOWN_CACHE is None:
+        return
+
+    return caches[settings.ST_MARKDOWN_CACHE]
+
+
+def _get_local(key):
+    with _lock:
+        try:
+            value = _entries.pop(key)
+        except KeyError:
+            return
+
+        _entries[key] = value
+        return value
+
+
+def _set_local(key, value):
+    size = settings.ST_MARKDOWN_CACHE_SIZE
+
+    if not size:
+        return
+
+    with _lock:
+        _entries.pop(key, None)
+        _entries[key] = value
+
+        while len(_entries) > size:
+            _entries.popitem(last=False)
+
+
+def get(key):
+    """
+    Return a copy of the cached value,\
+    the local entries are looked up first
+
+    :param key: A string
+    :return: The value or None
+    """
+    value = _get_local(key)
+
+    if value is None:
+        shared_cache = _get_shared_cache()
+
+        if shared_cache is None:
+            return
+
+        value = shared_cache.get(key)
+
+        if value is None:
+            return
+
+        _set_local(key, value)
+
+    return copy.deepcopy(value)
+
+
+def set(key, value):
+    """
+    Store a copy of the value in the local\
+    (bounded by ``settings.ST_MARKDOWN_CACHE_SIZE``)\
+    and shared (``settings.ST_MARKDOWN_CACHE``) caches
+    """
+    value = copy.deepcopy(value)
+    _set_local(key, value)
+    shared_cache = _get_shared_cache()
+
+    if shared_cache is not None:
+        shared_cache.set(key, value)
+
+
+def clear():
+    """
+    Clear the local entries
+    """
+    with _lock:
+        _entries.clear()
@@ -9,27 +9,35 @@ from django.contrib.auth import get_user_model
 
 import mistune
 
-from .utils.emoji import emojis
+from .utils.unicode_emoji import EMOJI_START, UnicodeEmojiPattern
 
 User = get_user_model()
 _linebreak = re.compile(r'^ *\n(?!\s*$)')
 _text = re.compile(
-    r'^[\s\S]+?(?=[\\<!\[_*`:@~]|https?://| *\n|$)'
+    r'^[\s\S]+?(?=[\\<!\[_*`:@~]|https?://| *\n|$|' + EMOJI_START + ')'
 )
+# User's "<" is always escaped,
+# so this can't be forged
+_mention_placeholder = re.compile(r'<st-mention-(?P<index>[0-9]+)>')
 
 
 class InlineGrammar(mistune.InlineGrammar):
 
-    # todo: match unicode emojis
     emoji = re.compile(
         r'^:(?P<emoji>[A-Za-z0-9_\-\+]+?):'
     )
 
+    unicode_emoji = UnicodeEmojiPattern()
+
     mention = re.compile(
         r'^@(?P<username>[\w.@+-]+)',
         flags=re.UNICODE
     )
 
+    # Override, the opening backticks must be the
+    # whole run, or long runs of them would backtrack
+    code = re.compile(r'^(`+)(?!`)\s*([\s\S]*?[^`])\s*\1(?!`)')
+
     # Override
     def hard_wrap(self):
         # Adds ":" and "@" as an invalid text character, so we can match emojis and mentions.
@@ -37,53 +45,98 @@ class InlineGrammar(mistune.InlineGrammar):
         self.text = _text
 
 
+# The grammar is never modified, so it's shared
+_rules = InlineGrammar()
+_rules.hard_wrap()
+
+
 class InlineLexer(mistune.InlineLexer):
 
     default_rules = copy.copy(mistune.InlineLexer.default_rules)
     default_rules.insert(2, 'emoji')
+    default_rules.insert(2, 'unicode_emoji')
     default_rules.insert(2, 'mention')
 
     def __init__(self, renderer, rules=None, **kwargs):
-        rules = InlineGrammar()
-        rules.hard_wrap()
-
-        super(InlineLexer, self).__init__(renderer, rules, **kwargs)
-
+        super(InlineLexer, self).__init__(renderer, _rules, **kwargs)
+        self.reset()
+
+    def reset(self):
+        """
+        Clear the state of the previous render
+        """
+        self.links = {}
+        self.footnotes = {}
+        self._in_link = False
+        self._in_footnote = False
         self.mentions = {}
-        self._mention_count = 0
+        self._mention_candidates = []
+
+    def _render_emoji(self, name):
+        name_class = name.replace('_', '-').replace('+', 'plus')
+        return self.renderer.emoji(name_class=name_class, name_raw=name)
 
     def output_emoji(self, m):
+        # Loaded on the first render
+        from .utils.emoji import emojis
+
         emoji = m.group('emoji')
 
         if emoji not in emojis:
             return m.group(0)
 
-        name_raw = emoji
-        name_class = emoji.replace('_', '-').replace('+', 'plus')
-        return self.renderer.emoji(name_class=name_class, name_raw=name_raw)
+        return self._render_emoji(emoji)
+
+    def output_unicode_emoji(self, m):
+        return self._render_emoji(m.group('emoji'))
 
     def output_mention(self, m):
         username = m.group('username')
 
         # Already mentioned?
-        if username in self.mentions:
+        try:
+            index = self._mention_candidates.index(username)
+        except ValueError:
+            # Mentions limiter
+            if len(self._mention_candidates) >= settings.ST_MENTIONS_PER_COMMENT:
+                return m.group(0)
+
+            index = len(self._mention_candidates)
+            self._mention_candidates.append(username)
+
+        # The users are fetched all at once
+        # once the whole text is rendered
+        return '<st-mention-%d>' % index
+
+    def render_mentions(self, text):
+        """
+        Replace the mention placeholders\
+        with links to the existing users.\
+        It must be called after rendering
+
+        :param text: The rendered text
+        :return: The text with the mentions
+        """
+        if not self._mention_candidates:
+            return text
+
+        users = {
+            user.username: user
+            for user in User.objects
+                .select_related('st')
+                .filter(username__in=self._mention_candidates)}
+        self.mentions = {
+            username: users[username]
+            for username in self._mention_candidates
+            if username in users}
+
+        def render_mention(m):
+            username = self._mention_candidates[int(m.group('index'))]
+
+            if username not in self.mentions:
+                return '@%s' % username
+
             user = self.mentions[username]
             return self.renderer.mention(username, user.st.get_absolute_url())
 
-        # Mentions limiter
-        if self._mention_count >= settings.ST_MENTIONS_PER_COMMENT:
-            return m.group(0)
-
-        # We increase this before doing the query to avoid abuses
-        self._mention_count += 1
-
-        # New mention
-        try:
-            user = User.objects\
-                .select_related('st')\
-                .get(username=username)
-        except User.DoesNotExist:
-            return m.group(0)
-
-        self.mentions[username] = user
-        return self.renderer.mention(username, user.st.get_absolute_url())
+        return _mention_placeholder.sub(render_mention, text)
@@ -2,12 +2,35 @@
 
 from __future__ import unicode_literals
 
+import hashlib
+import threading
+
+from django.conf import settings
+from django.utils.encoding import smart_bytes
 import mistune
 
+from . import cache
 from .block import BlockLexer
 from .inline import InlineLexer
 from .renderer import Renderer
 
+# Stored along the rendered HTML, bump it when
+# the output changes (i.e: new rules or fixes)
+# so the spiritrendercomments command re-renders
+# the comments rendered by a previous version
+RENDERER_VERSION = '3-%s' % mistune.__version__
+
+
+def _get_cache_key(text, no_follow):
+    # The settings that change the output are part of the key
+    return 'st_markdown_%s' % hashlib.sha1(smart_bytes('\n'.join((
+        RENDERER_VERSION,
+        str(no_follow),
+        str(settings.ST_MENTIONS_PER_COMMENT),
+        str(settings.ST_POLL_CHOICES_LIMIT),
+        ','.join(sorted(settings.ST_ALLOWED_URL_PROTOCOLS)),
+        text)))).hexdigest()
+
 
 class Markdown(mistune.Markdown):
 
@@ -25,9 +48,59 @@ class Markdown(mistune.Markdown):
             parse_inline_html=False
         )
 
+    def reset(self):
+        """
+        Clear the state of the previous render,\
+        so the instance can be reused
+        """
+        self.block.reset()
+        self.inline.reset()
+        self.footnotes = []
+        self.tokens = []
+
+    def _is_clean(self):
+        return (
+            not self.block.polls['polls'] and
+            not self.block.polls['choices'] and
+            not self.inline._mention_candidates)
+
+    def _render_cached(self, text):
+        """
+        Return the HTML with the mentions\
+        unresolved, so they are rendered\
+        with the current usernames. It's\
+        cached along the mentions and polls
+        """
+        key = _get_cache_key(text, no_follow=self.renderer.options['no_follow'])
+        rendered = cache.get(key)
+
+        if rendered is not None:
+            self.inline._mention_candidates = rendered['mentions']
+            self.block.polls = rendered['polls']
+            return rendered['html']
+
+        html = super(Markdown, self).__call__(text)
+
+        # The closing date is relative to now
+        if not any(poll.get('close_at') for poll in self.block.polls['polls']):
+            cache.set(key, {
+                'html': html,
+                'mentions': self.inline._mention_candidates,
+                'polls': self.block.polls})
+
+        return html
+
     # Override
     def __call__(self, text):
-        return super(Markdown, self).__call__(text).strip()
+        # A previous render may leave polls and
+        # mentions behind, the output would not match
+        # the cached one, so only clean renders are cached
+        if self._is_clean():
+            text = self._render_cached(text)
+        else:
+            text = super(Markdown, self).__call__(text)
+
+        return self.inline.render_mentions(text).strip()
 
     def render(self, text):
         return self(text)
@@ -72,3 +145,32 @@ class Markdown(mistune.Markdown):
             return self.renderer.poll_raw(poll_txt=self.token['raw'])
         else:
             return self.renderer.poll(name=name)
+
+
+_local = threading.local()
+
+
+def get_markdown(no_follow=True):
+    """
+    Return a Markdown instance owned by the\
+    current thread. Building the renderer\
+    and the lexers is costly, so they are\
+    reused. It must be rendered once, the\
+    mentions and polls are valid until the\
+    next call to this function in the same thread
+
+    :param no_follow: Add rel="nofollow" to links
+    :return: :py:class:`Markdown` instance
+    """
+    try:
+        instances = _local.instances
+    except AttributeError:
+        instances = _local.instances = {}
+
+    try:
+        markdown = instances[no_follow]
+    except KeyError:
+        markdown = instances[no_follow] = Markdown(no_follow=no_follow)
+
+    markdown.reset()
+    return markdown
@@ -0,0 +1,1628 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+
+# Code points (hex, dash separated) of each emoji,
+# the first name listed in the stylesheet wins
+emojis_unicode = {
+    '1f44d': '+1',
+    '1f44d-1f3fb': '+1_tone1',
+    '1f44d-1f3fc': '+1_tone2',
+    '1f44d-1f3fd': '+1_tone3',
+    '1f44d-1f3fe': '+1_tone4',
+    '1f44d-1f3ff': '+1_tone5',
+    '1f44e': '-1',
+    '1f44e-1f3fb': '-1_tone1',
+    '1f44e-1f3fc': '-1_tone2',
+    '1f44e-1f3fd': '-1_tone3',
+    '1f44e-1f3fe': '-1_tone4',
+    '1f44e-1f3ff': '-1_tone5',
+    '1f4af': '100',
+    '1f522': '1234',
+    '1f3b1': '8ball',
+    '1f170': 'a',
+    '1f18e': 'ab',
+    '1f524': 'abc',
+    '1f521': 'abcd',
+    '1f1e6-1f1e8': 'ac',
+    '1f251': 'accept',
+    '1f1e6-1f1e9': 'ad',
+    '1f39f': 'admission_tickets',
+    '1f1e6-1f1ea': 'ae',
+    '1f6a1': 'aerial_tramway',
+    '1f1e6-1f1eb': 'af',
+    '1f1e6-1f1ec': 'ag',
+    '1f1e6-1f1ee': 'ai',
+    '2708': 'airplane',
+    '1f6ec': 'airplane_arriving',
+    '1f6eb': 'airplane_departure',
+    '1f6e9': 'airplane_small',
+    '1f1e6-1f1f1': 'al',
+    '23f0': 'alarm_clock',
+    '2697': 'alembic',
+    '1f47d': 'alien',
+    '1f1e6-1f1f2': 'am',
+    '1f691': 'ambulance',
+    '1f3fa': 'amphora',
+    '2693': 'anchor',
+    '1f47c': 'angel',
+    '1f47c-1f3fb': 'angel_tone1',
+    '1f47c-1f3fc': 'angel_tone2',
+    '1f47c-1f3fd': 'angel_tone3',
+    '1f47c-1f3fe': 'angel_tone4',
+    '1f47c-1f3ff': 'angel_tone5',
+    '1f4a2': 'anger',
+    '1f5ef': 'anger_right',
+    '1f620': 'angry',
+    '1f627': 'anguished',
+    '1f41c': 'ant',
+    '1f1e6-1f1f4': 'ao',
+    '1f34e': 'apple',
+    '1f1e6-1f1f6': 'aq',
+    '2652': 'aquarius',
+    '1f1e6-1f1f7': 'ar',
+    '1f3f9': 'archery',
+    '2648': 'aries',
+    '25c0': 'arrow_backward',
+    '23ec': 'arrow_double_down',
+    '23eb': 'arrow_double_up',
+    '2b07': 'arrow_down',
+    '1f53d': 'arrow_down_small',
+    '25b6': 'arrow_forward',
+    '2935': 'arrow_heading_down',
+    '2934': 'arrow_heading_up',
+    '2b05': 'arrow_left',
+    '2199': 'arrow_lower_left',
+    '2198': 'arrow_lower_right',
+    '27a1': 'arrow_right',
+    '21aa': 'arrow_right_hook',
+    '2b06': 'arrow_up',
+    '2195': 'arrow_up_down',
+    '1f53c': 'arrow_up_small',
+    '2196': 'arrow_upper_left',
+    '2197': 'arrow_upper_right',
+    '1f503': 'arrows_clockwise',
+    '1f504': 'arrows_counterclockwise',
+    '1f3a8': 'art',
+    '1f69b': 'articulated_lorry',
+    '1f1e6-1f1f8': 'as',
+    '002a-20e3': 'asterisk',
+    '1f632': 'astonished',
+    '1f1e6-1f1f9': 'at',
+    '1f45f': 'athletic_shoe',
+    '1f3e7': 'atm',
+    '269b': 'atom',
+    '1f1e6-1f1fa': 'au',
+    '1f1e6-1f1fc': 'aw',
+    '1f1e6-1f1fd': 'ax',
+    '1f1e6-1f1ff': 'az',
+    '1f171': 'b',
+    '1f1e7-1f1e6': 'ba',
+    '1f476': 'baby',
+    '1f37c': 'baby_bottle',
+    '1f424': 'baby_chick',
+    '1f6bc': 'baby_symbol',
+    '1f476-1f3fb': 'baby_tone1',
+    '1f476-1f3fc': 'baby_tone2',
+    '1f476-1f3fd': 'baby_tone3',
+    '1f476-1f3fe': 'baby_tone4',
+    '1f476-1f3ff': 'baby_tone5',
+    '1f519': 'back',
+    '1f3f8': 'badminton',
+    '1f6c4': 'baggage_claim',
+    '1f388': 'balloon',
+    '1f5f3': 'ballot_box',
+    '2611': 'ballot_box_with_check',
+    '1f38d': 'bamboo',
+    '1f34c': 'banana',
+    '203c': 'bangbang',
+    '1f3e6': 'bank',
+    '1f4ca': 'bar_chart',
+    '1f488': 'barber',
+    '26be': 'baseball',
+    '1f3c0': 'basketball',
+    '26f9': 'basketball_player',
+    '26f9-1f3fb': 'basketball_player_tone1',
+    '26f9-1f3fc': 'basketball_player_tone2',
+    '26f9-1f3fd': 'basketball_player_tone3',
+    '26f9-1f3fe': 'basketball_player_tone4',
+    '26f9-1f3ff': 'basketball_player_tone5',
+    '1f6c0': 'bath',
+    '1f6c0-1f3fb': 'bath_tone1',
+    '1f6c0-1f3fc': 'bath_tone2',
+    '1f6c0-1f3fd': 'bath_tone3',
+    '1f6c0-1f3fe': 'bath_tone4',
+    '1f6c0-1f3ff': 'bath_tone5',
+    '1f6c1': 'bathtub',
+    '1f50b': 'battery',
+    '1f1e7-1f1e7': 'bb',
+    '1f1e7-1f1e9': 'bd',
+    '1f1e7-1f1ea': 'be',
+    '1f3d6': 'beach',
+    '26f1': 'beach_umbrella',
+    '1f43b': 'bear',
+    '1f6cf': 'bed',
+    '1f41d': 'bee',
+    '1f37a': 'beer',
+    '1f37b': 'beers',
+    '1f41e': 'beetle',
+    '1f530': 'beginner',
+    '1f514': 'bell',
+    '1f6ce': 'bellhop',
+    '1f371': 'bento',
+    '1f1e7-1f1eb': 'bf',
+    '1f1e7-1f1ec': 'bg',
+    '1f1e7-1f1ed': 'bh',
+    '1f1e7-1f1ee': 'bi',
+    '1f6b4': 'bicyclist',
+    '1f6b4-1f3fb': 'bicyclist_tone1',
+    '1f6b4-1f3fc': 'bicyclist_tone2',
+    '1f6b4-1f3fd': 'bicyclist_tone3',
+    '1f6b4-1f3fe': 'bicyclist_tone4',
+    '1f6b4-1f3ff': 'bicyclist_tone5',
+    '1f6b2': 'bike',
+    '1f459': 'bikini',
+    '2623': 'biohazard',
+    '1f426': 'bird',
+    '1f382': 'birthday',
+    '1f1e7-1f1ef': 'bj',
+    '1f1e7-1f1f1': 'bl',
+    '26ab': 'black_circle',
+    '1f0cf': 'black_joker',
+    '2b1b': 'black_large_square',
+    '25fe': 'black_medium_small_square',
+    '25fc': 'black_medium_square',
+    '2712': 'black_nib',
+    '25aa': 'black_small_square',
+    '1f532': 'black_square_button',
+    '1f33c': 'blossom',
+    '1f421': 'blowfish',
+    '1f4d8': 'blue_book',
+    '1f699': 'blue_car',
+    '1f499': 'blue_heart',
+    '1f60a': 'blush',
+    '1f1e7-1f1f2': 'bm',
+    '1f1e7-1f1f3': 'bn',
+    '1f1e7-1f1f4': 'bo',
+    '1f417': 'boar',
+    '1f4a3': 'bomb',
+    '1f4d6': 'book',
+    '1f516': 'bookmark',
+    '1f4d1': 'bookmark_tabs',
+    '1f4da': 'books',
+    '1f4a5': 'boom',
+    '1f462': 'boot',
+    '1f37e': 'bottle_with_popping_cork',
+    '1f490': 'bouquet',
+    '1f647': 'bow',
+    '1f647-1f3fb': 'bow_tone1',
+    '1f647-1f3fc': 'bow_tone2',
+    '1f647-1f3fd': 'bow_tone3',
+    '1f647-1f3fe': 'bow_tone4',
+    '1f647-1f3ff': 'bow_tone5',
+    '1f3b3': 'bowling',
+    '1f466': 'boy',
+    '1f466-1f3fb': 'boy_tone1',
+    '1f466-1f3fc': 'boy_tone2',
+    '1f466-1f3fd': 'boy_tone3',
+    '1f466-1f3fe': 'boy_tone4',
+    '1f466-1f3ff': 'boy_tone5',
+    '1f1e7-1f1f6': 'bq',
+    '1f1e7-1f1f7': 'br',
+    '1f35e': 'bread',
+    '1f470': 'bride_with_veil',
+    '1f470-1f3fb': 'bride_with_veil_tone1',
+    '1f470-1f3fc': 'bride_with_veil_tone2',
+    '1f470-1f3fd': 'bride_with_veil_tone3',
+    '1f470-1f3fe': 'bride_with_veil_tone4',
+    '1f470-1f3ff': 'bride_with_veil_tone5',
+    '1f309': 'bridge_at_night',
+    '1f4bc': 'briefcase',
+    '1f494': 'broken_heart',
+    '1f1e7-1f1f8': 'bs',
+    '1f1e7-1f1f9': 'bt',
+    '1f41b': 'bug',
+    '1f3d7': 'building_construction',
+    '1f4a1': 'bulb',
+    '1f685': 'bullettrain_front',
+    '1f684': 'bullettrain_side',
+    '1f32f': 'burrito',
+    '1f68c': 'bus',
+    '1f68f': 'busstop',
+    '1f464': 'bust_in_silhouette',
+    '1f465': 'busts_in_silhouette',
+    '1f1e7-1f1fb': 'bv',
+    '1f1e7-1f1fc': 'bw',
+    '1f1e7-1f1fe': 'by',
+    '1f1e7-1f1ff': 'bz',
+    '1f1e8-1f1e6': 'ca',
+    '1f335': 'cactus',
+    '1f370': 'cake',
+    '1f4c6': 'calendar',
+    '1f5d3': 'calendar_spiral',
+    '1f4f2': 'calling',
+    '1f42b': 'camel',
+    '1f4f7': 'camera',
+    '1f4f8': 'camera_with_flash',
+    '1f3d5': 'camping',
+    '264b': 'cancer',
+    '1f56f': 'candle',
+    '1f36c': 'candy',
+    '1f520': 'capital_abcd',
+    '2651': 'capricorn',
+    '1f5c3': 'card_box',
+    '1f4c7': 'card_index',
+    '1f5c2': 'card_index_dividers',
+    '1f3a0': 'carousel_horse',
+    '1f431': 'cat',
+    '1f408': 'cat2',
+    '1f1e8-1f1e8': 'cc',
+    '1f4bf': 'cd',
+    '1f1e8-1f1eb': 'cf',
+    '1f1e8-1f1ec': 'cg',
+    '1f1e8-1f1ed': 'ch',
+    '26d3': 'chains',
+    '1f4b9': 'chart',
+    '1f4c9': 'chart_with_downwards_trend',
+    '1f4c8': 'chart_with_upwards_trend',
+    '1f3c1': 'checkered_flag',
+    '1f9c0': 'cheese',
+    '1f352': 'cherries',
+    '1f338': 'cherry_blossom',
+    '1f330': 'chestnut',
+    '1f414': 'chicken',
+    '1f6b8': 'children_crossing',
+    '1f1e8-1f1f1': 'chile',
+    '1f43f': 'chipmunk',
+    '1f36b': 'chocolate_bar',
+    '1f384': 'christmas_tree',
+    '26ea': 'church',
+    '1f1e8-1f1ee': 'ci',
+    '1f3a6': 'cinema',
+    '1f3aa': 'circus_tent',
+    '1f306': 'city_dusk',
+    '1f307': 'city_sunrise',
+    '1f3d9': 'cityscape',
+    '1f1e8-1f1f0': 'ck',
+    '1f191': 'cl',
+    '1f44f': 'clap',
+    '1f44f-1f3fb': 'clap_tone1',
+    '1f44f-1f3fc': 'clap_tone2',
+    '1f44f-1f3fd': 'clap_tone3',
+    '1f44f-1f3fe': 'clap_tone4',
+    '1f44f-1f3ff': 'clap_tone5',
+    '1f3ac': 'clapper',
+    '1f3db': 'classical_building',
+    '1f4cb': 'clipboard',
+    '1f570': 'clock',
+    '1f550': 'clock1',
+    '1f559': 'clock10',
+    '1f565': 'clock1030',
+    '1f55a': 'clock11',
+    '1f566': 'clock1130',
+    '1f55b': 'clock12',
+    '1f567': 'clock1230',
+    '1f55c': 'clock130',
+    '1f551': 'clock2',
+    '1f55d': 'clock230',
+    '1f552': 'clock3',
+    '1f55e': 'clock330',
+    '1f553': 'clock4',
+    '1f55f': 'clock430',
+    '1f554': 'clock5',
+    '1f560': 'clock530',
+    '1f555': 'clock6',
+    '1f561': 'clock630',
+    '1f556': 'clock7',
+    '1f562': 'clock730',
+    '1f557': 'clock8',
+    '1f563': 'clock830',
+    '1f558': 'clock9',
+    '1f564': 'clock930',
+    '1f4d5': 'closed_book',
+    '1f510': 'closed_lock_with_key',
+    '1f302': 'closed_umbrella',
+    '2601': 'cloud',
+    '1f329': 'cloud_lightning',
+    '1f327': 'cloud_rain',
+    '1f328': 'cloud_snow',
+    '1f32a': 'cloud_tornado',
+    '2663': 'clubs',
+    '1f1e8-1f1f2': 'cm',
+    '1f1e8-1f1f3': 'cn',
+    '1f1e8-1f1f4': 'co',
+    '1f378': 'cocktail',
+    '2615': 'coffee',
+    '26b0': 'coffin',
+    '1f630': 'cold_sweat',
+    '2604': 'comet',
+    '1f5dc': 'compression',
+    '1f4bb': 'computer',
+    '1f38a': 'confetti_ball',
+    '1f616': 'confounded',
+    '1f615': 'confused',
+    '1f1e8-1f1e9': 'congo',
+    '3297': 'congratulations',
+    '1f6a7': 'construction',
+    '1f477': 'construction_worker',
+    '1f477-1f3fb': 'construction_worker_tone1',
+    '1f477-1f3fc': 'construction_worker_tone2',
+    '1f477-1f3fd': 'construction_worker_tone3',
+    '1f477-1f3fe': 'construction_worker_tone4',
+    '1f477-1f3ff': 'construction_worker_tone5',
+    '1f39b': 'control_knobs',
+    '1f3ea': 'convenience_store',
+    '1f36a': 'cookie',
+    '1f192': 'cool',
+    '1f46e': 'cop',
+    '1f46e-1f3fb': 'cop_tone1',
+    '1f46e-1f3fc': 'cop_tone2',
+    '1f46e-1f3fd': 'cop_tone3',
+    '1f46e-1f3fe': 'cop_tone4',
+    '1f46e-1f3ff': 'cop_tone5',
+    '00a9': 'copyright',
+    '1f33d': 'corn',
+    '1f6cb': 'couch',
+    '1f46b': 'couple',
+    '1f468-2764-1f468': 'couple_mm',
+    '1f491': 'couple_with_heart',
+    '1f469-2764-1f469': 'couple_with_heart_ww',
+    '1f48f': 'couplekiss',
+    '1f468-2764-1f48b-1f468': 'couplekiss_mm',
+    '1f469-2764-1f48b-1f469': 'couplekiss_ww',
+    '1f42e': 'cow',
+    '1f404': 'cow2',
+    '1f1e8-1f1f5': 'cp',
+    '1f1e8-1f1f7': 'cr',
+    '1f980': 'crab',
+    '1f58d': 'crayon',
+    '1f4b3': 'credit_card',
+    '1f319': 'crescent_moon',
+    '1f3cf': 'cricket',
+    '1f40a': 'crocodile',
+    '271d': 'cross',
+    '1f38c': 'crossed_flags',
+    '2694': 'crossed_swords',
+    '1f451': 'crown',
+    '1f6f3': 'cruise_ship',
+    '1f622': 'cry',
+    '1f63f': 'crying_cat_face',
+    '1f52e': 'crystal_ball',
+    '1f1e8-1f1fa': 'cu',
+    '1f498': 'cupid',
+    '27b0': 'curly_loop',
+    '1f4b1': 'currency_exchange',
+    '1f35b': 'curry',
+    '1f36e': 'custard',
+    '1f6c3': 'customs',
+    '1f1e8-1f1fb': 'cv',
+    '1f1e8-1f1fc': 'cw',
+    '1f1e8-1f1fd': 'cx',
+    '1f1e8-1f1fe': 'cy',
+    '1f300': 'cyclone',
+    '1f1e8-1f1ff': 'cz',
+    '1f5e1': 'dagger',
+    '1f483': 'dancer',
+    '1f483-1f3fb': 'dancer_tone1',
+    '1f483-1f3fc': 'dancer_tone2',
+    '1f483-1f3fd': 'dancer_tone3',
+    '1f483-1f3fe': 'dancer_tone4',
+    '1f483-1f3ff': 'dancer_tone5',
+    '1f46f': 'dancers',
+    '1f361': 'dango',
+    '1f576': 'dark_sunglasses',
+    '1f3af': 'dart',
+    '1f4a8': 'dash',
+    '1f4c5': 'date',
+    '1f1e9-1f1ea': 'de',
+    '1f333': 'deciduous_tree',
+    '1f3ec': 'department_store',
+    '1f3da': 'derelict_house_building',
+    '1f3dc': 'desert',
+    '1f3dd': 'desert_island',
+    '1f5a5': 'desktop',
+    '1f1e9-1f1ec': 'dg',
+    '1f4a0': 'diamond_shape_with_a_dot_inside',
+    '2666': 'diamonds',
+    '1f61e': 'disappointed',
+    '1f625': 'disappointed_relieved',
+    '1f4ab': 'dizzy',
+    '1f635': 'dizzy_face',
+    '1f1e9-1f1ef': 'dj',
+    '1f1e9-1f1f0': 'dk',
+    '1f1e9-1f1f2': 'dm',
+    '1f1e9-1f1f4': 'do',
+    '1f6af': 'do_not_litter',
+    '1f436': 'dog',
+    '1f415': 'dog2',
+    '1f4b5': 'dollar',
+    '1f38e': 'dolls',
+    '1f42c': 'dolphin',
+    '1f6aa': 'door',
+    '23f8': 'double_vertical_bar',
+    '1f369': 'doughnut',
+    '1f54a': 'dove',
+    '1f409': 'dragon',
+    '1f432': 'dragon_face',
+    '1f457': 'dress',
+    '1f42a': 'dromedary_camel',
+    '1f4a7': 'droplet',
+    '1f4c0': 'dvd',
+    '1f1e9-1f1ff': 'dz',
+    '1f4e7': 'e-mail',
+    '1f1ea-1f1e6': 'ea',
+    '1f442': 'ear',
+    '1f33e': 'ear_of_rice',
+    '1f442-1f3fb': 'ear_tone1',
+    '1f442-1f3fc': 'ear_tone2',
+    '1f442-1f3fd': 'ear_tone3',
+    '1f442-1f3fe': 'ear_tone4',
+    '1f442-1f3ff': 'ear_tone5',
+    '1f30d': 'earth_africa',
+    '1f30e': 'earth_americas',
+    '1f30f': 'earth_asia',
+    '1f1ea-1f1e8': 'ec',
+    '1f1ea-1f1ea': 'ee',
+    '1f1ea-1f1ec': 'eg',
+    '1f373': 'egg',
+    '1f346': 'eggplant',
+    '1f1ea-1f1ed': 'eh',
+    '0038-20e3': 'eight',
+    '2734': 'eight_pointed_black_star',
+    '2733': 'eight_spoked_asterisk',
+    '1f50c': 'electric_plug',
+    '1f418': 'elephant',
+    '1f51a': 'end',
+    '2709': 'envelope',
+    '1f4e9': 'envelope_with_arrow',
+    '1f1ea-1f1f7': 'er',
+    '1f1ea-1f1f8': 'es',
+    '1f1ea-1f1f9': 'et',
+    '1f1ea-1f1fa': 'eu',
+    '1f4b6': 'euro',
+    '1f3f0': 'european_castle',
+    '1f3e4': 'european_post_office',
+    '1f332': 'evergreen_tree',
+    '2757': 'exclamation',
+    '1f611': 'expressionless',
+    '1f441': 'eye',
+    '1f441-1f5e8': 'eye_in_speech_bubble',
+    '1f453': 'eyeglasses',
+    '1f440': 'eyes',
+    '1f915': 'face_with_head_bandage',
+    '1f644': 'face_with_rolling_eyes',
+    '1f912': 'face_with_thermometer',
+    '1f3ed': 'factory',
+    '1f342': 'fallen_leaf',
+    '1f46a': 'family',
+    '1f468-1f468-1f466': 'family_mmb',
+    '1f468-1f468-1f466-1f466': 'family_mmbb',
+    '1f468-1f468-1f467': 'family_mmg',
+    '1f468-1f468-1f467-1f466': 'family_mmgb',
+    '1f468-1f468-1f467-1f467': 'family_mmgg',
+    '1f468-1f469-1f466-1f466': 'family_mwbb',
+    '1f468-1f469-1f467': 'family_mwg',
+    '1f468-1f469-1f467-1f466': 'family_mwgb',
+    '1f468-1f469-1f467-1f467': 'family_mwgg',
+    '1f469-1f469-1f466': 'family_wwb',
+    '1f469-1f469-1f466-1f466': 'family_wwbb',
+    '1f469-1f469-1f467': 'family_wwg',
+    '1f469-1f469-1f467-1f466': 'family_wwgb',
+    '1f469-1f469-1f467-1f467': 'family_wwgg',
+    '23e9': 'fast_forward',
+    '1f4e0': 'fax',
+    '1f628': 'fearful',
+    '1f43e': 'feet',
+    '1f3a1': 'ferris_wheel',
+    '26f4': 'ferry',
+    '1f1eb-1f1ee': 'fi',
+    '1f3d1': 'field_hockey',
+    '1f5c4': 'file_cabinet',
+    '1f4c1': 'file_folder',
+    '1f39e': 'film_frames',
+    '1f4fd': 'film_projector',
+    '1f525': 'fire',
+    '1f692': 'fire_engine',
+    '1f386': 'fireworks',
+    '1f313': 'first_quarter_moon',
+    '1f31b': 'first_quarter_moon_with_face',
+    '1f41f': 'fish',
+    '1f365': 'fish_cake',
+    '1f3a3': 'fishing_pole_and_fish',
+    '270a': 'fist',
+    '270a-1f3fb': 'fist_tone1',
+    '270a-1f3fc': 'fist_tone2',
+    '270a-1f3fd': 'fist_tone3',
+    '270a-1f3fe': 'fist_tone4',
+    '270a-1f3ff': 'fist_tone5',
+    '0035-20e3': 'five',
+    '1f1eb-1f1ef': 'fj',
+    '1f1eb-1f1f0': 'fk',
+    '1f3f4': 'flag_black',
+    '1f1eb-1f1f2': 'flag_fm',
+    '1f1eb-1f1f4': 'flag_fo',
+    '1f1eb-1f1f7': 'flag_fr',
+    '1f1ec-1f1e6': 'flag_ga',
+    '1f1ec-1f1e7': 'flag_gb',
+    '1f1ec-1f1e9': 'flag_gd',
+    '1f1ec-1f1ea': 'flag_ge',
+    '1f1ec-1f1eb': 'flag_gf',
+    '1f1ec-1f1ec': 'flag_gg',
+    '1f1ec-1f1ed': 'flag_gh',
+    '1f1ec-1f1ee': 'flag_gi',
+    '1f1ec-1f1f1': 'flag_gl',
+    '1f1ec-1f1f2': 'flag_gm',
+    '1f1ec-1f1f3': 'flag_gn',
+    '1f1ec-1f1f5': 'flag_gp',
+    '1f1ec-1f1f6': 'flag_gq',
+    '1f1ec-1f1f7': 'flag_gr',
+    '1f1ec-1f1f8': 'flag_gs',
+    '1f1ec-1f1f9': 'flag_gt',
+    '1f1ec-1f1fa': 'flag_gu',
+    '1f1ec-1f1fc': 'flag_gw',
+    '1f1ec-1f1fe': 'flag_gy',
+    '1f1ed-1f1f0': 'flag_hk',
+    '1f1ed-1f1f2': 'flag_hm',
+    '1f1ed-1f1f3': 'flag_hn',
+    '1f1ed-1f1f7': 'flag_hr',
+    '1f1ed-1f1f9': 'flag_ht',
+    '1f1ed-1f1fa': 'flag_hu',
+    '1f1ee-1f1e8': 'flag_ic',
+    '1f1ee-1f1e9': 'flag_id',
+    '1f1ee-1f1ea': 'flag_ie',
+    '1f1ee-1f1f1': 'flag_il',
+    '1f1ee-1f1f2': 'flag_im',
+    '1f1ee-1f1f3': 'flag_in',
+    '1f1ee-1f1f4': 'flag_io',
+    '1f1ee-1f1f6': 'flag_iq',
+    '1f1ee-1f1f7': 'flag_ir',
+    '1f1ee-1f1f8': 'flag_is',
+    '1f1ee-1f1f9': 'flag_it',
+    '1f1ef-1f1ea': 'flag_je',
+    '1f1ef-1f1f2': 'flag_jm',
+    '1f1ef-1f1f4': 'flag_jo',
+    '1f1ef-1f1f5': 'flag_jp',
+    '1f1f0-1f1ea': 'flag_ke',
+    '1f1f0-1f1ec': 'flag_kg',
+    '1f1f0-1f1ed': 'flag_kh',
+    '1f1f0-1f1ee': 'flag_ki',
+    '1f1f0-1f1f2': 'flag_km',
+    '1f1f0-1f1f3': 'flag_kn',
+    '1f1f0-1f1f5': 'flag_kp',
+    '1f1f0-1f1f7': 'flag_kr',
+    '1f1f0-1f1fc': 'flag_kw',
+    '1f1f0-1f1fe': 'flag_ky',
+    '1f1f0-1f1ff': 'flag_kz',
+    '1f1f1-1f1e6': 'flag_la',
+    '1f1f1-1f1e7': 'flag_lb',
+    '1f1f1-1f1e8': 'flag_lc',
+    '1f1f1-1f1ee': 'flag_li',
+    '1f1f1-1f1f0': 'flag_lk',
+    '1f1f1-1f1f7': 'flag_lr',
+    '1f1f1-1f1f8': 'flag_ls',
+    '1f1f1-1f1f9': 'flag_lt',
+    '1f1f1-1f1fa': 'flag_lu',
+    '1f1f1-1f1fb': 'flag_lv',
+    '1f1f1-1f1fe': 'flag_ly',
+    '1f1f2-1f1e6': 'flag_ma',
+    '1f1f2-1f1e8': 'flag_mc',
+    '1f1f2-1f1e9': 'flag_md',
+    '1f1f2-1f1ea': 'flag_me',
+    '1f1f2-1f1eb': 'flag_mf',
+    '1f1f2-1f1ec': 'flag_mg',
+    '1f1f2-1f1ed': 'flag_mh',
+    '1f1f2-1f1f0': 'flag_mk',
+    '1f1f2-1f1f1': 'flag_ml',
+    '1f1f2-1f1f2': 'flag_mm',
+    '1f1f2-1f1f3': 'flag_mn',
+    '1f1f2-1f1f4': 'flag_mo',
+    '1f1f2-1f1f5': 'flag_mp',
+    '1f1f2-1f1f6': 'flag_mq',
+    '1f1f2-1f1f7': 'flag_mr',
+    '1f1f2-1f1f8': 'flag_ms',
+    '1f1f2-1f1f9': 'flag_mt',
+    '1f1f2-1f1fa': 'flag_mu',
+    '1f1f2-1f1fb': 'flag_mv',
+    '1f1f2-1f1fc': 'flag_mw',
+    '1f1f2-1f1fd': 'flag_mx',
+    '1f1f2-1f1fe': 'flag_my',
+    '1f1f2-1f1ff': 'flag_mz',
+    '1f1f3-1f1e6': 'flag_na',
+    '1f1f3-1f1e8': 'flag_nc',
+    '1f1f3-1f1ea': 'flag_ne',
+    '1f1f3-1f1eb': 'flag_nf',
+    '1f1f3-1f1ec': 'flag_ng',
+    '1f1f3-1f1ee': 'flag_ni',
+    '1f1f3-1f1f1': 'flag_nl',
+    '1f1f3-1f1f4': 'flag_no',
+    '1f1f3-1f1f5': 'flag_np',
+    '1f1f3-1f1f7': 'flag_nr',
+    '1f1f3-1f1fa': 'flag_nu',
+    '1f1f3-1f1ff': 'flag_nz',
+    '1f1f4-1f1f2': 'flag_om',
+    '1f1f5-1f1e6': 'flag_pa',
+    '1f1f5-1f1ea': 'flag_pe',
+    '1f1f5-1f1eb': 'flag_pf',
+    '1f1f5-1f1ec': 'flag_pg',
+    '1f1f5-1f1ed': 'flag_ph',
+    '1f1f5-1f1f0': 'flag_pk',
+    '1f1f5-1f1f1': 'flag_pl',
+    '1f1f5-1f1f2': 'flag_pm',
+    '1f1f5-1f1f3': 'flag_pn',
+    '1f1f5-1f1f7': 'flag_pr',
+    '1f1f5-1f1f8': 'flag_ps',
+    '1f1f5-1f1f9': 'flag_pt',
+    '1f1f5-1f1fc': 'flag_pw',
+    '1f1f5-1f1fe': 'flag_py',
+    '1f1f6-1f1e6': 'flag_qa',
+    '1f1f7-1f1ea': 'flag_re',
+    '1f1f7-1f1f4': 'flag_ro',
+    '1f1f7-1f1f8': 'flag_rs',
+    '1f1f7-1f1fa': 'flag_ru',
+    '1f1f7-1f1fc': 'flag_rw',
+    '1f1f8-1f1e6': 'flag_sa',
+    '1f1f8-1f1e7': 'flag_sb',
+    '1f1f8-1f1e8': 'flag_sc',
+    '1f1f8-1f1e9': 'flag_sd',
+    '1f1f8-1f1ea': 'flag_se',
+    '1f1f8-1f1ec': 'flag_sg',
+    '1f1f8-1f1ed': 'flag_sh',
+    '1f1f8-1f1ee': 'flag_si',
+    '1f1f8-1f1ef': 'flag_sj',
+    '1f1f8-1f1f0': 'flag_sk',
+    '1f1f8-1f1f1': 'flag_sl',
+    '1f1f8-1f1f2': 'flag_sm',
+    '1f1f8-1f1f3': 'flag_sn',
+    '1f1f8-1f1f4': 'flag_so',
+    '1f1f8-1f1f7': 'flag_sr',
+    '1f1f8-1f1f8': 'flag_ss',
+    '1f1f8-1f1f9': 'flag_st',
+    '1f1f8-1f1fb': 'flag_sv',
+    '1f1f8-1f1fd': 'flag_sx',
+    '1f1f8-1f1fe': 'flag_sy',
+    '1f1f8-1f1ff': 'flag_sz',
+    '1f1f9-1f1e6': 'flag_ta',
+    '1f1f9-1f1e8': 'flag_tc',
+    '1f1f9-1f1e9': 'flag_td',
+    '1f1f9-1f1eb': 'flag_tf',
+    '1f1f9-1f1ec': 'flag_tg',
+    '1f1f9-1f1ed': 'flag_th',
+    '1f1f9-1f1ef': 'flag_tj',
+    '1f1f9-1f1f0': 'flag_tk',
+    '1f1f9-1f1f1': 'flag_tl',
+    '1f1f9-1f1f2': 'flag_tm',
+    '1f1f9-1f1f3': 'flag_tn',
+    '1f1f9-1f1f4': 'flag_to',
+    '1f1f9-1f1f7': 'flag_tr',
+    '1f1f9-1f1f9': 'flag_tt',
+    '1f1f9-1f1fb': 'flag_tv',
+    '1f1f9-1f1fc': 'flag_tw',
+    '1f1f9-1f1ff': 'flag_tz',
+    '1f1fa-1f1e6': 'flag_ua',
+    '1f1fa-1f1ec': 'flag_ug',
+    '1f1fa-1f1f2': 'flag_um',
+    '1f1fa-1f1f8': 'flag_us',
+    '1f1fa-1f1fe': 'flag_uy',
+    '1f1fa-1f1ff': 'flag_uz',
+    '1f1fb-1f1e6': 'flag_va',
+    '1f1fb-1f1e8': 'flag_vc',
+    '1f1fb-1f1ea': 'flag_ve',
+    '1f1fb-1f1ec': 'flag_vg',
+    '1f1fb-1f1ee': 'flag_vi',
+    '1f1fb-1f1f3': 'flag_vn',
+    '1f1fb-1f1fa': 'flag_vu',
+    '1f1fc-1f1eb': 'flag_wf',
+    '1f3f3': 'flag_white',
+    '1f1fc-1f1f8': 'flag_ws',
+    '1f1fd-1f1f0': 'flag_xk',
+    '1f1fe-1f1ea': 'flag_ye',
+    '1f1fe-1f1f9': 'flag_yt',
+    '1f1ff-1f1e6': 'flag_za',
+    '1f1ff-1f1f2': 'flag_zm',
+    '1f1ff-1f1fc': 'flag_zw',
+    '1f38f': 'flags',
+    '1f526': 'flashlight',
+    '269c': 'fleur-de-lis',
+    '1f4be': 'floppy_disk',
+    '1f3b4': 'flower_playing_cards',
+    '1f633': 'flushed',
+    '1f32b': 'fog',
+    '1f301': 'foggy',
+    '1f3c8': 'football',
+    '1f463': 'footprints',
+    '1f374': 'fork_and_knife',
+    '1f37d': 'fork_and_knife_with_plate',
+    '26f2': 'fountain',
+    '0034-20e3': 'four',
+    '1f340': 'four_leaf_clover',
+    '1f5bc': 'frame_photo',
+    '1f193': 'free',
+    '1f364': 'fried_shrimp',
+    '1f35f': 'fries',
+    '1f438': 'frog',
+    '1f626': 'frowning',
+    '2639': 'frowning2',
+    '26fd': 'fuelpump',
+    '1f315': 'full_moon',
+    '1f31d': 'full_moon_with_face',
+    '26b1': 'funeral_urn',
+    '1f3b2': 'game_die',
+    '2699': 'gear',
+    '1f48e': 'gem',
+    '264a': 'gemini',
+    '1f47b': 'ghost',
+    '1f381': 'gift',
+    '1f49d': 'gift_heart',
+    '1f467': 'girl',
+    '1f467-1f3fb': 'girl_tone1',
+    '1f467-1f3fc': 'girl_tone2',
+    '1f467-1f3fd': 'girl_tone3',
+    '1f467-1f3fe': 'girl_tone4',
+    '1f467-1f3ff': 'girl_tone5',
+    '1f310': 'globe_with_meridians',
+    '1f410': 'goat',
+    '26f3': 'golf',
+    '1f3cc': 'golfer',
+    '1f475': 'grandma',
+    '1f475-1f3fb': 'grandma_tone1',
+    '1f475-1f3fc': 'grandma_tone2',
+    '1f475-1f3fd': 'grandma_tone3',
+    '1f475-1f3fe': 'grandma_tone4',
+    '1f475-1f3ff': 'grandma_tone5',
+    '1f347': 'grapes',
+    '1f34f': 'green_apple',
+    '1f4d7': 'green_book',
+    '1f49a': 'green_heart',
+    '2755': 'grey_exclamation',
+    '2754': 'grey_question',
+    '1f62c': 'grimacing',
+    '1f601': 'grin',
+    '1f600': 'grinning',
+    '1f482': 'guardsman',
+    '1f482-1f3fb': 'guardsman_tone1',
+    '1f482-1f3fc': 'guardsman_tone2',
+    '1f482-1f3fd': 'guardsman_tone3',
+    '1f482-1f3fe': 'guardsman_tone4',
+    '1f482-1f3ff': 'guardsman_tone5',
+    '1f3b8': 'guitar',
+    '1f52b': 'gun',
+    '1f487': 'haircut',
+    '1f487-1f3fb': 'haircut_tone1',
+    '1f487-1f3fc': 'haircut_tone2',
+    '1f487-1f3fd': 'haircut_tone3',
+    '1f487-1f3fe': 'haircut_tone4',
+    '1f487-1f3ff': 'haircut_tone5',
+    '1f354': 'hamburger',
+    '1f528': 'hammer',
+    '2692': 'hammer_and_pick',
+    '1f6e0': 'hammer_and_wrench',
+    '1f439': 'hamster',
+    '1f590': 'hand_splayed',
+    '1f590-1f3fb': 'hand_splayed_tone1',
+    '1f590-1f3fc': 'hand_splayed_tone2',
+    '1f590-1f3fd': 'hand_splayed_tone3',
+    '1f590-1f3fe': 'hand_splayed_tone4',
+    '1f590-1f3ff': 'hand_splayed_tone5',
+    '1f45c': 'handbag',
+    '1f4a9': 'hankey',
+    '0023-20e3': 'hash',
+    '1f425': 'hatched_chick',
+    '1f423': 'hatching_chick',
+    '1f3a7': 'headphones',
+    '1f649': 'hear_no_evil',
+    '2764': 'heart',
+    '1f49f': 'heart_decoration',
+    '2763': 'heart_exclamation',
+    '1f60d': 'heart_eyes',
+    '1f63b': 'heart_eyes_cat',
+    '1f493': 'heartbeat',
+    '1f497': 'heartpulse',
+    '2665': 'hearts',
+    '2714': 'heavy_check_mark',
+    '2797': 'heavy_division_sign',
+    '1f4b2': 'heavy_dollar_sign',
+    '2796': 'heavy_minus_sign',
+    '2716': 'heavy_multiplication_x',
+    '2795': 'heavy_plus_sign',
+    '1f681': 'helicopter',
+    '26d1': 'helmet_with_cross',
+    '1f33f': 'herb',
+    '1f33a': 'hibiscus',
+    '1f506': 'high_brightness',
+    '1f460': 'high_heel',
+    '1f3d2': 'hockey',
+    '1f573': 'hole',
+    '1f3d8': 'homes',
+    '1f36f': 'honey_pot',
+    '1f434': 'horse',
+    '1f3c7': 'horse_racing',
+    '1f3c7-1f3fb': 'horse_racing_tone1',
+    '1f3c7-1f3fc': 'horse_racing_tone2',
+    '1f3c7-1f3fd': 'horse_racing_tone3',
+    '1f3c7-1f3fe': 'horse_racing_tone4',
+    '1f3c7-1f3ff': 'horse_racing_tone5',
+    '1f3e5': 'hospital',
+    '1f32d': 'hot_dog',
+    '1f336': 'hot_pepper',
+    '1f3e8': 'hotel',
+    '2668': 'hotsprings',
+    '231b': 'hourglass',
+    '23f3': 'hourglass_flowing_sand',
+    '1f3e0': 'house',
+    '1f3e1': 'house_with_garden',
+    '1f917': 'hugging',
+    '1f62f': 'hushed',
+    '1f368': 'ice_cream',
+    '26f8': 'ice_skate',
+    '1f366': 'icecream',
+    '1f194': 'id',
+    '1f250': 'ideograph_advantage',
+    '1f47f': 'imp',
+    '1f4e5': 'inbox_tray',
+    '1f4e8': 'incoming_envelope',
+    '1f481': 'information_desk_person',
+    '1f481-1f3fb': 'information_desk_person_tone1',
+    '1f481-1f3fc': 'information_desk_person_tone2',
+    '1f481-1f3fd': 'information_desk_person_tone3',
+    '1f481-1f3fe': 'information_desk_person_tone4',
+    '1f481-1f3ff': 'information_desk_person_tone5',
+    '2139': 'information_source',
+    '1f607': 'innocent',
+    '2049': 'interrobang',
+    '1f4f1': 'iphone',
+    '1f3ee': 'izakaya_lantern',
+    '1f383': 'jack_o_lantern',
+    '1f5fe': 'japan',
+    '1f3ef': 'japanese_castle',
+    '1f47a': 'japanese_goblin',
+    '1f479': 'japanese_ogre',
+    '1f456': 'jeans',
+    '1f602': 'joy',
+    '1f639': 'joy_cat',
+    '1f579': 'joystick',
+    '1f54b': 'kaaba',
+    '1f511': 'key',
+    '1f5dd': 'key2',
+    '2328': 'keyboard',
+    '1f458': 'kimono',
+    '1f48b': 'kiss',
+    '1f617': 'kissing',
+    '1f63d': 'kissing_cat',
+    '1f61a': 'kissing_closed_eyes',
+    '1f618': 'kissing_heart',
+    '1f619': 'kissing_smiling_eyes',
+    '1f52a': 'knife',
+    '1f428': 'koala',
+    '1f201': 'koko',
+    '1f3f7': 'label',
+    '1f535': 'large_blue_circle',
+    '1f537': 'large_blue_diamond',
+    '1f536': 'large_orange_diamond',
+    '1f317': 'last_quarter_moon',
+    '1f31c': 'last_quarter_moon_with_face',
+    '1f606': 'laughing',
+    '1f343': 'leaves',
+    '1f4d2': 'ledger',
+    '1f6c5': 'left_luggage',
+    '2194': 'left_right_arrow',
+    '21a9': 'leftwards_arrow_with_hook',
+    '1f34b': 'lemon',
+    '264c': 'leo',
+    '1f406': 'leopard',
+    '1f39a': 'level_slider',
+    '1f574': 'levitate',
+    '264e': 'libra',
+    '1f3cb': 'lifter',
+    '1f3cb-1f3fb': 'lifter_tone1',
+    '1f3cb-1f3fc': 'lifter_tone2',
+    '1f3cb-1f3fd': 'lifter_tone3',
+    '1f3cb-1f3fe': 'lifter_tone4',
+    '1f3cb-1f3ff': 'lifter_tone5',
+    '1f688': 'light_rail',
+    '1f517': 'link',
+    '1f587': 'linked_paperclips',
+    '1f981': 'lion',
+    '1f444': 'lips',
+    '1f484': 'lipstick',
+    '1f512': 'lock',
+    '1f50f': 'lock_with_ink_pen',
+    '1f36d': 'lollipop',
+    '27bf': 'loop',
+    '1f50a': 'loud_sound',
+    '1f4e2': 'loudspeaker',
+    '1f3e9': 'love_hotel',
+    '1f48c': 'love_letter',
+    '1f505': 'low_brightness',
+    '1f58a': 'lower_left_ballpoint_pen',
+    '1f58b': 'lower_left_fountain_pen',
+    '1f58c': 'lower_left_paintbrush',
+    '24c2': 'm',
+    '1f50d': 'mag',
+    '1f50e': 'mag_right',
+    '1f004': 'mahjong',
+    '1f4eb': 'mailbox',
+    '1f4ea': 'mailbox_closed',
+    '1f4ec': 'mailbox_with_mail',
+    '1f4ed': 'mailbox_with_no_mail',
+    '1f468': 'man',
+    '1f468-1f3fb': 'man_tone1',
+    '1f468-1f3fc': 'man_tone2',
+    '1f468-1f3fd': 'man_tone3',
+    '1f468-1f3fe': 'man_tone4',
+    '1f468-1f3ff': 'man_tone5',
+    '1f472': 'man_with_gua_pi_mao',
+    '1f472-1f3fb': 'man_with_gua_pi_mao_tone1',
+    '1f472-1f3fc': 'man_with_gua_pi_mao_tone2',
+    '1f472-1f3fd': 'man_with_gua_pi_mao_tone3',
+    '1f472-1f3fe': 'man_with_gua_pi_mao_tone4',
+    '1f472-1f3ff': 'man_with_gua_pi_mao_tone5',
+    '1f473': 'man_with_turban',
+    '1f473-1f3fb': 'man_with_turban_tone1',
+    '1f473-1f3fc': 'man_with_turban_tone2',
+    '1f473-1f3fd': 'man_with_turban_tone3',
+    '1f473-1f3fe': 'man_with_turban_tone4',
+    '1f473-1f3ff': 'man_with_turban_tone5',
+    '1f45e': 'mans_shoe',
+    '1f5fa': 'map',
+    '1f341': 'maple_leaf',
+    '1f637': 'mask',
+    '1f486': 'massage',
+    '1f486-1f3fb': 'massage_tone1',
+    '1f486-1f3fc': 'massage_tone2',
+    '1f486-1f3fd': 'massage_tone3',
+    '1f486-1f3fe': 'massage_tone4',
+    '1f486-1f3ff': 'massage_tone5',
+    '1f356': 'meat_on_bone',
+    '1f3c5': 'medal',
+    '1f4e3': 'mega',
+    '1f348': 'melon',
+    '1f54e': 'menorah',
+    '1f6b9': 'mens',
+    '1f918': 'metal',
+    '1f918-1f3fb': 'metal_tone1',
+    '1f918-1f3fc': 'metal_tone2',
+    '1f918-1f3fd': 'metal_tone3',
+    '1f918-1f3fe': 'metal_tone4',
+    '1f918-1f3ff': 'metal_tone5',
+    '1f687': 'metro',
+    '1f3a4': 'microphone',
+    '1f399': 'microphone2',
+    '1f52c': 'microscope',
+    '1f595': 'middle_finger',
+    '1f595-1f3fb': 'middle_finger_tone1',
+    '1f595-1f3fc': 'middle_finger_tone2',
+    '1f595-1f3fd': 'middle_finger_tone3',
+    '1f595-1f3fe': 'middle_finger_tone4',
+    '1f595-1f3ff': 'middle_finger_tone5',
+    '1f396': 'military_medal',
+    '1f30c': 'milky_way',
+    '1f690': 'minibus',
+    '1f4bd': 'minidisc',
+    '1f4f4': 'mobile_phone_off',
+    '1f911': 'money_mouth',
+    '1f4b8': 'money_with_wings',
+    '1f4b0': 'moneybag',
+    '1f412': 'monkey',
+    '1f435': 'monkey_face',
+    '1f69d': 'monorail',
+    '1f393': 'mortar_board',
+    '1f54c': 'mosque',
+    '1f6e5': 'motorboat',
+    '1f3cd': 'motorcycle',
+    '1f6e3': 'motorway',
+    '1f5fb': 'mount_fuji',
+    '26f0': 'mountain',
+    '1f6b5': 'mountain_bicyclist',
+    '1f6b5-1f3fb': 'mountain_bicyclist_tone1',
+    '1f6b5-1f3fc': 'mountain_bicyclist_tone2',
+    '1f6b5-1f3fd': 'mountain_bicyclist_tone3',
+    '1f6b5-1f3fe': 'mountain_bicyclist_tone4',
+    '1f6b5-1f3ff': 'mountain_bicyclist_tone5',
+    '1f6a0': 'mountain_cableway',
+    '1f69e': 'mountain_railway',
+    '1f3d4': 'mountain_snow',
+    '1f42d': 'mouse',
+    '1f401': 'mouse2',
+    '1f5b1': 'mouse_three_button',
+    '1f3a5': 'movie_camera',
+    '1f5ff': 'moyai',
+    '1f4aa': 'muscle',
+    '1f4aa-1f3fb': 'muscle_tone1',
+    '1f4aa-1f3fc': 'muscle_tone2',
+    '1f4aa-1f3fd': 'muscle_tone3',
+    '1f4aa-1f3fe': 'muscle_tone4',
+    '1f4aa-1f3ff': 'muscle_tone5',
+    '1f344': 'mushroom',
+    '1f3b9': 'musical_keyboard',
+    '1f3b5': 'musical_note',
+    '1f3bc': 'musical_score',
+    '1f507': 'mute',
+    '1f485': 'nail_care',
+    '1f485-1f3fb': 'nail_care_tone1',
+    '1f485-1f3fc': 'nail_care_tone2',
+    '1f485-1f3fd': 'nail_care_tone3',
+    '1f485-1f3fe': 'nail_care_tone4',
+    '1f485-1f3ff': 'nail_care_tone5',
+    '1f4db': 'name_badge',
+    '1f3de': 'national_park',
+    '1f454': 'necktie',
+    '274e': 'negative_squared_cross_mark',
+    '1f913': 'nerd',
+    '1f610': 'neutral_face',
+    '1f195': 'new',
+    '1f311': 'new_moon',
+    '1f31a': 'new_moon_with_face',
+    '1f4f0': 'newspaper',
+    '1f5de': 'newspaper2',
+    '23ed': 'next_track',
+    '1f196': 'ng',
+    '1f303': 'night_with_stars',
+    '0039-20e3': 'nine',
+    '1f515': 'no_bell',
+    '1f6b3': 'no_bicycles',
+    '26d4': 'no_entry',
+    '1f6ab': 'no_entry_sign',
+    '1f645': 'no_good',
+    '1f645-1f3fb': 'no_good_tone1',
+    '1f645-1f3fc': 'no_good_tone2',
+    '1f645-1f3fd': 'no_good_tone3',
+    '1f645-1f3fe': 'no_good_tone4',
+    '1f645-1f3ff': 'no_good_tone5',
+    '1f4f5': 'no_mobile_phones',
+    '1f636': 'no_mouth',
+    '1f6b7': 'no_pedestrians',
+    '1f6ad': 'no_smoking',
+    '1f6b1': 'non-potable_water',
+    '1f443': 'nose',
+    '1f443-1f3fb': 'nose_tone1',
+    '1f443-1f3fc': 'nose_tone2',
+    '1f443-1f3fd': 'nose_tone3',
+    '1f443-1f3fe': 'nose_tone4',
+    '1f443-1f3ff': 'nose_tone5',
+    '1f4d3': 'notebook',
+    '1f4d4': 'notebook_with_decorative_cover',
+    '1f5d2': 'notepad_spiral',
+    '1f3b6': 'notes',
+    '1f529': 'nut_and_bolt',
+    '2b55': 'o',
+    '1f17e': 'o2',
+    '1f30a': 'ocean',
+    '1f419': 'octopus',
+    '1f362': 'oden',
+    '1f3e2': 'office',
+    '1f6e2': 'oil',
+    '1f197': 'ok',
+    '1f44c': 'ok_hand',
+    '1f44c-1f3fb': 'ok_hand_tone1',
+    '1f44c-1f3fc': 'ok_hand_tone2',
+    '1f44c-1f3fd': 'ok_hand_tone3',
+    '1f44c-1f3fe': 'ok_hand_tone4',
+    '1f44c-1f3ff': 'ok_hand_tone5',
+    '1f646': 'ok_woman',
+    '1f646-1f3fb': 'ok_woman_tone1',
+    '1f646-1f3fc': 'ok_woman_tone2',
+    '1f646-1f3fd': 'ok_woman_tone3',
+    '1f646-1f3fe': 'ok_woman_tone4',
+    '1f646-1f3ff': 'ok_woman_tone5',
+    '1f474': 'older_man',
+    '1f474-1f3fb': 'older_man_tone1',
+    '1f474-1f3fc': 'older_man_tone2',
+    '1f474-1f3fd': 'older_man_tone3',
+    '1f474-1f3fe': 'older_man_tone4',
+    '1f474-1f3ff': 'older_man_tone5',
+    '1f549': 'om_symbol',
+    '1f51b': 'on',
+    '1f698': 'oncoming_automobile',
+    '1f68d': 'oncoming_bus',
+    '1f694': 'oncoming_police_car',
+    '1f696': 'oncoming_taxi',
+    '0031-20e3': 'one',
+    '1f4c2': 'open_file_folder',
+    '1f450': 'open_hands',
+    '1f450-1f3fb': 'open_hands_tone1',
+    '1f450-1f3fc': 'open_hands_tone2',
+    '1f450-1f3fd': 'open_hands_tone3',
+    '1f450-1f3fe': 'open_hands_tone4',
+    '1f450-1f3ff': 'open_hands_tone5',
+    '1f62e': 'open_mouth',
+    '26ce': 'ophiuchus',
+    '1f4d9': 'orange_book',
+    '2626': 'orthodox_cross',
+    '1f4e4': 'outbox_tray',
+    '1f402': 'ox',
+    '1f4e6': 'package',
+    '1f4c4': 'page_facing_up',
+    '1f4c3': 'page_with_curl',
+    '1f4df': 'pager',
+    '1f334': 'palm_tree',
+    '1f43c': 'panda_face',
+    '1f4ce': 'paperclip',
+    '1f17f': 'parking',
+    '303d': 'part_alternation_mark',
+    '26c5': 'partly_sunny',
+    '1f6c2': 'passport_control',
+    '262e': 'peace',
+    '1f351': 'peach',
+    '1f350': 'pear',
+    '1f4dd': 'pencil',
+    '270f': 'pencil2',
+    '1f427': 'penguin',
+    '1f614': 'pensive',
+    '1f3ad': 'performing_arts',
+    '1f623': 'persevere',
+    '1f64d': 'person_frowning',
+    '1f64d-1f3fb': 'person_frowning_tone1',
+    '1f64d-1f3fc': 'person_frowning_tone2',
+    '1f64d-1f3fd': 'person_frowning_tone3',
+    '1f64d-1f3fe': 'person_frowning_tone4',
+    '1f64d-1f3ff': 'person_frowning_tone5',
+    '1f471': 'person_with_blond_hair',
+    '1f471-1f3fb': 'person_with_blond_hair_tone1',
+    '1f471-1f3fc': 'person_with_blond_hair_tone2',
+    '1f471-1f3fd': 'person_with_blond_hair_tone3',
+    '1f471-1f3fe': 'person_with_blond_hair_tone4',
+    '1f471-1f3ff': 'person_with_blond_hair_tone5',
+    '1f64e': 'person_with_pouting_face',
+    '1f64e-1f3fb': 'person_with_pouting_face_tone1',
+    '1f64e-1f3fc': 'person_with_pouting_face_tone2',
+    '1f64e-1f3fd': 'person_with_pouting_face_tone3',
+    '1f64e-1f3fe': 'person_with_pouting_face_tone4',
+    '1f64e-1f3ff': 'person_with_pouting_face_tone5',
+    '26cf': 'pick',
+    '1f437': 'pig',
+    '1f416': 'pig2',
+    '1f43d': 'pig_nose',
+    '1f48a': 'pill',
+    '1f34d': 'pineapple',
+    '1f3d3': 'ping_pong',
+    '2653': 'pisces',
+    '1f355': 'pizza',
+    '1f6d0': 'place_of_worship',
+    '23ef': 'play_pause',
+    '1f447': 'point_down',
+    '1f447-1f3fb': 'point_down_tone1',
+    '1f447-1f3fc': 'point_down_tone2',
+    '1f447-1f3fd': 'point_down_tone3',
+    '1f447-1f3fe': 'point_down_tone4',
+    '1f447-1f3ff': 'point_down_tone5',
+    '1f448': 'point_left',
+    '1f448-1f3fb': 'point_left_tone1',
+    '1f448-1f3fc': 'point_left_tone2',
+    '1f448-1f3fd': 'point_left_tone3',
+    '1f448-1f3fe': 'point_left_tone4',
+    '1f448-1f3ff': 'point_left_tone5',
+    '1f449': 'point_right',
+    '1f449-1f3fb': 'point_right_tone1',
+    '1f449-1f3fc': 'point_right_tone2',
+    '1f449-1f3fd': 'point_right_tone3',
+    '1f449-1f3fe': 'point_right_tone4',
+    '1f449-1f3ff': 'point_right_tone5',
+    '261d': 'point_up',
+    '1f446': 'point_up_2',
+    '1f446-1f3fb': 'point_up_2_tone1',
+    '1f446-1f3fc': 'point_up_2_tone2',
+    '1f446-1f3fd': 'point_up_2_tone3',
+    '1f446-1f3fe': 'point_up_2_tone4',
+    '1f446-1f3ff': 'point_up_2_tone5',
+    '261d-1f3fb': 'point_up_tone1',
+    '261d-1f3fc': 'point_up_tone2',
+    '261d-1f3fd': 'point_up_tone3',
+    '261d-1f3fe': 'point_up_tone4',
+    '261d-1f3ff': 'point_up_tone5',
+    '1f693': 'police_car',
+    '1f429': 'poodle',
+    '1f37f': 'popcorn',
+    '1f3e3': 'post_office',
+    '1f4ef': 'postal_horn',
+    '1f4ee': 'postbox',
+    '1f6b0': 'potable_water',
+    '1f45d': 'pouch',
+    '1f357': 'poultry_leg',
+    '1f4b7': 'pound',
+    '1f63e': 'pouting_cat',
+    '1f64f': 'pray',
+    '1f64f-1f3fb': 'pray_tone1',
+    '1f64f-1f3fc': 'pray_tone2',
+    '1f64f-1f3fd': 'pray_tone3',
+    '1f64f-1f3fe': 'pray_tone4',
+    '1f64f-1f3ff': 'pray_tone5',
+    '1f4ff': 'prayer_beads',
+    '23ee': 'previous_track',
+    '1f478': 'princess',
+    '1f478-1f3fb': 'princess_tone1',
+    '1f478-1f3fc': 'princess_tone2',
+    '1f478-1f3fd': 'princess_tone3',
+    '1f478-1f3fe': 'princess_tone4',
+    '1f478-1f3ff': 'princess_tone5',
+    '1f5a8': 'printer',
+    '1f44a': 'punch',
+    '1f44a-1f3fb': 'punch_tone1',
+    '1f44a-1f3fc': 'punch_tone2',
+    '1f44a-1f3fd': 'punch_tone3',
+    '1f44a-1f3fe': 'punch_tone4',
+    '1f44a-1f3ff': 'punch_tone5',
+    '1f49c': 'purple_heart',
+    '1f45b': 'purse',
+    '1f4cc': 'pushpin',
+    '1f6ae': 'put_litter_in_its_place',
+    '2753': 'question',
+    '1f430': 'rabbit',
+    '1f407': 'rabbit2',
+    '1f3ce': 'race_car',
+    '1f40e': 'racehorse',
+    '1f4fb': 'radio',
+    '1f518': 'radio_button',
+    '2622': 'radioactive',
+    '1f621': 'rage',
+    '1f6e4': 'railroad_track',
+    '1f683': 'railway_car',
+    '1f308': 'rainbow',
+    '270b': 'raised_hand',
+    '270b-1f3fb': 'raised_hand_tone1',
+    '270b-1f3fc': 'raised_hand_tone2',
+    '270b-1f3fd': 'raised_hand_tone3',
+    '270b-1f3fe': 'raised_hand_tone4',
+    '270b-1f3ff': 'raised_hand_tone5',
+    '1f596': 'raised_hand_with_part_between_middle_and_ring_fingers',
+    '1f596-1f3fb': 'raised_hand_with_part_between_middle_and_ring_fingers_tone1',
+    '1f596-1f3fc': 'raised_hand_with_part_between_middle_and_ring_fingers_tone2',
+    '1f596-1f3fd': 'raised_hand_with_part_between_middle_and_ring_fingers_tone3',
+    '1f596-1f3fe': 'raised_hand_with_part_between_middle_and_ring_fingers_tone4',
+    '1f596-1f3ff': 'raised_hand_with_part_between_middle_and_ring_fingers_tone5',
+    '1f64c': 'raised_hands',
+    '1f64c-1f3fb': 'raised_hands_tone1',
+    '1f64c-1f3fc': 'raised_hands_tone2',
+    '1f64c-1f3fd': 'raised_hands_tone3',
+    '1f64c-1f3fe': 'raised_hands_tone4',
+    '1f64c-1f3ff': 'raised_hands_tone5',
+    '1f64b': 'raising_hand',
+    '1f64b-1f3fb': 'raising_hand_tone1',
+    '1f64b-1f3fc': 'raising_hand_tone2',
+    '1f64b-1f3fd': 'raising_hand_tone3',
+    '1f64b-1f3fe': 'raising_hand_tone4',
+    '1f64b-1f3ff': 'raising_hand_tone5',
+    '1f40f': 'ram',
+    '1f35c': 'ramen',
+    '1f400': 'rat',
+    '23fa': 'record_button',
+    '267b': 'recycle',
+    '1f697': 'red_car',
+    '1f534': 'red_circle',
+    '00ae': 'registered',
+    '263a': 'relaxed',
+    '1f60c': 'relieved',
+    '1f397': 'reminder_ribbon',
+    '1f501': 'repeat',
+    '1f502': 'repeat_one',
+    '1f6bb': 'restroom',
+    '1f49e': 'revolving_hearts',
+    '23ea': 'rewind',
+    '1f380': 'ribbon',
+    '1f35a': 'rice',
+    '1f359': 'rice_ball',
+    '1f358': 'rice_cracker',
+    '1f391': 'rice_scene',
+    '1f48d': 'ring',
+    '1f916': 'robot',
+    '1f680': 'rocket',
+    '1f3a2': 'roller_coaster',
+    '1f413': 'rooster',
+    '1f339': 'rose',
+    '1f3f5': 'rosette',
+    '1f6a8': 'rotating_light',
+    '1f4cd': 'round_pushpin',
+    '1f6a3': 'rowboat',
+    '1f6a3-1f3fb': 'rowboat_tone1',
+    '1f6a3-1f3fc': 'rowboat_tone2',
+    '1f6a3-1f3fd': 'rowboat_tone3',
+    '1f6a3-1f3fe': 'rowboat_tone4',
+    '1f6a3-1f3ff': 'rowboat_tone5',
+    '1f3c9': 'rugby_football',
+    '1f3c3': 'runner',
+    '1f3c3-1f3fb': 'runner_tone1',
+    '1f3c3-1f3fc': 'runner_tone2',
+    '1f3c3-1f3fd': 'runner_tone3',
+    '1f3c3-1f3fe': 'runner_tone4',
+    '1f3c3-1f3ff': 'runner_tone5',
+    '1f3bd': 'running_shirt_with_sash',
+    '1f202': 'sa',
+    '2650': 'sagittarius',
+    '26f5': 'sailboat',
+    '1f376': 'sake',
+    '1f461': 'sandal',
+    '1f385': 'santa',
+    '1f385-1f3fb': 'santa_tone1',
+    '1f385-1f3fc': 'santa_tone2',
+    '1f385-1f3fd': 'santa_tone3',
+    '1f385-1f3fe': 'santa_tone4',
+    '1f385-1f3ff': 'santa_tone5',
+    '1f4e1': 'satellite',
+    '1f6f0': 'satellite_orbital',
+    '1f3b7': 'saxophone',
+    '2696': 'scales',
+    '1f3eb': 'school',
+    '1f392': 'school_satchel',
+    '2702': 'scissors',
+    '1f982': 'scorpion',
+    '264f': 'scorpius',
+    '1f631': 'scream',
+    '1f640': 'scream_cat',
+    '1f4dc': 'scroll',
+    '1f4ba': 'seat',
+    '3299': 'secret',
+    '1f648': 'see_no_evil',
+    '1f331': 'seedling',
+    '0037-20e3': 'seven',
+    '2618': 'shamrock',
+    '1f367': 'shaved_ice',
+    '1f411': 'sheep',
+    '1f41a': 'shell',
+    '1f6e1': 'shield',
+    '26e9': 'shinto_shrine',
+    '1f6a2': 'ship',
+    '1f455': 'shirt',
+    '1f6cd': 'shopping_bags',
+    '1f6bf': 'shower',
+    '1f4f6': 'signal_strength',
+    '0036-20e3': 'six',
+    '1f52f': 'six_pointed_star',
+    '1f480': 'skeleton',
+    '1f3bf': 'ski',
+    '26f7': 'skier',
+    '2620': 'skull_and_crossbones',
+    '1f634': 'sleeping',
+    '1f6cc': 'sleeping_accommodation',
+    '1f62a': 'sleepy',
+    '1f575': 'sleuth_or_spy',
+    '1f575-1f3fb': 'sleuth_or_spy_tone1',
+    '1f575-1f3fc': 'sleuth_or_spy_tone2',
+    '1f575-1f3fd': 'sleuth_or_spy_tone3',
+    '1f575-1f3fe': 'sleuth_or_spy_tone4',
+    '1f575-1f3ff': 'sleuth_or_spy_tone5',
+    '1f641': 'slight_frown',
+    '1f642': 'slight_smile',
+    '1f3b0': 'slot_machine',
+    '1f539': 'small_blue_diamond',
+    '1f538': 'small_orange_diamond',
+    '1f53a': 'small_red_triangle',
+    '1f53b': 'small_red_triangle_down',
+    '1f604': 'smile',
+    '1f638': 'smile_cat',
+    '1f603': 'smiley',
+    '1f63a': 'smiley_cat',
+    '1f608': 'smiling_imp',
+    '1f60f': 'smirk',
+    '1f63c': 'smirk_cat',
+    '1f6ac': 'smoking',
+    '1f40c': 'snail',
+    '1f40d': 'snake',
+    '1f3c2': 'snowboarder',
+    '2744': 'snowflake',
+    '26c4': 'snowman',
+    '2603': 'snowman2',
+    '1f62d': 'sob',
+    '26bd': 'soccer',
+    '1f51c': 'soon',
+    '1f198': 'sos',
+    '1f509': 'sound',
+    '1f47e': 'space_invader',
+    '2660': 'spades',
+    '1f35d': 'spaghetti',
+    '2747': 'sparkle',
+    '1f387': 'sparkler',
+    '2728': 'sparkles',
+    '1f496': 'sparkling_heart',
+    '1f64a': 'speak_no_evil',
+    '1f508': 'speaker',
+    '1f5e3': 'speaking_head',
+    '1f4ac': 'speech_balloon',
+    '1f6a4': 'speedboat',
+    '1f577': 'spider',
+    '1f578': 'spider_web',
+    '1f3df': 'stadium',
+    '2b50': 'star',
+    '1f31f': 'star2',
+    '262a': 'star_and_crescent',
+    '2721': 'star_of_david',
+    '1f320': 'stars',
+    '1f689': 'station',
+    '1f5fd': 'statue_of_liberty',
+    '1f682': 'steam_locomotive',
+    '1f372': 'stew',
+    '23f9': 'stop_button',
+    '23f1': 'stopwatch',
+    '1f4cf': 'straight_ruler',
+    '1f353': 'strawberry',
+    '1f61b': 'stuck_out_tongue',
+    '1f61d': 'stuck_out_tongue_closed_eyes',
+    '1f61c': 'stuck_out_tongue_winking_eye',
+    '1f31e': 'sun_with_face',
+    '1f33b': 'sunflower',
+    '1f60e': 'sunglasses',
+    '2600': 'sunny',
+    '1f305': 'sunrise',
+    '1f304': 'sunrise_over_mountains',
+    '1f3c4': 'surfer',
+    '1f3c4-1f3fb': 'surfer_tone1',
+    '1f3c4-1f3fc': 'surfer_tone2',
+    '1f3c4-1f3fd': 'surfer_tone3',
+    '1f3c4-1f3fe': 'surfer_tone4',
+    '1f3c4-1f3ff': 'surfer_tone5',
+    '1f363': 'sushi',
+    '1f69f': 'suspension_railway',
+    '1f613': 'sweat',
+    '1f4a6': 'sweat_drops',
+    '1f605': 'sweat_smile',
+    '1f360': 'sweet_potato',
+    '1f3ca': 'swimmer',
+    '1f3ca-1f3fb': 'swimmer_tone1',
+    '1f3ca-1f3fc': 'swimmer_tone2',
+    '1f3ca-1f3fd': 'swimmer_tone3',
+    '1f3ca-1f3fe': 'swimmer_tone4',
+    '1f3ca-1f3ff': 'swimmer_tone5',
+    '1f523': 'symbols',
+    '1f54d': 'synagogue',
+    '1f489': 'syringe',
+    '1f32e': 'taco',
+    '1f389': 'tada',
+    '1f38b': 'tanabata_tree',
+    '1f34a': 'tangerine',
+    '2649': 'taurus',
+    '1f695': 'taxi',
+    '1f375': 'tea',
+    '260e': 'telephone',
+    '1f4de': 'telephone_receiver',
+    '1f52d': 'telescope',
+    '1f51f': 'ten',
+    '1f3be': 'tennis',
+    '26fa': 'tent',
+    '1f321': 'thermometer',
+    '1f914': 'thinking',
+    '1f4ad': 'thought_balloon',
+    '0033-20e3': 'three',
+    '26c8': 'thunder_cloud_and_rain',
+    '1f3ab': 'ticket',
+    '1f42f': 'tiger',
+    '1f405': 'tiger2',
+    '23f2': 'timer',
+    '1f62b': 'tired_face',
+    '2122': 'tm',
+    '1f6bd': 'toilet',
+    '1f5fc': 'tokyo_tower',
+    '1f345': 'tomato',
+    '1f445': 'tongue',
+    '1f51d': 'top',
+    '1f3a9': 'tophat',
+    '1f5b2': 'trackball',
+    '1f69c': 'tractor',
+    '1f6a5': 'traffic_light',
+    '1f68b': 'train',
+    '1f686': 'train2',
+    '1f68a': 'tram',
+    '1f6a9': 'triangular_flag_on_post',
+    '1f4d0': 'triangular_ruler',
+    '1f531': 'trident',
+    '1f624': 'triumph',
+    '1f68e': 'trolleybus',
+    '1f3c6': 'trophy',
+    '1f379': 'tropical_drink',
+    '1f420': 'tropical_fish',
+    '1f69a': 'truck',
+    '1f3ba': 'trumpet',
+    '1f337': 'tulip',
+    '1f983': 'turkey',
+    '1f422': 'turtle',
+    '1f4fa': 'tv',
+    '1f500': 'twisted_rightwards_arrows',
+    '0032-20e3': 'two',
+    '1f495': 'two_hearts',
+    '1f46c': 'two_men_holding_hands',
+    '1f46d': 'two_women_holding_hands',
+    '1f239': 'u5272',
+    '1f234': 'u5408',
+    '1f23a': 'u55b6',
+    '1f22f': 'u6307',
+    '1f237': 'u6708',
+    '1f236': 'u6709',
+    '1f235': 'u6e80',
+    '1f21a': 'u7121',
+    '1f238': 'u7533',
+    '1f232': 'u7981',
+    '1f233': 'u7a7a',
+    '2614': 'umbrella',
+    '2602': 'umbrella2',
+    '1f612': 'unamused',
+    '1f51e': 'underage',
+    '1f984': 'unicorn',
+    '1f513': 'unlock',
+    '1f199': 'up',
+    '1f643': 'upside_down',
+    '270c': 'v',
+    '270c-1f3fb': 'v_tone1',
+    '270c-1f3fc': 'v_tone2',
+    '270c-1f3fd': 'v_tone3',
+    '270c-1f3fe': 'v_tone4',
+    '270c-1f3ff': 'v_tone5',
+    '1f6a6': 'vertical_traffic_light',
+    '1f4fc': 'vhs',
+    '1f4f3': 'vibration_mode',
+    '1f4f9': 'video_camera',
+    '1f3ae': 'video_game',
+    '1f3bb': 'violin',
+    '264d': 'virgo',
+    '1f30b': 'volcano',
+    '1f3d0': 'volleyball',
+    '1f19a': 'vs',
+    '1f6b6': 'walking',
+    '1f6b6-1f3fb': 'walking_tone1',
+    '1f6b6-1f3fc': 'walking_tone2',
+    '1f6b6-1f3fd': 'walking_tone3',
+    '1f6b6-1f3fe': 'walking_tone4',
+    '1f6b6-1f3ff': 'walking_tone5',
+    '1f318': 'waning_crescent_moon',
+    '1f316': 'waning_gibbous_moon',
+    '26a0': 'warning',
+    '1f5d1': 'wastebasket',
+    '231a': 'watch',
+    '1f403': 'water_buffalo',
+    '1f349': 'watermelon',
+    '1f44b': 'wave',
+    '1f44b-1f3fb': 'wave_tone1',
+    '1f44b-1f3fc': 'wave_tone2',
+    '1f44b-1f3fd': 'wave_tone3',
+    '1f44b-1f3fe': 'wave_tone4',
+    '1f44b-1f3ff': 'wave_tone5',
+    '3030': 'wavy_dash',
+    '1f312': 'waxing_crescent_moon',
+    '1f314': 'waxing_gibbous_moon',
+    '1f6be': 'wc',
+    '1f629': 'weary',
+    '1f492': 'wedding',
+    '1f433': 'whale',
+    '1f40b': 'whale2',
+    '2638': 'wheel_of_dharma',
+    '267f': 'wheelchair',
+    '2705': 'white_check_mark',
+    '26aa': 'white_circle',
+    '1f4ae': 'white_flower',
+    '2b1c': 'white_large_square',
+    '25fd': 'white_medium_small_square',
+    '25fb': 'white_medium_square',
+    '25ab': 'white_small_square',
+    '1f533': 'white_square_button',
+    '1f325': 'white_sun_behind_cloud',
+    '1f326': 'white_sun_behind_cloud_with_rain',
+    '1f324': 'white_sun_small_cloud',
+    '1f32c': 'wind_blowing_face',
+    '1f390': 'wind_chime',
+    '1f377': 'wine_glass',
+    '1f609': 'wink',
+    '1f43a': 'wolf',
+    '1f469': 'woman',
+    '1f469-1f3fb': 'woman_tone1',
+    '1f469-1f3fc': 'woman_tone2',
+    '1f469-1f3fd': 'woman_tone3',
+    '1f469-1f3fe': 'woman_tone4',
+    '1f469-1f3ff': 'woman_tone5',
+    '1f45a': 'womans_clothes',
+    '1f452': 'womans_hat',
+    '1f6ba': 'womens',
+    '1f61f': 'worried',
+    '1f527': 'wrench',
+    '270d': 'writing_hand',
+    '270d-1f3fb': 'writing_hand_tone1',
+    '270d-1f3fc': 'writing_hand_tone2',
+    '270d-1f3fd': 'writing_hand_tone3',
+    '270d-1f3fe': 'writing_hand_tone4',
+    '270d-1f3ff': 'writing_hand_tone5',
+    '274c': 'x',
+    '1f49b': 'yellow_heart',
+    '1f4b4': 'yen',
+    '262f': 'yin_yang',
+    '1f60b': 'yum',
+    '26a1': 'zap',
+    '0030-20e3': 'zero',
+    '1f910': 'zipper_mouth',
+    '1f4a4': 'zzz',
+}
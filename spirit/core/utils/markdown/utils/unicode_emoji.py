@@ -0,0 +1,155 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+import sys
+import threading
+
+__all__ = [
+    'EMOJI_START',
+    'UnicodeEmojiPattern']
+
+_VARIATION = '\ufe0f'
+_END = ''  # Never a char
+
+# Single code point emojis in the BMP displayed
+# as emojis by default, the rest of them are text
+# (i.e: the copyright sign) unless followed by
+# the emoji variation selector
+_EMOJI_PRESENTATION = (
+    (0x231a, 0x231b), (0x23e9, 0x23ec), (0x23f0, 0x23f0), (0x23f3, 0x23f3),
+    (0x25fd, 0x25fe), (0x2614, 0x2615), (0x2648, 0x2653), (0x267f, 0x267f),
+    (0x2693, 0x2693), (0x26a1, 0x26a1), (0x26aa, 0x26ab), (0x26bd, 0x26be),
+    (0x26c4, 0x26c5), (0x26ce, 0x26ce), (0x26d4, 0x26d4), (0x26ea, 0x26ea),
+    (0x26f2, 0x26f3), (0x26f5, 0x26f5), (0x26fa, 0x26fa), (0x26fd, 0x26fd),
+    (0x2705, 0x2705), (0x270a, 0x270b), (0x2728, 0x2728), (0x274c, 0x274c),
+    (0x274e, 0x274e), (0x2753, 0x2755), (0x2757, 0x2757), (0x2795, 0x2797),
+    (0x27b0, 0x27b0), (0x27bf, 0x27bf), (0x2b1b, 0x2b1c), (0x2b50, 0x2b50),
+    (0x2b55, 0x2b55))
+
+
+def _to_unicode(code_point):
+    try:
+        return unichr(code_point)
+    except NameError:  # Python 3
+        return chr(code_point)
+    except ValueError:  # Narrow build
+        code_point -= 0x10000
+        return unichr(0xd800 + (code_point >> 10)) + unichr(0xdc00 + (code_point & 0x3ff))
+
+
+# Where emojis may start, the text rule stops
+# before them. Most chars in the symbols blocks
+# are emojis only when followed by the variation
+# selector or a skin tone (or not at all, i.e:
+# CJK), so the text rule consumes them otherwise.
+# Keycaps start with an ascii char so they are
+# only matched with the keycap mark
+_PRESENTATION_START = ''.join(
+    '%s-%s' % (_to_unicode(first), _to_unicode(last))
+    for first, last in _EMOJI_PRESENTATION)
+
+if sys.maxunicode > 0xffff:
+    EMOJI_START = (
+        '[' + _PRESENTATION_START + '\U0001f000-\U0001faff]|'
+        '[\u00a9\u00ae\u203c-\u3299](?:\ufe0f|[\U0001f3fb-\U0001f3ff])|'
+        '[#*0-9]\ufe0f?\u20e3')
+else:  # Narrow build, astral chars are surrogate pairs
+    EMOJI_START = (
+        '[' + _PRESENTATION_START + '\ud83c-\ud83e]|'
+        '[\u00a9\u00ae\u203c-\u3299](?:\ufe0f|\ud83c[\udffb-\udfff])|'
+        '[#*0-9]\ufe0f?\u20e3')
+
+_lock = threading.Lock()
+_trie = {}
+
+
+def _is_text(code_points):
+    if len(code_points) > 1 or code_points[0] >= 0x1f000:
+        return False
+
+    return not any(
+        first <= code_points[0] <= last
+        for first, last in _EMOJI_PRESENTATION)
+
+
+def _build_trie():
+    """
+    Return a trie of the emojis chars,\
+    the leaves are (name, is_text)
+    """
+    from .emoji_unicode import emojis_unicode
+
+    trie = {}
+
+    for code_points_raw, name in emojis_unicode.items():
+        code_points = [int(c, 16) for c in code_points_raw.split('-')]
+        node = trie
+
+        for char in ''.join(_to_unicode(c) for c in code_points):
+            node = node.setdefault(char, {})
+
+        node[_END] = (name, _is_text(code_points))
+
+    return trie
+
+
+def _get_trie():
+    # The table is loaded on the first render
+    if not _trie:
+        with _lock:
+            if not _trie:
+                _trie.update(_build_trie())
+
+    return _trie
+
+
+class UnicodeEmojiMatch(object):
+
+    def __init__(self, text, name):
+        self._text = text
+        self._name = name
+
+    def group(self, group=0):
+        if group == 0:
+            return self._text
+
+        assert group == 'emoji'
+        return self._name
+
+
+class UnicodeEmojiPattern(object):
+    """
+    Matches the longest unicode emoji at the\
+    start of the text, like a compiled regex\
+    would. It walks the emojis trie, so the\
+    cost doesn't depend on the number of emojis
+    """
+
+    def match(self, text):
+        node = _get_trie()
+        index = 0
+        length = len(text)
+        found = None
+
+        while index < length:
+            node = node.get(text[index])
+
+            if node is None:
+                break
+
+            index += 1
+            has_variation = index < length and text[index] == _VARIATION
+
+            if has_variation:
+                index += 1
+
+            try:
+                name, is_text = node[_END]
+            except KeyError:
+                continue
+
+            if has_variation or not is_text:
+                found = UnicodeEmojiMatch(text[:index], name)
+
+        return found
@@ -0,0 +1,53 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+from django.core.paginator import Paginator
+from django.db.models import Max
+
+
+class NumberPaginator(Paginator):
+    """
+    Paginates over a dense 1-based sequence field\
+    (i.e: the comment number). Pages are fetched\
+    by range of numbers instead of by offset, so\
+    the deepest pages are as cheap as the first one.
+
+    The total is the last number, unless a count is given.\
+    Objects without number fall back to an offset query.
+    """
+
+    def __init__(self, object_list, per_page, lookup_field, count=None, **kwargs):
+        super(NumberPaginator, self).__init__(object_list, per_page, **kwargs)
+        self.lookup_field = lookup_field
+        self._count = count
+
+    def _get_count(self):
+        if self._count is None:
+            self._count = self.object_list\
+                .aggregate(last_number=Max(self.lookup_field))['last_number']
+
+        if self._count is None:
+            # Not numbered, maybe
+            self._count = self.object_list.count()
+
+        return self._count
+    count = property(_get_count)
+
+    def page(self, number):
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        top = bottom + self.per_page
+        expected_len = max(0, min(top, self.count) - bottom)
+
+        object_list = list(self.object_list.filter(**{
+            '%s__gt' % self.lookup_field: bottom,
+            '%s__lte' % self.lookup_field: top
+        }))
+
+        if len(object_list) != expected_len:
+            # There are gaps, the numbers
+            # have not been backfilled yet
+            object_list = self.object_list[bottom:top]
+
+        return self._get_page(object_list, number, self)
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+import uuid
+import hashlib
+
+from django.conf import settings
+from django.core.cache import caches
+from django.utils.encoding import smart_bytes
+
+__all__ = [
+    'is_enabled',
+    'bump_generation',
+    'get_key',
+    'get_results']
+
+_GENERATION_KEY = 'st_search_generation'
+_RESULTS_KEY = 'st_search_results_%s'
+
+# The generation is bumped when the
+# index changes, this bounds the setups
+# where the index is updated by other means
+_CACHE_TIMEOUT = 60 * 60
+
+
+def is_enabled():
+    return settings.ST_SEARCH_RESULTS_CACHE is not None
+
+
+def _get_cache():
+    return caches[settings.ST_SEARCH_RESULTS_CACHE]
+
+
+def bump_generation():
+    """
+    Invalidate the cached results,\
+    must be called every time the index changes
+    """
+    if not is_enabled():
+        return
+
+    _get_cache().set(_GENERATION_KEY, uuid.uuid4().hex, timeout=None)
+
+
+def _get_generation():
+    cache = _get_cache()
+    generation = cache.get(_GENERATION_KEY)
+
+    if generation is None:
+        cache.add(_GENERATION_KEY, uuid.uuid4().hex, timeout=None)
+        generation = cache.get(_GENERATION_KEY)
+
+    return generation
+
+
+def get_key(query, group_by, category_ids, access_category_ids):
+    """
+    Return the cache key of a search
+
+    :param query: The search query
+    :param group_by: The results kind
+    :param category_ids: The categories filtered by
+    :param access_category_ids: The categories the user\
+    can access or None if there is no restriction
+    :return: The key, it includes the index generation
+    """
+    if access_category_ids is not None:
+        access_category_ids = sorted(access_category_ids)
+
+    key = '|'.join((
+        _get_generation(),
+        ' '.join(query.lower().split()),
+        group_by,
+        ','.join(str(pk) for pk in sorted(category_ids)),
+        '*' if access_category_ids is None else
+        ','.join(str(pk) for pk in access_category_ids)))
+    return _RESULTS_KEY % hashlib.md5(smart_bytes(key)).hexdigest()
+
+
+def get_results(key, sqs):
+    """
+    Return the cached results,\
+    search them if they are not cached.\
+    Up to ``settings.ST_SEARCH_RESULTS_CACHE_MAX_LEN``\
+    results are fetched
+
+    :param key: See :py:func:`get_key`
+    :param sqs: The search queryset
+    :return: List of (pk, stored_fields),\
+    in the search order
+    """
+    cache = _get_cache()
+    results = cache.get(key)
+
+    if results is None:
+        # A single backend query,
+        # iterating fetches small chunks
+        results = [
+            (r.pk, r.get_stored_fields())
+            for r in sqs[:settings.ST_SEARCH_RESULTS_CACHE_MAX_LEN]]
+        cache.set(key, results, timeout=_CACHE_TIMEOUT)
+
+    return results
@@ -0,0 +1,350 @@
+# -*- coding: utf-8 -*-
+
+"""
+Search backend storing an inverted index\
+in the database, see\
+:py:class:`spirit.search.models.SearchDocument`.\
+Writes don't lock anything but the updated\
+documents and are part of the current\
+transaction, unlike the whoosh file lock.
+
+The document field is split into lowercase\
+words (there is no stemming) and the other\
+indexed fields are stored as ``field=value``\
+terms. Queries match all the words and support\
+exact and ``in`` filters on single valued fields.\
+The results are ranked by the sum of the words\
+frequency.
+
+Usage::
+
+    HAYSTACK_CONNECTIONS = {
+        'default': {
+            'ENGINE': 'spirit.search.db_backend.DatabaseEngine',
+        },
+    }
+"""
+
+from __future__ import unicode_literals
+
+import re
+import json
+from collections import Counter
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.db.models import Count, Sum
+from django.utils import six
+from django.utils.encoding import python_2_unicode_compatible
+
+from haystack import connections
+from haystack.backends import BaseEngine, BaseSearchBackend, BaseSearchQuery, SearchNode, log_query
+from haystack.constants import ID, DJANGO_CT, DJANGO_ID
+from haystack.exceptions import SearchBackendError, SkipDocument, NotHandled
+from haystack.models import SearchResult
+from haystack.utils import get_identifier, get_model_ct
+from haystack.utils.app_loading import haystack_get_model
+
+from .models import SearchDocument, SearchPosting
+
+_WORD = re.compile(r'\w+', flags=re.UNICODE)
+_TERM_MAX_LEN = SearchPosting._meta.get_field('term').max_length
+
+
+def _tokenize(text):
+    return [
+        word[:_TERM_MAX_LEN]
+        for word in _WORD.findall(six.text_type(text).lower())]
+
+
+def _field_term(name, value, field_type):
+    if field_type == 'boolean':
+        value = 'false' if value in (False, 0, '0', 'false') else 'true'
+
+    return ('%s=%s' % (name, value))[:_TERM_MAX_LEN]
+
+
+def _get_cts(models):
+    return [get_model_ct(model) for model in models]
+
+
+@python_2_unicode_compatible
+class DatabaseQuery(object):
+    """
+    The parsed query, the documents must match\
+    one term of every group and none of the\
+    excluded terms
+    """
+
+    def __init__(self):
+        self.groups = []
+        self.excluded = set()
+
+    def add_group(self, terms):
+        terms = frozenset(terms)
+
+        if terms and terms not in self.groups:
+            self.groups.append(terms)
+
+    def __str__(self):
+        return ' '.join(
+            ['(%s)' % ' OR '.join(sorted(terms)) for terms in self.groups] +
+            ['-%s' % term for term in sorted(self.excluded)])
+
+
+class DatabaseSearchBackend(BaseSearchBackend):
+
+    def _get_postings(self, index, document):
+        postings = Counter()
+
+        for field in index.fields.values():
+            if not field.indexed:
+                continue
+
+            value = document.get(field.index_fieldname)
+
+            if value is None:
+                continue
+
+            if field.document:
+                postings.update(_tokenize(value))
+                continue
+
+            values = value if field.is_multivalued else [value]
+            postings.update(
+                _field_term(field.index_fieldname, v, field.field_type)
+                for v in values)
+
+        return postings
+
+    def _get_stored(self, index, document):
+        return json.dumps({
+            field.index_fieldname: document.get(field.index_fieldname)
+            for field in index.fields.values()
+            if field.stored}, cls=DjangoJSONEncoder)
+
+    def update(self, index, iterable, commit=True):
+        documents = {}
+
+        for obj in iterable:
+            try:
+                document = index.full_prepare(obj)
+            except SkipDocument:
+                continue
+
+            documents[document[ID]] = document
+
+        if not documents:
+            return
+
+        with transaction.atomic():
+            # The postings are deleted along
+            SearchDocument.objects\
+                .filter(identifier__in=list(documents))\
+                .delete()
+            SearchDocument.objects.bulk_create([
+                SearchDocument(
+                    identifier=identifier,
+                    django_ct=document[DJANGO_CT],
+                    django_id=document[DJANGO_ID],
+                    stored=self._get_stored(index, document))
+                for identifier, document in documents.items()])
+            document_ids = SearchDocument.objects\
+                .filter(identifier__in=list(documents))\
+                .values_list('identifier', 'pk')
+            SearchPosting.objects.bulk_create([
+                SearchPosting(document_id=document_id, term=term, frequency=frequency)
+                for identifier, document_id in document_ids
+                for term, frequency in self._get_postings(index, documents[identifier]).items()])
+
+    def remove(self, obj_or_string, commit=True):
+        SearchDocument.objects\
+            .filter(identifier=get_identifier(obj_or_string))\
+            .delete()
+
+    def clear(self, models=None, commit=True):
+        documents = SearchDocument.objects.all()
+
+        if models:
+            documents = documents.filter(django_ct__in=_get_cts(models))
+
+        with transaction.atomic():
+            SearchPosting.objects\
+                .filter(document__in=documents)\
+                .delete()
+            documents.delete()
+
+    def _get_content_types(self, models, limit_to_registered_models):
+        if models:
+            return _get_cts(models)
+
+        if limit_to_registered_models is None:
+            limit_to_registered_models = getattr(settings, 'HAYSTACK_LIMIT_TO_REGISTERED_MODELS', True)
+
+        if limit_to_registered_models:
+            unified_index = connections[self.connection_alias].get_unified_index()
+            return _get_cts(unified_index.get_indexed_models())
+
+        return None
+
+    def _rank(self, query, content_types):
+        """
+        :return: Queryset of (document_id, score)\
+        ordered by score
+        """
+        if not query.groups:
+            documents = SearchDocument.objects.all()
+
+            if content_types is not None:
+                documents = documents.filter(django_ct__in=content_types)
+
+            if query.excluded:
+                documents = documents.exclude(postings__term__in=query.excluded)
+
+            return documents\
+                .order_by('-pk')\
+                .extra(select={'score': '0'})\
+                .values_list('pk', 'score')
+
+        # Every document has one value per filtered
+        # field, so a document matches as many terms
+        # as groups when it matches all of them
+        postings = SearchPosting.objects\
+            .filter(term__in={term for terms in query.groups for term in terms})
+
+        if content_types is not None:
+            postings = postings.filter(document__django_ct__in=content_types)
+
+        if query.excluded:
+            postings = postings.exclude(
+                document_id__in=SearchPosting.objects
+                .filter(term__in=query.excluded)
+                .values('document_id'))
+
+        return postings\
+            .values('document_id')\
+            .annotate(matches=Count('pk'), score=Sum('frequency'))\
+            .filter(matches=len(query.groups))\
+            .order_by('-score', '-document_id')\
+            .values_list('document_id', 'score')
+
+    def _to_result(self, document, score, result_class):
+        app_label, model_name = document.django_ct.split('.')
+        model = haystack_get_model(app_label, model_name)
+
+        try:
+            index = connections[self.connection_alias]\
+                .get_unified_index()\
+                .get_index(model)
+        except NotHandled:
+            return
+
+        fields = {}
+
+        for key, value in json.loads(document.stored).items():
+            key = str(key)
+
+            if key in index.fields:
+                value = index.fields[key].convert(value)
+
+            fields[key] = value
+
+        return result_class(app_label, model_name, document.django_id, score, **fields)
+
+    @log_query
+    def search(self, query_string, start_offset=0, end_offset=None, sort_by=None,
+               models=None, limit_to_registered_models=None, result_class=None, **kwargs):
+        if sort_by:
+            raise SearchBackendError("The database backend can only sort by relevance.")
+
+        ranked = self._rank(
+            query_string,
+            self._get_content_types(models, limit_to_registered_models))
+        hits = ranked.count()
+        page = list(ranked[start_offset:end_offset])
+        documents = SearchDocument.objects.in_bulk([document_id for document_id, _ in page])
+        results = [
+            self._to_result(documents[document_id], score, result_class or SearchResult)
+            for document_id, score in page
+            if document_id in documents]
+
+        return {
+            'results': [result for result in results if result is not None],
+            'hits': hits}
+
+
+class DatabaseSearchQuery(BaseSearchQuery):
+
+    def _get_field_types(self):
+        return {
+            field.index_fieldname: field
+            for field in connections[self._using]
+            .get_unified_index()
+            .all_searchfields()
+            .values()}
+
+    def _add_node(self, query, node, fields, negated=False):
+        negated = negated != node.negated
+
+        if node.connector != SearchNode.AND and len(node.children) > 1:
+            raise SearchBackendError("The database backend doesn't support OR queries.")
+
+        for child in node.children:
+            if isinstance(child, SearchNode):
+                self._add_node(query, child, fields, negated)
+                continue
+
+            expression, value = child
+            field_name, filter_type = node.split_expression(expression)
+            value = getattr(value, 'query_string', value)
+            field = fields.get(field_name)
+
+            if field_name == 'content' or (field is not None and field.document):
+                words = six.text_type(value).split()
+
+                if not negated:
+                    query.excluded.update(
+                        term
+                        for word in words
+                        if word.startswith('-')
+                        for term in _tokenize(word))
+                    words = [word for word in words if not word.startswith('-')]
+
+                terms = _tokenize(' '.join(words))
+
+                if negated:
+                    query.excluded.update(terms)
+                else:
+                    for term in terms:
+                        query.add_group([term])
+
+                continue
+
+            if field is None:
+                raise SearchBackendError("The '%s' field is not indexed." % field_name)
+
+            if filter_type in ('content', 'contains', 'exact'):
+                values = [value]
+            elif filter_type == 'in':
+                values = list(value)
+            else:
+                raise SearchBackendError(
+                    "The database backend doesn't support the '%s' filter." % filter_type)
+
+            terms = [_field_term(field_name, v, field.field_type) for v in values]
+
+            if negated:
+                query.excluded.update(terms)
+            else:
+                query.add_group(terms)
+
+    def build_query(self):
+        query = DatabaseQuery()
+        self._add_node(query, self.query_filter, self._get_field_types())
+        return query
+
+
+class DatabaseEngine(BaseEngine):
+    backend = DatabaseSearchBackend
+    query = DatabaseSearchQuery
@@ -11,11 +11,26 @@ from haystack.forms import SearchForm
 from haystack.query import EmptySearchQuerySet
 
 from ..topic.models import Topic
+from ..comment.models import Comment
 from ..category.models import Category
+from ..category import acl
+
+GROUP_BY_TOPIC, GROUP_BY_COMMENT = 'topic', 'comment'
+
+GROUP_BY = (
+    (GROUP_BY_TOPIC, _("Topics")),
+    (GROUP_BY_COMMENT, _("Comments")),
+)
 
 
 class BaseSearchForm(SearchForm):
 
+    def __init__(self, *args, **kwargs):
+        # The results are limited to the
+        # categories the user can access
+        self.user = kwargs.pop('user', None)
+        super(BaseSearchForm, self).__init__(*args, **kwargs)
+
     def clean_q(self):
         q = self.cleaned_data['q']
 
@@ -27,6 +42,26 @@ class BaseSearchForm(SearchForm):
 
         return q
 
+    def _filter_group(self, sqs, group_by):
+        # Whoosh counts the documents left out by
+        # models() as hits, so the other kind is
+        # excluded in the query as well
+        if group_by == GROUP_BY_COMMENT:
+            return sqs.models(Comment).filter(is_comment=1)
+
+        return sqs.models(Topic).filter(is_comment=0)
+
+    def _filter_access(self, sqs):
+        category_ids = acl.get_category_ids(self.user, acl.ACCESS)
+
+        if category_ids is None:
+            return sqs
+
+        if not category_ids:
+            return self.no_query_found()
+
+        return sqs.filter(category_id__in=category_ids)
+
 
 class BasicSearchForm(BaseSearchForm):
 
@@ -36,7 +71,8 @@ class BasicSearchForm(BaseSearchForm):
         if isinstance(sqs, EmptySearchQuerySet):
             return sqs
 
-        topics = sqs.models(Topic)
+        topics = self._filter_access(
+            self._filter_group(sqs, GROUP_BY_TOPIC))
 
         # See: haystack pull #1141 and #1093
         # querying False won't work on elastic
@@ -46,29 +82,41 @@ class BasicSearchForm(BaseSearchForm):
 class AdvancedSearchForm(BaseSearchForm):
 
     category = forms.ModelMultipleChoiceField(
-        queryset=Category.objects.visible(),
+        queryset=Category.objects.none(),
         required=False,
         label=_('Filter by'),
         widget=forms.CheckboxSelectMultiple)
+    group_by = forms.ChoiceField(
+        choices=GROUP_BY,
+        required=False,
+        label=_('Show'),
+        widget=forms.RadioSelect)
 
     def __init__(self, *args, **kwargs):
         super(AdvancedSearchForm, self).__init__(*args, **kwargs)
+        # The access is resolved when the queryset
+        # is created, so it can't be done at import time
+        self.fields['category'].queryset = Category.objects.visible()
         self.fields['category'].label_from_instance = (
             lambda obj: smart_text(obj.title))
 
+    def clean_group_by(self):
+        return self.cleaned_data['group_by'] or GROUP_BY_TOPIC
+
     def search(self):
         sqs = super(AdvancedSearchForm, self).search()
 
         if isinstance(sqs, EmptySearchQuerySet):
             return sqs
 
-        topics = sqs.models(Topic)
+        results = self._filter_access(
+            self._filter_group(sqs, self.cleaned_data['group_by']))
         categories = self.cleaned_data['category']
 
         if categories:
-            topics = topics.filter(
+            results = results.filter(
                 category_id__in=[c.pk for c in categories])
 
         # See: haystack pull #1141 and #1093
         # querying False won't work on elastic
-        return topics.filter(is_removed=0)
+        return results.filter(is_removed=0)
@@ -0,0 +1,27 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TopicIndexQueue',
+            fields=[
+                ('id', models.AutoField(verbose_name='ID', primary_key=True, serialize=False, auto_created=True)),
+                ('topic_id', models.IntegerField(verbose_name='topic', unique=True)),
+                ('date', models.DateTimeField(verbose_name='date', default=django.utils.timezone.now)),
+            ],
+            options={
+                'verbose_name': 'topic index queue',
+                'verbose_name_plural': 'topics index queue',
+                'ordering': ['date', 'pk'],
+            },
+        ),
+    ]
@@ -0,0 +1,45 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('spirit_search', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchDocument',
+            fields=[
+                ('id', models.AutoField(verbose_name='ID', primary_key=True, serialize=False, auto_created=True)),
+                ('identifier', models.CharField(verbose_name='identifier', max_length=255, unique=True)),
+                ('django_ct', models.CharField(verbose_name='content type', max_length=255, db_index=True)),
+                ('django_id', models.CharField(verbose_name='object id', max_length=255)),
+                ('stored', models.TextField(verbose_name='stored fields', default='{}')),
+            ],
+            options={
+                'verbose_name': 'search document',
+                'verbose_name_plural': 'search documents',
+            },
+        ),
+        migrations.CreateModel(
+            name='SearchPosting',
+            fields=[
+                ('id', models.AutoField(verbose_name='ID', primary_key=True, serialize=False, auto_created=True)),
+                ('term', models.CharField(verbose_name='term', max_length=100)),
+                ('frequency', models.PositiveIntegerField(verbose_name='frequency', default=1)),
+                ('document', models.ForeignKey(related_name='postings', to='spirit_search.SearchDocument')),
+            ],
+            options={
+                'verbose_name': 'search posting',
+                'verbose_name_plural': 'search postings',
+            },
+        ),
+        migrations.AlterUniqueTogether(
+            name='searchposting',
+            unique_together=set([('term', 'document')]),
+        ),
+    ]
@@ -0,0 +1,28 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+import django.utils.timezone
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('spirit_search', '0002_searchdocument_searchposting'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CommentIndexQueue',
+            fields=[
+                ('id', models.AutoField(verbose_name='ID', primary_key=True, serialize=False, auto_created=True)),
+                ('comment_id', models.IntegerField(verbose_name='comment', unique=True)),
+                ('date', models.DateTimeField(verbose_name='date', default=django.utils.timezone.now)),
+            ],
+            options={
+                'verbose_name': 'comment index queue',
+                'verbose_name_plural': 'comments index queue',
+                'ordering': ['date', 'pk'],
+            },
+        ),
+    ]
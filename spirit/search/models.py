@@ -0,0 +1,333 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+from django.db import models, transaction, IntegrityError
+from django.db.models import Q
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.conf import settings
+from django.utils.translation import ugettext_lazy as _
+from django.utils import timezone
+from django.utils.encoding import python_2_unicode_compatible
+
+from ..category.models import Category
+from ..topic.models import Topic
+from ..comment.models import Comment
+from .signals import topics_changed, comments_changed
+from . import typeahead
+
+# Keep the IN lists within the
+# SQLite parameters limit (999)
+_ENQUEUE_BATCH_SIZE = 300
+
+# The topic and category fields the comments
+# index depends on, the comments are queued
+# again only when one of these changes
+_TOPIC_COMMENT_FIELDS = ('category', 'is_removed', 'effective_is_removed', 'effective_is_private')
+_CATEGORY_COMMENT_FIELDS = ('parent', 'is_removed', 'is_private')
+
+
+def _batches(pks):
+    pks = sorted(pks)
+
+    for i in range(0, len(pks), _ENQUEUE_BATCH_SIZE):
+        yield set(pks[i:i + _ENQUEUE_BATCH_SIZE])
+
+
+def _enqueue(model, field_name, pks):
+    """
+    Insert the missing entries and bump\
+    the date of the existing ones
+    """
+    for batch in _batches(pks):
+        _enqueue_batch(model, field_name, batch)
+
+
+def _enqueue_batch(model, field_name, pks):
+    now = timezone.now()
+    queued = set(
+        model.objects
+        .filter(**{'%s__in' % field_name: pks})
+        .values_list(field_name, flat=True))
+
+    if queued:
+        model.objects\
+            .filter(**{'%s__in' % field_name: queued})\
+            .update(date=now)
+
+    new_pks = pks - queued
+
+    try:
+        with transaction.atomic():
+            model.objects.bulk_create([
+                model(**{field_name: pk, 'date': now})
+                for pk in new_pks])
+    except IntegrityError:
+        # Some of them were queued concurrently
+        for pk in new_pks:
+            _enqueue_one(model, field_name, pk, now)
+
+
+def _enqueue_one(model, field_name, pk, date):
+    updated = model.objects\
+        .filter(**{field_name: pk})\
+        .update(date=date)
+
+    if updated:
+        return
+
+    try:
+        with transaction.atomic():
+            model.objects.create(**{field_name: pk, 'date': date})
+    except IntegrityError:
+        model.objects\
+            .filter(**{field_name: pk})\
+            .update(date=date)
+
+
+@python_2_unicode_compatible
+class TopicIndexQueue(models.Model):
+    """
+    Topics waiting to be (re)indexed, see the\
+    ``spiritsearchqueue`` command. There is one\
+    entry per topic, the date is bumped when the\
+    topic changes again before being indexed
+
+    :ivar topic_id: The topic pk, it's not a foreign\
+    key so deleted topics can be removed from the index
+    :vartype topic_id: `:py:class:models.IntegerField`
+    :ivar date: Last time the topic was queued
+    :vartype date: `:py:class:models.DateTimeField`
+    """
+    topic_id = models.IntegerField(_("topic"), unique=True)
+    date = models.DateTimeField(_("date"), default=timezone.now)
+
+    class Meta:
+        ordering = ['date', 'pk']
+        verbose_name = _("topic index queue")
+        verbose_name_plural = _("topics index queue")
+
+    def __str__(self):
+        return '%d' % self.topic_id
+
+    @classmethod
+    def enqueue(cls, topic_ids, comments=False):
+        """
+        Queue the topics, unless\
+        ``settings.ST_SEARCH_INDEX_QUEUE`` is off.\
+        The ``topics_changed`` signal is sent either way
+
+        :param topic_ids: Iterable of topic pks
+        :param comments: Queue the topics comments as well,\
+        this is only needed when the category or the\
+        visibility of the topics changed, since the\
+        comments index stores those
+        """
+        topic_ids = set(topic_ids)
+
+        if not topic_ids:
+            return
+
+        topics_changed.send(sender=cls, topic_ids=topic_ids)
+
+        if settings.ST_SEARCH_INDEX_QUEUE:
+            _enqueue(cls, 'topic_id', topic_ids)
+
+        if comments and (
+                settings.ST_SEARCH_INDEX_QUEUE or
+                comments_changed.has_listeners()):
+            for batch in _batches(topic_ids):
+                CommentIndexQueue.enqueue(
+                    Comment.objects
+                    .filter(topic_id__in=batch)
+                    .values_list('pk', flat=True))
+
+    @classmethod
+    def enqueue_category(cls, category, comments=False):
+        """
+        Queue the topics within the\
+        category and its subcategories
+
+        :param comments: Queue the topics comments as well
+        """
+        if not settings.ST_SEARCH_INDEX_QUEUE:
+            return
+
+        cls.enqueue(
+            Topic.objects
+            .filter(Q(category=category) | Q(category__parent=category))
+            .values_list('pk', flat=True),
+            comments=comments)
+
+
+@python_2_unicode_compatible
+class CommentIndexQueue(models.Model):
+    """
+    Comments waiting to be (re)indexed,\
+    see :py:class:`TopicIndexQueue`
+
+    :ivar comment_id: The comment pk
+    :vartype comment_id: `:py:class:models.IntegerField`
+    :ivar date: Last time the comment was queued
+    :vartype date: `:py:class:models.DateTimeField`
+    """
+    comment_id = models.IntegerField(_("comment"), unique=True)
+    date = models.DateTimeField(_("date"), default=timezone.now)
+
+    class Meta:
+        ordering = ['date', 'pk']
+        verbose_name = _("comment index queue")
+        verbose_name_plural = _("comments index queue")
+
+    def __str__(self):
+        return '%d' % self.comment_id
+
+    @classmethod
+    def enqueue(cls, comment_ids):
+        """
+        Queue the comments, unless\
+        ``settings.ST_SEARCH_INDEX_QUEUE`` is off.\
+        The ``comments_changed`` signal is sent either way
+
+        :param comment_ids: Iterable of comment pks
+        """
+        comment_ids = set(comment_ids)
+
+        if not comment_ids:
+            return
+
+        comments_changed.send(sender=cls, comment_ids=comment_ids)
+
+        if settings.ST_SEARCH_INDEX_QUEUE:
+            _enqueue(cls, 'comment_id', comment_ids)
+
+
+@python_2_unicode_compatible
+class SearchDocument(models.Model):
+    """
+    Document of the database search backend,\
+    see :py:mod:`spirit.search.db_backend`
+
+    :ivar identifier: The haystack identifier,\
+    i.e: ``spirit_topic.topic.1``
+    :vartype identifier: `:py:class:models.CharField`
+    :ivar stored: JSON of the stored fields
+    :vartype stored: `:py:class:models.TextField`
+    """
+    identifier = models.CharField(_("identifier"), max_length=255, unique=True)
+    django_ct = models.CharField(_("content type"), max_length=255, db_index=True)
+    django_id = models.CharField(_("object id"), max_length=255)
+    stored = models.TextField(_("stored fields"), default='{}')
+
+    class Meta:
+        verbose_name = _("search document")
+        verbose_name_plural = _("search documents")
+
+    def __str__(self):
+        return self.identifier
+
+
+class SearchPosting(models.Model):
+    """
+    A term of a search document. Terms\
+    of the document field are words,\
+    the other indexed fields are stored\
+    as ``field=value`` terms
+
+    :ivar frequency: Times the term\
+    is found within the document
+    :vartype frequency: `:py:class:models.PositiveIntegerField`
+    """
+    document = models.ForeignKey(SearchDocument, related_name='postings')
+    term = models.CharField(_("term"), max_length=100)
+    frequency = models.PositiveIntegerField(_("frequency"), default=1)
+
+    class Meta:
+        unique_together = ('term', 'document')
+        verbose_name = _("search posting")
+        verbose_name_plural = _("search postings")
+
+
+def _has_changed(instance, field_names, update_fields):
+    """
+    Whether any of the fields differs from the\
+    saved row. New instances have not changed
+    """
+    if instance.pk is None:
+        return False
+
+    if update_fields is not None and not set(field_names) & set(update_fields):
+        return False
+
+    attnames = [instance._meta.get_field(name).attname for name in field_names]
+    saved = type(instance).objects\
+        .filter(pk=instance.pk)\
+        .values_list(*attnames)\
+        .first()
+    return (
+        saved is not None and
+        tuple(saved) != tuple(getattr(instance, name) for name in attnames))
+
+
+def track_topic_comments_fields(sender, instance, update_fields=None, **kwargs):
+    instance._st_comments_changed = _has_changed(
+        instance, _TOPIC_COMMENT_FIELDS, update_fields)
+
+pre_save.connect(track_topic_comments_fields, sender=Topic, dispatch_uid='Topic:track_topic_comments_fields')
+
+
+def enqueue_topic(sender, instance, **kwargs):
+    TopicIndexQueue.enqueue(
+        [instance.pk],
+        comments=getattr(instance, '_st_comments_changed', False))
+
+post_save.connect(enqueue_topic, sender=Topic, dispatch_uid='Topic:enqueue_topic')
+
+
+def enqueue_comment(sender, instance, **kwargs):
+    TopicIndexQueue.enqueue([instance.topic_id])
+    CommentIndexQueue.enqueue([instance.pk])
+
+post_save.connect(enqueue_comment, sender=Comment, dispatch_uid='Comment:enqueue_comment')
+
+
+def track_category_comments_fields(sender, instance, update_fields=None, **kwargs):
+    instance._st_comments_changed = _has_changed(
+        instance, _CATEGORY_COMMENT_FIELDS, update_fields)
+
+pre_save.connect(track_category_comments_fields, sender=Category, dispatch_uid='Category:track_category_comments_fields')
+
+
+def enqueue_category_topics(sender, instance, created, **kwargs):
+    if created:
+        return
+
+    TopicIndexQueue.enqueue_category(
+        instance,
+        comments=getattr(instance, '_st_comments_changed', False))
+
+post_save.connect(enqueue_category_topics, sender=Category, dispatch_uid='Category:enqueue_category_topics')
+
+
+def update_typeahead_user(sender, instance, **kwargs):
+    typeahead.update_user(instance)
+
+post_save.connect(update_typeahead_user, sender=settings.AUTH_USER_MODEL, dispatch_uid='User:update_typeahead_user')
+
+
+def remove_typeahead_user(sender, instance, **kwargs):
+    typeahead.remove_user(instance)
+
+post_delete.connect(remove_typeahead_user, sender=settings.AUTH_USER_MODEL, dispatch_uid='User:remove_typeahead_user')
+
+
+def update_typeahead_topic(sender, instance, **kwargs):
+    typeahead.update_topic(instance)
+
+post_save.connect(update_typeahead_topic, sender=Topic, dispatch_uid='Topic:update_typeahead_topic')
+
+
+def remove_typeahead_topic(sender, instance, **kwargs):
+    typeahead.remove_topic(instance)
+
+post_delete.connect(remove_typeahead_topic, sender=Topic, dispatch_uid='Topic:remove_typeahead_topic')
@@ -8,6 +8,11 @@ from django.db.models import Q
 from haystack import indexes
 
 from ..topic.models import Topic
+from ..comment.models import Comment
+from .utils import get_topic_text, get_comment_text
+
+# Text stored to build the result snippet
+COMMENT_BODY_MAX_LEN = 1000
 
 
 # See: django-haystack issue #801
@@ -31,9 +36,10 @@ class BooleanField(indexes.BooleanField):
 
 class TopicIndex(indexes.SearchIndex, indexes.Indexable):
 
-    text = indexes.CharField(document=True, use_template=True, stored=False)
+    text = indexes.CharField(document=True, stored=False)
     category_id = indexes.IntegerField(model_attr='category_id', stored=False)
     is_removed = BooleanField(stored=False)
+    is_comment = BooleanField(stored=False)
 
     title = indexes.CharField(model_attr='title', indexed=False)
     slug = indexes.CharField(model_attr='slug', indexed=False)
@@ -47,10 +53,12 @@ class TopicIndex(indexes.SearchIndex, indexes.Indexable):
 
     # Overridden
     def index_queryset(self, using=None):
+        # The access is filtered on search
         return (self.get_model().objects
-                .visible()
+                .unremoved()
+                .public()
                 .exclude(category_id=settings.ST_TOPIC_PRIVATE_CATEGORY_PK)
-                .select_related('category__parent'))
+                .select_related('category', 'main_category'))
 
     # Overridden
     def build_queryset(self, using=None, start_date=None, end_date=None):
@@ -90,6 +98,17 @@ class TopicIndex(indexes.SearchIndex, indexes.Indexable):
                     Q(**lookup_subcategory))
                 .order_by('pk'))
 
+    def prepare_text(self, obj):
+        """
+        Populate the ``text`` index field\
+        with the title and the comments text,\
+        see :py:func:`spirit.search.utils.get_topic_text`
+
+        :param obj: Topic
+        :return: text
+        """
+        return get_topic_text(obj)
+
     def prepare_is_removed(self, obj):
         """
         Populate the ``is_removed`` index field
@@ -97,9 +116,17 @@ class TopicIndex(indexes.SearchIndex, indexes.Indexable):
         :param obj: Topic
         :return: whether the topic is removed or not
         """
-        return (obj.is_removed or
-                obj.category.is_removed or
-                obj.main_category.is_removed)
+        return obj.effective_is_removed
+
+    def prepare_is_comment(self, obj):
+        """
+        Populate the ``is_comment`` index field,\
+        see :py:meth:`spirit.search.forms.BaseSearchForm.search`
+
+        :param obj: Topic
+        :return: False
+        """
+        return False
 
     def prepare_main_category_name(self, obj):
         """
@@ -110,3 +137,73 @@ class TopicIndex(indexes.SearchIndex, indexes.Indexable):
         :return: main category name
         """
         return obj.main_category.title
+
+
+class CommentIndex(indexes.SearchIndex, indexes.Indexable):
+
+    text = indexes.CharField(document=True, stored=False)
+    category_id = indexes.IntegerField(model_attr='topic__category_id', stored=False)
+    is_removed = BooleanField(stored=False)
+    is_comment = BooleanField(stored=False)
+
+    topic_id = indexes.IntegerField(model_attr='topic_id', indexed=False)
+    topic_title = indexes.CharField(model_attr='topic__title', indexed=False)
+    date = indexes.DateTimeField(model_attr='date', indexed=False)
+    body = indexes.CharField(indexed=False)
+
+    # Overridden
+    def get_model(self):
+        return Comment
+
+    # Overridden
+    def get_updated_field(self):
+        # Edits are not caught, those are
+        # indexed through the signals
+        return 'date'
+
+    # Overridden
+    def index_queryset(self, using=None):
+        return (self.get_model().objects
+                .unremoved()
+                .public()
+                .exclude(topic__category_id=settings.ST_TOPIC_PRIVATE_CATEGORY_PK)
+                .select_related('topic'))
+
+    def prepare_text(self, obj):
+        """
+        Populate the ``text`` index field\
+        with the comment text, without quotes
+
+        :param obj: Comment
+        :return: text
+        """
+        return get_comment_text(obj.comment_html)
+
+    def prepare_is_removed(self, obj):
+        """
+        Populate the ``is_removed`` index field
+
+        :param obj: Comment
+        :return: whether the comment or its topic is removed or not
+        """
+        return obj.is_removed or obj.topic.effective_is_removed
+
+    def prepare_is_comment(self, obj):
+        """
+        Populate the ``is_comment`` index field
+
+        :param obj: Comment
+        :return: True
+        """
+        return True
+
+    def prepare_body(self, obj):
+        """
+        Populate the ``body`` index field\
+        with the start of the comment text,\
+        the snippets are built from it
+
+        :param obj: Comment
+        :return: text
+        """
+        return get_comment_text(obj.comment_html)[:COMMENT_BODY_MAX_LEN]
@@ -0,0 +1,52 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+from django.dispatch import Signal
+
+from haystack.signals import BaseSignalProcessor
+
+from .cache import bump_generation
+
+# Sent with the pks of the topics or
+# comments that need to be (re)indexed
+topics_changed = Signal(providing_args=['topic_ids'])
+comments_changed = Signal(providing_args=['comment_ids'])
+
+
+class TopicSignalProcessor(BaseSignalProcessor):
+    """
+    Index the changed topics and comments right away,\
+    within the current transaction. Meant for\
+    the database backend (see\
+    :py:mod:`spirit.search.db_backend`), set\
+    ``HAYSTACK_SIGNAL_PROCESSOR`` to this class path.
+
+    Category changes are not handled\
+    here, those are left to the\
+    ``spiritsearchqueue`` command
+    """
+
+    def setup(self):
+        topics_changed.connect(self.handle_topics_changed)
+        comments_changed.connect(self.handle_comments_changed)
+
+    def teardown(self):
+        topics_changed.disconnect(self.handle_topics_changed)
+        comments_changed.disconnect(self.handle_comments_changed)
+
+    def handle_topics_changed(self, sender, topic_ids, **kwargs):
+        from .utils import update_topics
+
+        for using in self.connection_router.for_write():
+            update_topics(list(topic_ids), using=using)
+
+        bump_generation()
+
+    def handle_comments_changed(self, sender, comment_ids, **kwargs):
+        from .utils import update_comments
+
+        for using in self.connection_router.for_write():
+            update_comments(list(comment_ids), using=using)
+
+        bump_generation()
@@ -1,24 +1,35 @@
 # -*- coding: utf-8 -*-
 
 from __future__ import unicode_literals
+import json
 import datetime
+import threading
 
 from django.test import TestCase, override_settings
+from django.contrib.auth.models import Group
 from django.core.urlresolvers import reverse
 from django.template import Template, Context
 from django.conf import settings
 from django.core.management import call_command
-from django.template.loader import render_to_string
 from django.utils import timezone
+from django.utils.six import StringIO
 
+from haystack import connections, connection_router
 from haystack.query import SearchQuerySet
 from djconfig.utils import override_djconfig
 
 from ..core.tests import utils
 from ..topic.models import Topic
+from ..comment.models import Comment
 from .forms import BasicSearchForm, AdvancedSearchForm
 from .tags import render_search_form
 from .search_indexes import TopicIndex
+from .utils import get_topic_text, highlight, pause_queue, resume_queue, is_queue_paused
+from .signals import TopicSignalProcessor
+from .models import TopicIndexQueue, CommentIndexQueue
+from . import models as search_models
+from . import cache as search_cache
+from . import typeahead
 
 
 def rebuild_index():
@@ -99,6 +110,38 @@ class SearchTopicIndexTest(TestCase):
         self.assertEqual(
             len(self.topic_sqs.filter(is_removed=False)), 1)
 
+    def test_rebuild_command(self):
+        """
+        Should index the topics by partitions and\
+        replace the documents of the current index
+        """
+        utils.create_private_topic()
+        category = utils.create_category()
+        topic_a = utils.create_topic(category, title='my title')
+        topic_b = utils.create_topic(category, title='my title')
+        topic_c = utils.create_topic(category, title='my title')
+        rebuild_index()
+        topic_c.delete()
+        utils.create_comment(topic=topic_b, comment_html='foo')
+
+        out = StringIO()
+        call_command(
+            "spiritsearchrebuild", workers=1, partition_size=1, batch_size=1, stdout=out)
+        self.assertEqual(
+            sorted(s.object.pk for s in self.topic_sqs.filter(text='my title')),
+            sorted([topic_a.pk, topic_b.pk]))
+        self.assertEqual(
+            [s.object.pk for s in self.topic_sqs.filter(text='foo')],
+            [topic_b.pk])
+        self.assertEqual(
+            [s.object.pk for s in SearchQuerySet().models(Comment).filter(text='foo')],
+            [Comment.objects.get(comment_html='foo').pk])
+        self.assertFalse(is_queue_paused())
+        out_put = out.getvalue().splitlines()
+        self.assertTrue(out_put[0].startswith('1/3 partitions, '))
+        self.assertTrue(out_put[2].startswith('3/3 partitions, 3 documents, '))
+        self.assertEqual(out_put[-1], 'ok')
+
     def test_indexing_slug_empty(self):
         """
         Should store the slug as an empty string
@@ -141,25 +184,56 @@ class SearchTopicIndexTest(TestCase):
         self.assertEqual(
             len(self.topic_sqs.filter(text='my title foo bar')), 1)
         self.assertEqual(
-            len(self.topic_sqs.filter(text='bar')), 1)
+            len(list(self.topic_sqs.filter(text='bar'))), 1)
         self.assertEqual(
             len(self.topic_sqs.filter(text='<b>')), 0)
         self.assertEqual(
             len(self.topic_sqs.filter(text='span')), 0)
 
-    def test_indexing_text_template(self):
+    def test_indexing_text(self):
         """
-        Should include topic title and all comments
+        Should include topic title and all comments,\
+        the first comment first then the most liked
         """
         category = utils.create_category()
         topic = utils.create_topic(category, title='my title')
         utils.create_comment(topic=topic, comment_html='<span>foo</span>')
         utils.create_comment(topic=topic, comment_html='<b>bar</b>')
+        utils.create_comment(topic=topic, comment_html='<p>baz <em>qux</em></p>', likes_count=1)
+        utils.create_comment(topic=topic, comment_html='removed', is_removed=True)
         self.assertEqual(
-            render_to_string(
-                'search/indexes/spirit_topic/topic_text.txt',
-                context={'object': topic}),
-            'my title\n\nbar\n\nfoo\n\n')
+            get_topic_text(topic),
+            'my title\nfoo\nbaz qux\nbar')
+
+    def test_indexing_text_quotes_and_embeds(self):
+        """
+        Should include each quote once, after the\
+        comments, and skip the embedded media
+        """
+        category = utils.create_category()
+        topic = utils.create_topic(category, title='my title')
+        quote = '<blockquote><p>@foo said:<br>a <blockquote>b</blockquote></p></blockquote>'
+        utils.create_comment(topic=topic, comment_html=quote + '<p>foo</p>')
+        utils.create_comment(topic=topic, comment_html=quote + '<p>bar</p>')
+        utils.create_comment(
+            topic=topic,
+            comment_html='<span class="video"><iframe src="http://x.com">'
+                         '</iframe></span><video><a href="http://x.com/x.mp4">'
+                         'http://x.com/x.mp4</a></video>baz')
+        self.assertEqual(
+            get_topic_text(topic),
+            'my title\nfoo\nbar\nbaz\n@foo said: a b')
+
+    @override_settings(ST_SEARCH_INDEX_TEXT_MAX_LEN=10)
+    def test_indexing_text_max_len(self):
+        """
+        Should cap the comments text
+        """
+        category = utils.create_category()
+        topic = utils.create_topic(category, title='my title')
+        utils.create_comment(topic=topic, comment_html='foo bar baz')
+        utils.create_comment(topic=topic, comment_html='qux')
+        self.assertEqual(get_topic_text(topic), 'my title\nfoo bar ba')
 
     def test_indexing_build_queryset_by_topic(self):
         """
@@ -262,6 +336,364 @@ class SearchTopicIndexTest(TestCase):
             len(TopicIndex().build_queryset(start_date=self.now, end_date=self.now)), 0)
 
 
+class SearchCommentIndexTest(TestCase):
+
+    def setUp(self):
+        utils.cache_clear()
+        self.comment_sqs = SearchQuerySet().models(Comment).filter(is_comment=1)
+
+    def test_indexing(self):
+        """
+        Should index the comment text without\
+        the quotes and store the result fields
+        """
+        category = utils.create_category()
+        topic = utils.create_topic(category, title='my title')
+        comment = utils.create_comment(
+            topic=topic,
+            comment_html='<p>foo</p><blockquote>bar</blockquote>')
+        rebuild_index()
+        self.assertEqual(len(self.comment_sqs.filter(text='bar')), 0)
+        results = list(self.comment_sqs.filter(text='foo'))
+        self.assertEqual([r.object for r in results], [comment])
+        fields = results[0].get_stored_fields()
+        self.assertEqual(fields['topic_id'], topic.pk)
+        self.assertEqual(fields['topic_title'], 'my title')
+        self.assertEqual(fields['body'], 'foo')
+
+    def test_indexing_excludes(self):
+        """
+        Should exclude removed, private\
+        and action comments
+        """
+        category = utils.create_category()
+        topic = utils.create_topic(category)
+        utils.create_comment(topic=topic, comment_html='foo', is_removed=True)
+        utils.create_comment(topic=topic, comment_html='foo', action=1)
+        private = utils.create_private_topic()
+        utils.create_comment(topic=private.topic, comment_html='foo')
+        rebuild_index()
+        self.assertEqual(len(self.comment_sqs.filter(text='foo')), 0)
+
+    def test_highlight(self):
+        """
+        Should mark the query words and escape the text
+        """
+        self.assertEqual(
+            highlight('a <b> Foo bar foos', 'foo'),
+            'a &lt;b&gt; <mark>Foo</mark> bar foos')
+        self.assertEqual(
+            highlight('lorem ipsum foo dolor', 'foo', length=9),
+            'ipsum <mark>foo</mark>')
+        self.assertEqual(highlight('lorem ipsum', 'foo', length=5), 'lorem')
+
+
+@override_settings(ST_SEARCH_INDEX_QUEUE=True)
+class SearchTopicIndexQueueTest(TestCase):
+
+    def setUp(self):
+        utils.cache_clear()
+        self.topic_sqs = SearchQuerySet().models(Topic)
+
+    def test_enqueue(self):
+        """
+        Should queue the changed topics once
+        """
+        main_category = utils.create_category()
+        category = utils.create_category(parent=main_category)
+        topic = utils.create_topic(category)
+        other_topic = utils.create_topic(utils.create_category())
+        self.assertEqual(
+            sorted(TopicIndexQueue.objects.values_list('topic_id', flat=True)),
+            sorted([topic.pk, other_topic.pk]))
+
+        TopicIndexQueue.objects.all().delete()
+        utils.create_comment(topic=topic)
+        utils.create_comment(topic=topic)
+        self.assertEqual(
+            list(TopicIndexQueue.objects.values_list('topic_id', flat=True)),
+            [topic.pk])
+
+        TopicIndexQueue.objects.all().delete()
+        main_category.save()
+        self.assertEqual(
+            list(TopicIndexQueue.objects.values_list('topic_id', flat=True)),
+            [topic.pk])
+
+    def test_enqueue_date(self):
+        """
+        Should bump the date of queued topics
+        """
+        yesterday = timezone.now() - datetime.timedelta(days=1)
+        topic = utils.create_topic(utils.create_category())
+        TopicIndexQueue.objects.update(date=yesterday)
+        TopicIndexQueue.enqueue([topic.pk])
+        self.assertEqual(TopicIndexQueue.objects.count(), 1)
+        self.assertGreater(TopicIndexQueue.objects.get().date, yesterday)
+
+    def test_enqueue_comments(self):
+        """
+        Should queue the new comment, or all the\
+        topic comments when the topic changes
+        """
+        topic = utils.create_topic(utils.create_category())
+        comment_a = utils.create_comment(topic=topic)
+        CommentIndexQueue.objects.all().delete()
+        comment_b = utils.create_comment(topic=topic)
+        self.assertEqual(
+            list(CommentIndexQueue.objects.values_list('comment_id', flat=True)),
+            [comment_b.pk])
+
+        CommentIndexQueue.objects.all().delete()
+        topic.title = 'new title'
+        topic.is_pinned = True
+        topic.save()
+        self.assertEqual(CommentIndexQueue.objects.count(), 0)
+
+        topic.category = utils.create_category()
+        topic.save()
+        self.assertEqual(
+            sorted(CommentIndexQueue.objects.values_list('comment_id', flat=True)),
+            sorted([comment_a.pk, comment_b.pk]))
+
+    def test_enqueue_category_comments(self):
+        """
+        Should queue the category comments\
+        only when their visibility changes
+        """
+        category = utils.create_category()
+        comment = utils.create_comment(topic=utils.create_topic(category))
+        CommentIndexQueue.objects.all().delete()
+        category.title = 'new title'
+        category.save()
+        self.assertEqual(CommentIndexQueue.objects.count(), 0)
+
+        category.is_removed = True
+        category.save()
+        self.assertEqual(
+            list(CommentIndexQueue.objects.values_list('comment_id', flat=True)),
+            [comment.pk])
+
+    def test_enqueue_batch(self):
+        """
+        Should queue the topic comments in batches
+        """
+        topic = utils.create_topic(utils.create_category())
+        comments = [utils.create_comment(topic=topic) for _ in range(3)]
+        CommentIndexQueue.objects.all().delete()
+        org_batch_size, search_models._ENQUEUE_BATCH_SIZE = \
+            search_models._ENQUEUE_BATCH_SIZE, 2
+        try:
+            TopicIndexQueue.enqueue([topic.pk], comments=True)
+            TopicIndexQueue.enqueue([topic.pk], comments=True)
+        finally:
+            search_models._ENQUEUE_BATCH_SIZE = org_batch_size
+
+        self.assertEqual(
+            sorted(CommentIndexQueue.objects.values_list('comment_id', flat=True)),
+            sorted(c.pk for c in comments))
+
+    @override_settings(ST_SEARCH_INDEX_QUEUE=False)
+    def test_enqueue_disabled(self):
+        """
+        Should not queue anything when disabled
+        """
+        utils.create_comment(topic=utils.create_topic(utils.create_category()))
+        self.assertEqual(TopicIndexQueue.objects.count(), 0)
+        self.assertEqual(CommentIndexQueue.objects.count(), 0)
+
+    def test_command_paused(self):
+        """
+        Should leave the queue while the index is rebuilt
+        """
+        utils.create_topic(utils.create_category())
+        pause_queue()
+        try:
+            out = StringIO()
+            call_command("spiritsearchqueue", stdout=out)
+        finally:
+            resume_queue()
+
+        self.assertEqual(TopicIndexQueue.objects.count(), 1)
+        self.assertEqual(
+            out.getvalue().splitlines()[0],
+            'The search index is being rebuilt, the queue is left for the next run')
+
+        call_command("spiritsearchqueue", stdout=StringIO())
+        self.assertEqual(TopicIndexQueue.objects.count(), 0)
+
+    def test_command(self):
+        """
+        Should index the queued topics and\
+        remove the ones that can't be found
+        """
+        call_command("clear_index", verbosity=0, interactive=False)
+        category = utils.create_category()
+        topic = utils.create_topic(category, title='my title')
+        removed_topic = utils.create_topic(category, title='my title')
+        comment = utils.create_comment(topic=topic, comment_html='foo')
+        call_command("spiritsearchqueue", batch_size=1, stdout=StringIO())
+        self.assertEqual(TopicIndexQueue.objects.count(), 0)
+        self.assertEqual(CommentIndexQueue.objects.count(), 0)
+        self.assertEqual(
+            [s.object.pk for s in SearchQuerySet().models(Comment).filter(text='foo')],
+            [comment.pk])
+        self.assertEqual(
+            sorted(s.object.pk for s in self.topic_sqs.filter(text='my title')),
+            sorted([topic.pk, removed_topic.pk]))
+        self.assertEqual(len(list(self.topic_sqs.filter(text='foo'))), 1)
+
+        removed_topic.is_removed = True
+        removed_topic.save()
+        Topic.objects.filter(pk=removed_topic.pk).update_visibility()
+        out = StringIO()
+        call_command("spiritsearchqueue", stdout=out)
+        self.assertEqual(TopicIndexQueue.objects.count(), 0)
+        self.assertEqual(
+            [s.object.pk for s in self.topic_sqs.filter(text='my title')],
+            [topic.pk])
+        self.assertEqual(out.getvalue().splitlines()[-1], 'ok')
+
+        Comment.objects.filter(pk=comment.pk).update(is_removed=True)
+        CommentIndexQueue.enqueue([comment.pk])
+        out = StringIO()
+        call_command("spiritsearchqueue", stdout=out)
+        self.assertEqual(len(list(SearchQuerySet().models(Comment).filter(text='foo'))), 0)
+        self.assertEqual(out.getvalue().splitlines()[1], '0 comments indexed, 1 removed')
+
+
+class SearchDatabaseBackendTest(TestCase):
+
+    def setUp(self):
+        utils.cache_clear()
+        self.topic_sqs = SearchQuerySet(using='db').models(Topic)
+
+    def update_index(self):
+        call_command("update_index", using=['db'], verbosity=0)
+
+    def test_search(self):
+        """
+        Should match all the words, ranked by frequency
+        """
+        category = utils.create_category()
+        topic_a = utils.create_topic(category, title='foo bar')
+        topic_b = utils.create_topic(category, title='foo bar')
+        utils.create_topic(category, title='foo')
+        utils.create_comment(topic=topic_b, comment_html='<p>Foo bar</p>')
+        self.update_index()
+        self.assertEqual(
+            [r.pk for r in self.topic_sqs.filter(content='bar foo')],
+            [str(topic_b.pk), str(topic_a.pk)])
+        self.assertEqual(len(self.topic_sqs.filter(content='foo')), 3)
+        self.assertEqual(len(self.topic_sqs.filter(content='baz')), 0)
+        self.assertEqual(len(self.topic_sqs.auto_query('foo -bar')), 1)
+        self.assertEqual(len(self.topic_sqs.exclude(content='bar')), 1)
+        self.assertEqual(len(self.topic_sqs.all()), 3)
+        self.assertEqual(
+            [r.pk for r in self.topic_sqs.filter(content='foo')[:1]],
+            [str(topic_b.pk)])
+        self.assertEqual(len(list(self.topic_sqs.filter(content='foo')[1:3])), 2)
+
+    def test_search_filters(self):
+        """
+        Should filter by the indexed fields
+        """
+        category_a = utils.create_category()
+        category_b = utils.create_category()
+        topic_a = utils.create_topic(category_a, title='foo')
+        topic_b = utils.create_topic(category_b, title='foo')
+        self.update_index()
+        sqs = self.topic_sqs.filter(content='foo')
+        self.assertEqual(
+            [r.pk for r in sqs.filter(category_id=category_a.pk)],
+            [str(topic_a.pk)])
+        self.assertEqual(
+            len(sqs.filter(category_id__in=[category_a.pk, category_b.pk])), 2)
+        self.assertEqual(
+            [r.pk for r in sqs.exclude(category_id=category_a.pk)],
+            [str(topic_b.pk)])
+        self.assertEqual(len(sqs.filter(is_removed=0)), 2)
+        self.assertEqual(len(sqs.filter(is_removed=True)), 0)
+
+    def test_search_stored_fields(self):
+        """
+        Should return the stored fields
+        """
+        main_category = utils.create_category(title='main')
+        category = utils.create_category(parent=main_category)
+        topic = utils.create_topic(category, title='foo')
+        self.update_index()
+        fields = list(self.topic_sqs.filter(content='foo'))[0].get_stored_fields()
+        self.assertEqual(fields['title'], 'foo')
+        self.assertEqual(fields['slug'], topic.slug)
+        self.assertEqual(fields['comment_count'], 0)
+        self.assertEqual(fields['main_category_name'], 'main')
+        self.assertEqual(
+            fields['last_active'].replace(microsecond=0),
+            timezone.make_naive(topic.last_active, timezone.utc).replace(microsecond=0))
+
+    def test_update_and_remove(self):
+        """
+        Should replace the document on\
+        update and delete it on remove
+        """
+        category = utils.create_category()
+        topic = utils.create_topic(category, title='foo')
+        backend = connections['db'].get_backend()
+        index = connections['db'].get_unified_index().get_index(Topic)
+        backend.update(index, [topic])
+        topic.title = 'bar'
+        backend.update(index, [topic])
+        self.assertEqual(len(self.topic_sqs.filter(content='foo')), 0)
+        self.assertEqual(len(self.topic_sqs.filter(content='bar')), 1)
+
+        backend.remove(topic)
+        self.assertEqual(len(self.topic_sqs.all()), 0)
+
+        backend.update(index, [topic])
+        backend.clear()
+        self.assertEqual(len(self.topic_sqs.all()), 0)
+
+    @override_settings(ST_SEARCH_QUERY_MIN_LEN=1)
+    def test_search_forms(self):
+        """
+        Should work with the search forms
+        """
+        category = utils.create_category()
+        utils.create_topic(category, title='sup?')
+        utils.create_topic(utils.create_category(), title='sup?')
+        self.update_index()
+        form = BasicSearchForm({'q': 'sup'}, searchqueryset=SearchQuerySet(using='db'))
+        self.assertEqual(form.is_valid(), True)
+        self.assertEqual(len(form.search()), 2)
+
+        form = AdvancedSearchForm(
+            {'q': 'sup', 'category': [category.pk]},
+            searchqueryset=SearchQuerySet(using='db'))
+        self.assertEqual(form.is_valid(), True)
+        self.assertEqual(len(form.search()), 1)
+
+    def test_signal_processor(self):
+        """
+        Should index the changed topics
+        """
+        processor = TopicSignalProcessor(connections, connection_router)
+        org_for_write, connection_router.for_write = connection_router.for_write, lambda **hints: ['db']
+        try:
+            category = utils.create_category()
+            topic = utils.create_topic(category, title='foo')
+            utils.create_comment(topic=topic, comment_html='bar')
+            self.assertEqual(len(self.topic_sqs.filter(content='foo bar')), 1)
+
+            Topic.objects.filter(pk=topic.pk).update(is_removed=True)
+            Topic.objects.filter(pk=topic.pk).update_visibility()
+            TopicIndexQueue.enqueue([topic.pk])
+            self.assertEqual(len(self.topic_sqs.all()), 0)
+        finally:
+            processor.teardown()
+            connection_router.for_write = org_for_write
+
+
 class SearchViewTest(TestCase):
 
     def setUp(self):
@@ -351,6 +783,60 @@ class SearchViewTest(TestCase):
                                    data)
         self.assertEqual(len(response.context['page']), 1)
 
+    def test_advanced_search_comments(self):
+        """
+        Should group the results by comment\
+        and link to the comment page
+        """
+        comment = utils.create_comment(
+            topic=self.topic, comment_html='<p>the <b>bar</b> baz</p>')
+        other = utils.create_comment(topic=self.topic2, comment_html='bar')
+        rebuild_index()
+        utils.login(self)
+        data = {'q': 'baz', 'group_by': 'comment'}
+        response = self.client.get(reverse('spirit:search:search'), data)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.context['group_by'], 'comment')
+        page = list(response.context['page'])
+        self.assertEqual(len(page), 1)
+        self.assertEqual(page[0]['pk'], str(comment.pk))
+        self.assertEqual(page[0]['fields']['topic_title'], self.topic.title)
+        self.assertEqual(page[0]['url'], reverse('spirit:comment:find', kwargs={'pk': comment.pk}))
+        self.assertEqual(page[0]['snippet'], 'the bar <mark>baz</mark>')
+        self.assertContains(response, 'the bar <mark>baz</mark>')
+
+        data['q'] = 'bar'
+        response = self.client.get(reverse('spirit:search:search'), data)
+        self.assertEqual(
+            sorted(r['url'] for r in response.context['page']),
+            sorted([
+                reverse('spirit:comment:find', kwargs={'pk': comment.pk}),
+                reverse('spirit:comment:find', kwargs={'pk': other.pk})]))
+
+        # The comments are not indexed again on title edits
+        Topic.objects.filter(pk=self.topic.pk).update(title='new title')
+        data['q'] = 'baz'
+        response = self.client.get(reverse('spirit:search:search'), data)
+        self.assertEqual(response.context['page'][0]['fields']['topic_title'], 'new title')
+        self.assertContains(response, 'new title')
+
+    def test_advanced_search_restricted_category(self):
+        """
+        Should not include the topics of\
+        categories the user can't access
+        """
+        group = Group.objects.create(name='secret')
+        self.category.restrict_access.add(group)
+        rebuild_index()
+        utils.login(self)
+        data = {'q': 'spirit search'}
+        response = self.client.get(reverse('spirit:search:search'), data)
+        self.assertEqual(len(response.context['page']), 0)
+
+        self.user.groups.add(group)
+        response = self.client.get(reverse('spirit:search:search'), data)
+        self.assertEqual(len(response.context['page']), 1)
+
     def test_search_removed_topics(self):
         """
         Should not include removed topics
@@ -372,6 +858,299 @@ class SearchViewTest(TestCase):
         self.assertEqual(len(response.context['page']), 0)
 
 
+@override_settings(ST_SEARCH_RESULTS_CACHE='default')
+class SearchResultsCacheTest(TestCase):
+
+    def setUp(self):
+        utils.cache_clear()
+        self.user = utils.create_user()
+        self.category = utils.create_category()
+        self.topic = utils.create_topic(
+            category=self.category, user=self.user, title="spirit search")
+        rebuild_index()
+
+    def search(self, **data):
+        data.setdefault('q', 'spirit search')
+        response = self.client.get(reverse('spirit:search:search'), data)
+        self.assertEqual(response.status_code, 200)
+        return [r['pk'] for r in response.context['page']]
+
+    def test_results_cached(self):
+        """
+        Should serve the cached results until the generation changes
+        """
+        utils.login(self)
+        self.assertEqual(self.search(), [str(self.topic.pk)])
+
+        topic = utils.create_topic(category=self.category, title="spirit search")
+        rebuild_index()
+        self.assertEqual(self.search(), [str(self.topic.pk)])
+        self.assertEqual(self.search(q='Spirit  SEARCH'), [str(self.topic.pk)])
+        self.assertEqual(
+            sorted(self.search(category=self.category.pk)),
+            sorted([str(self.topic.pk), str(topic.pk)]))
+
+        search_cache.bump_generation()
+        self.assertEqual(
+            sorted(self.search()),
+            sorted([str(self.topic.pk), str(topic.pk)]))
+
+    def test_results_cached_access(self):
+        """
+        Should cache the results by the categories the user can access
+        """
+        utils.login(self)
+        self.assertEqual(self.search(), [str(self.topic.pk)])
+
+        group = Group.objects.create(name='secret')
+        self.category.restrict_access.add(group)
+        self.assertEqual(self.search(), [])
+
+    @override_settings(ST_SEARCH_INDEX_QUEUE=True)
+    def test_results_cached_queue(self):
+        """
+        Should invalidate the results once the queue is indexed
+        """
+        utils.login(self)
+        self.assertEqual(self.search(), [str(self.topic.pk)])
+
+        topic = utils.create_topic(category=self.category, title="spirit search")
+        self.assertEqual(self.search(), [str(self.topic.pk)])
+        call_command("spiritsearchqueue", stdout=StringIO())
+        self.assertEqual(
+            sorted(self.search()),
+            sorted([str(self.topic.pk), str(topic.pk)]))
+
+    @override_settings(ST_SEARCH_RESULTS_CACHE_MAX_LEN=1)
+    @override_djconfig(topics_per_page=1)
+    def test_results_cached_deep_pages(self):
+        """
+        Should query the backend when the pages\
+        go beyond the cached results
+        """
+        utils.login(self)
+        topic = utils.create_topic(category=self.category, title="spirit search")
+        rebuild_index()
+        pks = self.search() + self.search(page=2)
+        self.assertEqual(
+            sorted(pks),
+            sorted([str(self.topic.pk), str(topic.pk)]))
+
+    @override_settings(ST_SEARCH_RESULTS_CACHE=None)
+    def test_results_cache_disabled(self):
+        """
+        Should not cache the results
+        """
+        utils.login(self)
+        self.assertEqual(self.search(), [str(self.topic.pk)])
+
+        topic = utils.create_topic(category=self.category, title="spirit search")
+        rebuild_index()
+        self.assertEqual(
+            sorted(self.search()),
+            sorted([str(self.topic.pk), str(topic.pk)]))
+
+
+class SearchTypeaheadTest(TestCase):
+
+    def setUp(self):
+        utils.cache_clear()
+        self.user = utils.create_user(username='foo')
+        self.category = utils.create_category()
+        self.topic = utils.create_topic(self.category, title='Hello World')
+        typeahead._build('users')
+        typeahead._build('topics')
+
+    def get(self, **data):
+        response = self.client.get(reverse('spirit:search:typeahead'), data)
+        self.assertEqual(response.status_code, 200)
+        return json.loads(response.content.decode('utf-8'))
+
+    def test_prefix_index(self):
+        """
+        Should find the items with a word\
+        starting with every query word
+        """
+        index = typeahead.PrefixIndex([
+            (1, 'Hello World', 'a'),
+            (2, 'help me', 'b'),
+            (3, 'world wide', 'c')])
+        self.assertEqual(len(index), 3)
+        self.assertEqual(sorted(index.search('hel')[0]), [(1, 'a'), (2, 'b')])
+        self.assertEqual(index.search('wor hel'), ([(1, 'a')], False))
+        self.assertEqual(index.search('xyz'), ([], False))
+        self.assertEqual(index.search(''), ([], False))
+        self.assertEqual(
+            index.search('hel', allow=lambda data: data == 'b'),
+            ([(2, 'b')], False))
+        self.assertEqual(index.search('hel', deadline=0), ([], True))
+
+        index.add(2, 'world peace', 'd')
+        index.remove(1)
+        self.assertEqual(index.search('hel'), ([], False))
+        self.assertEqual(sorted(index.search('wor')[0]), [(2, 'd'), (3, 'c')])
+        self.assertEqual(len(index), 2)
+
+    def test_prefix_index_scan_limit(self):
+        """
+        Should scan the highest ranked items of\
+        a key first, and tell when the scan stops\
+        before the last matching key
+        """
+        index = typeahead.PrefixIndex(
+            [(pk, 'foo', pk) for pk in range(1, 6)] +
+            [(6, 'foobar', 6)],
+            rank=lambda data: data)
+        index.add(7, 'foo', 7)
+        org_max_scan, typeahead._MAX_SCAN = typeahead._MAX_SCAN, 3
+        try:
+            self.assertEqual(index.search('foo'), ([(7, 7), (5, 5), (4, 4)], True))
+            self.assertEqual(index.search('foob'), ([(6, 6)], False))
+        finally:
+            typeahead._MAX_SCAN = org_max_scan
+
+        self.assertEqual(len(index.search('foo')[0]), 7)
+        self.assertFalse(index.search('foo')[1])
+
+    def test_typeahead_requires_login(self):
+        """
+        Should require to be logged-in
+        """
+        response = self.client.get(reverse('spirit:search:typeahead'))
+        self.assertEqual(response.status_code, 302)
+
+    def test_typeahead_users(self):
+        """
+        Should suggest the active users, the exact match first
+        """
+        utils.login(self)
+        foobar = utils.create_user(username='foobar')
+        foobaz = utils.create_user(username='foobaz')
+        foobaz.is_active = False
+        foobaz.save()
+        self.assertEqual(
+            self.get(q='FOO', kind='user'),
+            {
+                'results': [
+                    {
+                        'id': self.user.pk,
+                        'label': 'foo',
+                        'url': reverse('spirit:user:detail', kwargs={'pk': self.user.pk})
+                    },
+                    {
+                        'id': foobar.pk,
+                        'label': 'foobar',
+                        'url': reverse('spirit:user:detail', kwargs={'pk': foobar.pk})
+                    }],
+                'partial': False})
+
+        foobar.is_active = False
+        foobar.save()
+        self.assertEqual(
+            [r['id'] for r in self.get(q='foo', kind='user')['results']],
+            [self.user.pk])
+
+    def test_typeahead_topics(self):
+        """
+        Should suggest the visible topics,\
+        the most recently active first
+        """
+        utils.login(self)
+        self.assertEqual(
+            self.get(q='wor hel'),
+            {
+                'results': [{
+                    'id': self.topic.pk,
+                    'label': 'Hello World',
+                    'url': self.topic.get_absolute_url()}],
+                'partial': False})
+
+        topic = utils.create_topic(self.category, title='hello <b>')
+        utils.create_private_topic(title='hello')
+        self.assertEqual(
+            [r['id'] for r in self.get(q='hello', kind='topic')['results']],
+            [topic.pk, self.topic.pk])
+        self.assertEqual(
+            self.get(q='hello')['results'][0]['label'], 'hello &lt;b&gt;')
+
+        topic.is_removed = True
+        topic.save()
+        self.topic.delete()
+        self.assertEqual(self.get(q='hello')['results'], [])
+
+    def test_typeahead_topics_access(self):
+        """
+        Should not suggest the topics of\
+        categories the user can't access
+        """
+        utils.login(self)
+        group = Group.objects.create(name='secret')
+        self.category.restrict_access.add(group)
+        self.assertEqual(self.get(q='hello')['results'], [])
+
+        self.user.groups.add(group)
+        self.assertEqual(len(self.get(q='hello')['results']), 1)
+
+    @override_settings(ST_TYPEAHEAD_REBUILD_INTERVAL=None)
+    def test_typeahead_rebuild(self):
+        """
+        Should replace the index on rebuild
+        """
+        utils.login(self)
+        self.assertEqual(len(self.get(q='hello')['results']), 1)
+        Topic.objects.filter(pk=self.topic.pk).update(title='bye')
+        typeahead._build('topics')
+        self.assertEqual(self.get(q='hello')['results'], [])
+
+    def test_typeahead_build_background(self):
+        """
+        Should build the index in the background,\
+        the results are partial until then
+        """
+        utils.login(self)
+        typeahead.clear()
+        built = []
+        started = threading.Event()
+        org_rebuild = typeahead._rebuild
+
+        def rebuild_mock(name):
+            built.append(name)
+            started.set()
+
+        try:
+            typeahead._rebuild = rebuild_mock
+            self.assertEqual(self.get(q='hello'), {'results': [], 'partial': True})
+            self.assertTrue(started.wait(timeout=5))
+
+            # Building already
+            self.assertEqual(self.get(q='hello'), {'results': [], 'partial': True})
+            self.assertEqual(built, ['topics'])
+        finally:
+            typeahead._rebuild = org_rebuild
+            typeahead._indexes_rebuilding.clear()
+
+        typeahead._build('topics')
+        self.assertEqual(self.get(q='hello')['partial'], False)
+
+    @override_settings(ST_TYPEAHEAD_USERS_MAX_LEN=1)
+    def test_typeahead_users_max_len(self):
+        """
+        Should index the most recently logged-in users only
+        """
+        utils.login(self)
+        utils.create_user(username='foobar')
+        typeahead._build('users')
+        self.assertEqual(
+            [r['id'] for r in self.get(q='foo', kind='user')['results']],
+            [self.user.pk])
+
+    def test_typeahead_invalid_kind(self):
+        utils.login(self)
+        response = self.client.get(
+            reverse('spirit:search:typeahead'), {'q': 'foo', 'kind': 'bar'})
+        self.assertEqual(response.status_code, 404)
+
+
 class SearchFormTest(TestCase):
 
     def setUp(self):
@@ -0,0 +1,387 @@
+# -*- coding: utf-8 -*-
+
+"""
+In-memory prefix indexes of the usernames\
+and the recent topic titles, used to suggest\
+them as they are typed.
+
+Every process keeps its own indexes, they\
+are built in the background on first use\
+(there are no suggestions until then),\
+updated by the model signals of the process\
+and rebuilt in the background every\
+``settings.ST_TYPEAHEAD_REBUILD_INTERVAL``\
+seconds to catch up with the other processes.
+"""
+
+from __future__ import unicode_literals
+
+import re
+import time
+import bisect
+import threading
+from array import array
+
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from django.db import connection
+
+from ..topic.models import Topic
+
+__all__ = [
+    'PrefixIndex',
+    'search_users',
+    'search_topics',
+    'update_user',
+    'remove_user',
+    'update_topic',
+    'remove_topic',
+    'clear']
+
+_WORD = re.compile(r'\w+', flags=re.UNICODE)
+
+# Matches visited per search, so a short
+# prefix can't scan the whole index
+_MAX_SCAN = 250
+
+
+def _words(text):
+    return _WORD.findall(text.lower())
+
+
+class PrefixIndex(object):
+    """
+    Sorted list of keys, every key points\
+    to an item. An item has one key per word.\
+    It's thread-safe
+
+    :param items: Iterable of (pk, text, data)
+    :param rank: Callable that takes the item\
+    data and returns its rank, the items of\
+    the same key are kept in rank order\
+    (highest first) so they are scanned first
+    """
+
+    def __init__(self, items=(), rank=None):
+        self._lock = threading.Lock()
+        self._rank = rank
+        self._items = {}
+        entries = []
+
+        for pk, text, data in items:
+            words = _words(text)
+            self._items[pk] = (words, data)
+            entries.extend((word, pk) for word in set(words))
+
+        if rank is None:
+            entries.sort()
+        else:
+            # The sort is stable, so the
+            # rank order is kept within a key
+            entries.sort(key=lambda entry: rank(self._items[entry[1]][1]), reverse=True)
+            entries.sort(key=lambda entry: entry[0])
+
+        self._keys = [key for key, _pk in entries]
+        self._pks = array('l', [pk for _key, pk in entries])
+
+    def __len__(self):
+        return len(self._items)
+
+    def _add(self, pk, text, data):
+        words = _words(text)
+        self._items[pk] = (words, data)
+
+        for word in set(words):
+            i = bisect.bisect_left(self._keys, word)
+
+            if self._rank is not None:
+                rank = self._rank(data)
+
+                while (i < len(self._keys) and
+                       self._keys[i] == word and
+                       self._rank(self._items[self._pks[i]][1]) >= rank):
+                    i += 1
+
+            self._keys.insert(i, word)
+            self._pks.insert(i, pk)
+
+    def _remove(self, pk):
+        words, _data = self._items.pop(pk, ((), None))
+
+        for word in set(words):
+            i = bisect.bisect_left(self._keys, word)
+
+            while i < len(self._keys) and self._keys[i] == word:
+                if self._pks[i] == pk:
+                    del self._keys[i]
+                    del self._pks[i]
+                    break
+
+                i += 1
+
+    def add(self, pk, text, data):
+        with self._lock:
+            self._remove(pk)
+            self._add(pk, text, data)
+
+    def remove(self, pk):
+        with self._lock:
+            self._remove(pk)
+
+    def search(self, query, allow=None, deadline=None):
+        """
+        Return the items with a word starting\
+        with every word of the query. The keys\
+        are scanned for the longest query word only.\
+        Up to ``_MAX_SCAN`` keys are scanned, in\
+        key order and then in rank order
+
+        :param query: Text
+        :param allow: Callable that takes\
+        the item data and returns a bool
+        :param deadline: Time (``time.time()``)\
+        when the scanning stops
+        :return: List of (pk, data) and\
+        whether the scanning ran out of time\
+        or stopped before the last matching key
+        """
+        words = _words(query)
+
+        if not words:
+            return [], False
+
+        prefix = max(words, key=len)
+        other_words = [word for word in words if word != prefix]
+        results = []
+        seen = set()
+        partial = False
+
+        with self._lock:
+            start = bisect.bisect_left(self._keys, prefix)
+            end = min(len(self._keys), start + _MAX_SCAN)
+
+            for i in range(start, end):
+                if not self._keys[i].startswith(prefix):
+                    break
+
+                if deadline is not None and time.time() > deadline:
+                    return results, True
+
+                pk = self._pks[i]
+
+                if pk in seen:
+                    continue
+
+                seen.add(pk)
+                item_words, data = self._items[pk]
+
+                if allow is not None and not allow(data):
+                    continue
+
+                if all(any(w.startswith(word) for w in item_words) for word in other_words):
+                    results.append((pk, data))
+            else:
+                partial = (
+                    end < len(self._keys) and
+                    self._keys[end].startswith(prefix))
+
+        return results, partial
+
+
+_lock = threading.Lock()
+_indexes = {}
+_indexes_rebuilding = set()
+
+
+def _build_users():
+    users = get_user_model().objects\
+        .filter(is_active=True)\
+        .order_by('-last_login', '-pk')\
+        .values_list('pk', 'username')
+    return PrefixIndex(
+        (pk, username, username)
+        for pk, username
+        in users[:settings.ST_TYPEAHEAD_USERS_MAX_LEN].iterator())
+
+
+def _build_topics():
+    # The access is filtered on search
+    topics = Topic.objects\
+        .unremoved()\
+        .public()\
+        .exclude(category_id=settings.ST_TOPIC_PRIVATE_CATEGORY_PK)\
+        .order_by('-last_active', '-pk')\
+        .values_list('pk', 'title', 'slug', 'category_id', 'last_active')
+    return PrefixIndex(
+        ((pk, title, (title, slug, category_id, last_active))
+         for pk, title, slug, category_id, last_active
+         in topics[:settings.ST_TYPEAHEAD_TOPICS_MAX_LEN].iterator()),
+        rank=lambda data: data[3])
+
+
+_BUILDERS = {
+    'users': _build_users,
+    'topics': _build_topics}
+
+
+def _build(name):
+    index = _BUILDERS[name]()
+
+    with _lock:
+        _indexes[name] = (index, time.time())
+
+
+def _rebuild(name):
+    try:
+        _build(name)
+    finally:
+        with _lock:
+            _indexes_rebuilding.discard(name)
+
+        # This runs on its own thread
+        connection.close()
+
+
+def _get_index(name):
+    """
+    Return the index, start building it if it's\
+    not built yet or if it's stale. The stale\
+    one is used until then
+
+    :return: The index or None if it's not built yet
+    """
+    with _lock:
+        index, built_at = _indexes.get(name, (None, None))
+        interval = settings.ST_TYPEAHEAD_REBUILD_INTERVAL
+
+        if name in _indexes_rebuilding or (
+                index is not None and
+                (interval is None or time.time() - built_at < interval)):
+            return index
+
+        _indexes_rebuilding.add(name)
+
+    thread = threading.Thread(target=_rebuild, args=(name,))
+    thread.daemon = True
+    thread.start()
+    return index
+
+
+def _get_built_index(name):
+    # Signals don't need to build it
+    index, _built_at = _indexes.get(name, (None, None))
+    return index
+
+
+def _deadline():
+    return time.time() + settings.ST_TYPEAHEAD_TIME_BUDGET
+
+
+def search_users(query, limit):
+    """
+    Return the active users whose\
+    username starts with the query
+
+    :param query: Text
+    :param limit: Max number of results
+    :return: List of (pk, username), the\
+    exact and shortest matches go first;\
+    whether the search ran out of time\
+    or the index is not built yet
+    """
+    index = _get_index('users')
+
+    if index is None:
+        return [], True
+
+    results, partial = index.search(query, deadline=_deadline())
+    query = query.strip().lower()
+    results.sort(key=lambda r: (r[1].lower() != query, len(r[1]), r[1]))
+    return results[:limit], partial
+
+
+def search_topics(query, limit, category_ids=None):
+    """
+    Return the recent topics with\
+    a word starting with every word\
+    of the query
+
+    :param query: Text
+    :param limit: Max number of results
+    :param category_ids: The categories the\
+    user can access, None if there is no restriction
+    :return: List of (pk, (title, slug, category_id, last_active)),\
+    the most recently active go first;\
+    whether the search ran out of time, matched\
+    more words than are scanned (the results\
+    may not be the most recent then) or the\
+    index is not built yet
+    """
+    if category_ids is None:
+        allow = None
+    else:
+        category_ids = set(category_ids)
+
+        def allow(data):
+            return data[2] in category_ids
+
+    index = _get_index('topics')
+
+    if index is None:
+        return [], True
+
+    results, partial = index.search(
+        query, allow=allow, deadline=_deadline())
+    results.sort(key=lambda r: (r[1][3], r[0]), reverse=True)
+    return results[:limit], partial
+
+
+def update_user(user):
+    index = _get_built_index('users')
+
+    if index is None:
+        return
+
+    if user.is_active:
+        index.add(user.pk, user.username, user.username)
+    else:
+        index.remove(user.pk)
+
+
+def remove_user(user):
+    index = _get_built_index('users')
+
+    if index is not None:
+        index.remove(user.pk)
+
+
+def update_topic(topic):
+    index = _get_built_index('topics')
+
+    if index is None:
+        return
+
+    if (topic.effective_is_removed or
+            topic.effective_is_private or
+            topic.category_id == settings.ST_TOPIC_PRIVATE_CATEGORY_PK):
+        index.remove(topic.pk)
+        return
+
+    index.add(topic.pk, topic.title, (
+        topic.title, topic.slug, topic.category_id, topic.last_active))
+
+
+def remove_topic(topic):
+    index = _get_built_index('topics')
+
+    if index is not None:
+        index.remove(topic.pk)
+
+
+def clear():
+    """
+    Drop the indexes, they are built again\
+    in the background on use
+    """
+    with _lock:
+        _indexes.clear()
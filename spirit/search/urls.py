@@ -9,4 +9,5 @@ from . import views
 
 urlpatterns = [
     url(r'^$', views.SearchView(), name='search'),
+    url(r'^typeahead/$', views.typeahead, name='typeahead'),
 ]
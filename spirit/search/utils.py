@@ -0,0 +1,298 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+import re
+
+from django.conf import settings
+from django.core.cache import cache
+from django.utils.html import escape
+from django.utils.safestring import mark_safe
+from django.utils.six.moves.html_parser import HTMLParser
+
+from haystack import connections
+
+from ..comment.models import Comment, COMMENT
+from ..topic.models import Topic
+
+__all__ = [
+    'get_topic_text',
+    'get_comment_text',
+    'highlight',
+    'update_topics',
+    'update_comments',
+    'pause_queue',
+    'resume_queue',
+    'is_queue_paused']
+
+# Keep the IN lists within the
+# SQLite parameters limit (999)
+_UPDATE_BATCH_SIZE = 300
+
+_QUEUE_PAUSED_KEY = 'st_search_queue_paused'
+
+# The pause is renewed as the rebuild goes on,
+# so it's lifted if the rebuild gets killed
+_QUEUE_PAUSED_TIMEOUT = 60 * 10
+
+_WORD = re.compile(r'\w+', flags=re.UNICODE)
+
+# The content of these is not text (i.e: the
+# embedded videos fallback link) and gets skipped
+_SKIP_TAGS = {'iframe', 'video', 'audio', 'object', 'script', 'style'}
+
+
+class _TextParser(HTMLParser):
+    """
+    Extracts the text of a comment HTML,\
+    the text of the outermost quotes is\
+    extracted apart
+    """
+
+    def __init__(self):
+        HTMLParser.__init__(self)
+        self.text = []
+        self.quotes = []
+        self._skip_depth = 0
+        self._quote_depth = 0
+
+    def handle_starttag(self, tag, attrs):
+        if tag in _SKIP_TAGS:
+            self._skip_depth += 1
+        elif tag == 'blockquote':
+            if not self._quote_depth:
+                self.quotes.append([])
+
+            self._quote_depth += 1
+
+    def handle_endtag(self, tag):
+        if tag in _SKIP_TAGS:
+            self._skip_depth = max(0, self._skip_depth - 1)
+        elif tag == 'blockquote':
+            self._quote_depth = max(0, self._quote_depth - 1)
+
+    def handle_data(self, data):
+        if self._skip_depth:
+            return
+
+        if self._quote_depth:
+            self.quotes[-1].append(data)
+        else:
+            self.text.append(data)
+
+
+def _normalize(parts):
+    return ' '.join(' '.join(parts).split())
+
+
+def _extract(comment_html):
+    """
+    :return: The comment text and the quotes text
+    """
+    parser = _TextParser()
+    parser.feed(comment_html)
+    parser.close()
+    return (
+        _normalize(parser.text),
+        [_normalize(quote) for quote in parser.quotes])
+
+
+def get_comment_text(comment_html):
+    """
+    Return the text of a comment HTML,\
+    without the quotes nor embedded media
+    """
+    text, _quotes = _extract(comment_html)
+    return text
+
+
+def _comments_html(topic):
+    """
+    Stream the comments HTML, the first\
+    comment goes first, then the most liked ones
+    """
+    comments = topic.comment_set\
+        .filter(is_removed=False, action=COMMENT)
+    first = list(
+        comments
+        .order_by('date', 'pk')
+        .values_list('pk', 'comment_html')[:1])
+
+    if not first:
+        return
+
+    first_pk, first_html = first[0]
+    yield first_html
+
+    for comment_html in comments\
+            .exclude(pk=first_pk)\
+            .order_by('-likes_count', 'date', 'pk')\
+            .values_list('comment_html', flat=True)\
+            .iterator():
+        yield comment_html
+
+
+def get_topic_text(topic):
+    """
+    Return the text to index of a topic: the title,\
+    the comments text and the quotes text, each\
+    distinct quote is included once and after the\
+    comments, since they are mostly copies of them.\
+    The comments are fetched as they are needed\
+    until ``settings.ST_SEARCH_INDEX_TEXT_MAX_LEN``\
+    chars of text are reached
+
+    :param topic: The topic
+    :return: The text
+    """
+    budget = settings.ST_SEARCH_INDEX_TEXT_MAX_LEN
+    texts = [topic.title]
+    quotes = []
+    quotes_seen = set()
+    quotes_size = 0
+
+    for comment_html in _comments_html(topic):
+        if budget <= 0:
+            break
+
+        text, comment_quotes = _extract(comment_html)
+
+        if text:
+            texts.append(text[:budget])
+            budget -= len(text) + 1
+
+        for quote in comment_quotes:
+            if quotes_size >= budget or not quote or quote in quotes_seen:
+                continue
+
+            quotes_seen.add(quote)
+            quotes.append(quote)
+            quotes_size += len(quote) + 1
+
+    for quote in quotes:
+        if budget <= 0:
+            break
+
+        texts.append(quote[:budget])
+        budget -= len(quote) + 1
+
+    return '\n'.join(texts)
+
+
+def highlight(text, query, length=200):
+    """
+    Return a fragment of the text around\
+    the first word of the query found,\
+    the query words are wrapped in ``<mark>``
+
+    :param text: Plain text
+    :param query: The search query
+    :param length: Max length of the fragment
+    :return: Safe HTML
+    """
+    words = {word.lower() for word in _WORD.findall(query)}
+    matches = [
+        match
+        for match in _WORD.finditer(text)
+        if match.group(0).lower() in words]
+    start = 0
+
+    if matches:
+        start = max(0, matches[0].start() - length // 4)
+
+        # Don't cut a word
+        while start and not text[start - 1].isspace():
+            start -= 1
+
+    fragment = text[start:start + length]
+    parts = []
+    last = 0
+
+    for match in _WORD.finditer(fragment):
+        if match.group(0).lower() not in words:
+            continue
+
+        parts.append(escape(fragment[last:match.start()]))
+        parts.append('<mark>%s</mark>' % escape(match.group(0)))
+        last = match.end()
+
+    parts.append(escape(fragment[last:]))
+    return mark_safe(''.join(parts))
+
+
+def _update_index(model, pks, using):
+    """
+    Index the objects, the ones that\
+    can't be found (i.e: deleted, removed\
+    or private) are removed from the index
+
+    :return: The number of updated\
+    and removed objects
+    """
+    backend = connections[using].get_backend()
+    index = connections[using].get_unified_index().get_index(model)
+    updated_count = 0
+    removed_count = 0
+
+    for i in range(0, len(pks), _UPDATE_BATCH_SIZE):
+        batch = pks[i:i + _UPDATE_BATCH_SIZE]
+        objs = list(
+            index.index_queryset(using=using)
+            .filter(pk__in=batch))
+
+        if objs:
+            backend.update(index, objs)
+
+        indexed_pks = {obj.pk for obj in objs}
+        removed_pks = [pk for pk in batch if pk not in indexed_pks]
+
+        for pk in removed_pks:
+            backend.remove('%s.%s.%d' % (
+                model._meta.app_label, model._meta.model_name, pk))
+
+        updated_count += len(objs)
+        removed_count += len(removed_pks)
+
+    return updated_count, removed_count
+
+
+def update_topics(topic_ids, using):
+    """
+    Index the topics, see :py:func:`_update_index`
+
+    :param topic_ids: List of topic pks
+    :param using: Haystack connection alias
+    :return: The number of updated\
+    and removed topics
+    """
+    return _update_index(Topic, topic_ids, using)
+
+
+def update_comments(comment_ids, using):
+    """
+    Index the comments, see :py:func:`_update_index`
+
+    :param comment_ids: List of comment pks
+    :param using: Haystack connection alias
+    :return: The number of updated\
+    and removed comments
+    """
+    return _update_index(Comment, comment_ids, using)
+
+
+def pause_queue():
+    """
+    Pause the ``spiritsearchqueue`` command,\
+    the queued entries are left for the\
+    runs after :py:func:`resume_queue`.\
+    It must be renewed within 10 minutes
+    """
+    cache.set(_QUEUE_PAUSED_KEY, True, timeout=_QUEUE_PAUSED_TIMEOUT)
+
+
+def resume_queue():
+    cache.delete(_QUEUE_PAUSED_KEY)
+
+
+def is_queue_paused():
+    return cache.get(_QUEUE_PAUSED_KEY, False)
@@ -3,13 +3,24 @@
 from __future__ import unicode_literals
 
 from haystack.views import SearchView as BaseSearchView
+from haystack.query import SearchQuerySet, EmptySearchQuerySet
 from djconfig import config
 
+from django.conf import settings
+from django.core.urlresolvers import reverse
+from django.http import Http404
 from django.utils.decorators import method_decorator
+from django.utils.html import escape
 from django.contrib.auth.decorators import login_required
 
-from .forms import AdvancedSearchForm
+from .forms import AdvancedSearchForm, GROUP_BY_TOPIC, GROUP_BY_COMMENT
+from .utils import highlight
+from . import cache as search_cache
+from . import typeahead as search_typeahead
+from ..core.utils import json_response
 from ..core.utils.paginator import yt_paginate
+from ..category import acl
+from ..topic.models import Topic
 
 
 class SearchView(BaseSearchView):
@@ -32,13 +43,128 @@ class SearchView(BaseSearchView):
     def __call__(self, request):
         return super(SearchView, self).__call__(request)
 
+    def build_form(self, form_kwargs=None):
+        form_kwargs = dict(form_kwargs or {}, user=self.request.user)
+        return super(SearchView, self).build_form(form_kwargs=form_kwargs)
+
+    def _get_group_by(self):
+        if self.form.is_valid():
+            return self.form.cleaned_data['group_by']
+
+        return GROUP_BY_TOPIC
+
+    def _get_pages_end(self):
+        """
+        Return the number of results the paginator\
+        reads, it counts the results up to the last\
+        page link. None if the page is not valid
+        """
+        try:
+            page_number = int(self.request.GET.get('page', 1))
+        except (TypeError, ValueError):
+            return
+
+        pages = page_number + settings.ST_YT_PAGINATOR_PAGE_RANGE * 2
+        return pages * config.topics_per_page
+
+    def get_results(self):
+        """
+        Return the cached results if caching is\
+        enabled, see :py:mod:`spirit.search.cache`
+        """
+        results = super(SearchView, self).get_results()
+
+        if (not search_cache.is_enabled() or
+                isinstance(results, EmptySearchQuerySet)):
+            return results
+
+        key = search_cache.get_key(
+            query=self.form.cleaned_data['q'],
+            group_by=self.form.cleaned_data['group_by'],
+            category_ids=[c.pk for c in self.form.cleaned_data['category']],
+            access_category_ids=acl.get_category_ids(self.request.user, acl.ACCESS))
+        cached_results = search_cache.get_results(key, results)
+        pages_end = self._get_pages_end()
+
+        # Deep pages are not cached
+        if (len(cached_results) >= settings.ST_SEARCH_RESULTS_CACHE_MAX_LEN and
+                (pages_end is None or
+                 pages_end > settings.ST_SEARCH_RESULTS_CACHE_MAX_LEN)):
+            return results
+
+        return cached_results
+
     def build_page(self):
         paginator = None
         page = yt_paginate(
             self.results,
             per_page=config.topics_per_page,
             page_number=self.request.GET.get('page', 1))
+
+        if isinstance(self.results, SearchQuerySet):
+            page = [(r.pk, r.get_stored_fields()) for r in page]
+
         page = [
-            {'fields': r.get_stored_fields(), 'pk': r.pk}
-            for r in page]
+            {'fields': dict(fields), 'pk': pk}
+            for pk, fields in page]
+
+        if self._get_group_by() == GROUP_BY_COMMENT:
+            # The comments are not indexed again
+            # when the topic title is edited
+            titles = dict(
+                Topic.objects
+                .filter(pk__in={r['fields']['topic_id'] for r in page})
+                .values_list('pk', 'title'))
+
+            for r in page:
+                r['fields']['topic_title'] = titles.get(
+                    r['fields']['topic_id'], r['fields']['topic_title'])
+                # The comment number changes when the previous
+                # ones are moved or deleted, so it's not stored
+                r['url'] = reverse('spirit:comment:find', kwargs={'pk': r['pk']})
+                r['snippet'] = highlight(r['fields']['body'] or '', self.query)
+
         return paginator, page
+
+    def extra_context(self):
+        return {'group_by': self._get_group_by()}
+
+
+@login_required
+def typeahead(request):
+    """
+    Suggest the usernames (``kind=user``)\
+    or the topic titles (``kind=topic``)\
+    starting with the query, see\
+    :py:mod:`spirit.search.typeahead`
+    """
+    query = request.GET.get('q', '')
+    kind = request.GET.get('kind', 'topic')
+    limit = settings.ST_TYPEAHEAD_RESULTS
+
+    if kind == 'user':
+        users, partial = search_typeahead.search_users(query, limit)
+        results = [
+            {
+                'id': pk,
+                'label': escape(username),
+                'url': reverse('spirit:user:detail', kwargs={'pk': pk})
+            }
+            for pk, username in users
+        ]
+    elif kind == 'topic':
+        topics, partial = search_typeahead.search_topics(
+            query, limit,
+            category_ids=acl.get_category_ids(request.user, acl.ACCESS))
+        results = [
+            {
+                'id': pk,
+                'label': escape(title),
+                'url': reverse('spirit:topic:detail', kwargs={'pk': pk, 'slug': slug})
+            }
+            for pk, (title, slug, _category_id, _last_active) in topics
+        ]
+    else:
+        raise Http404()
+
+    return json_response({'results': results, 'partial': partial})
@@ -16,7 +16,35 @@ ST_RATELIMIT_FOR_AUTH = '5/5m'
 ST_RATELIMIT_FOR_REGISTER = '2/10s'
 ST_RATELIMIT_SKIP_TIMEOUT_CHECK = False
 
+ST_CATEGORY_ACL_CACHE = 'default'
+
+ST_TOPIC_VIEWS_BUFFER_CACHE = None  # i.e: 'default', views are written right away when None
+ST_TOPIC_VIEWS_FLUSH_INTERVAL = 60  # seconds, None to flush through the spirittopicviews command only
+ST_TOPIC_VIEWS_UNIQUE = False  # count unique viewers instead of page views
+
+# 'inline' runs the jobs (i.e: comment notifications) after the request commits,
+# 'queue' stores them in the DB and the spiritjobs command runs them
+ST_JOBS_MODE = 'inline'
+ST_JOBS_MAX_ATTEMPTS = 5
+ST_JOBS_LOCK_SECONDS = 60 * 5
+ST_JOBS_RETRY_SECONDS = 60  # multiplied by the attempts
+
 ST_NOTIFICATIONS_PER_PAGE = 20
+ST_NOTIFICATIONS_COUNTER_CACHE = 'default'  # unread notifications counters
+# 'socket' publishes the notifications to the spiritnotificationstream
+# server, 'local' within the process, None disables them
+ST_NOTIFICATIONS_PUBSUB = None
+ST_NOTIFICATIONS_PUBSUB_SOCKET = '/tmp/spirit_notifications.sock'
+ST_NOTIFICATIONS_STREAM_POLL_TIMEOUT = 30  # seconds a long-poll waits for the unread counter to change
+ST_NOTIFICATIONS_STREAM_PING_INTERVAL = 15  # seconds, keeps the server-sent events connections open
+ST_NOTIFICATIONS_EMAIL_SITE_URL = None  # i.e: 'https://example.com', the notification emails are sent when it's set
+ST_NOTIFICATIONS_EMAIL_BATCH_SIZE = 100  # emails sent per send_messages() call
+ST_NOTIFICATIONS_EMAIL_RATE = None  # max emails sent per second, None for no limit
+ST_NOTIFICATIONS_EMAIL_MAX_AGE = 60 * 60 * 24 * 3  # seconds, older notifications are no longer emailed nor retried
+ST_NOTIFICATIONS_EMAIL_DIGEST_INTERVAL = 60 * 60 * 24  # seconds between the digests of a user
+
+ST_MARKDOWN_CACHE_SIZE = 1000  # rendered texts kept in memory by each process, 0 to disable
+ST_MARKDOWN_CACHE = None  # i.e: 'default', shares the rendered texts between processes
 
 ST_COMMENT_MAX_LEN = 3000
 ST_MENTIONS_PER_COMMENT = 30
@@ -25,10 +53,21 @@ ST_DOUBLE_POST_THRESHOLD_MINUTES = 30
 ST_YT_PAGINATOR_PAGE_RANGE = 3
 
 ST_SEARCH_QUERY_MIN_LEN = 3
+ST_SEARCH_INDEX_TEXT_MAX_LEN = 100000  # chars indexed per topic, the first and most liked comments go first
+ST_SEARCH_INDEX_QUEUE = False  # queue the changed topics, the spiritsearchqueue command indexes them
+ST_SEARCH_RESULTS_CACHE = None  # i.e: 'default', caches the results of the search queries
+ST_SEARCH_RESULTS_CACHE_MAX_LEN = 1000  # results cached per query, deeper pages query the search backend
+
+ST_TYPEAHEAD_TOPICS_MAX_LEN = 10000  # most recently active topics suggested
+ST_TYPEAHEAD_USERS_MAX_LEN = 100000  # most recently logged-in users suggested
+ST_TYPEAHEAD_RESULTS = 10
+ST_TYPEAHEAD_TIME_BUDGET = 0.01  # seconds scanning the index per request, the results are partial when it's over
+ST_TYPEAHEAD_REBUILD_INTERVAL = 60 * 5  # seconds, None to only update through the signals of each process
 
 ST_USER_LAST_SEEN_THRESHOLD_MINUTES = 1
 
 ST_POLL_CHOICES_LIMIT = 20
+ST_POLL_RENDER_CACHE = None  # i.e: 'default', caches the rendered polls shared by the viewers
 
 ST_PRIVATE_FORUM = False
 
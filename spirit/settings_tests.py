@@ -71,3 +71,4 @@ ST_RATELIMIT_CACHE = 'st_rate_limit'
 
 HAYSTACK_CONNECTIONS['default']['STORAGE'] = 'ram'
 HAYSTACK_LIMIT_TO_REGISTERED_MODELS = False
+HAYSTACK_CONNECTIONS['db'] = {'ENGINE': 'spirit.search.db_backend.DatabaseEngine'}
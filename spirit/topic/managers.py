@@ -1,63 +1,49 @@
 # -*- coding: utf-8 -*-
 
 from __future__ import unicode_literals
-from django.contrib.auth.models import Group
 
 from django.db import models
 from django.shortcuts import get_object_or_404
-from django.db.models import Q, Prefetch
+from django.db.models import Q, F, Prefetch
 
+from ..category import acl
 from ..comment.bookmark.models import CommentBookmark
 
 
 class TopicQuerySet(models.QuerySet):
 
     def unremoved(self):
-        return self.filter(Q(category__parent=None) | Q(category__parent__is_removed=False),
-                           category__is_removed=False,
-                           is_removed=False)
+        return self.filter(effective_is_removed=False)
 
     def public(self):
-        return self.filter(category__is_private=False)
+        return self.filter(effective_is_private=False)
 
     def visible(self, user=None):
         return self.unremoved().public().can_access(user)
 
     def can_access(self, user=None):
-        if user and user.is_authenticated():
-            if getattr(user, 'st', None) and (user.st.is_administrator or user.st.is_moderator):
-                return self.all()
-            groups = user.groups.all()
-        else:
-            groups = Group.objects.none()
-        return self.filter(
-            Q(category__restrict_access=None) |
-            Q(category__restrict_access__contains=groups)
-        ).distinct()
+        category_ids = acl.get_category_ids(user, acl.ACCESS)
+
+        if category_ids is None:
+            return self.all()
+
+        return self.filter(category_id__in=category_ids)
 
     def can_topic(self, user):
-        if user and user.is_authenticated():
-            if getattr(user, 'st', None) and (user.st.is_administrator or user.st.is_moderator):
-                return self.all()
-            groups = user.groups.all()
-        else:
-            groups = Group.objects.none()
-        return self.can_access(user).filter(
-            Q(category__restrict_topic=None) |
-            Q(category__restrict_topic__contains=groups)
-        ).distinct()
+        category_ids = acl.get_category_ids(user, acl.TOPIC)
+
+        if category_ids is None:
+            return self.all()
+
+        return self.filter(category_id__in=category_ids)
 
     def can_comment(self, user):
-        if user and user.is_authenticated():
-            if getattr(user, 'st', None) and (user.st.is_administrator or user.st.is_moderator):
-                return self.all()
-            groups = user.groups.all()
-        else:
-            groups = Group.objects.none()
-        return self.can_access(user).filter(
-            Q(category__restrict_comment=None) |
-            Q(category__restrict_comment__contains=groups)
-        ).distinct()
+        category_ids = acl.get_category_ids(user, acl.COMMENT)
+
+        if category_ids is None:
+            return self.all()
+
+        return self.filter(category_id__in=category_ids)
 
     def opened(self):
         return self.filter(is_closed=False)
@@ -69,17 +55,17 @@ class TopicQuerySet(models.QuerySet):
         if category.is_subcategory:
             return self.filter(category=category)
 
-        return self.filter(Q(category=category) | Q(category__parent=category))
+        return self.filter(main_category=category)
 
     def _access(self, user):
-        return self.filter(Q(category__is_private=False) | Q(topics_private__user=user))
+        return self.filter(Q(effective_is_private=False) | Q(topics_private__user=user))
 
     def for_access(self, user):
         return self.unremoved()._access(user=user).can_access(user)
 
     def for_unread(self, user):
         return self.filter(topicunread__user=user,
-                           topicunread__is_read=False)
+                           topicunread__date__lt=F('last_active'))
 
     def with_bookmarks(self, user):
         if not user.is_authenticated():
@@ -101,6 +87,42 @@ class TopicQuerySet(models.QuerySet):
                                      .select_related('category__parent'),
                                      pk=pk)
 
+    def update_visibility(self):
+        """
+        Recompute the denormalized visibility fields,\
+        this must be called after the category,\
+        its parent or the topics removal is changed\
+        through a bulk update. It runs one query\
+        per category
+
+        :return: number of updated topics
+        """
+        category_model = self.model._meta.get_field('category').related_model
+        categories = category_model.objects\
+            .filter(pk__in=self.values('category_id'))\
+            .select_related('parent')
+        count = 0
+
+        for category in categories:
+            visibility = self.model.get_visibility(category)
+
+            if visibility['effective_is_removed']:
+                up_to_date = Q(effective_is_removed=True)
+                visibility['effective_is_removed'] = True
+            else:
+                up_to_date = Q(effective_is_removed=F('is_removed'))
+                visibility['effective_is_removed'] = F('is_removed')
+
+            count += self\
+                .filter(category_id=category.pk)\
+                .exclude(
+                    up_to_date,
+                    effective_is_private=visibility['effective_is_private'],
+                    main_category_id=visibility['main_category_id'])\
+                .update(**visibility)
+
+        return count
+
     def for_update_or_404(self, pk, user):
         if user.st.is_moderator:
             return get_object_or_404(self.public(), pk=pk)
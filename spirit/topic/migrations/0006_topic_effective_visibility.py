@@ -0,0 +1,34 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('spirit_category', '0005_category_reindex_at'),
+        ('spirit_topic', '0005_topic_reindex_at'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='topic',
+            name='effective_is_private',
+            field=models.BooleanField(default=False, editable=False),
+        ),
+        migrations.AddField(
+            model_name='topic',
+            name='effective_is_removed',
+            field=models.BooleanField(default=False, editable=False),
+        ),
+        migrations.AddField(
+            model_name='topic',
+            name='main_category',
+            field=models.ForeignKey(blank=True, null=True, editable=False, related_name='+', to='spirit_category.Category'),
+        ),
+        migrations.AlterIndexTogether(
+            name='topic',
+            index_together=set([('effective_is_removed', 'effective_is_private', 'last_active'), ('main_category', 'effective_is_removed', 'last_active')]),
+        ),
+    ]
@@ -0,0 +1,36 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations
+from django.db.models import F
+
+
+def forwards(apps, schema_editor):
+    Category = apps.get_model("spirit_category", "Category")
+    Topic = apps.get_model("spirit_topic", "Topic")
+
+    for category in Category.objects.select_related('parent'):
+        is_removed = (
+            category.is_removed or
+            (category.parent_id and category.parent.is_removed))
+        Topic.objects\
+            .filter(category_id=category.pk)\
+            .update(
+                effective_is_removed=True if is_removed else F('is_removed'),
+                effective_is_private=category.is_private,
+                main_category_id=category.parent_id or category.pk)
+
+
+def noop(apps, schema_editor):
+    pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('spirit_topic', '0006_topic_effective_visibility'),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards, reverse_code=noop),
+    ]
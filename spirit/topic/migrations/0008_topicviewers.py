@@ -0,0 +1,26 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('spirit_topic', '0007_update_effective_visibility'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TopicViewers',
+            fields=[
+                ('id', models.AutoField(verbose_name='ID', primary_key=True, serialize=False, auto_created=True)),
+                ('registers', models.BinaryField()),
+                ('topic', models.OneToOneField(related_name='viewers', to='spirit_topic.Topic')),
+            ],
+            options={
+                'verbose_name': 'topic viewers',
+                'verbose_name_plural': 'topics viewers',
+            },
+        ),
+    ]
@@ -27,9 +27,21 @@ class Topic(models.Model):
     for reindex. It makes the search re-index the topic,\
     it must be set explicitly
     :vartype reindex_at: `:py:class:models.DateTimeField`
+    :ivar effective_is_removed: Whether the topic,\
+    its category or its parent category is removed.\
+    It's denormalized, see :py:meth:`.update_visibility`
+    :vartype effective_is_removed: `:py:class:models.BooleanField`
+    :ivar effective_is_private: Whether the category\
+    is private. It's denormalized
+    :vartype effective_is_private: `:py:class:models.BooleanField`
+    :ivar main_category: The parent category or the category\
+    itself if it has no parent. It's denormalized
+    :vartype main_category: `:py:class:models.ForeignKey`
     """
     user = models.ForeignKey(settings.AUTH_USER_MODEL, related_name='st_topics')
     category = models.ForeignKey('spirit_category.Category', verbose_name=_("category"))
+    main_category = models.ForeignKey('spirit_category.Category', related_name='+',
+                                      null=True, blank=True, editable=False)
 
     title = models.CharField(_("title"), max_length=255)
     slug = AutoSlugField(populate_from="title", db_index=False, blank=True)
@@ -42,6 +54,8 @@ class Topic(models.Model):
     is_globally_pinned = models.BooleanField(_("globally pinned"), default=False)
     is_closed = models.BooleanField(_("closed"), default=False)
     is_removed = models.BooleanField(default=False)
+    effective_is_removed = models.BooleanField(default=False, editable=False)
+    effective_is_private = models.BooleanField(default=False, editable=False)
 
     view_count = models.PositiveIntegerField(_("views count"), default=0)
     comment_count = models.PositiveIntegerField(_("comment count"), default=0)
@@ -52,10 +66,39 @@ class Topic(models.Model):
         ordering = ['-last_active', '-pk']
         verbose_name = _("topic")
         verbose_name_plural = _("topics")
+        index_together = [
+            ('effective_is_removed', 'effective_is_private', 'last_active'),
+            ('main_category', 'effective_is_removed', 'last_active'),
+        ]
 
     def __str__(self):
         return "%s" % self.title
 
+    def save(self, *args, **kwargs):
+        visibility = self.get_visibility(self.category)
+        self.effective_is_removed = self.is_removed or visibility['effective_is_removed']
+        self.effective_is_private = visibility['effective_is_private']
+        self.main_category_id = visibility['main_category_id']
+        super(Topic, self).save(*args, **kwargs)
+
+    @staticmethod
+    def get_visibility(category):
+        """
+        Compute the denormalized fields\
+        the topics of a category must have.\
+        ``effective_is_removed`` must be\
+        OR'ed with the topic ``is_removed``
+
+        :param category: Category with its parent
+        :return: dict of field names and values
+        """
+        return {
+            'effective_is_removed': bool(
+                category.is_removed or
+                (category.parent_id and category.parent.is_removed)),
+            'effective_is_private': category.is_private,
+            'main_category_id': category.parent_id or category.pk}
+
     def get_absolute_url(self):
         if self.category_id == settings.ST_TOPIC_PRIVATE_CATEGORY_PK:
             return reverse('spirit:topic:private:detail', kwargs={'topic_id': str(self.id), 'slug': self.slug})
@@ -71,10 +114,6 @@ class Topic(models.Model):
 
         return self.bookmark.get_new_comment_url()
 
-    @property
-    def main_category(self):
-        return self.category.parent or self.category
-
     @property
     def bookmark(self):
         # *bookmarks* is dynamically created by manager.with_bookmarks()
@@ -131,9 +170,11 @@ class Topic(models.Model):
 
     def update_last_commenter(self):
         last_comment = self.comment_set.filter(is_removed=False).first()
-        if last_comment and last_comment.user != self.last_commenter:
+        if last_comment and last_comment.user_id != self.last_commenter_id:
             self.last_commenter = last_comment.user
-            self.save()
+            Topic.objects\
+                .filter(pk=self.pk)\
+                .update(last_commenter=last_comment.user)
 
     def set_can_comment_attr(self, user):
         group_ids = user.groups.all().values_list('id', flat=True)
@@ -143,6 +184,20 @@ class Topic(models.Model):
                 category_id=self.category_id, group_id__in=group_ids).exists())
 
 
+class TopicViewers(models.Model):
+    """
+    Unique viewers of a topic, stored as\
+    a HyperLogLog counter (see\
+    :py:class:`spirit.core.utils.hyperloglog.HyperLogLog`)
+    """
+    topic = models.OneToOneField(Topic, related_name='viewers')
+    registers = models.BinaryField()
+
+    class Meta:
+        verbose_name = _("topic viewers")
+        verbose_name_plural = _("topics viewers")
+
+
 def increase_user_profile_comment_count(sender, instance, created, **kwargs):
     if created and not instance.category.is_private:
         instance.user.st.increase_topic_count()
@@ -7,6 +7,7 @@ from django.shortcuts import render, redirect, get_object_or_404
 
 from ...core.utils.decorators import moderator_required
 from ...comment.models import Comment, CLOSED, UNCLOSED, PINNED, UNPINNED
+from ...search.models import TopicIndexQueue
 from ..models import Topic
 
 
@@ -22,6 +23,15 @@ def _moderate(request, pk, field_name, to_value, action=None):
                     field_name: to_value,
                     'reindex_at': timezone.now()}))
 
+        if count and field_name == 'is_removed':
+            Topic.objects\
+                .filter(pk=pk)\
+                .update_visibility()
+
+        if count:
+            TopicIndexQueue.enqueue(
+                [pk], comments=field_name == 'is_removed')
+
         if count and action is not None:
             Comment.create_moderation_action(
                 user=request.user,
@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+import uuid
+
+from django.apps import apps
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models import Count, Sum, Case, When, IntegerField
+
+from . import pubsub
+
+__all__ = [
+    'get',
+    'invalidate']
+
+_CACHE_KEY = 'st_notification_counter_%s'
+
+# Bounds the staleness of the changes
+# not tracked (i.e: a topic gets removed)
+_CACHE_TIMEOUT = 60 * 5
+
+
+def _get_cache():
+    return caches[settings.ST_NOTIFICATIONS_COUNTER_CACHE]
+
+
+def _count(user):
+    TopicNotification = apps.get_model('spirit_topic_notification', 'TopicNotification')
+    counts = TopicNotification.objects\
+        .for_access(user)\
+        .unread()\
+        .aggregate(
+            total=Count('pk'),
+            private=Sum(Case(
+                When(topic__category_id=settings.ST_TOPIC_PRIVATE_CATEGORY_PK, then=1),
+                default=0,
+                output_field=IntegerField())))
+    private = counts['private'] or 0
+    return {
+        'public': counts['total'] - private,
+        'private': private}
+
+
+def get(user):
+    """
+    Return the unread notifications counter\
+    of the user, it's computed if it's not cached
+
+    :param user: Authenticated user
+    :return: dict of ``public`` and ``private``\
+    unread counts, and ``version``, it changes\
+    every time the counter gets computed
+    """
+    cache = _get_cache()
+    key = _CACHE_KEY % user.pk
+    counter = cache.get(key)
+
+    if counter is None:
+        counter = _count(user)
+        counter['version'] = uuid.uuid4().hex[:16]
+        cache.set(key, counter, timeout=_CACHE_TIMEOUT)
+
+    return counter
+
+
+def _delete(keys):
+    _get_cache().delete_many(keys)
+
+
+def invalidate(user_ids):
+    """
+    Invalidate the counters, must be called\
+    every time the unread notifications\
+    of the users change. The change gets\
+    published to the notifications stream
+
+    :param user_ids: Iterable of user pks
+    """
+    user_ids = set(user_ids)
+    keys = [_CACHE_KEY % user_id for user_id in user_ids]
+
+    if not keys:
+        return
+
+    _delete(keys)
+
+    # It may get computed again
+    # before the changes are committed
+    try:
+        on_commit = transaction.on_commit
+    except AttributeError:  # Django 1.8
+        pass
+    else:
+        on_commit(lambda: _delete(keys))
+
+    pubsub.publish(user_ids, {'type': 'counter'})
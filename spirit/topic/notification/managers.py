@@ -6,13 +6,13 @@ from django.db import models
 from django.db.models import Q
 from django.conf import settings
 
+from . import counter
+
 
 class TopicNotificationQuerySet(models.QuerySet):
 
     def unremoved(self):
-        return self.filter(Q(topic__category__parent=None) | Q(topic__category__parent__is_removed=False),
-                           topic__category__is_removed=False,
-                           topic__is_removed=False)
+        return self.filter(topic__effective_is_removed=False)
 
     def unread(self):
         return self.filter(is_read=False)
@@ -24,7 +24,7 @@ class TopicNotificationQuerySet(models.QuerySet):
         return self.filter(topic__category_id=settings.ST_TOPIC_PRIVATE_CATEGORY_PK)
 
     def _access(self, user):
-        return self.filter(Q(topic__category__is_private=False) | Q(topic__topics_private__user=user),
+        return self.filter(Q(topic__effective_is_private=False) | Q(topic__topics_private__user=user),
                            user=user)
 
     def for_access(self, user):
@@ -34,5 +34,7 @@ class TopicNotificationQuerySet(models.QuerySet):
 
     def read(self, user):
         # returns updated rows count (int)
-        return self.filter(user=user)\
+        count = self.filter(user=user)\
             .update(is_read=True)
+        counter.invalidate([user.pk])
+        return count
@@ -6,9 +6,12 @@ from django.db import models
 from django.utils.translation import ugettext_lazy as _
 from django.conf import settings
 from django.utils import timezone
+from django.utils.html import escape
 from django.db import IntegrityError, transaction
 
 from .managers import TopicNotificationQuerySet
+from . import counter
+from . import pubsub
 
 
 UNDEFINED, MENTION, COMMENT = range(3)
@@ -20,6 +23,20 @@ ACTION_CHOICES = (
 )
 
 
+def _publish(user_ids, comment, action):
+    # Same as the notifications list items
+    if not pubsub.is_enabled():
+        return
+
+    pubsub.publish(user_ids, {
+        'type': 'notification',
+        'user': escape(comment.user.username),
+        'action': action,
+        'title': escape(comment.topic.title),
+        'url': comment.get_absolute_url(),
+        'is_read': False})
+
+
 class TopicNotification(models.Model):
 
     user = models.ForeignKey(settings.AUTH_USER_MODEL, related_name='st_topic_notifications')
@@ -30,6 +47,7 @@ class TopicNotification(models.Model):
     action = models.IntegerField(choices=ACTION_CHOICES, default=UNDEFINED)
     is_read = models.BooleanField(default=False)
     is_active = models.BooleanField(default=False)
+    is_emailed = models.BooleanField(default=False)
 
     objects = TopicNotificationQuerySet.as_manager()
 
@@ -59,14 +77,22 @@ class TopicNotification(models.Model):
         if not user.is_authenticated():
             return
 
-        cls.objects\
-            .filter(user=user, topic=topic)\
-            .update(is_read=True)
+        notifications = cls.objects\
+            .filter(user=user, topic=topic, is_read=False)
+
+        # Viewing a read topic should not write
+        if not notifications.exists():
+            return
+
+        updated = notifications.update(is_read=True)
+
+        if updated:
+            counter.invalidate([user.pk])
 
     @classmethod
     def create_maybe(cls, user, comment, is_read=True, action=COMMENT):
         # Create a dummy notification
-        return cls.objects.get_or_create(
+        notification, created = cls.objects.get_or_create(
             user=user,
             topic=comment.topic,
             defaults={
@@ -77,39 +103,72 @@ class TopicNotification(models.Model):
             }
         )
 
+        if created and not is_read:
+            _publish([user.pk], comment, action)
+            counter.invalidate([user.pk])
+
+        return notification, created
+
     @classmethod
     def notify_new_comment(cls, comment):
-        cls.objects\
+        notifications = cls.objects\
             .filter(topic=comment.topic, is_active=True, is_read=True)\
-            .exclude(user=comment.user)\
-            .update(comment=comment, is_read=False, action=COMMENT, date=timezone.now())
+            .exclude(user=comment.user)
+        # The counters of the ones read meanwhile
+        # are not invalidated, they expire. The
+        # UPDATE is not filtered by the ids, so
+        # a big topic doesn't get a huge IN clause
+        user_ids = list(
+            notifications
+            .order_by()
+            .values_list('user_id', flat=True))
+        notifications.update(
+            comment=comment, is_read=False, is_emailed=False, action=COMMENT, date=timezone.now())
+
+        if user_ids:
+            _publish(user_ids, comment, COMMENT)
+            counter.invalidate(user_ids)
 
     @classmethod
     def notify_new_mentions(cls, comment, mentions):
         if not mentions:
             return
 
-        # TODO: refactor
-        for username, user in mentions.items():
-            try:
-                with transaction.atomic():
-                    cls.objects.create(
-                        user=user,
-                        topic=comment.topic,
-                        comment=comment,
-                        action=MENTION,
-                        is_active=True
-                    )
-            except IntegrityError:
-                pass
+        user_ids = [user.pk for user in mentions.values()]
+        notified_ids = set(
+            cls.objects
+            .filter(user_id__in=user_ids, topic=comment.topic)
+            .values_list('user_id', flat=True))
+        notifications = [
+            cls(user_id=user_id,
+                topic=comment.topic,
+                comment=comment,
+                action=MENTION,
+                is_active=True)
+            for user_id in user_ids
+            if user_id not in notified_ids]
+
+        try:
+            with transaction.atomic():
+                cls.objects.bulk_create(notifications)
+        except IntegrityError:
+            # Some got created meanwhile, ignore them
+            for notification in notifications:
+                try:
+                    with transaction.atomic():
+                        notification.save()
+                except IntegrityError:
+                    pass
 
         cls.objects\
-            .filter(user__in=mentions.values(), topic=comment.topic, is_read=True)\
-            .update(comment=comment, is_read=False, action=MENTION, date=timezone.now())
+            .filter(user_id__in=user_ids, topic=comment.topic, is_read=True)\
+            .update(comment=comment, is_read=False, is_emailed=False, action=MENTION, date=timezone.now())
+        _publish(user_ids, comment, MENTION)
+        counter.invalidate(user_ids)
 
     @classmethod
     def bulk_create(cls, users, comment):
-        return cls.objects.bulk_create([
+        notifications = cls.objects.bulk_create([
             cls(user=user,
                 topic=comment.topic,
                 comment=comment,
@@ -117,3 +176,7 @@ class TopicNotification(models.Model):
                 is_active=True)
             for user in users
         ])
+        user_ids = [n.user_id for n in notifications]
+        _publish(user_ids, comment, COMMENT)
+        counter.invalidate(user_ids)
+        return notifications
@@ -0,0 +1,268 @@
+# -*- coding: utf-8 -*-
+
+"""
+Publish/subscribe of the notification events,\
+they feed the notifications stream (see\
+:py:mod:`spirit.topic.notification.stream`).
+
+``settings.ST_NOTIFICATIONS_PUBSUB`` sets\
+the implementation: ``'local'`` delivers\
+the events within the process, ``'socket'``\
+sends them through a unix socket to the\
+process listening on\
+``settings.ST_NOTIFICATIONS_PUBSUB_SOCKET``\
+and ``None`` disables them
+"""
+
+from __future__ import unicode_literals
+
+import os
+import stat
+import json
+import errno
+import socket
+import threading
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.db import transaction
+
+__all__ = [
+    'LOCAL',
+    'SOCKET',
+    'LocalPubSub',
+    'SocketPubSub',
+    'get_pubsub',
+    'is_enabled',
+    'publish']
+
+LOCAL, SOCKET = 'local', 'socket'
+
+# User pks per socket message, so
+# the datagrams are kept small
+_BATCH_SIZE = 1000
+_MAX_MESSAGE_SIZE = 2 ** 17
+
+
+class LocalPubSub(object):
+    """
+    Delivers the events to the subscribers\
+    of the process, within the publisher\
+    thread. It's thread-safe
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._callbacks = []
+
+    def subscribe(self, callback):
+        """
+        :param callback: Callable that takes\
+        a list of user pks and the event
+        """
+        with self._lock:
+            self._callbacks.append(callback)
+
+    def unsubscribe(self, callback):
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+    def _deliver(self, user_ids, event):
+        with self._lock:
+            callbacks = list(self._callbacks)
+
+        for callback in callbacks:
+            callback(user_ids, event)
+
+    def publish(self, user_ids, event):
+        self._deliver(list(user_ids), event)
+
+    def close(self):
+        with self._lock:
+            self._callbacks = []
+
+
+class SocketPubSub(LocalPubSub):
+    """
+    Sends the events as datagrams to a unix\
+    socket, the first subscriber of the process\
+    binds it and a thread delivers them.\
+    The events are dropped when no process\
+    is listening, publishing never blocks
+
+    :param path: The socket file path
+    """
+
+    def __init__(self, path):
+        super(SocketPubSub, self).__init__()
+        self.path = path
+        self._sender = None
+        self._receiver = None
+
+    def _get_sender(self):
+        with self._lock:
+            if self._sender is None:
+                self._sender = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+                self._sender.setblocking(False)
+
+            return self._sender
+
+    def publish(self, user_ids, event):
+        user_ids = list(user_ids)
+
+        for i in range(0, len(user_ids), _BATCH_SIZE):
+            message = json.dumps({
+                'user_ids': user_ids[i:i + _BATCH_SIZE],
+                'event': event})
+
+            try:
+                self._get_sender().sendto(message.encode('utf-8'), self.path)
+            except socket.error:  # Not listening or full
+                pass
+
+    def _receive(self, sock):
+        while True:
+            try:
+                data = sock.recv(_MAX_MESSAGE_SIZE)
+            except socket.error:
+                return
+
+            if self._receiver is not sock:  # Closed
+                return
+
+            try:
+                message = json.loads(data.decode('utf-8'))
+            except ValueError:
+                continue
+
+            self._deliver(message['user_ids'], message['event'])
+
+    def _unlink_stale(self):
+        """
+        Remove the socket left behind by a process\
+        that is gone, a live one is never replaced
+
+        :raise socket.error: If another\
+        process is listening on the path
+        """
+        try:
+            mode = os.stat(self.path).st_mode
+        except OSError:  # Does not exist
+            return
+
+        if not stat.S_ISSOCK(mode):
+            return  # Binding will fail
+
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+
+        try:
+            probe.connect(self.path)
+        except socket.error as err:
+            if err.errno != errno.ECONNREFUSED:
+                raise
+        else:
+            raise socket.error(
+                errno.EADDRINUSE,
+                "Another process is listening on %s" % self.path)
+        finally:
+            probe.close()
+
+        os.unlink(self.path)
+
+    def _listen(self):
+        self._unlink_stale()
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        sock.bind(self.path)
+        self._receiver = sock
+        thread = threading.Thread(target=self._receive, args=(sock, ))
+        thread.daemon = True
+        thread.start()
+
+    def subscribe(self, callback):
+        with self._lock:
+            if self._receiver is None:
+                self._listen()
+
+        super(SocketPubSub, self).subscribe(callback)
+
+    def close(self):
+        super(SocketPubSub, self).close()
+
+        with self._lock:
+            sender, self._sender = self._sender, None
+            receiver, self._receiver = self._receiver, None
+
+        if sender is not None:
+            sender.close()
+
+        if receiver is not None:
+            # Wakes up the receiving thread
+            receiver.shutdown(socket.SHUT_RDWR)
+            receiver.close()
+
+            try:
+                os.unlink(self.path)
+            except OSError:
+                pass
+
+
+_lock = threading.Lock()
+_pubsubs = {}
+
+
+def get_pubsub():
+    """
+    Return the pub/sub of\
+    ``settings.ST_NOTIFICATIONS_PUBSUB``,\
+    or None if it's disabled
+    """
+    mode = settings.ST_NOTIFICATIONS_PUBSUB
+
+    if mode is None:
+        return None
+
+    key = (mode, settings.ST_NOTIFICATIONS_PUBSUB_SOCKET)
+
+    with _lock:
+        if key not in _pubsubs:
+            if mode == LOCAL:
+                _pubsubs[key] = LocalPubSub()
+            elif mode == SOCKET:
+                _pubsubs[key] = SocketPubSub(settings.ST_NOTIFICATIONS_PUBSUB_SOCKET)
+            else:
+                raise ImproperlyConfigured(
+                    "Invalid settings.ST_NOTIFICATIONS_PUBSUB: %r" % mode)
+
+        return _pubsubs[key]
+
+
+def is_enabled():
+    return settings.ST_NOTIFICATIONS_PUBSUB is not None
+
+
+def publish(user_ids, event):
+    """
+    Publish the event to the users once\
+    the current transaction is committed
+
+    :param user_ids: Iterable of user pks
+    :param event: JSON serializable dict\
+    with the event ``type``
+    """
+    pubsub = get_pubsub()
+
+    if pubsub is None:
+        return
+
+    user_ids = list(set(user_ids))
+
+    if not user_ids:
+        return
+
+    try:
+        on_commit = transaction.on_commit
+    except AttributeError:  # Django 1.8
+        pubsub.publish(user_ids, event)
+    else:
+        on_commit(lambda: pubsub.publish(user_ids, event))
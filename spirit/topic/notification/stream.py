@@ -0,0 +1,383 @@
+# -*- coding: utf-8 -*-
+
+"""
+Server of the notifications stream, it pushes the\
+new notifications and the unread counters to the\
+browsers, either as server-sent events (``/stream/``)\
+or long-polling (``/poll/?version=<counter version>``).
+
+It runs on a single asyncio event loop (Python 3.4+),\
+an idle connection is just a protocol instance. The\
+sessions and counters are fetched in a pool of threads.\
+It's meant to be served behind the forum domain\
+(i.e: a reverse proxy path), so the session cookie\
+is sent. See the ``spiritnotificationstream`` command
+"""
+
+from __future__ import unicode_literals
+
+import json
+import asyncio
+import logging
+from functools import partial
+from importlib import import_module
+from concurrent.futures import ThreadPoolExecutor
+
+from django.conf import settings
+from django.contrib.auth import get_user
+from django.db import close_old_connections
+from django.http import HttpRequest
+from django.utils.six.moves.urllib.parse import parse_qs
+from django.utils.six.moves.http_cookies import SimpleCookie, CookieError
+
+from . import counter
+
+__all__ = ['StreamServer']
+
+logger = logging.getLogger(__name__)
+
+_STREAM, _POLL = '/stream', '/poll'
+
+_MAX_HEADERS_SIZE = 8192
+
+# Slow clients get disconnected
+# instead of buffering their events
+_MAX_WRITE_BUFFER_SIZE = 2 ** 16
+
+# Milliseconds the browser waits to reconnect
+_RETRY = 10000
+
+_STATUS = {
+    200: 'OK',
+    400: 'Bad Request',
+    403: 'Forbidden',
+    404: 'Not Found',
+    405: 'Method Not Allowed',
+    503: 'Service Unavailable'}
+
+
+def _parse_request(head):
+    """
+    :return: The method, path, query and headers
+    :raise ValueError: If it's not a valid request
+    """
+    lines = head.decode('latin-1').split('\r\n')
+    method, target, _version = lines[0].split(' ')
+    path, _, query = target.partition('?')
+    headers = {}
+
+    for line in lines[1:]:
+        name, sep, value = line.partition(':')
+
+        if not sep:
+            raise ValueError('Invalid header')
+
+        headers[name.strip().lower()] = value.strip()
+
+    return method, path, parse_qs(query), headers
+
+
+def _get_session_key(headers):
+    cookie = SimpleCookie()
+
+    try:
+        cookie.load(str(headers.get('cookie', '')))
+    except CookieError:
+        return None
+
+    morsel = cookie.get(settings.SESSION_COOKIE_NAME)
+    return morsel and morsel.value
+
+
+def _render_head(status, headers=()):
+    lines = ['HTTP/1.1 %d %s' % (status, _STATUS[status])]
+    lines.extend('%s: %s' % header for header in headers)
+    return ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1')
+
+
+def _render_event(event):
+    return ('event: %s\ndata: %s\n\n' % (
+        event['type'], json.dumps(event))).encode('utf-8')
+
+
+def _fetch_user(session_key):
+    # These run in the threads pool
+    close_old_connections()
+    request = HttpRequest()
+    request.session = import_module(settings.SESSION_ENGINE)\
+        .SessionStore(session_key)
+    return get_user(request)
+
+
+def _fetch_counter(user):
+    close_old_connections()
+    return counter.get(user)
+
+
+class _Client(asyncio.Protocol):
+    """
+    A connection, it reads the request\
+    headers and then waits for the events
+    """
+
+    def __init__(self, server):
+        self.server = server
+        self.transport = None
+        self.user = None
+        self.is_poll = False
+        self.version = None
+        self._head = b''
+        self._events = []
+        self._counter = None
+        self._timeout = None
+
+    def connection_made(self, transport):
+        self.transport = transport
+
+    def data_received(self, data):
+        if self._head is None:  # Read already
+            return
+
+        self._head += data
+        head, sep, _body = self._head.partition(b'\r\n\r\n')
+
+        if not sep:
+            if len(self._head) > _MAX_HEADERS_SIZE:
+                self.respond(400)
+
+            return
+
+        self._head = None
+        self.server.handle(self, head)
+
+    def connection_lost(self, exc):
+        self.server.remove(self)
+        self.transport = None
+
+        if self._timeout is not None:
+            self._timeout.cancel()
+
+    def write(self, data):
+        if self.transport is None:
+            return
+
+        self.transport.write(data)
+
+        if self.transport.get_write_buffer_size() > _MAX_WRITE_BUFFER_SIZE:
+            self.transport.abort()
+
+    def respond(self, status, data=None):
+        if self.transport is None:
+            return
+
+        headers = [('Connection', 'close'), ('Cache-Control', 'no-cache')]
+        body = b''
+
+        if data is not None:
+            body = json.dumps(data).encode('utf-8')
+            headers.append(('Content-Type', 'application/json'))
+
+        headers.append(('Content-Length', len(body)))
+        self.write(_render_head(status, headers) + body)
+
+        if self.transport is not None:
+            self.transport.close()
+            self.transport = None
+
+    def start(self, poll_timeout):
+        if self.is_poll:
+            self._timeout = self.server.loop.call_later(
+                poll_timeout, self._respond_poll)
+            return
+
+        self.write(
+            _render_head(200, [
+                ('Content-Type', 'text/event-stream'),
+                ('Cache-Control', 'no-cache'),
+                ('X-Accel-Buffering', 'no')]) +
+            ('retry: %d\n\n' % _RETRY).encode('latin-1'))
+
+    def _respond_poll(self):
+        self.respond(200, {
+            'events': self._events,
+            'counter': self._counter})
+
+    def send_event(self, event):
+        if self.is_poll:
+            # They go along the counter
+            self._events.append(event)
+        else:
+            self.write(_render_event(event))
+
+    def send_counter(self, unread):
+        self._counter = unread
+
+        if not self.is_poll:
+            self.write(_render_event(dict(unread, type='counter')))
+            return
+
+        if self._events or unread['version'] != self.version:
+            self._respond_poll()
+
+    def ping(self):
+        if self.user is not None and not self.is_poll:
+            self.write(b': ping\n\n')
+
+
+class StreamServer(object):
+    """
+    Keeps the connections of every user\
+    and pushes the events published to them
+
+    :param loop: asyncio event loop
+    :param pubsub: The pub/sub the events\
+    are received from, see\
+    :py:mod:`spirit.topic.notification.pubsub`
+    :param workers: Max number of threads\
+    querying the sessions and counters
+    """
+
+    def __init__(self, loop, pubsub, workers=4):
+        self.loop = loop
+        self.pubsub = pubsub
+        self._executor = ThreadPoolExecutor(max_workers=workers)
+        self._clients = {}
+        self._fetching = set()
+        self._refetch = set()
+        self._ping_handle = None
+
+    def __call__(self):
+        # The protocol factory
+        return _Client(self)
+
+    def start(self):
+        self.pubsub.subscribe(self._on_publish)
+        self._ping()
+
+    def close(self):
+        self.pubsub.unsubscribe(self._on_publish)
+
+        if self._ping_handle is not None:
+            self._ping_handle.cancel()
+
+        for clients in list(self._clients.values()):
+            for client in list(clients):
+                if client.transport is not None:
+                    client.transport.close()
+
+        self._executor.shutdown(wait=False)
+
+    def _ping(self):
+        for clients in list(self._clients.values()):
+            for client in list(clients):
+                client.ping()
+
+        self._ping_handle = self.loop.call_later(
+            settings.ST_NOTIFICATIONS_STREAM_PING_INTERVAL, self._ping)
+
+    def _run(self, func, arg, callback):
+        future = self.loop.run_in_executor(self._executor, func, arg)
+        future.add_done_callback(callback)
+
+    def handle(self, client, head):
+        try:
+            method, path, query, headers = _parse_request(head)
+        except ValueError:
+            client.respond(400)
+            return
+
+        if method != 'GET':
+            client.respond(405)
+            return
+
+        path = path.rstrip('/')
+
+        if path not in (_STREAM, _POLL):
+            client.respond(404)
+            return
+
+        session_key = _get_session_key(headers)
+
+        if not session_key:
+            client.respond(403)
+            return
+
+        client.is_poll = path == _POLL
+        client.version = query.get('version', [None])[0]
+        self._run(_fetch_user, session_key, partial(self._on_user, client))
+
+    def _on_user(self, client, future):
+        if client.transport is None:  # Gone
+            return
+
+        try:
+            user = future.result()
+        except Exception:
+            logger.exception('Failed to fetch the stream user')
+            client.respond(503)
+            return
+
+        if not user.is_authenticated():
+            client.respond(403)
+            return
+
+        client.user = user
+        self._clients.setdefault(user.pk, set()).add(client)
+        client.start(settings.ST_NOTIFICATIONS_STREAM_POLL_TIMEOUT)
+        self._update_counter(user)
+
+    def remove(self, client):
+        if client.user is None:
+            return
+
+        clients = self._clients.get(client.user.pk, set())
+        clients.discard(client)
+
+        if not clients:
+            self._clients.pop(client.user.pk, None)
+
+    def _update_counter(self, user):
+        # Fetched once for all the
+        # connections of the user
+        if user.pk in self._fetching:
+            self._refetch.add(user.pk)
+            return
+
+        self._fetching.add(user.pk)
+        self._run(_fetch_counter, user, partial(self._on_counter, user))
+
+    def _on_counter(self, user, future):
+        self._fetching.discard(user.pk)
+
+        try:
+            unread = future.result()
+        except Exception:
+            logger.exception('Failed to fetch the notifications counter')
+        else:
+            for client in list(self._clients.get(user.pk, ())):
+                client.send_counter(unread)
+
+        # It changed while fetching
+        if user.pk in self._refetch:
+            self._refetch.discard(user.pk)
+
+            if user.pk in self._clients:
+                self._update_counter(user)
+
+    def _on_publish(self, user_ids, event):
+        # Called from the publisher thread
+        self.loop.call_soon_threadsafe(self._dispatch, user_ids, event)
+
+    def _dispatch(self, user_ids, event):
+        for user_id in user_ids:
+            clients = self._clients.get(user_id)
+
+            if not clients:
+                continue
+
+            if event['type'] == 'counter':
+                self._update_counter(next(iter(clients)).user)
+                continue
+
+            for client in list(clients):
+                client.send_event(event)
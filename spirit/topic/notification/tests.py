@@ -1,11 +1,22 @@
 # -*- coding: utf-8 -*-
 
 from __future__ import unicode_literals
+import os
 import json
+import socket
 import datetime
+import tempfile
+import threading
+from unittest import skipIf
+
+try:
+    import asyncio
+except ImportError:  # Python 2
+    asyncio = None
 
 from django.test import TestCase
-from django.test.utils import override_settings
+from django.test.utils import override_settings, CaptureQueriesContext
+from django.db import connection
 from django.core.urlresolvers import reverse
 from django.template import Template, Context
 from django.utils import timezone
@@ -16,6 +27,8 @@ from ...core.tests import utils
 from .models import TopicNotification, COMMENT, MENTION
 from .forms import NotificationCreationForm, NotificationForm
 from .tags import render_notification_form, has_topic_notifications
+from . import pubsub
+from . import counter
 
 
 @override_settings(ST_NOTIFICATIONS_PER_PAGE=1)
@@ -242,6 +255,69 @@ class TopicNotificationViewTest(TestCase):
         }
         self.assertDictEqual(res['n'][0], expected)
 
+    def test_topic_notification_unread_count(self):
+        """
+        Should return the unread counter, or\
+        304 if it has not changed
+        """
+        utils.login(self)
+        url = reverse('spirit:topic:notification:unread-count')
+        private = utils.create_private_topic(user=self.user)
+        TopicNotification.objects.create(
+            user=self.user, topic=private.topic,
+            comment=utils.create_comment(topic=private.topic), action=COMMENT)
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        res = json.loads(response.content.decode('utf-8'))
+        self.assertEqual(res['public'], 1)
+        self.assertEqual(res['private'], 1)
+        etag = response['ETag']
+        self.assertEqual(etag, '"%s"' % res['version'])
+
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertFalse([
+            q for q in queries.captured_queries
+            if 'spirit_topic_notification' in q['sql']])
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response['ETag'], etag)
+
+        self.client.post(reverse('spirit:topic:notification:mark-all-read'))
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        res = json.loads(response.content.decode('utf-8'))
+        self.assertEqual(res['public'], 0)
+        self.assertEqual(res['private'], 1)
+        self.assertNotEqual(response['ETag'], etag)
+
+        TopicNotification.mark_as_read(user=self.user, topic=private.topic)
+        response = self.client.get(url)
+        self.assertEqual(json.loads(response.content.decode('utf-8'))['private'], 0)
+
+    def test_topic_notification_unread_count_notify(self):
+        """
+        Should update the counter on new comments
+        """
+        utils.login(self)
+        url = reverse('spirit:topic:notification:unread-count')
+        TopicNotification.objects.filter(user=self.user).update(is_read=True)
+        response = self.client.get(url)
+        self.assertEqual(json.loads(response.content.decode('utf-8'))['public'], 0)
+
+        comment = utils.create_comment(topic=self.topic, user=self.user2)
+        TopicNotification.notify_new_comment(comment=comment)
+        response = self.client.get(url, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(json.loads(response.content.decode('utf-8'))['public'], 1)
+
+    def test_topic_notification_unread_count_login(self):
+        """
+        Should require to be logged-in
+        """
+        url = reverse('spirit:topic:notification:unread-count')
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 302)
+
     def test_topic_notification_create(self):
         """
         create notification
@@ -429,7 +505,14 @@ class TopicNotificationModelsTest(TestCase):
         TopicNotification.objects.create(user=subscriber, topic=topic, comment=comment,
                                          is_active=True, is_read=True)
 
-        TopicNotification.notify_new_comment(comment)
+        with CaptureQueriesContext(connection) as ctx:
+            TopicNotification.notify_new_comment(comment)
+
+        # The UPDATE is not filtered by the selected users
+        updates = [q['sql'] for q in ctx.captured_queries if 'UPDATE' in q['sql']]
+        self.assertEqual(len(updates), 1)
+        self.assertNotIn('"user_id" IN', updates[0])
+
         notification = TopicNotification.objects.get(user=subscriber, topic=topic)
         self.assertTrue(notification.is_active)
         self.assertFalse(notification.is_read)
@@ -466,6 +549,28 @@ class TopicNotificationModelsTest(TestCase):
         self.assertFalse(TopicNotification.objects.get(user=self.user, comment=comment).is_read)
         self.assertTrue(TopicNotification.objects.get(user=self.user, comment=comment).is_active)
 
+    def test_topic_notification_notify_new_mentions_bulk(self):
+        """
+        Should create the missing notifications at once\
+        and notify the existing ones
+        """
+        user_a = utils.create_user()
+        user_b = utils.create_user()
+        mentions = {
+            self.user.username: self.user,
+            user_a.username: user_a,
+            user_b.username: user_b}
+        TopicNotification.objects.filter(pk=self.topic_notification.pk).update(is_read=True)
+        comment = utils.create_comment(topic=self.topic_notification.topic)
+
+        with self.assertNumQueries(5):  # select, savepoint, insert, release, update
+            TopicNotification.notify_new_mentions(comment=comment, mentions=mentions)
+
+        notifications = TopicNotification.objects.filter(comment=comment, action=MENTION, is_read=False)
+        self.assertEqual(
+            sorted(notifications.values_list('user_id', flat=True)),
+            sorted([self.user.pk, user_a.pk, user_b.pk]))
+
     def test_topic_notification_notify_new_mentions_unactive(self):
         """
         set is_read=False when user gets mentioned
@@ -559,3 +664,261 @@ class TopicNotificationTemplateTagsTest(TestCase):
         topic2 = utils.create_topic(self.category)
         context = render_notification_form(self.user, topic2)
         self.assertIsNone(context['notification'])
+
+
+@override_settings(ST_NOTIFICATIONS_PUBSUB='local')
+class TopicNotificationPubSubTest(TestCase):
+
+    def setUp(self):
+        utils.cache_clear()
+        self.user = utils.create_user()
+        self.user2 = utils.create_user()
+        self.topic = utils.create_topic(utils.create_category())
+        self.comment = utils.create_comment(topic=self.topic)
+        self.events = []
+        pubsub.get_pubsub().subscribe(self._on_publish)
+
+    def tearDown(self):
+        pubsub.get_pubsub().unsubscribe(self._on_publish)
+
+    def _on_publish(self, user_ids, event):
+        self.events.append((sorted(user_ids), event))
+
+    def test_publish(self):
+        """
+        Should publish the new notifications and the counter changes
+        """
+        TopicNotification.objects.create(
+            user=self.user, topic=self.topic, comment=self.comment,
+            action=COMMENT, is_active=True, is_read=True)
+        comment = utils.create_comment(topic=self.topic, user=self.user2)
+        TopicNotification.notify_new_comment(comment=comment)
+        self.assertEqual(self.events, [
+            ([self.user.pk], {
+                'type': 'notification',
+                'user': self.user2.username,
+                'action': COMMENT,
+                'title': self.topic.title,
+                'url': comment.get_absolute_url(),
+                'is_read': False}),
+            ([self.user.pk], {'type': 'counter'})])
+
+        self.events = []
+        TopicNotification.mark_as_read(user=self.user, topic=self.topic)
+        self.assertEqual(self.events, [([self.user.pk], {'type': 'counter'})])
+
+    def test_publish_mentions(self):
+        """
+        Should publish the mentions
+        """
+        TopicNotification.notify_new_mentions(
+            comment=self.comment, mentions={self.user2.username: self.user2})
+        self.assertEqual(
+            [(user_ids, event['type'], event.get('action')) for user_ids, event in self.events],
+            [([self.user2.pk], 'notification', MENTION),
+             ([self.user2.pk], 'counter', None)])
+
+    def test_publish_disabled(self):
+        """
+        Should not publish when it's disabled
+        """
+        with override_settings(ST_NOTIFICATIONS_PUBSUB=None):
+            self.assertIsNone(pubsub.get_pubsub())
+            TopicNotification.notify_new_mentions(
+                comment=self.comment, mentions={self.user2.username: self.user2})
+        self.assertEqual(self.events, [])
+
+    def test_socket(self):
+        """
+        Should deliver the events through the socket
+        """
+        path = os.path.join(tempfile.mkdtemp(), 'notifications.sock')
+        publisher = pubsub.SocketPubSub(path)
+        publisher.publish([self.user.pk], {'type': 'counter'})  # Not listening
+
+        subscriber = pubsub.SocketPubSub(path)
+        received = threading.Event()
+        events = []
+
+        def on_publish(user_ids, event):
+            events.append((user_ids, event))
+            received.set()
+
+        subscriber.subscribe(on_publish)
+        try:
+            publisher.publish([self.user.pk, self.user2.pk], {'type': 'counter'})
+            self.assertTrue(received.wait(5))
+        finally:
+            publisher.close()
+            subscriber.close()
+        self.assertEqual(events, [([self.user.pk, self.user2.pk], {'type': 'counter'})])
+        self.assertFalse(os.path.exists(path))
+
+    def test_socket_listening(self):
+        """
+        Should not replace the socket of a live\
+        listener, only the one left behind
+        """
+        path = os.path.join(tempfile.mkdtemp(), 'notifications.sock')
+        subscriber = pubsub.SocketPubSub(path)
+        subscriber.subscribe(lambda user_ids, event: None)
+        other = pubsub.SocketPubSub(path)
+
+        try:
+            self.assertRaises(socket.error, other.subscribe, lambda user_ids, event: None)
+            self.assertEqual(other._callbacks, [])
+        finally:
+            subscriber.close()
+
+        # Left behind
+        stale = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        stale.bind(path)
+        stale.close()
+        self.assertTrue(os.path.exists(path))
+        other.subscribe(lambda user_ids, event: None)
+        other.close()
+        self.assertFalse(os.path.exists(path))
+
+
+@skipIf(asyncio is None, "Requires Python 3.4+")
+@override_settings(ST_NOTIFICATIONS_PUBSUB='local')
+class TopicNotificationStreamTest(TestCase):
+
+    def setUp(self):
+        from . import stream
+
+        utils.cache_clear()
+        self.user = utils.create_user()
+        self.user2 = utils.create_user()
+        self.topic = utils.create_topic(utils.create_category())
+        self.comment = utils.create_comment(topic=self.topic)
+        TopicNotification.objects.create(
+            user=self.user, topic=self.topic, comment=self.comment,
+            action=COMMENT, is_active=True, is_read=True)
+        utils.login(self)
+        self.session_key = self.client.cookies['sessionid'].value
+        self.sockets = []
+
+        # The sessions and counters are fetched
+        # in this thread, within the test transaction
+        self.stream = stream
+        self.org_close_old_connections, stream.close_old_connections = \
+            stream.close_old_connections, lambda: None
+        self.loop = asyncio.new_event_loop()
+        self.server = stream.StreamServer(self.loop, pubsub.get_pubsub())
+        self.server._run = self._run
+        self.listening = self.loop.run_until_complete(
+            self.loop.create_server(self.server, '127.0.0.1', 0))
+        self.port = self.listening.sockets[0].getsockname()[1]
+        self.server.start()
+
+    def tearDown(self):
+        for sock in self.sockets:
+            sock.close()
+
+        self.server.close()
+        self.listening.close()
+        self.loop.run_until_complete(self.listening.wait_closed())
+        self.loop.close()
+        self.stream.close_old_connections = self.org_close_old_connections
+
+    def _run(self, func, arg, callback):
+        future = asyncio.Future(loop=self.loop)
+        future.set_result(func(arg))
+        callback(future)
+
+    def _pump(self):
+        self.loop.call_later(0.05, self.loop.stop)
+        self.loop.run_forever()
+
+    def _request(self, path, session_key=None, method='GET'):
+        sock = socket.create_connection(('127.0.0.1', self.port))
+        sock.setblocking(False)
+        self.sockets.append(sock)
+        request = '%s %s HTTP/1.1\r\nHost: localhost\r\n' % (method, path)
+
+        if session_key:
+            request += 'Cookie: sessionid=%s\r\n' % session_key
+
+        sock.sendall((request + '\r\n').encode('latin-1'))
+        return sock
+
+    def _read(self, sock):
+        self._pump()
+        data = b''
+
+        while True:
+            try:
+                chunk = sock.recv(2 ** 16)
+            except socket.error:
+                return data.decode('utf-8')
+
+            if not chunk:  # Closed
+                return data.decode('utf-8')
+
+            data += chunk
+
+    def _notify(self):
+        comment = utils.create_comment(topic=self.topic, user=self.user2)
+        TopicNotification.notify_new_comment(comment=comment)
+
+    def test_stream(self):
+        """
+        Should stream the counter and the new notifications
+        """
+        sock = self._request('/stream/', self.session_key)
+        response = self._read(sock)
+        self.assertIn('HTTP/1.1 200 OK', response)
+        self.assertIn('Content-Type: text/event-stream', response)
+        self.assertIn('event: counter\ndata: ', response)
+        self.assertIn('"public": 0', response)
+
+        self._notify()
+        response = self._read(sock)
+        self.assertIn('event: notification\ndata: ', response)
+        self.assertIn(self.topic.title, response)
+        self.assertIn('event: counter\ndata: ', response)
+        self.assertIn('"public": 1', response)
+
+        self.server._ping()
+        self.assertEqual(self._read(sock), ': ping\n\n')
+
+        # Other users are not notified
+        TopicNotification.notify_new_mentions(
+            comment=self.comment, mentions={self.user2.username: self.user2})
+        self.assertEqual(self._read(sock), '')
+
+    def test_poll(self):
+        """
+        Should wait until the counter changes
+        """
+        version = counter.get(self.user)['version']
+        sock = self._request('/poll/?version=%s' % version, self.session_key)
+        self.assertEqual(self._read(sock), '')
+
+        self._notify()
+        response = self._read(sock)
+        self.assertIn('HTTP/1.1 200 OK', response)
+        res = json.loads(response.split('\r\n\r\n', 1)[1])
+        self.assertEqual(res['counter']['public'], 1)
+        self.assertNotEqual(res['counter']['version'], version)
+        self.assertEqual([e['type'] for e in res['events']], ['notification'])
+
+        # Outdated version
+        sock = self._request('/poll/?version=%s' % version, self.session_key)
+        response = self._read(sock)
+        res = json.loads(response.split('\r\n\r\n', 1)[1])
+        self.assertEqual(res['counter']['public'], 1)
+        self.assertEqual(res['events'], [])
+
+    def test_errors(self):
+        """
+        Should require a logged-in user and a valid request
+        """
+        self.assertIn('HTTP/1.1 403 Forbidden', self._read(self._request('/stream/')))
+        self.assertIn('HTTP/1.1 403 Forbidden', self._read(self._request('/stream/', 'foo')))
+        self.assertIn('HTTP/1.1 404 Not Found', self._read(self._request('/foo/', self.session_key)))
+        self.assertIn(
+            'HTTP/1.1 405 Method Not Allowed',
+            self._read(self._request('/stream/', self.session_key, method='POST')))
+        self.assertIn('HTTP/1.1 400 Bad Request', self._read(self._request('/stream/ foo')))
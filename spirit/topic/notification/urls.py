@@ -12,6 +12,7 @@ urlpatterns = [
     url(r'^unread/$', views.index_unread, name='index-unread'),
     url(r'^mark-all-read/$', views.mark_all_read, name='mark-all-read'),
     url(r'^ajax/$', views.index_ajax, name='index-ajax'),
+    url(r'^unread-count/$', views.unread_count, name='unread-count'),
     url(r'^(?P<topic_id>\d+)/create/$', views.create, name='create'),
     url(r'^(?P<pk>\d+)/update/$', views.update, name='update'),
 ]
@@ -6,10 +6,11 @@ import json
 from django.contrib.auth.decorators import login_required
 from django.shortcuts import render, redirect, get_object_or_404
 from django.views.decorators.http import require_POST
-from django.http import Http404, HttpResponse
+from django.http import Http404, HttpResponse, HttpResponseNotModified
 from django.conf import settings
 from django.contrib import messages
 from django.utils.html import escape
+from django.utils.cache import patch_cache_control
 
 from djconfig import config
 
@@ -19,6 +20,7 @@ from ...core.utils.paginator.infinite_paginator import paginate
 from ...topic.models import Topic
 from .models import TopicNotification
 from .forms import NotificationForm, NotificationCreationForm
+from . import counter
 
 
 @require_POST
@@ -76,6 +78,30 @@ def index_ajax(request):
     return HttpResponse(json.dumps({'n': notifications, }), content_type="application/json")
 
 
+def _unread_count_response(request, unread):
+    etag = '"%s"' % unread['version']
+
+    if request.META.get('HTTP_IF_NONE_MATCH') == etag:
+        response = HttpResponseNotModified()
+    else:
+        response = utils.json_response(unread)
+
+    response['ETag'] = etag
+    patch_cache_control(response, private=True, no_cache=True)
+    return response
+
+
+@login_required
+def unread_count(request):
+    """
+    Return the unread notifications counter,\
+    or 304 if the ``If-None-Match`` header\
+    matches the counter version. The cached\
+    counter is served with no notification queries
+    """
+    return _unread_count_response(request, counter.get(request.user))
+
+
 @require_POST
 @login_required
 def mark_all_read(request):
@@ -84,6 +110,7 @@ def mark_all_read(request):
         .unread()\
         .public()\
         .update(is_read=True)
+    counter.invalidate([request.user.pk])
     messages.success(request, 'Marked %s notifications as read' % count)
     return redirect('spirit:topic:notification:index')
 
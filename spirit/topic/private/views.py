@@ -14,7 +14,7 @@ from django.conf import settings
 from djconfig import config
 
 from ...core import utils
-from ...core.utils.paginator import paginate, yt_paginate
+from ...core.utils.paginator import number_paginate, yt_paginate
 from ...core.utils.ratelimit.decorators import ratelimit
 from ...comment.forms import CommentForm
 from ...comment.utils import comment_posted
@@ -93,10 +93,11 @@ def detail(request, topic_id, slug):
         .for_topic(topic=topic)\
         .with_likes(user=request.user)\
         .with_polls(user=request.user)\
-        .order_by('date')
+        .order_by('date', 'pk')
 
-    comments = paginate(
+    comments = number_paginate(
         comments,
+        lookup_field='comment_number',
         per_page=config.comments_per_page,
         page_number=request.GET.get('page', 1)
     )
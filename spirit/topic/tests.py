@@ -8,20 +8,24 @@ from django.test import TestCase, RequestFactory, override_settings
 from django.core.urlresolvers import reverse
 from django.utils import timezone
 from django.core.exceptions import ObjectDoesNotExist
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
 
 from djconfig.utils import override_djconfig
 
 from spirit.comment.utils import comment_posted
 from ..core.tests import utils
 from . import utils as utils_topic
+from . import view_count
 from ..comment.models import MOVED
-from .models import Topic
+from .models import Topic, TopicViewers
 from .forms import TopicForm
 from ..comment.models import Comment
 from ..comment.bookmark.models import CommentBookmark
 from .notification.models import TopicNotification
 from spirit.user.models import UserProfile
 from .unread.models import TopicUnread
+from ..category.models import Category
 
 
 class TopicViewTest(TestCase):
@@ -264,6 +268,30 @@ class TopicViewTest(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(list(response.context['comments']), [comment1, comment2])
 
+    @override_djconfig(comments_per_page=2)
+    def test_topic_detail_view_paginate_last_page(self):
+        """
+        should display topic with comments, last page
+        """
+        utils.login(self)
+        category = utils.create_category()
+
+        topic = utils.create_topic(category=category)
+
+        utils.create_comment(topic=topic)
+        utils.create_comment(topic=topic)
+        comment3 = utils.create_comment(topic=topic)
+
+        response = self.client.get(
+            reverse('spirit:topic:detail', kwargs={'pk': topic.pk, 'slug': topic.slug}) + '?page=2')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(list(response.context['comments']), [comment3])
+        self.assertEqual(response.context['comments'].start_index(), 3)
+
+        response = self.client.get(
+            reverse('spirit:topic:detail', kwargs={'pk': topic.pk, 'slug': topic.slug}) + '?page=999999999')
+        self.assertEqual(response.status_code, 404)
+
     def test_topic_detail_viewed(self):
         """
         Calls utils.topic_viewed
@@ -575,13 +603,195 @@ class TopicUtilsTest(TestCase):
         topic = utils.create_topic(category=category, user=self.user)
         comment = utils.create_comment(topic=topic)
         notification = TopicNotification.objects.create(user=topic.user, topic=topic, comment=comment, is_read=False)
-        unread = TopicUnread.objects.create(user=topic.user, topic=topic, is_read=False)
+        unread = TopicUnread.objects.create(
+            user=topic.user, topic=topic, date=topic.last_active - datetime.timedelta(seconds=1))
         utils_topic.topic_viewed(req, topic)
         self.assertEqual(len(CommentBookmark.objects.filter(user=self.user, topic=topic)), 1)
         self.assertTrue(TopicNotification.objects.get(pk=notification.pk).is_read)
         self.assertTrue(TopicUnread.objects.get(pk=unread.pk).is_read)
         self.assertEqual(Topic.objects.get(pk=topic.pk).view_count, 1)
 
+    def test_topic_viewed_up_to_date(self):
+        """
+        Should not write the read state when it's up to date
+        """
+        req = RequestFactory().get('/?page=1')
+        req.user = self.user
+
+        category = utils.create_category()
+        topic = utils.create_topic(category=category, user=self.user)
+        comment = utils.create_comment(topic=topic)
+        TopicNotification.objects.create(user=self.user, topic=topic, comment=comment, is_read=True)
+        TopicUnread.objects.create(user=self.user, topic=topic, date=topic.last_active)
+        CommentBookmark.objects.create(user=self.user, topic=topic, comment_number=50)
+
+        with CaptureQueriesContext(connection) as ctx:
+            utils_topic.topic_viewed(req, topic)
+
+        writes = [
+            q['sql'] for q in ctx.captured_queries
+            if 'UPDATE' in q['sql'] or 'INSERT' in q['sql']]
+        self.assertEqual(len(writes), 1)
+        self.assertIn('view_count', writes[0])
+        self.assertEqual(CommentBookmark.objects.get(user=self.user, topic=topic).comment_number, 50)
+        self.assertEqual(Topic.objects.get(pk=topic.pk).view_count, 1)
+
+    def test_topic_viewed_notification_read_topic(self):
+        """
+        Should mark the notification as read\
+        even if the topic was already read
+        """
+        req = RequestFactory().get('/?page=1')
+        req.user = self.user
+
+        category = utils.create_category()
+        topic = utils.create_topic(category=category)
+        comment = utils.create_comment(topic=topic)
+        TopicUnread.objects.create(user=self.user, topic=topic, date=topic.last_active)
+        notification = TopicNotification.objects.create(
+            user=self.user, topic=topic, comment=comment, is_read=False)
+        utils_topic.topic_viewed(req, topic)
+        self.assertTrue(TopicNotification.objects.get(pk=notification.pk).is_read)
+
+
+class TopicViewCountTest(TestCase):
+
+    def setUp(self):
+        utils.cache_clear()
+        self.user = utils.create_user()
+        self.category = utils.create_category()
+        self.topic = utils.create_topic(category=self.category)
+        self.topic2 = utils.create_topic(category=self.category)
+
+    def test_record(self):
+        """
+        Should increase the view count right away
+        """
+        view_count.record(topic=self.topic, viewer='user:1')
+        view_count.record(topic=self.topic, viewer='user:1')
+        self.assertEqual(Topic.objects.get(pk=self.topic.pk).view_count, 2)
+
+    @override_settings(ST_TOPIC_VIEWS_BUFFER_CACHE='default', ST_TOPIC_VIEWS_FLUSH_INTERVAL=None)
+    def test_record_buffered(self):
+        """
+        Should buffer the views until they are flushed
+        """
+        for _ in range(3):
+            view_count.record(topic=self.topic, viewer='user:1')
+
+        view_count.record(topic=self.topic2, viewer='user:1')
+        self.assertEqual(Topic.objects.get(pk=self.topic.pk).view_count, 0)
+
+        self.assertEqual(view_count.flush(), 2)
+        self.assertEqual(Topic.objects.get(pk=self.topic.pk).view_count, 3)
+        self.assertEqual(Topic.objects.get(pk=self.topic2.pk).view_count, 1)
+
+        # Drained
+        self.assertEqual(view_count.flush(), 0)
+        view_count.record(topic=self.topic, viewer='user:1')
+        self.assertEqual(view_count.flush(), 1)
+        self.assertEqual(Topic.objects.get(pk=self.topic.pk).view_count, 4)
+
+    @override_settings(ST_TOPIC_VIEWS_BUFFER_CACHE='default', ST_TOPIC_VIEWS_FLUSH_INTERVAL=None)
+    def test_record_buffered_late(self):
+        """
+        Should write the views buffered in the\
+        flushed generation on the next flush
+        """
+        cache = view_count._get_cache()
+        generation = view_count._get_generation(cache)
+        view_count.record(topic=self.topic, viewer='user:1')
+        self.assertEqual(view_count.flush(), 1)
+
+        # Raced the flush
+        view_count._buffer_view(cache, generation, self.topic.pk)
+        view_count._buffer_view(cache, generation, self.topic2.pk)
+        self.assertEqual(view_count.flush(), 2)
+        self.assertEqual(Topic.objects.get(pk=self.topic.pk).view_count, 2)
+        self.assertEqual(Topic.objects.get(pk=self.topic2.pk).view_count, 1)
+
+        # Drained
+        view_count._buffer_view(cache, generation, self.topic.pk)
+        self.assertEqual(view_count.flush(), 0)
+        self.assertEqual(Topic.objects.get(pk=self.topic.pk).view_count, 2)
+
+    @override_settings(ST_TOPIC_VIEWS_BUFFER_CACHE='default', ST_TOPIC_VIEWS_FLUSH_INTERVAL=60)
+    def test_record_buffered_interval(self):
+        """
+        Should flush once per interval
+        """
+        view_count.record(topic=self.topic, viewer='user:1')
+        self.assertEqual(Topic.objects.get(pk=self.topic.pk).view_count, 1)
+
+        view_count.record(topic=self.topic, viewer='user:1')
+        self.assertEqual(Topic.objects.get(pk=self.topic.pk).view_count, 1)
+
+    @override_settings(ST_TOPIC_VIEWS_UNIQUE=True)
+    def test_record_unique(self):
+        """
+        Should count the unique viewers
+        """
+        view_count.record(topic=self.topic, viewer='user:1')
+        view_count.record(topic=self.topic, viewer='user:1')
+        view_count.record(topic=self.topic, viewer='user:2')
+        self.assertEqual(Topic.objects.get(pk=self.topic.pk).view_count, 2)
+
+    @override_settings(ST_TOPIC_VIEWS_UNIQUE=True)
+    def test_record_unique_keep_views(self):
+        """
+        Should add the unique viewers to the\
+        previous views, and not write repeated viewers
+        """
+        Topic.objects.filter(pk=self.topic.pk).update(view_count=10)
+        view_count.record(topic=self.topic, viewer='user:1')
+        self.assertEqual(Topic.objects.get(pk=self.topic.pk).view_count, 11)
+
+        with CaptureQueriesContext(connection) as ctx:
+            view_count.record(topic=self.topic, viewer='user:1')
+
+        self.assertEqual(len(ctx.captured_queries), 1)
+        self.assertEqual(Topic.objects.get(pk=self.topic.pk).view_count, 11)
+        self.assertEqual(len(TopicViewers.objects.filter(topic=self.topic)), 1)
+
+    @override_settings(
+        ST_TOPIC_VIEWS_UNIQUE=True,
+        ST_TOPIC_VIEWS_BUFFER_CACHE='default',
+        ST_TOPIC_VIEWS_FLUSH_INTERVAL=None)
+    def test_record_unique_buffered_late(self):
+        """
+        Should merge the viewers buffered in the\
+        flushed generation on the next flush
+        """
+        cache = view_count._get_cache()
+        generation = view_count._get_generation(cache)
+        view_count.record(topic=self.topic, viewer='user:1')
+        self.assertEqual(view_count.flush(), 1)
+
+        # Raced the flush
+        view_count._buffer_viewer(cache, generation, self.topic.pk, 'user:2')
+        self.assertEqual(view_count.flush(), 1)
+        self.assertEqual(Topic.objects.get(pk=self.topic.pk).view_count, 2)
+
+    @override_settings(
+        ST_TOPIC_VIEWS_UNIQUE=True,
+        ST_TOPIC_VIEWS_BUFFER_CACHE='default',
+        ST_TOPIC_VIEWS_FLUSH_INTERVAL=None)
+    def test_record_unique_buffered(self):
+        """
+        Should merge the buffered viewers into the stored ones
+        """
+        view_count.record(topic=self.topic, viewer='user:1')
+        view_count.record(topic=self.topic, viewer='user:2')
+        view_count.record(topic=self.topic, viewer='user:2')
+        self.assertEqual(Topic.objects.get(pk=self.topic.pk).view_count, 0)
+        self.assertEqual(view_count.flush(), 1)
+        self.assertEqual(Topic.objects.get(pk=self.topic.pk).view_count, 2)
+
+        view_count.record(topic=self.topic, viewer='user:1')
+        view_count.record(topic=self.topic, viewer='user:3')
+        self.assertEqual(view_count.flush(), 1)
+        self.assertEqual(Topic.objects.get(pk=self.topic.pk).view_count, 3)
+
 
 class TopicModelsTest(TestCase):
 
@@ -705,3 +915,67 @@ class TopicModelsTest(TestCase):
         Topic.objects.filter(pk=topic.pk).update(comment_count=2)
         topic_with_bookmark3 = Topic.objects.filter(pk=topic.pk).with_bookmarks(self.user).first()
         self.assertEqual(topic_with_bookmark3.get_bookmark_url(), topic_with_bookmark3.bookmark.get_new_comment_url())
+
+    def test_topic_effective_visibility(self):
+        """
+        Should set the denormalized visibility fields on save
+        """
+        subcategory = utils.create_category(parent=self.category)
+        topic = utils.create_topic(category=subcategory)
+        topic = Topic.objects.get(pk=topic.pk)
+        self.assertFalse(topic.effective_is_removed)
+        self.assertFalse(topic.effective_is_private)
+        self.assertEqual(topic.main_category_id, self.category.pk)
+
+        topic.is_removed = True
+        topic.save()
+        self.assertTrue(Topic.objects.get(pk=topic.pk).effective_is_removed)
+
+        private = utils.create_private_topic()
+        self.assertTrue(Topic.objects.get(pk=private.topic.pk).effective_is_private)
+
+    def test_topic_effective_visibility_category_change(self):
+        """
+        Should update the topics when the category\
+        or the parent category is removed or moved
+        """
+        subcategory = utils.create_category(parent=self.category)
+        topic = utils.create_topic(category=subcategory)
+
+        self.category.is_removed = True
+        self.category.save()
+        self.assertTrue(Topic.objects.get(pk=topic.pk).effective_is_removed)
+        self.assertTrue(Topic.objects.get(pk=self.topic.pk).effective_is_removed)
+
+        self.category.is_removed = False
+        self.category.save()
+        self.assertFalse(Topic.objects.get(pk=topic.pk).effective_is_removed)
+        self.assertFalse(Topic.objects.get(pk=self.topic.pk).effective_is_removed)
+
+        category = utils.create_category()
+        subcategory.parent = category
+        subcategory.save()
+        self.assertEqual(Topic.objects.get(pk=topic.pk).main_category_id, category.pk)
+
+    def test_topic_update_visibility(self):
+        """
+        Should recompute the visibility of bulk updated topics
+        """
+        subcategory = utils.create_category(parent=self.category)
+        topic = utils.create_topic(category=subcategory)
+        topic_removed = utils.create_topic(category=subcategory)
+        Topic.objects.filter(pk=topic_removed.pk).update(is_removed=True)
+        Topic.objects.all().update(
+            effective_is_removed=False, effective_is_private=True, main_category=None)
+
+        self.assertEqual(Topic.objects.all().update_visibility(), 3)
+        self.assertEqual(Topic.objects.all().update_visibility(), 0)
+        self.assertEqual(
+            list(Topic.objects.unremoved().order_by('pk')),
+            [self.topic, topic])
+        self.assertEqual(Topic.objects.public().count(), 3)
+        self.assertEqual(Topic.objects.get(pk=topic.pk).main_category_id, self.category.pk)
+
+        Category.objects.filter(pk=self.category.pk).update(is_removed=True)
+        self.assertEqual(Topic.objects.all().update_visibility(), 2)
+        self.assertFalse(Topic.objects.unremoved().exists())
@@ -0,0 +1,41 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+import datetime
+
+from django.db import migrations
+from django.utils import timezone
+from django.conf import settings
+
+
+def forwards(apps, schema_editor):
+    # The date becomes the topic activity the user
+    # has read up to. Read topics are read up to
+    # now and unread ones were never read
+    TopicUnread = apps.get_model("spirit_topic_unread", "TopicUnread")
+    never = datetime.datetime(1970, 1, 1)
+
+    if settings.USE_TZ:
+        never = timezone.make_aware(never, timezone.utc)
+
+    TopicUnread.objects\
+        .filter(is_read=True)\
+        .update(date=timezone.now())
+    TopicUnread.objects\
+        .filter(is_read=False)\
+        .update(date=never)
+
+
+def noop(apps, schema_editor):
+    pass
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('spirit_topic_unread', '0002_auto_20150828_2003'),
+    ]
+
+    operations = [
+        migrations.RunPython(forwards, reverse_code=noop),
+    ]
@@ -0,0 +1,18 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('spirit_topic_unread', '0003_topicunread_read_date'),
+    ]
+
+    operations = [
+        migrations.RemoveField(
+            model_name='topicunread',
+            name='is_read',
+        ),
+    ]
@@ -9,12 +9,20 @@ from django.utils import timezone
 
 
 class TopicUnread(models.Model):
+    """
+    Last time the user read a topic. The topic\
+    is unread when it's been active since then,\
+    so posting a comment doesn't need to update\
+    the other users rows
 
+    :ivar date: Last activity of the topic\
+    the last time the user read it
+    :vartype date: `:py:class:models.DateTimeField`
+    """
     user = models.ForeignKey(settings.AUTH_USER_MODEL, related_name='st_topics_unread')
     topic = models.ForeignKey('spirit_topic.Topic')
 
     date = models.DateTimeField(default=timezone.now)
-    is_read = models.BooleanField(default=True)
 
     class Meta:
         unique_together = ('user', 'topic')
@@ -25,20 +33,43 @@ class TopicUnread(models.Model):
     def get_absolute_url(self):
         return self.topic.get_absolute_url()
 
+    @property
+    def is_read(self):
+        return self.date >= self.topic.last_active
+
     @classmethod
     def create_or_mark_as_read(cls, user, topic):
+        """
+        Move the user read date forward,\
+        nothing gets written if the topic\
+        has not been active since then
+
+        :param user: The user
+        :param topic: The topic, its\
+        ``last_active`` must be up to date
+        :return: Whether the read date was moved forward
+        """
         if not user.is_authenticated():
-            return
+            return False
 
-        return cls.objects.update_or_create(
-            user=user,
-            topic=topic,
-            defaults={'is_read': True, }
-        )
+        date = cls.objects\
+            .filter(user=user, topic=topic)\
+            .values_list('date', flat=True)\
+            .first()
 
-    @classmethod
-    def unread_new_comment(cls, comment):
-        cls.objects\
-            .filter(topic=comment.topic)\
-            .exclude(user=comment.user)\
-            .update(is_read=False, date=timezone.now())
+        # The topic may have been active since it was
+        # fetched, so it's read up to that point only
+        if date is None:
+            _unread, created = cls.objects.get_or_create(
+                user=user,
+                topic=topic,
+                defaults={'date': topic.last_active})
+            return created
+
+        if date >= topic.last_active:
+            return False
+
+        updated = cls.objects\
+            .filter(user=user, topic=topic, date__lt=topic.last_active)\
+            .update(date=topic.last_active)
+        return bool(updated)
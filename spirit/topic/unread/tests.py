@@ -2,12 +2,19 @@
 
 from __future__ import unicode_literals
 
+import datetime
+
 from django.test import TestCase
 from django.core.urlresolvers import reverse
+from django.utils import timezone
 
 from ...core.tests import utils
 from .models import TopicUnread
 from ...comment.bookmark.models import CommentBookmark
+from ...comment.utils import comment_posted
+from ..models import Topic
+
+YESTERDAY = timezone.now() - datetime.timedelta(days=1)
 
 
 class TopicUnreadViewTest(TestCase):
@@ -32,7 +39,7 @@ class TopicUnreadViewTest(TestCase):
         topic unread list
         """
         TopicUnread.objects.filter(pk__in=[self.topic_unread.pk, self.topic_unread2.pk])\
-            .update(is_read=False)
+            .update(date=YESTERDAY)
 
         utils.login(self)
         response = self.client.get(reverse('spirit:topic:unread:index'))
@@ -49,7 +56,7 @@ class TopicUnreadViewTest(TestCase):
         TopicUnread.objects.all().delete()
 
         topic_a = utils.create_private_topic(user=self.user)
-        TopicUnread.objects.create(user=self.user, topic=topic_a.topic, is_read=False)
+        TopicUnread.objects.create(user=self.user, topic=topic_a.topic, date=YESTERDAY)
 
         utils.login(self)
         response = self.client.get(reverse('spirit:topic:unread:index'))
@@ -70,11 +77,11 @@ class TopicUnreadViewTest(TestCase):
         topic_c = utils.create_topic(category=category_removed)
         topic_d = utils.create_topic(category=subcategory)
         topic_e = utils.create_topic(category=subcategory_removed)
-        TopicUnread.objects.create(user=self.user, topic=topic_a.topic, is_read=False)
-        TopicUnread.objects.create(user=self.user, topic=topic_b, is_read=False)
-        TopicUnread.objects.create(user=self.user, topic=topic_c, is_read=False)
-        TopicUnread.objects.create(user=self.user, topic=topic_d, is_read=False)
-        TopicUnread.objects.create(user=self.user, topic=topic_e, is_read=False)
+        TopicUnread.objects.create(user=self.user, topic=topic_a.topic, date=YESTERDAY)
+        TopicUnread.objects.create(user=self.user, topic=topic_b, date=YESTERDAY)
+        TopicUnread.objects.create(user=self.user, topic=topic_c, date=YESTERDAY)
+        TopicUnread.objects.create(user=self.user, topic=topic_d, date=YESTERDAY)
+        TopicUnread.objects.create(user=self.user, topic=topic_e, date=YESTERDAY)
 
         utils.login(self)
         response = self.client.get(reverse('spirit:topic:unread:index'))
@@ -112,7 +119,7 @@ class TopicUnreadViewTest(TestCase):
         """
         TopicUnread.objects\
             .filter(pk__in=[self.topic_unread.pk, self.topic_unread2.pk])\
-            .update(is_read=False)
+            .update(date=YESTERDAY)
         bookmark = CommentBookmark.objects.create(topic=self.topic2, user=self.user)
 
         utils.login(self)
@@ -140,19 +147,30 @@ class TopicUnreadModelsTest(TestCase):
         create or mark as read
         """
         user = utils.create_user()
-        TopicUnread.create_or_mark_as_read(user=user, topic=self.topic)
+        self.assertTrue(TopicUnread.create_or_mark_as_read(user=user, topic=self.topic))
         self.assertEqual(len(TopicUnread.objects.filter(user=user, topic=self.topic)), 1)
+        self.assertTrue(TopicUnread.objects.get(user=user, topic=self.topic).is_read)
+        self.assertFalse(TopicUnread.create_or_mark_as_read(user=user, topic=self.topic))
 
-        TopicUnread.objects.all().update(is_read=True)
-        TopicUnread.create_or_mark_as_read(user=user, topic=self.topic)
+        TopicUnread.objects.all().update(date=YESTERDAY)
+        self.assertFalse(TopicUnread.objects.get(user=user, topic=self.topic).is_read)
+        self.assertTrue(TopicUnread.create_or_mark_as_read(user=user, topic=self.topic))
         self.assertTrue(TopicUnread.objects.get(user=user, topic=self.topic).is_read)
+        self.assertEqual(
+            TopicUnread.objects.get(user=user, topic=self.topic).date,
+            self.topic.last_active)
 
     def test_topic_unread_new_comment(self):
         """
-        Mark as unread
+        Should be unread for everyone but the comment author,\
+        without updating the other users rows
         """
-        TopicUnread.objects.all().update(is_read=True)
         comment = utils.create_comment(user=self.user, topic=self.topic)
-        TopicUnread.unread_new_comment(comment=comment)
+        comment_posted(comment=comment, mentions=None)
         self.assertTrue(TopicUnread.objects.get(user=self.user, topic=self.topic).is_read)
         self.assertFalse(TopicUnread.objects.get(user=self.user2, topic=self.topic).is_read)
+        self.assertEqual(
+            TopicUnread.objects.get(pk=self.topic_unread3.pk).date,
+            self.topic_unread3.date)
+        self.assertEqual(list(Topic.objects.for_unread(user=self.user2)), [self.topic])
+        self.assertEqual(list(Topic.objects.for_unread(user=self.user)), [])
@@ -2,31 +2,38 @@
 
 from __future__ import unicode_literals
 
+from django.db import transaction
+
 from ..comment.bookmark.models import CommentBookmark
 from .notification.models import TopicNotification
 from .unread.models import TopicUnread
+from . import view_count
 
 
 def topic_viewed(request, topic):
+    """
+    Update the read state of the topic for\
+    the user. Writes are skipped when the state\
+    is up to date (i.e: the bookmark is ahead\
+    and the topic is already read). The unread\
+    notifications are marked as read either way,\
+    some don't come along new comments\
+    (i.e: being invited to a private topic)
+    """
     # Todo test detail views
     user = request.user
     comment_number = CommentBookmark.page_to_comment_number(request.GET.get('page', 1))
 
     if user.is_authenticated():
-        try:
-            bookmark = CommentBookmark.objects.get(user=user, topic=topic)
-            if bookmark.comment_number < comment_number:
-                bookmark.comment_number = comment_number
-                bookmark.save()
-        except CommentBookmark.DoesNotExist:
-            CommentBookmark.objects.update_or_create(
-                user=user,
-                topic=topic,
-                defaults={
-                    'comment_number': comment_number,
-                }
-            )
-        TopicNotification.mark_as_read(user=user, topic=topic)
-        TopicUnread.create_or_mark_as_read(user=user, topic=topic)
-
-    topic.increase_view_count()
+        with transaction.atomic():
+            CommentBookmark.increase_to(user=user, topic=topic, comment_number=comment_number)
+
+            TopicUnread.create_or_mark_as_read(user=user, topic=topic)
+            TopicNotification.mark_as_read(user=user, topic=topic)
+
+    if user.is_authenticated():
+        viewer = 'user:%s' % user.pk
+    else:
+        viewer = 'ip:%s' % request.META.get('REMOTE_ADDR', '')
+
+    view_count.record(topic=topic, viewer=viewer)
@@ -0,0 +1,286 @@
+# -*- coding: utf-8 -*-
+
+from __future__ import unicode_literals
+
+import uuid
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.cache import caches
+from django.db import transaction
+from django.db.models import F
+
+from ..core.utils.hyperloglog import HyperLogLog
+from .models import Topic, TopicViewers
+
+__all__ = [
+    'record',
+    'flush']
+
+# Views are buffered per generation,
+# flushing moves to a new generation
+# and drains the previous one. It's
+# drained once more on the next flush,
+# to catch the views that raced the move
+_GENERATION_KEY = 'st_topic_views_generation'
+_PREVIOUS_GENERATION_KEY = 'st_topic_views_previous_generation'
+_FLUSH_KEY = 'st_topic_views_flush'
+_FLUSH_LOCK_KEY = 'st_topic_views_flush_lock'
+_DIRTY_COUNT_KEY = 'st_topic_views_%s_dirty'
+_DIRTY_SLOT_KEY = 'st_topic_views_%s_dirty_%d'
+_VIEWS_KEY = 'st_topic_views_%s_views_%d'
+_VIEWERS_KEY = 'st_topic_views_%s_viewers_%d'
+
+# Unflushed generations are dropped after this
+_TIMEOUT = 60 * 60 * 24 * 7
+_FLUSH_LOCK_TIMEOUT = 60 * 5
+
+
+def _get_cache():
+    return caches[settings.ST_TOPIC_VIEWS_BUFFER_CACHE]
+
+
+def _get_generation(cache):
+    generation = cache.get(_GENERATION_KEY)
+
+    if generation is None:
+        cache.add(_GENERATION_KEY, uuid.uuid4().hex, timeout=None)
+        generation = cache.get(_GENERATION_KEY)
+
+    return generation
+
+
+def _mark_dirty(cache, generation, topic_id):
+    count_key = _DIRTY_COUNT_KEY % generation
+    cache.add(count_key, 0, timeout=_TIMEOUT)
+
+    try:
+        slot = cache.incr(count_key)
+    except ValueError:  # Expired
+        return
+
+    cache.set(_DIRTY_SLOT_KEY % (generation, slot), topic_id, timeout=_TIMEOUT)
+
+
+def _buffer_view(cache, generation, topic_id):
+    key = _VIEWS_KEY % (generation, topic_id)
+
+    if cache.add(key, 1, timeout=_TIMEOUT):
+        _mark_dirty(cache, generation, topic_id)
+        return
+
+    try:
+        cache.incr(key)
+    except ValueError:  # Expired
+        cache.set(key, 1, timeout=_TIMEOUT)
+        _mark_dirty(cache, generation, topic_id)
+
+
+def _buffer_viewer(cache, generation, topic_id, viewer):
+    key = _VIEWERS_KEY % (generation, topic_id)
+    registers = cache.get(key)
+
+    if registers is None:
+        viewers = HyperLogLog()
+        viewers.add(viewer)
+
+        if cache.add(key, viewers.to_bytes(), timeout=_TIMEOUT):
+            _mark_dirty(cache, generation, topic_id)
+            return
+
+        registers = cache.get(key)
+
+    viewers = HyperLogLog(registers)
+
+    # Repeated viewers don't change the counter
+    if viewers.add(viewer):
+        cache.set(key, viewers.to_bytes(), timeout=_TIMEOUT)
+
+
+def _save_views(views):
+    """
+    Add the views to the topics,\
+    topics with the same amount\
+    of views are updated at once
+
+    :param views: {topic_id: views}
+    :return: The updated topic ids
+    """
+    topics_by_views = defaultdict(list)
+
+    for topic_id, count in views.items():
+        if count:
+            topics_by_views[count].append(topic_id)
+
+    for count, topic_ids in topics_by_views.items():
+        Topic.objects\
+            .filter(pk__in=topic_ids)\
+            .update(view_count=F('view_count') + count)
+
+    return {
+        topic_id
+        for topic_ids in topics_by_views.values()
+        for topic_id in topic_ids}
+
+
+def _save_viewers(viewers):
+    """
+    Merge the viewers into the stored ones\
+    and add the increase of the estimated\
+    unique viewers to the view count. The\
+    stored ones are read first, so nothing\
+    gets locked nor written if the viewers\
+    were seen before
+
+    :param viewers: {topic_id: HyperLogLog}
+    :return: The updated topic ids
+    """
+    stored_registers = dict(
+        TopicViewers.objects
+        .filter(topic_id__in=list(viewers))
+        .values_list('topic_id', 'registers'))
+    viewers = {
+        topic_id: topic_viewers
+        for topic_id, topic_viewers in viewers.items()
+        if topic_id not in stored_registers or
+        HyperLogLog(stored_registers[topic_id]).merge(topic_viewers)}
+    updated = set()
+
+    for topic_id, topic_viewers in sorted(viewers.items()):
+        with transaction.atomic():
+            stored, created = TopicViewers.objects\
+                .select_for_update()\
+                .get_or_create(
+                    topic_id=topic_id,
+                    defaults={'registers': topic_viewers.to_bytes()})
+            count = 0
+
+            if not created:
+                stored_viewers = HyperLogLog(stored.registers)
+                count = stored_viewers.count()
+
+                if not stored_viewers.merge(topic_viewers):
+                    continue
+
+                stored.registers = stored_viewers.to_bytes()
+                stored.save()
+                topic_viewers = stored_viewers
+
+            # The estimate may shrink a bit
+            # when switching to the raw one
+            increase = max(0, topic_viewers.count() - count)
+            Topic.objects\
+                .filter(pk=topic_id)\
+                .update(view_count=F('view_count') + increase)
+            updated.add(topic_id)
+
+    return updated
+
+
+def _drain(cache, generation, is_last):
+    """
+    Write the views buffered in a generation.\
+    The drained views are subtracted, instead\
+    of deleting the keys, so the ones added\
+    meanwhile are kept for the last drain.\
+    The viewers are merged again in the last\
+    drain, that's a no-op for the ones seen already
+
+    :return: The updated topic ids
+    """
+    count_key = _DIRTY_COUNT_KEY % generation
+    slot_keys = [
+        _DIRTY_SLOT_KEY % (generation, slot)
+        for slot in range(1, (cache.get(count_key) or 0) + 1)]
+    topic_ids = set(cache.get_many(slot_keys).values())
+
+    if settings.ST_TOPIC_VIEWS_UNIQUE:
+        key_pattern = _VIEWERS_KEY
+    else:
+        key_pattern = _VIEWS_KEY
+
+    keys = {key_pattern % (generation, topic_id): topic_id for topic_id in topic_ids}
+    buffered = cache.get_many(list(keys))
+
+    if is_last:
+        cache.delete_many(slot_keys + list(keys) + [count_key])
+    elif not settings.ST_TOPIC_VIEWS_UNIQUE:
+        for key, count in buffered.items():
+            try:
+                cache.decr(key, count)
+            except ValueError:  # Expired
+                pass
+
+    if settings.ST_TOPIC_VIEWS_UNIQUE:
+        return _save_viewers({
+            keys[key]: HyperLogLog(registers)
+            for key, registers in buffered.items()})
+
+    return _save_views({
+        keys[key]: count
+        for key, count in buffered.items()})
+
+
+def flush():
+    """
+    Write the buffered views to the database.\
+    It does nothing if another flush is running
+
+    :return: Number of topics updated
+    """
+    cache = _get_cache()
+
+    if not cache.add(_FLUSH_LOCK_KEY, 1, timeout=_FLUSH_LOCK_TIMEOUT):
+        return 0
+
+    try:
+        previous_generation = cache.get(_PREVIOUS_GENERATION_KEY)
+        generation = _get_generation(cache)
+        cache.set(_GENERATION_KEY, uuid.uuid4().hex, timeout=None)
+        cache.set(_PREVIOUS_GENERATION_KEY, generation, timeout=_TIMEOUT)
+        updated = set()
+
+        if previous_generation is not None:
+            updated.update(_drain(cache, previous_generation, is_last=True))
+
+        updated.update(_drain(cache, generation, is_last=False))
+        return len(updated)
+    finally:
+        cache.delete(_FLUSH_LOCK_KEY)
+
+
+def record(topic, viewer):
+    """
+    Record a topic view. Views are written\
+    right away unless a buffer cache is set in\
+    ``settings.ST_TOPIC_VIEWS_BUFFER_CACHE``,\
+    in which case they are flushed in bulk every\
+    ``settings.ST_TOPIC_VIEWS_FLUSH_INTERVAL`` seconds\
+    or by the ``spirittopicviews`` command
+
+    :param topic: The viewed topic
+    :param viewer: A string identifying the viewer,\
+    only used when ``settings.ST_TOPIC_VIEWS_UNIQUE`` is True
+    """
+    if settings.ST_TOPIC_VIEWS_BUFFER_CACHE is None:
+        if settings.ST_TOPIC_VIEWS_UNIQUE:
+            viewers = HyperLogLog()
+            viewers.add(viewer)
+            _save_viewers({topic.pk: viewers})
+        else:
+            topic.increase_view_count()
+
+        return
+
+    cache = _get_cache()
+    generation = _get_generation(cache)
+
+    if settings.ST_TOPIC_VIEWS_UNIQUE:
+        _buffer_viewer(cache, generation, topic.pk, viewer)
+    else:
+        _buffer_view(cache, generation, topic.pk)
+
+    interval = settings.ST_TOPIC_VIEWS_FLUSH_INTERVAL
+
+    if interval and cache.add(_FLUSH_KEY, 1, timeout=interval):
+        flush()
@@ -9,7 +9,7 @@ from django.conf import settings
 
 from djconfig import config
 
-from ..core.utils.paginator import paginate, yt_paginate
+from ..core.utils.paginator import number_paginate, yt_paginate
 from ..core.utils.ratelimit.decorators import ratelimit
 from ..category.models import Category
 from ..comment.models import MOVED
@@ -97,10 +97,11 @@ def detail(request, pk, slug):
         .with_likes(user=request.user)\
         .with_polls(user=request.user)\
         .prefetch_related(*settings.ST_COMMENTS_PREFETCH_RELATED)\
-        .order_by('date')
+        .order_by('date', 'pk')
 
-    comments = paginate(
+    comments = number_paginate(
         comments,
+        lookup_field='comment_number',
         per_page=config.comments_per_page,
         page_number=request.GET.get('page', 1)
     )
@@ -15,6 +15,7 @@ from djconfig import config
 
 from spirit.user.models import UserSuspensionLog
 from ...core.utils.paginator import yt_paginate
+from ...search.models import TopicIndexQueue, CommentIndexQueue
 from ...core.utils.decorators import administrator_required, moderator_required
 from .forms import UserForm, UserProfileForm, UserSuspendForm, UserSuspendAndDeleteForm
 
@@ -103,7 +104,11 @@ def suspend_and_delete(request, user_id):
 
             # delete topics and comments
             user.st_topics.exclude(is_removed=True).update(is_removed=True, reindex_at=timezone.now())
+            user.st_topics.update_visibility()
             user.st_comments.update(is_removed=True)
+            TopicIndexQueue.enqueue(user.st_topics.values_list('pk', flat=True), comments=True)
+            TopicIndexQueue.enqueue(user.st_comments.values_list('topic_id', flat=True))
+            CommentIndexQueue.enqueue(user.st_comments.values_list('pk', flat=True))
 
             # log suspension
             UserSuspensionLog.objects.create(
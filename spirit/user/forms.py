@@ -81,7 +81,7 @@ class UserProfileForm(forms.ModelForm):
 
     class Meta:
         model = UserProfile
-        fields = ("location", "timezone", "hide_last_seen")
+        fields = ("location", "timezone", "hide_last_seen", "notify_email")
 
     def __init__(self, *args, **kwargs):
         super(UserProfileForm, self).__init__(*args, **kwargs)
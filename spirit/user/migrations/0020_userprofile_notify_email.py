@@ -0,0 +1,19 @@
+# -*- coding: utf-8 -*-
+from __future__ import unicode_literals
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('spirit_user', '0019_usersuspensionlog'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='userprofile',
+            name='notify_email',
+            field=models.IntegerField(verbose_name='email notifications', default=0, choices=[(0, 'Never'), (1, 'Immediately'), (2, 'Digest')]),
+        ),
+    ]
@@ -23,6 +23,14 @@ AVATAR_CHOICES = getattr(settings, 'ST_AVATAR_CHOICES', (
     ('file', _('uploaded file')),
 ))
 
+NOTIFY_NEVER, NOTIFY_IMMEDIATELY, NOTIFY_DIGEST = range(3)
+
+NOTIFY_CHOICES = (
+    (NOTIFY_NEVER, _("Never")),
+    (NOTIFY_IMMEDIATELY, _("Immediately")),
+    (NOTIFY_DIGEST, _("Digest")),
+)
+
 
 @deconstructible
 class UploadToHandler(object):
@@ -61,6 +69,7 @@ class UserProfile(models.Model):
     avatar_cached_url = models.CharField(max_length=255, blank=True, null=True)
     avatar_flair = models.CharField(_("avatar flair"), max_length=128, blank=True)
     user_title = models.CharField(_("user title"), max_length=128, blank=True)  # the user can choose this title
+    notify_email = models.IntegerField(_("email notifications"), choices=NOTIFY_CHOICES, default=NOTIFY_NEVER)
 
     topic_count = models.PositiveIntegerField(_("topic count"), default=0)
     comment_count = models.PositiveIntegerField(_("comment count"), default=0)
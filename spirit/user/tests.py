@@ -10,6 +10,7 @@ from django.core import mail
 from django.utils.translation import ugettext as _
 from django.utils import timezone
 from django.test.utils import override_settings
+from smtplib import SMTPException
 
 from djconfig.utils import override_djconfig
 
@@ -21,6 +22,10 @@ from ..comment.models import Comment
 from ..comment.bookmark.models import CommentBookmark
 from .utils.tokens import UserActivationTokenGenerator, UserEmailChangeTokenGenerator
 from .utils.email import send_activation_email, send_email_change_email, sender
+from .utils.email import send_notification_emails, send_pending_notification_emails
+from .models import NOTIFY_NEVER, NOTIFY_IMMEDIATELY, NOTIFY_DIGEST
+from ..topic.notification.models import TopicNotification, COMMENT, MENTION
+from ..topic.private.models import TopicPrivate
 from .utils import email
 from . import middleware
 
@@ -343,7 +348,8 @@ class UserViewTest(TestCase):
 
         # post
         form_data = {'first_name': 'foo', 'last_name': 'bar',
-                     'location': 'spirit', 'timezone': self.user.st.timezone}
+                     'location': 'spirit', 'timezone': self.user.st.timezone,
+                     'notify_email': NOTIFY_NEVER}
         response = self.client.post(reverse('spirit:user:update'),
                                     form_data)
         expected_url = reverse('spirit:user:update')
@@ -466,7 +472,8 @@ class UserFormTest(TestCase):
         edit user profile
         """
         form_data = {'first_name': 'foo', 'last_name': 'bar',
-                     'location': 'spirit', 'timezone': self.user.st.timezone}
+                     'location': 'spirit', 'timezone': self.user.st.timezone,
+                     'notify_email': NOTIFY_NEVER}
         form = UserProfileForm(data=form_data, instance=self.user.st)
         self.assertEqual(form.is_valid(), True)
 
@@ -476,7 +483,7 @@ class UserFormTest(TestCase):
     def test_profile_timezone_field(self):
         form_data = {
             'first_name': 'foo', 'last_name': 'bar',
-            'location': 'spirit', 'timezone': 'UTC'}
+            'location': 'spirit', 'timezone': 'UTC', 'notify_email': NOTIFY_NEVER}
 
         form = UserProfileForm(data=form_data, instance=self.user.st)
         self.assertEqual(form.is_valid(), True)
@@ -859,6 +866,231 @@ class UtilsUserTests(TestCase):
         self.assertEquals(mail.outbox[0].from_email, "foo@bar.com")
 
 
+@override_settings(ST_NOTIFICATIONS_EMAIL_SITE_URL='https://example.com')
+class UserNotificationEmailTest(TestCase):
+
+    def setUp(self):
+        utils.cache_clear()
+        self.user = utils.create_user()
+        self.category = utils.create_category()
+        self.topic = utils.create_topic(self.category)
+        self.comment = utils.create_comment(topic=self.topic)
+
+    def _notify(self, notify_email, topic=None, comment=None, **kwargs):
+        user = utils.create_user()
+        user.st.notify_email = notify_email
+        user.st.save()
+        topic = topic or self.topic
+        TopicNotification.objects.create(
+            user=user, topic=topic, comment=comment or self.comment,
+            action=COMMENT, is_active=True, **kwargs)
+        return user
+
+    def test_send_notification_emails(self):
+        """
+        Should email the users that get them right away, once
+        """
+        user = self._notify(NOTIFY_IMMEDIATELY)
+        self._notify(NOTIFY_NEVER)
+        self._notify(NOTIFY_DIGEST)
+        self._notify(NOTIFY_IMMEDIATELY, is_read=True)
+        topic = utils.create_topic(self.category)
+        self._notify(NOTIFY_IMMEDIATELY, topic=topic, comment=utils.create_comment(topic=topic))
+        self.assertEqual(send_notification_emails(self.comment.pk), 1)
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, [user.email])
+        self.assertIn(self.topic.title, mail.outbox[0].subject)
+        self.assertIn(
+            'https://example.com' + reverse(
+                'spirit:comment:bookmark:find', kwargs={'topic_id': self.topic.pk}),
+            mail.outbox[0].body)
+        self.assertTrue(TopicNotification.objects.get(user=user).is_emailed)
+
+        self.assertEqual(send_notification_emails(self.comment.pk), 0)
+        self.assertEqual(len(mail.outbox), 1)
+
+    @override_settings(ST_NOTIFICATIONS_EMAIL_BATCH_SIZE=2)
+    def test_send_notification_emails_batch(self):
+        """
+        Should render the email once and send\
+        the batches through one connection
+        """
+        for __ in range(3):
+            self._notify(NOTIFY_IMMEDIATELY)
+
+        calls = {'render': 0, 'connection': 0, 'send': []}
+        org_render, org_get_connection = email._render, email.get_connection
+
+        def render(*args, **kwargs):
+            calls['render'] += 1
+            return org_render(*args, **kwargs)
+
+        def get_connection():
+            calls['connection'] += 1
+            connection = org_get_connection()
+            org_send_messages = connection.send_messages
+
+            def send_messages(messages):
+                calls['send'].append(len(messages))
+                return org_send_messages(messages)
+
+            connection.send_messages = send_messages
+            return connection
+
+        email._render, email.get_connection = render, get_connection
+        try:
+            self.assertEqual(send_notification_emails(self.comment.pk), 3)
+        finally:
+            email._render, email.get_connection = org_render, org_get_connection
+
+        self.assertEqual(len(mail.outbox), 3)
+        self.assertEqual(calls, {'render': 1, 'connection': 1, 'send': [2, 1]})
+
+    def test_send_notification_emails_failure(self):
+        """
+        Should release the notifications of a failed batch
+        """
+        user = self._notify(NOTIFY_IMMEDIATELY)
+        org_get_connection = email.get_connection
+
+        def get_connection():
+            connection = org_get_connection()
+
+            def send_messages(messages):
+                raise SMTPException('foo')
+
+            connection.send_messages = send_messages
+            return connection
+
+        email.get_connection = get_connection
+        try:
+            self.assertEqual(send_notification_emails(self.comment.pk), 0)
+        finally:
+            email.get_connection = org_get_connection
+
+        self.assertFalse(TopicNotification.objects.get(user=user).is_emailed)
+        self.assertEqual(send_pending_notification_emails(), 1)
+        self.assertEqual(mail.outbox[0].to, [user.email])
+
+    def test_send_notification_emails_comment_removed(self):
+        """
+        Should not email the removed comments
+        """
+        self._notify(NOTIFY_IMMEDIATELY)
+        Comment.objects.filter(pk=self.comment.pk).update(is_removed=True)
+        self.assertEqual(send_notification_emails(self.comment.pk), 0)
+        self.assertEqual(send_pending_notification_emails(), 0)
+        self.assertEqual(len(mail.outbox), 0)
+
+    def test_send_notification_emails_comment_deleted(self):
+        """
+        Should skip the comments deleted\
+        while the emails are made
+        """
+        user = self._notify(NOTIFY_IMMEDIATELY)
+
+        class CommentMock(object):
+            class objects(object):
+                @staticmethod
+                def select_related(*args):
+                    return Comment.objects.none()
+
+        org_comment, email.Comment = email.Comment, CommentMock
+        try:
+            self.assertEqual(send_notification_emails(self.comment.pk), 0)
+        finally:
+            email.Comment = org_comment
+
+        self.assertFalse(TopicNotification.objects.get(user=user).is_emailed)
+        self.assertEqual(send_notification_emails(self.comment.pk), 1)
+
+    def test_send_notification_emails_build_failure(self):
+        """
+        Should release the claimed notifications\
+        of the batch when an email can't be made
+        """
+        user = self._notify(NOTIFY_IMMEDIATELY)
+        notification = TopicNotification.objects.get(user=user)
+
+        def emails():
+            yield [notification.pk], email._make_email('foo', 'bar', 'bar', user.email)
+            raise ValueError('foo')
+
+        self.assertRaises(ValueError, email._send, emails())
+        self.assertFalse(TopicNotification.objects.get(pk=notification.pk).is_emailed)
+        self.assertEqual(len(mail.outbox), 0)
+
+    def test_send_notification_emails_private_access_removed(self):
+        """
+        Should not email the users removed from the private topic
+        """
+        topic_private = utils.create_private_topic()
+        topic = topic_private.topic
+        comment = utils.create_comment(topic=topic)
+        user = self._notify(NOTIFY_IMMEDIATELY, topic=topic, comment=comment, is_read=True)
+        access = TopicPrivate.objects.create(user=user, topic=topic)
+        access.delete()
+        TopicNotification.notify_new_comment(comment)
+        self.assertFalse(TopicNotification.objects.get(user=user).is_read)
+        self.assertEqual(send_notification_emails(comment.pk), 0)
+        self.assertEqual(send_pending_notification_emails(), 0)
+        self.assertEqual(len(mail.outbox), 0)
+
+        TopicPrivate.objects.create(user=user, topic=topic)
+        self.assertEqual(send_notification_emails(comment.pk), 1)
+        self.assertEqual(mail.outbox[0].to, [user.email])
+
+    def test_send_notification_emails_removed(self):
+        """
+        Should not email the notifications\
+        of removed topics and categories
+        """
+        self._notify(NOTIFY_IMMEDIATELY)
+        Topic.objects.filter(pk=self.topic.pk).update(effective_is_removed=True)
+        self.assertEqual(send_notification_emails(self.comment.pk), 0)
+
+        category = utils.create_category()
+        topic = utils.create_topic(category)
+        comment = utils.create_comment(topic=topic)
+        self._notify(NOTIFY_IMMEDIATELY, topic=topic, comment=comment)
+        category.is_removed = True
+        category.save()
+        self.assertEqual(send_notification_emails(comment.pk), 0)
+        self.assertEqual(send_pending_notification_emails(), 0)
+        self.assertEqual(len(mail.outbox), 0)
+
+    @override_settings(ST_NOTIFICATIONS_EMAIL_MAX_AGE=60)
+    def test_send_pending_notification_emails_max_age(self):
+        """
+        Should give up the old notifications
+        """
+        self._notify(NOTIFY_IMMEDIATELY, date=timezone.now() - datetime.timedelta(seconds=120))
+        self.assertEqual(send_pending_notification_emails(), 0)
+
+    @override_settings(ST_NOTIFICATIONS_EMAIL_DIGEST_INTERVAL=60)
+    def test_send_pending_notification_emails_digest(self):
+        """
+        Should send a digest once the oldest\
+        notification has waited for the interval
+        """
+        old_date = timezone.now() - datetime.timedelta(seconds=120)
+        user = self._notify(NOTIFY_DIGEST, date=old_date)
+        topic = utils.create_topic(self.category, title='digest topic')
+        TopicNotification.objects.create(
+            user=user, topic=topic, comment=utils.create_comment(topic=topic),
+            action=MENTION, is_active=True)
+        self._notify(NOTIFY_DIGEST)
+        self.assertEqual(send_pending_notification_emails(), 1)
+        self.assertEqual(len(mail.outbox), 1)
+        self.assertEqual(mail.outbox[0].to, [user.email])
+        self.assertIn(self.topic.title, mail.outbox[0].body)
+        self.assertIn('digest topic', mail.outbox[0].body)
+        self.assertEqual(
+            TopicNotification.objects.filter(user=user, is_emailed=True).count(), 2)
+
+        self.assertEqual(send_pending_notification_emails(), 0)
+
+
 class UserMiddlewareTest(TestCase):
 
     def setUp(self):
@@ -1,21 +1,45 @@
 # -*- coding: utf-8 -*-
 
 from __future__ import unicode_literals
+import time
 import logging
+import datetime
+from itertools import groupby, chain
 from smtplib import SMTPException
 
-from django.core.mail import EmailMultiAlternatives
+from django.core.mail import EmailMultiAlternatives, get_connection
+from django.db.models import Q, F
 from django.contrib.sites.shortcuts import get_current_site
-from django.template import Context
+from django.utils import timezone
 from django.utils.translation import ugettext as _
+from django.utils.six.moves.urllib.parse import urlparse
 from django.template.loader import render_to_string
 from django.conf import settings
 
+from ...core.utils import jobs
+from ...comment.models import Comment
+from ...topic.notification.models import TopicNotification, COMMENT, MENTION
+from ..models import NOTIFY_IMMEDIATELY, NOTIFY_DIGEST
 from .tokens import UserActivationTokenGenerator, UserEmailChangeTokenGenerator
 
 logger = logging.getLogger('django')
 
 
+def _render(template_name, context):
+    """
+    :return: The text and HTML bodies
+    """
+    message = render_to_string(template_name, context)
+    html = render_to_string("spirit/_base_email.html", {'content': message})
+    return message, html
+
+
+def _make_email(subject, message, html, recipient):
+    email = EmailMultiAlternatives(subject, message, from_email=settings.DEFAULT_FROM_EMAIL, to=[recipient])
+    email.attach_alternative(content=html, mimetype="text/html")
+    return email
+
+
 def sender(request, subject, template_name, context, to):
     site = get_current_site(request)
     context.update({
@@ -23,18 +47,15 @@ def sender(request, subject, template_name, context, to):
         'domain': site.domain,
         'protocol': 'https' if request.is_secure() else 'http'
     })
-    message = render_to_string(template_name, context)
-    html_context = Context({
-        'content': message
-    })
+    message, html = _render(template_name, context)
+    emails = [
+        _make_email(subject, message, html, recipient)
+        for recipient in to]
 
-    for recipient in to:
-        email = EmailMultiAlternatives(subject, message, from_email=settings.DEFAULT_FROM_EMAIL, to=[recipient])
-        email.attach_alternative(content=render_to_string("spirit/_base_email.html", html_context), mimetype="text/html")
-        try:
-            email.send()
-        except (SMTPException, OSError) as err:
-            logger.exception(err)
+    try:
+        get_connection().send_messages(emails)
+    except (SMTPException, OSError) as err:
+        logger.exception(err)
 
 
 def send_activation_email(request, user):
@@ -55,12 +76,196 @@ def send_email_change_email(request, user, new_email):
     sender(request, subject, template_name, context, [send_to_email, ])
 
 
-def send_notification_email(request, topic_notifications, comment):
-    # TODO: test, implement
-    subject = _("New notification: %(topic_name)s" % {'topic_name': comment.topic.title, })
-    template_name = 'spirit/user/notification_email.html'
-    context = {'comment': comment, }
-    to = [tn.user.email
-          for tn in topic_notifications
-          if tn.user.is_subscribed]
-    sender(request, subject, template_name, context, to)
+def _get_site_context():
+    # There is no request to get the site from
+    url = urlparse(settings.ST_NOTIFICATIONS_EMAIL_SITE_URL)
+    return {
+        'site_name': url.netloc,
+        'domain': url.netloc,
+        'protocol': url.scheme}
+
+
+def _pending_notifications():
+    """
+    Unread notifications not emailed yet,\
+    the old ones are given up (i.e: after\
+    failing for a while). The ones of removed\
+    comments and topics, and of private topics\
+    the user was removed from are left out
+    """
+    max_age = datetime.timedelta(seconds=settings.ST_NOTIFICATIONS_EMAIL_MAX_AGE)
+    return TopicNotification.objects\
+        .unremoved()\
+        .unread()\
+        .filter(
+            is_active=True,
+            is_emailed=False,
+            action__in=[COMMENT, MENTION],
+            comment__is_removed=False,
+            date__gte=timezone.now() - max_age)\
+        .filter(
+            Q(topic__effective_is_private=False) |
+            Q(topic__topics_private__user=F('user')))\
+        .exclude(user__email='')
+
+
+def _claim(pks):
+    # Another process may be emailing them
+    return TopicNotification.objects\
+        .filter(pk__in=pks, is_emailed=False)\
+        .update(is_emailed=True)
+
+
+def _unclaim(pks):
+    TopicNotification.objects\
+        .filter(pk__in=pks)\
+        .update(is_emailed=False)
+
+
+def _throttle(count, started_at):
+    rate = settings.ST_NOTIFICATIONS_EMAIL_RATE
+
+    if rate:
+        time.sleep(max(0, count / float(rate) - (time.time() - started_at)))
+
+
+def _send(emails):
+    """
+    Send the emails through a single connection,\
+    in batches of ``settings.ST_NOTIFICATIONS_EMAIL_BATCH_SIZE``.\
+    The notifications of an email are claimed right before\
+    it's sent, the ones of a failed batch are released to\
+    be retried later, and the sending stops
+
+    :param emails: Iterable of (notification pks, email)
+    :return: The number of sent emails
+    """
+    batch_size = settings.ST_NOTIFICATIONS_EMAIL_BATCH_SIZE
+    sent = 0
+    batch = []
+    emails = iter(emails)
+
+    with get_connection() as connection:
+        while True:
+            try:
+                for pks, email in emails:
+                    if _claim(pks):
+                        batch.append((pks, email))
+
+                    if len(batch) >= batch_size:
+                        break
+            except Exception:
+                # Building the next email failed,
+                # the batch would never be sent
+                _unclaim([pk for pks, _email in batch for pk in pks])
+                raise
+
+            if not batch:
+                return sent
+
+            started_at = time.time()
+
+            try:
+                connection.send_messages([email for _pks, email in batch])
+            except (SMTPException, OSError) as err:
+                logger.exception(err)
+                _unclaim([pk for pks, _email in batch for pk in pks])
+                return sent
+
+            sent += len(batch)
+            _throttle(len(batch), started_at)
+            batch = []
+
+
+def _immediate_emails(notifications):
+    """
+    Make the emails of the notified users that\
+    get them right away, the template is\
+    rendered once per comment
+    """
+    rows = list(
+        notifications
+        .filter(user__st__notify_email=NOTIFY_IMMEDIATELY)
+        .order_by('comment_id', 'pk')
+        .values_list('pk', 'comment_id', 'user__email'))
+    comments = Comment.objects\
+        .select_related('topic')\
+        .in_bulk({comment_id for _pk, comment_id, _email in rows})
+    context = _get_site_context()
+
+    for comment_id, comment_rows in groupby(rows, key=lambda row: row[1]):
+        comment = comments.get(comment_id)
+
+        # Deleted meanwhile
+        if comment is None:
+            continue
+
+        subject = _("New notification: %(topic_name)s") % {'topic_name': comment.topic.title}
+        message, html = _render(
+            'spirit/user/notification_email.html',
+            dict(context, comment=comment))
+
+        for pk, _comment_id, recipient in comment_rows:
+            yield [pk], _make_email(subject, message, html, recipient)
+
+
+def _digest_emails(notifications):
+    """
+    Make the digest of the users that get\
+    them, once the oldest pending notification\
+    has waited for ``settings.ST_NOTIFICATIONS_EMAIL_DIGEST_INTERVAL``
+    """
+    notifications = notifications.filter(user__st__notify_email=NOTIFY_DIGEST)
+    interval = datetime.timedelta(seconds=settings.ST_NOTIFICATIONS_EMAIL_DIGEST_INTERVAL)
+    user_ids = notifications\
+        .filter(date__lte=timezone.now() - interval)\
+        .order_by()\
+        .values_list('user_id', flat=True)\
+        .distinct()
+    notifications = notifications\
+        .filter(user_id__in=list(user_ids))\
+        .select_related('user', 'topic')\
+        .order_by('user_id', '-date', '-pk')
+    context = _get_site_context()
+    subject = _("New notifications")
+
+    for _user_id, user_notifications in groupby(notifications, key=lambda n: n.user_id):
+        user_notifications = list(user_notifications)
+        message, html = _render(
+            'spirit/user/notification_digest_email.html',
+            dict(context, notifications=user_notifications))
+        yield (
+            [n.pk for n in user_notifications],
+            _make_email(subject, message, html, user_notifications[0].user.email))
+
+
+@jobs.non_atomic
+def send_notification_emails(comment_id):
+    """
+    Email the comment notifications to the users\
+    that get them right away. It's deferred as a\
+    job in ``settings.ST_JOBS_MODE = 'queue'``\
+    (see :py:mod:`spirit.core.utils.jobs`),\
+    it runs outside of a transaction so the\
+    claims of the sent emails are kept.\
+    The failed ones are retried by the\
+    ``spiritnotificationemails`` command
+
+    :param comment_id: The comment pk
+    :return: The number of sent emails
+    """
+    return _send(_immediate_emails(
+        _pending_notifications().filter(comment_id=comment_id)))
+
+
+def send_pending_notification_emails():
+    """
+    Email the pending notifications, the failed\
+    ones and the digests, through a single connection
+
+    :return: The number of sent emails
+    """
+    pending = _pending_notifications()
+    return _send(chain(
+        _immediate_emails(pending),
+        _digest_emails(pending)))